@@ -1,11 +1,12 @@
 import logging
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import gevent
 from more_itertools import peekable
 
+from rotkehlchen.accounting.checkpoints import AccountingCheckpoints
 from rotkehlchen.accounting.constants import FREE_PNL_EVENTS_LIMIT
 from rotkehlchen.accounting.export.csv import CSVExporter
 from rotkehlchen.accounting.pot import AccountingPot
@@ -17,6 +18,7 @@ from rotkehlchen.db.settings import DBSettings
 from rotkehlchen.errors.asset import UnknownAsset, UnprocessableTradePair, UnsupportedAsset
 from rotkehlchen.errors.misc import AccountingError, RemoteError
 from rotkehlchen.errors.price import NoPriceForGivenTimestamp, PriceQueryUnsupportedAsset
+from rotkehlchen.globaldb.handler import GlobalDBHandler
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.premium.premium import Premium
 from rotkehlchen.types import EVM_CHAIN_IDS_WITH_TRANSACTIONS, Timestamp
@@ -90,11 +92,10 @@ class Accountant:
     def _process_skipping_exception(
             self,
             exception: Exception,
-            events: Sequence['AccountingEventMixin'],
+            event: 'AccountingEventMixin',
             count: int,
             reason: str,
     ) -> int:
-        event = events[count]
         ts = event.get_timestamp()
         identifier = event.get_identifier()
         self.msg_aggregator.add_error(
@@ -113,20 +114,42 @@ class Accountant:
             self,
             start_ts: Timestamp,
             end_ts: Timestamp,
-            events: Sequence['AccountingEventMixin'],
+            events: Iterable['AccountingEventMixin'],
+            events_num: int | None = None,
     ) -> int:
         """Processes the entire history of cryptoworld actions in order to determine
         the price and time at which every asset was obtained and also
         the general and taxable profit/loss.
 
         The events history is already expected to be sorted when passed to this function.
+        It is consumed only once so it can be an iterator that lazily reads the events.
+        In that case `events_num` should be the number of events in it, as it's saved
+        in the report. If not given the events are counted in memory.
 
         start_ts here is the timestamp at which to start taking trades and other
         taxable events into account. Not where processing starts from. Processing
-        always starts from the very first event we find in the history.
+        starts from the very first event we find in the history or, if the past cost
+        basis is calculated, from the latest accounting checkpoint before start_ts whose
+        events and inputs have not changed since it was saved.
 
         Returns the id of the generated report
         """
+        # the prices of the same assets are queried at many timestamps during processing
+        with GlobalDBHandler.historical_prices_cache():
+            return self._process_history(
+                start_ts=start_ts,
+                end_ts=end_ts,
+                events=events,
+                events_num=events_num,
+            )
+
+    def _process_history(
+            self,
+            start_ts: Timestamp,
+            end_ts: Timestamp,
+            events: Iterable['AccountingEventMixin'],
+            events_num: int | None,
+    ) -> int:
         active_premium = self.premium and self.premium.is_active()
         log.info(
             'Start of history processing',
@@ -135,14 +158,31 @@ class Accountant:
             active_premium=active_premium,
         )
         events_limit = -1 if active_premium else FREE_PNL_EVENTS_LIMIT
+        if events_num is None:
+            events = events if isinstance(events, Sequence) else list(events)
+            events_num = len(events)
+
         # Ask the DB for the settings once at the start of processing so we got the
         # same settings through the entire task
         with self.db.conn.read_ctx() as cursor:
             db_settings = self.db.get_settings(cursor)
             self.ignored_asset_ids = self.db.get_ignored_asset_ids(cursor)
+            ignored_ids_mapping = self.db.get_ignored_action_ids(cursor=cursor, action_type=None)
+            checkpoints = AccountingCheckpoints(
+                database=self.db,
+                start_ts=start_ts,
+                enabled=db_settings.calculate_past_cost_basis,
+            )
+            events_iter = peekable(checkpoints.setup(
+                cursor=cursor,
+                settings=db_settings,
+                ignored_asset_ids=self.ignored_asset_ids,
+                ignored_ids_mapping=ignored_ids_mapping,
+                events=events,
+            ))
             # Create a new pnl report in the DB to be used to save each event generated
             dbpnl = DBAccountingReports(self.db)
-            first_ts = Timestamp(0) if len(events) == 0 else events[0].get_timestamp()
+            first_ts = Timestamp(0) if (first_event := events_iter.peek(None)) is None else first_event.get_timestamp()  # noqa: E501
             report_id = dbpnl.add_report(
                 first_processed_timestamp=first_ts,
                 start_ts=start_ts,
@@ -158,12 +198,20 @@ class Accountant:
             self.first_processed_timestamp = first_ts
 
             count = 0
-            actions_length = len(events)
             prev_time = last_event_ts = Timestamp(0)
-            ignored_ids_mapping = self.db.get_ignored_action_ids(cursor=cursor, action_type=None)
 
-        events_iter = peekable(events)
+        # continue from the latest accounting checkpoint if the events before it are unchanged
+        if (resumed := checkpoints.resume(events_iterator=events_iter, pot=self.pots[0])) is not None:  # noqa: E501
+            count, prev_time = resumed
+            last_event_ts = self.currently_processing_timestamp = prev_time
+
         while True:
+            checkpoints.maybe_save(
+                events_iterator=events_iter,
+                pot=self.pots[0],
+                processed_actions=count,
+            )
+            event = events_iter.peek(None)  # to know which event to skip if processing fails
             try:
                 (
                     processed_events_num,
@@ -179,10 +227,11 @@ class Accountant:
             except PriceQueryUnsupportedAsset as e:
                 count = self._process_skipping_exception(
                     exception=e,
-                    events=events,
+                    event=event,  # type: ignore[arg-type]  # processing fails only for an event
                     count=count,
                     reason='not being able to find price for an unsupported asset',
                 )
+                checkpoints.disable()
                 continue
             except NoPriceForGivenTimestamp as e:
                 self.pots[0].cost_basis.missing_prices.add(
@@ -197,13 +246,15 @@ class Accountant:
             except RemoteError as e:
                 count = self._process_skipping_exception(
                     exception=e,
-                    events=events,
+                    event=event,  # type: ignore[arg-type]  # processing fails only for an event
                     count=count,
                     reason='inability to reach an external service at that point in time',
                 )
+                checkpoints.disable()
                 continue
             except AccountingError as e:
                 log.error(f'Found critical error {e} when processing history. Stopping.')
+                self.pots[0].save_report_events()
                 e.report_id = report_id
                 raise
 
@@ -221,15 +272,16 @@ class Accountant:
                 log.debug(
                     f'PnL reports event processing has hit the event limit of {events_limit}. '
                     f'Processing stopped and the results will not '
-                    f'take into account subsequent events. Total events were {len(events)}',
+                    f'take into account subsequent events. Total events were {events_num}',
                 )
                 break
 
+        self.pots[0].save_report_events()
         dbpnl.add_report_overview(
             report_id=report_id,
             last_processed_timestamp=last_event_ts,
             processed_actions=count,
-            total_actions=actions_length,
+            total_actions=events_num,
             pnls=self.pots[0].pnls,
         )
 
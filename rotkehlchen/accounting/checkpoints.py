@@ -0,0 +1,281 @@
+import hashlib
+import logging
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Optional
+
+from rotkehlchen.accounting.export.csv import ACCOUNTING_SETTINGS
+from rotkehlchen.db.reports import DBAccountingReports
+from rotkehlchen.errors.serialization import DeserializationError
+from rotkehlchen.globaldb.handler import GlobalDBHandler
+from rotkehlchen.history.events.structures.base import HistoryBaseEntry
+from rotkehlchen.history.types import HistoricalPriceOracle
+from rotkehlchen.logging import RotkehlchenLogsAdapter
+from rotkehlchen.types import Timestamp
+from rotkehlchen.utils.version_check import get_system_spec
+
+if TYPE_CHECKING:
+    from more_itertools import peekable
+
+    from rotkehlchen.accounting.mixins.event import AccountingEventMixin
+    from rotkehlchen.accounting.pot import AccountingPot
+    from rotkehlchen.accounting.structures.processed_event import ProcessedAccountingEvent
+    from rotkehlchen.accounting.structures.types import ActionType
+    from rotkehlchen.db.dbhandler import DBHandler
+    from rotkehlchen.db.drivers.gevent import DBCursor
+    from rotkehlchen.db.settings import DBSettings
+
+logger = logging.getLogger(__name__)
+log = RotkehlchenLogsAdapter(logger)
+
+# Settings that change how the events are processed. A change in any of them invalidates
+# all the checkpoints. The ones that only affect the PnL inside the report period don't
+# matter since checkpoints are only made before it but are kept here for simplicity.
+CHECKPOINT_SETTINGS = (
+    *ACCOUNTING_SETTINGS,
+    'main_currency',
+    'include_fees_in_cost_basis',
+    'eth_staking_taxable_after_withdrawal_enabled',
+    'treat_eth2_as_eth',
+    'historical_price_oracles',
+)
+
+
+def year_start(timestamp: Timestamp) -> Timestamp:
+    """Returns the timestamp of the start of the UTC year of the given timestamp"""
+    year = datetime.fromtimestamp(timestamp, tz=UTC).year
+    return Timestamp(int(datetime(year, 1, 1, tzinfo=UTC).timestamp()))
+
+
+def calculate_inputs_hash(
+        cursor: 'DBCursor',
+        settings: 'DBSettings',
+        ignored_asset_ids: set[str],
+        ignored_ids_mapping: dict['ActionType', set[str]],
+) -> str:
+    """Hash everything apart from the events themselves that can change the result of
+    processing the history. That is the rotki version, the accounting settings, the ignored
+    assets and actions, the accounting rules and the manual historical prices."""
+    inputs_hash = hashlib.sha256(get_system_spec()['rotkehlchen'].encode())
+    for name in CHECKPOINT_SETTINGS:
+        inputs_hash.update(f'{name}={getattr(settings, name)!s};'.encode())
+    inputs_hash.update(','.join(sorted(ignored_asset_ids)).encode())
+    for action_type, identifiers in sorted(ignored_ids_mapping.items(), key=lambda x: x[0].value):
+        inputs_hash.update(f'{action_type.serialize()}:{",".join(sorted(identifiers))};'.encode())
+    for table in ('accounting_rules', 'linked_rules_properties'):
+        for entry in cursor.execute(f'SELECT * FROM {table} ORDER BY identifier'):
+            inputs_hash.update(repr(entry).encode())
+
+    with GlobalDBHandler().conn.read_ctx() as global_cursor:
+        for entry in global_cursor.execute(
+                'SELECT from_asset, to_asset, timestamp, price FROM price_history '
+                'WHERE source_type=? ORDER BY from_asset, to_asset, timestamp',
+                (HistoricalPriceOracle.MANUAL.serialize_for_db(),),
+        ):
+            inputs_hash.update(repr(entry).encode())
+
+    return inputs_hash.hexdigest()
+
+
+def event_hash_data(event: 'AccountingEventMixin') -> bytes:
+    """Returns the data of an event that is hashed to detect changes in it. It should not
+    query anything, so history events are represented by what is saved in the DB for them
+    and the rest of the events, which are all dataclasses, by their representation."""
+    if isinstance(event, HistoryBaseEntry):
+        return repr(event.serialize_for_db()).encode()
+
+    return repr(event).encode()
+
+
+class EventsHasher:
+    """Iterator over the events given to accounting that keeps a running hash of them
+
+    The hash of the events before a checkpoint tells if they were edited, deleted,
+    re-decoded or if new ones were added since the checkpoint was made.
+    """
+
+    def __init__(self, events: Iterable['AccountingEventMixin']) -> None:
+        self._events = iter(events)
+        self._hash = hashlib.sha256()
+        self._previous_hash = self._hash.copy()
+        self.active = True
+        self.last_event: AccountingEventMixin | None = None
+        # timestamp of the event read before last_event
+        self.previous_timestamp: Timestamp | None = None
+
+    def __iter__(self) -> Iterator['AccountingEventMixin']:
+        return self
+
+    def __next__(self) -> 'AccountingEventMixin':
+        event = next(self._events)
+        if self.active is False:
+            return event
+
+        self._previous_hash = self._hash.copy()
+        self.previous_timestamp = None if self.last_event is None else self.last_event.get_timestamp()  # noqa: E501
+        self.last_event = event
+        self._hash.update(event_hash_data(event))
+        return event
+
+    def hash_before(self, event: Optional['AccountingEventMixin']) -> str | None:
+        """Returns the hash of all the events read before the given one. The event should be
+        the last one read or None if all events were read. Otherwise returns None."""
+        if self.active is False:
+            return None
+
+        if event is None:
+            return self._hash.hexdigest()
+
+        if event is not self.last_event:
+            return None
+
+        return self._previous_hash.hexdigest()
+
+
+class AccountingCheckpoints:
+    """Saves the state of the accounting pot at the start of each year before the report
+    period so that later reports can restore it and skip processing all older events.
+
+    Checkpoints are only used when the past cost basis is calculated since otherwise
+    the events before the report period are not processed at all.
+    """
+
+    def __init__(self, database: 'DBHandler', start_ts: Timestamp, enabled: bool) -> None:
+        self.dbpnl = DBAccountingReports(database)
+        self.start_ts = start_ts
+        self.enabled = enabled
+        self.hasher: EventsHasher | None = None
+        self.inputs_hash = ''
+        self.last_checkpoint_ts = Timestamp(-1)
+        self.segment_start = 0  # index of the first processed event after the last checkpoint
+
+    def setup(
+            self,
+            cursor: 'DBCursor',
+            settings: 'DBSettings',
+            ignored_asset_ids: set[str],
+            ignored_ids_mapping: dict['ActionType', set[str]],
+            events: Iterable['AccountingEventMixin'],
+    ) -> Iterable['AccountingEventMixin']:
+        """Delete the checkpoints made with different inputs and return the events wrapped
+        in an iterator that hashes them. Returns the events as they are if disabled."""
+        if self.enabled is False:
+            return events
+
+        self.inputs_hash = calculate_inputs_hash(
+            cursor=cursor,
+            settings=settings,
+            ignored_asset_ids=ignored_asset_ids,
+            ignored_ids_mapping=ignored_ids_mapping,
+        )
+        self.dbpnl.delete_checkpoints(inputs_hash=self.inputs_hash)
+        self.hasher = EventsHasher(events)
+        return self.hasher
+
+    def disable(self) -> None:
+        """Stop making checkpoints for the rest of the processing"""
+        self.enabled = False
+        if self.hasher is not None:
+            self.hasher.active = False
+
+    def resume(
+            self,
+            events_iterator: "peekable['AccountingEventMixin']",
+            pot: 'AccountingPot',
+    ) -> tuple[int, Timestamp] | None:
+        """Find the latest checkpoint that is still valid, restore the pot to its state and
+        skip the events before it. Checkpoints after a changed event are deleted.
+
+        Returns the number of processed actions and the timestamp of the last skipped
+        event or None if no checkpoint could be used.
+        """
+        if self.enabled is False or self.hasher is None:
+            return None
+
+        resumed: tuple[Timestamp, int, Timestamp] | None = None
+        resumed_state = None
+        processed_events: list[ProcessedAccountingEvent] = []
+        skipped_events: list[AccountingEventMixin] = []
+        for checkpoint_ts, events_hash, processed_actions in self.dbpnl.get_checkpoints(until_ts=self.start_ts):  # noqa: E501
+            while (head := events_iterator.peek(None)) is not None and head.get_timestamp() < checkpoint_ts:  # noqa: E501
+                skipped_events.append(next(events_iterator))
+
+            if len(skipped_events) == 0 or self.hasher.hash_before(head) != events_hash:
+                log.debug(f'Events before accounting checkpoint at {checkpoint_ts} changed')
+                self.dbpnl.delete_checkpoints(from_ts=checkpoint_ts)
+                break
+
+            try:
+                state, segment_events = self.dbpnl.get_checkpoint(checkpoint_ts)
+                pot.restore_checkpoint_state(state=state, processed_events=processed_events + segment_events)  # noqa: E501
+            except DeserializationError as e:
+                log.error(f'Failed to restore accounting checkpoint at {checkpoint_ts} due to {e!s}')  # noqa: E501
+                self.dbpnl.delete_checkpoints(from_ts=checkpoint_ts)
+                pot.restore_checkpoint_state(state=resumed_state, processed_events=processed_events)  # noqa: E501
+                break
+
+            resumed = (checkpoint_ts, processed_actions, skipped_events[-1].get_timestamp())
+            resumed_state = state
+            processed_events += segment_events
+            skipped_events = []
+
+        # the events after the last usable checkpoint still need to be processed
+        events_iterator.prepend(*skipped_events)
+        if resumed is None:
+            return None
+
+        checkpoint_ts, processed_actions, last_skipped_ts = resumed
+        self.dbpnl.add_report_events(
+            report_id=pot.report_id,  # type: ignore[arg-type]  # report id is set by now
+            ts_converter=pot.timestamp_to_date,
+            events=processed_events,
+        )
+        self.last_checkpoint_ts = checkpoint_ts
+        self.segment_start = len(processed_events)
+        log.info(f'Resumed history processing from the accounting checkpoint at {checkpoint_ts}')
+        return processed_actions, last_skipped_ts
+
+    def maybe_save(
+            self,
+            events_iterator: "peekable['AccountingEventMixin']",
+            pot: 'AccountingPot',
+            processed_actions: int,
+    ) -> None:
+        """Save a checkpoint if the next event is the first one after a year start that
+        comes before the report period and all the previous events were processed fully"""
+        if self.enabled is False or self.hasher is None:
+            return
+
+        if pot.had_price_errors or len(pot.cost_basis.missing_prices) != 0:
+            # prices found later would change the processing of the events before
+            self.disable()
+            return
+
+        if (head := events_iterator.peek(None)) is None:
+            return
+
+        checkpoint_ts = year_start(head.get_timestamp())
+        if checkpoint_ts > self.start_ts:
+            self.disable()  # all next checkpoints are inside the report period
+            return
+
+        if (
+            checkpoint_ts <= self.last_checkpoint_ts or
+            self.hasher.previous_timestamp is None or
+            self.hasher.previous_timestamp >= checkpoint_ts or  # the last event was consumed with an event after the year start  # noqa: E501
+            (events_hash := self.hasher.hash_before(head)) is None
+        ):
+            return
+
+        self.dbpnl.add_checkpoint(
+            timestamp=checkpoint_ts,
+            inputs_hash=self.inputs_hash,
+            events_hash=events_hash,
+            processed_actions=processed_actions,
+            state=pot.serialize_checkpoint_state(),
+            ts_converter=pot.timestamp_to_date,
+            events=pot.processed_events[self.segment_start:],
+        )
+        self.last_checkpoint_ts = checkpoint_ts
+        self.segment_start = len(pot.processed_events)
+        log.debug(f'Saved accounting checkpoint at {checkpoint_ts}')
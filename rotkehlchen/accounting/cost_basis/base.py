@@ -292,6 +292,41 @@ class BaseCostBasisMethod(ABC):
     def __len__(self) -> int:
         return len(self._acquisitions_heap)
 
+    def serialize_state(self) -> dict[str, Any]:
+        """Serialize the acquisitions heap, in its current order, to be saved in a checkpoint"""
+        return {'acquisitions': [
+            entry.acquisition_event.serialize() | {
+                'remaining_amount': str(entry.acquisition_event.remaining_amount),
+                'priority': str(entry.priority),
+            } for entry in self._acquisitions_heap
+        ]}
+
+    def deserialize_state(self, state: dict[str, Any]) -> None:
+        """Restore the acquisitions heap from the data created by serialize_state
+
+        May raise:
+        - DeserializationError if the data is not valid
+        """
+        acquisitions_heap = []
+        try:
+            for entry in state['acquisitions']:
+                acquisition = AssetAcquisitionEvent(
+                    amount=deserialize_fval(entry['full_amount'], name='full_amount', location='cost basis state'),  # noqa: E501
+                    timestamp=Timestamp(entry['timestamp']),
+                    rate=Price(deserialize_fval(entry['rate'], name='rate', location='cost basis state')),  # noqa: E501
+                    index=entry['index'],
+                )
+                acquisition.remaining_amount = deserialize_fval(entry['remaining_amount'], name='remaining_amount', location='cost basis state')  # noqa: E501
+                acquisitions_heap.append(AssetAcquisitionHeapElement(
+                    priority=deserialize_fval(entry['priority'], name='priority', location='cost basis state'),  # noqa: E501
+                    acquisition_event=acquisition,
+                ))
+        except KeyError as e:
+            raise DeserializationError(f'Missing key {e!s} in cost basis state') from e
+
+        # the list was saved in heap order so the heap invariant still holds
+        self._acquisitions_heap = acquisitions_heap
+
 
 class FIFOCostBasisMethod(BaseCostBasisMethod):
     """
@@ -307,6 +342,16 @@ class FIFOCostBasisMethod(BaseCostBasisMethod):
         heapq.heappush(self._acquisitions_heap, AssetAcquisitionHeapElement(self._count, acquisition))  # noqa: E501
         self._count += 1
 
+    def serialize_state(self) -> dict[str, Any]:
+        return super().serialize_state() | {'count': str(self._count)}
+
+    def deserialize_state(self, state: dict[str, Any]) -> None:
+        super().deserialize_state(state)
+        try:
+            self._count = deserialize_fval(state['count'], name='count', location='cost basis state')  # noqa: E501
+        except KeyError as e:
+            raise DeserializationError(f'Missing key {e!s} in cost basis state') from e
+
 
 class LIFOCostBasisMethod(BaseCostBasisMethod):
     """
@@ -322,6 +367,16 @@ class LIFOCostBasisMethod(BaseCostBasisMethod):
         heapq.heappush(self._acquisitions_heap, AssetAcquisitionHeapElement(-self._count, acquisition))  # noqa: E501
         self._count += 1
 
+    def serialize_state(self) -> dict[str, Any]:
+        return super().serialize_state() | {'count': str(self._count)}
+
+    def deserialize_state(self, state: dict[str, Any]) -> None:
+        super().deserialize_state(state)
+        try:
+            self._count = deserialize_fval(state['count'], name='count', location='cost basis state')  # noqa: E501
+        except KeyError as e:
+            raise DeserializationError(f'Missing key {e!s} in cost basis state') from e
+
 
 class HIFOCostBasisMethod(BaseCostBasisMethod):
     """
@@ -441,6 +496,22 @@ class AverageCostBasisMethod(BaseCostBasisMethod):
             average_cost_basis=self.current_total_acb / self.current_amount,
         )
 
+    def serialize_state(self) -> dict[str, Any]:
+        return super().serialize_state() | {
+            'count': str(self._count),
+            'current_amount': str(self.current_amount),
+            'current_total_acb': str(self.current_total_acb),
+        }
+
+    def deserialize_state(self, state: dict[str, Any]) -> None:
+        super().deserialize_state(state)
+        try:
+            self._count = deserialize_fval(state['count'], name='count', location='cost basis state')  # noqa: E501
+            self.current_amount = deserialize_fval(state['current_amount'], name='current_amount', location='cost basis state')  # noqa: E501
+            self.current_total_acb = deserialize_fval(state['current_total_acb'], name='current_total_acb', location='cost basis state')  # noqa: E501
+        except KeyError as e:
+            raise DeserializationError(f'Missing key {e!s} in cost basis state') from e
+
 
 class CostBasisEvents:
     def __init__(self, cost_basis_method: CostBasisMethod) -> None:
@@ -586,6 +657,37 @@ class CostBasisCalculator(CustomizableDateMixin):
         self.missing_acquisitions: list[MissingAcquisition] = []
         self.missing_prices: set[MissingPrice] = set()
 
+    def serialize_state(self) -> dict[str, Any]:
+        """Serialize the acquisitions of all assets and the missing acquisitions found so far
+        to be saved in an accounting checkpoint. Spends and used acquisitions are only kept
+        for information and are not part of the state."""
+        return {
+            'assets': {
+                asset.identifier: events.acquisitions_manager.serialize_state()
+                for asset, events in self._events.items()
+            },
+            'missing_acquisitions': [x.serialize() for x in self.missing_acquisitions],
+        }
+
+    def deserialize_state(self, state: dict[str, Any]) -> None:
+        """Restore the data created by serialize_state. Should be called right after reset.
+
+        May raise:
+        - DeserializationError if the data is not valid
+        """
+        try:
+            for identifier, asset_state in state['assets'].items():
+                self._events[Asset(identifier)].acquisitions_manager.deserialize_state(asset_state)
+
+            self.missing_acquisitions = [MissingAcquisition(
+                asset=Asset(entry['asset']),
+                time=Timestamp(entry['time']),
+                found_amount=deserialize_fval(entry['found_amount'], name='found_amount', location='cost basis state'),  # noqa: E501
+                missing_amount=deserialize_fval(entry['missing_amount'], name='missing_amount', location='cost basis state'),  # noqa: E501
+            ) for entry in state['missing_acquisitions']]
+        except KeyError as e:
+            raise DeserializationError(f'Missing key {e!s} in cost basis state') from e
+
     def get_events(self, asset: Asset) -> CostBasisEvents:
         """Custom getter for events so that we have common cost basis for some assets"""
         if asset == A_WETH:
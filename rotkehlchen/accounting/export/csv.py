@@ -1,9 +1,10 @@
+import itertools
 import json
 import logging
-from collections.abc import Collection
-from csv import DictWriter
+from collections.abc import Collection, Iterable
+from csv import DictWriter, reader, writer
 from pathlib import Path
-from tempfile import mkdtemp
+from tempfile import TemporaryFile, mkdtemp
 from typing import TYPE_CHECKING, Any, Literal
 from zipfile import ZIP_DEFLATED, ZipFile
 
@@ -53,30 +54,60 @@ class CSVWriteError(Exception):
 
 def dict_to_csv_file(
         path: Path,
-        dictionary_list: list,
+        dictionary_list: Iterable[dict[str, Any]],
         headers: Collection | None = None,
 ) -> None:
-    """Takes a filepath and a list of dictionaries representing the rows and writes them
-    into the file as a CSV
+    """Takes a filepath and an iterable of dictionaries representing the rows and writes
+    them into the file as a CSV. The rows are written as they are consumed, so they can
+    be lazily generated.
 
     May raise:
     - CSVWriteError if DictWriter.writerow() tried to write a dict contains
     fields not in fieldnames
     """
-    if len(dictionary_list) == 0:
+    rows = iter(dictionary_list)
+    if (first_row := next(rows, None)) is None:
         log.debug(f'Skipping writting empty CSV for {path}')
         return
 
     with open(path, 'w', newline='', encoding='utf-8') as f:
-        w = DictWriter(f, fieldnames=dictionary_list[0].keys() if headers is None else headers)
+        w = DictWriter(f, fieldnames=first_row.keys() if headers is None else headers)
         w.writeheader()
         try:
-            for dic in dictionary_list:
+            for dic in itertools.chain((first_row,), rows):
                 w.writerow(dic)
         except ValueError as e:
             raise CSVWriteError(f'Failed to write {path} CSV due to {e!s}') from e
 
 
+def dict_to_csv_file_with_all_keys(
+        path: Path,
+        dictionary_list: Iterable[dict[str, Any]],
+) -> None:
+    """Like dict_to_csv_file but the headers are all the keys of the rows in the order
+    they are first seen. The headers go first in the file, so the rows are consumed
+    once and spooled to a temporary file until all of them have been seen. Rows that
+    lack some of the keys are written with empty values for them.
+    """
+    headers: dict[str, None] = {}  # maintain insertion order without storing extra info
+    with TemporaryFile(mode='w+', newline='', encoding='utf-8') as spool:
+        spool_writer = writer(spool)
+        for dic in dictionary_list:
+            headers.update(dict.fromkeys(dic))
+            spool_writer.writerow([dic.get(header, '') for header in headers])
+
+        if len(headers) == 0:
+            log.debug(f'Skipping writting empty CSV for {path}')
+            return
+
+        spool.seek(0)
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            w = writer(f)
+            w.writerow(headers)
+            for row in reader(spool):
+                w.writerow(row + [''] * (len(headers) - len(row)))
+
+
 class CSVExporter(CustomizableDateMixin):
 
     def __init__(
@@ -35,6 +35,9 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
+# Number of processed events written to the report in a single DB transaction
+PNL_EVENTS_SAVE_BATCH_SIZE = 1000
+
 
 class AccountingPot(CustomizableDateMixin):
     """
@@ -70,28 +73,45 @@ class AccountingPot(CustomizableDateMixin):
         )
         self.pnls = PnlTotals()
         self.processed_events: list[ProcessedAccountingEvent] = []
+        # processed events that are saved in the DB in batches of PNL_EVENTS_SAVE_BATCH_SIZE
+        self.unsaved_events: list[ProcessedAccountingEvent] = []
         self.events_accountant = EventsAccountant(
             evm_accounting_aggregators=evm_accounting_aggregators,
             pot=self,
         )
         self.query_start_ts = self.query_end_ts = Timestamp(0)
         self.report_id: int | None = None
+        # set when a price could not be found due to a missing or unreachable price source
+        # since processing of the affected events may differ once the price is known
+        self.had_price_errors = False
+        # profit currency rates already queried in this report, or the error of not finding
+        # them, since events at the same timestamp often need the price of the same asset
+        self.rates: dict[tuple[str, Timestamp], Price | NoPriceForGivenTimestamp] = {}
 
     def _add_processed_event(self, event: ProcessedAccountingEvent) -> None:
-        dbpnl = DBAccountingReports(self.database)
         self.processed_events.append(event)
+        self.unsaved_events.append(event)
+        if len(self.unsaved_events) >= PNL_EVENTS_SAVE_BATCH_SIZE:
+            self.save_report_events()
+
+        log.debug(event.to_string(self.timestamp_to_date))
+
+    def save_report_events(self) -> None:
+        """Save the processed events that are not yet in the DB to the report.
+        Should be called once processing stops so that all events get saved."""
+        if len(self.unsaved_events) == 0 or self.report_id is None:
+            return
+
         try:
-            dbpnl.add_report_data(
-                report_id=self.report_id,  # type: ignore # report id is initialized by now
-                time=event.timestamp,
+            DBAccountingReports(self.database).add_report_events(
+                report_id=self.report_id,
                 ts_converter=self.timestamp_to_date,
-                event=event,
+                events=self.unsaved_events,
             )
-        except (DeserializationError, InputError) as e:
+        except InputError as e:
             log.error(str(e))
-            return
 
-        log.debug(event.to_string(self.timestamp_to_date))
+        self.unsaved_events = []
 
     def get_rate_in_profit_currency(self, asset: Asset, timestamp: Timestamp) -> Price:
         """Get the profit_currency price of asset in the given timestamp
@@ -104,13 +124,25 @@ class AccountingPot(CustomizableDateMixin):
         or with reading the response returned by the server
         """
         if asset == self.profit_currency:
-            rate = Price(ONE)
-        else:
-            rate = PriceHistorian().query_historical_price(
-                from_asset=asset,
-                to_asset=self.profit_currency,
-                timestamp=timestamp,
-            )
+            return Price(ONE)
+
+        if (rate := self.rates.get((asset.identifier, timestamp))) is None:
+            try:
+                rate = PriceHistorian().query_historical_price(
+                    from_asset=asset,
+                    to_asset=self.profit_currency,
+                    timestamp=timestamp,
+                )
+            except NoPriceForGivenTimestamp as e:
+                rate = e
+            except RemoteError:  # not cached since the service may be reachable again
+                self.had_price_errors = True
+                raise
+            self.rates[(asset.identifier, timestamp)] = rate
+
+        if isinstance(rate, NoPriceForGivenTimestamp):
+            self.had_price_errors = True
+            raise rate.with_traceback(None)  # don't grow the traceback on each raise
         return rate
 
     def reset(
@@ -131,6 +163,42 @@ class AccountingPot(CustomizableDateMixin):
         self.cost_basis.reset(settings)
         self.events_accountant.reset()
         self.processed_events = []
+        self.unsaved_events = []
+        self.had_price_errors = False
+        self.rates = {}
+
+    def serialize_checkpoint_state(self) -> dict[str, Any]:
+        """Get the state of the pot that is needed to continue processing from this point.
+        Totals are not included since checkpoints are only made before the report period."""
+        return {
+            'cost_basis': self.cost_basis.serialize_state(),
+            'evm_accountants': self.events_accountant.evm_accounting_aggregators.serialize_state(),
+        }
+
+    def restore_checkpoint_state(
+            self,
+            state: dict[str, Any] | None,
+            processed_events: list[ProcessedAccountingEvent],
+    ) -> None:
+        """Restore the state created by serialize_checkpoint_state and the events processed
+        until it was created. Should be called after reset. With no state it only brings
+        the pot back to the state right after reset.
+
+        May raise:
+        - DeserializationError if the state is not valid
+        """
+        self.cost_basis.reset(self.settings)
+        self.events_accountant.evm_accounting_aggregators.reset()
+        self.processed_events = processed_events
+        self.unsaved_events = []  # the checkpoint events are saved when resuming from it
+        if state is None:
+            return
+
+        try:
+            self.cost_basis.deserialize_state(state['cost_basis'])
+            self.events_accountant.evm_accounting_aggregators.deserialize_state(state['evm_accountants'])
+        except KeyError as e:
+            raise DeserializationError(f'Missing key {e!s} in accounting checkpoint state') from e
 
     def add_in_event(
             self,  # pylint: disable=unused-argument
@@ -33,6 +33,28 @@ from rotkehlchen.utils.serialization import rlk_jsondumps
 
 T = TypeVar('T', bound='ProcessedAccountingEvent')
 
+ProcessedEventDBTuple = tuple[
+    str,  # type
+    str,  # location
+    str,  # asset
+    str,  # free_amount
+    str,  # taxable_amount
+    str,  # pnl_taxable
+    str,  # pnl_free
+    str,  # data
+]
+# The keys of the exported dict that are saved in columns of the pnl_events table in the
+# order of ProcessedEventDBTuple. The rest are saved in the json data.
+PNL_EVENT_COLUMN_KEYS = (
+    'type',
+    'location',
+    'asset_identifier',
+    'free_amount',
+    'taxable_amount',
+    'pnl_taxable',
+    'pnl_free',
+)
+
 
 class AccountingEventExportType(Enum):
     API = auto()
@@ -219,12 +241,17 @@ class ProcessedAccountingEvent:
 
         return self.pnl
 
-    def serialize_for_db(self, ts_converter: Callable[[Timestamp], str]) -> str:
-        """May raise:
+    def serialize_for_db(self, ts_converter: Callable[[Timestamp], str]) -> ProcessedEventDBTuple:
+        """Serialize the event into the columns of the pnl_events table. The fields that
+        reports filter, sort and aggregate by get their own column and the rest go into
+        the json data.
 
+        May raise:
         - DeserializationError if something fails during conversion to the DB tuple
         """
         json_data = self.serialize_to_dict(ts_converter)
+        for key in (*PNL_EVENT_COLUMN_KEYS, 'timestamp'):
+            json_data.pop(key)
         try:
             string_data = rlk_jsondumps(json_data)
         except (OverflowError, ValueError, TypeError) as e:
@@ -232,20 +259,42 @@ class ProcessedAccountingEvent:
                 f'Could not dump json to string for NamedJson. Error was {e!s}',
             ) from e
 
-        return string_data
+        return (
+            self.event_type.serialize(),
+            self.location.serialize_for_db(),
+            self.asset.identifier,
+            str(self.free_amount),
+            str(self.taxable_amount),
+            str(self.pnl.taxable),
+            str(self.pnl.free),
+            string_data,
+        )
 
     @classmethod
-    def deserialize_from_db(cls: builtins.type[T], timestamp: Timestamp, stringified_json: str) -> T:  # noqa: E501
-        """May raise:
+    def deserialize_from_db(cls: builtins.type[T], timestamp: Timestamp, entry: ProcessedEventDBTuple) -> T:  # noqa: E501
+        """Create the event from the timestamp and the tuple made by serialize_for_db
+
+        May raise:
         - DeserializationError if something is wrong with reading this from the DB
         """
         try:
-            data = json.loads(stringified_json)
+            data = json.loads(entry[7])
         except json.decoder.JSONDecodeError as e:
             raise DeserializationError(
                 f'Could not decode processed accounting event json from the DB due to {e!s}',
             ) from e
 
+        data |= dict(zip(PNL_EVENT_COLUMN_KEYS, entry[:7], strict=True))
+        data['location'] = str(Location.deserialize_from_db(data['location']))
+        return cls.deserialize_from_dict(timestamp, data)
+
+    @classmethod
+    def deserialize_from_dict(cls: builtins.type[T], timestamp: Timestamp, data: dict[str, Any]) -> T:  # noqa: E501
+        """Create the event from the dict made by serialize_to_dict
+
+        May raise:
+        - DeserializationError if something is wrong with the data
+        """
         try:
             pnl_taxable = deserialize_fval(data['pnl_taxable'], name='pnl_taxable', location='processed event decoding')  # noqa: E501
             pnl_free = deserialize_fval(data['pnl_free'], name='pnl_free', location='processed event decoding')  # noqa: E501
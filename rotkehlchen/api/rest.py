@@ -6,7 +6,7 @@ import sys
 import tempfile
 import traceback
 from collections import defaultdict
-from collections.abc import Callable, Sequence
+from collections.abc import Callable, Iterator, Sequence
 from http import HTTPStatus
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Literal, Optional, get_args, overload
@@ -34,7 +34,7 @@ from rotkehlchen.accounting.export.csv import (
     FILENAME_HISTORY_EVENTS_CSV,
     FILENAME_SKIPPED_EXTERNAL_EVENTS_CSV,
     CSVWriteError,
-    dict_to_csv_file,
+    dict_to_csv_file_with_all_keys,
 )
 from rotkehlchen.accounting.pot import AccountingPot
 from rotkehlchen.accounting.structures.balance import Balance, BalanceType
@@ -42,6 +42,7 @@ from rotkehlchen.accounting.structures.processed_event import AccountingEventExp
 from rotkehlchen.accounting.structures.types import ActionType
 from rotkehlchen.api.v1.schemas import TradeSchema
 from rotkehlchen.api.v1.types import IncludeExcludeFilterData
+from rotkehlchen.api.websockets.typedefs import WSMessageType
 from rotkehlchen.assets.asset import (
     Asset,
     AssetWithNameAndType,
@@ -104,6 +105,7 @@ from rotkehlchen.constants.limits import (
 from rotkehlchen.constants.misc import (
     AIRDROPS_TOLERANCE,
     AVATARIMAGESDIR_NAME,
+    DEFAULT_FVAL_BACKEND,
     DEFAULT_MAX_LOG_BACKUP_FILES,
     DEFAULT_MAX_LOG_SIZE_IN_MB,
     DEFAULT_SQL_VM_INSTRUCTIONS_CB,
@@ -113,7 +115,7 @@ from rotkehlchen.constants.misc import (
 )
 from rotkehlchen.constants.prices import ZERO_PRICE
 from rotkehlchen.constants.resolver import ChainID
-from rotkehlchen.constants.timing import ENS_AVATARS_REFRESH
+from rotkehlchen.constants.timing import ASYNC_TASK_RESULT_TTL, ENS_AVATARS_REFRESH
 from rotkehlchen.data_import.manager import DataImportSource
 from rotkehlchen.db.accounting_rules import DBAccountingRules, query_missing_accounting_rules
 from rotkehlchen.db.addressbook import DBAddressbook
@@ -126,6 +128,7 @@ from rotkehlchen.db.constants import (
 )
 from rotkehlchen.db.custom_assets import DBCustomAssets
 from rotkehlchen.db.ens import DBEns
+from rotkehlchen.db.eth2 import VALIDATOR_PROFIT_ENTRY_TYPES, DBEth2
 from rotkehlchen.db.evmtx import DBEvmTx
 from rotkehlchen.db.filtering import (
     AccountingRulesFilterQuery,
@@ -182,7 +185,7 @@ from rotkehlchen.exchanges.constants import ALL_SUPPORTED_EXCHANGES
 from rotkehlchen.exchanges.data_structures import Trade
 from rotkehlchen.exchanges.utils import query_binance_exchange_pairs
 from rotkehlchen.externalapis.github import Github
-from rotkehlchen.fval import FVal
+from rotkehlchen.fval import FVal, get_fval_backend
 from rotkehlchen.globaldb.assets_management import export_assets_from_file, import_assets_from_file
 from rotkehlchen.globaldb.cache import (
     globaldb_delete_general_cache_values,
@@ -260,6 +263,7 @@ from rotkehlchen.types import (
     UserNote,
 )
 from rotkehlchen.utils.misc import combine_dicts, ts_ms_to_sec, ts_now
+from rotkehlchen.utils.rate_limit import RateLimiters
 from rotkehlchen.utils.snapshots import parse_import_snapshot_data
 from rotkehlchen.utils.version_check import get_current_version
 
@@ -386,7 +390,10 @@ class RestAPI:
         self.task_lock = Semaphore()
         self.login_lock = Semaphore()
         self.task_id = 0
-        self.task_results: dict[int, Any] = {}
+        # greenlets of the async tasks whose result has not been collected yet
+        self.task_greenlets: dict[int, gevent.Greenlet] = {}
+        # completion timestamp and result of finished tasks in order of completion
+        self.task_results: dict[int, tuple[Timestamp, Any]] = {}
         self.trade_schema = TradeSchema()
 
     # - Private functions not exposed to the API
@@ -397,8 +404,38 @@ class RestAPI:
         return task_id
 
     def _write_task_result(self, task_id: int, result: Any) -> None:
+        """Store the result of a task and notify the frontend via websockets that it can
+        be collected. Results of cancelled tasks are dropped since nobody can collect them."""
         with self.task_lock:
-            self.task_results[task_id] = result
+            self._expire_task_results()
+            if task_id not in self.task_greenlets:
+                return
+
+            self.task_results[task_id] = (ts_now(), result)
+
+        self.rotkehlchen.msg_aggregator.add_message(
+            message_type=WSMessageType.ASYNC_TASK_COMPLETED,
+            data={'task_id': task_id},
+        )
+
+    def _forget_task(self, task_id: int) -> None:
+        """Remove a task and its result. Must be called with the task lock acquired"""
+        self.task_results.pop(task_id, None)
+        if (greenlet := self.task_greenlets.pop(task_id, None)) is not None:
+            self.rotkehlchen.api_task_greenlets.remove(greenlet)
+
+    def _expire_task_results(self) -> None:
+        """Forget the tasks whose result was not collected within ASYNC_TASK_RESULT_TTL.
+        Must be called with the task lock acquired. Results are stored in order of
+        completion so only the expired ones are visited."""
+        expiry_ts = ts_now() - ASYNC_TASK_RESULT_TTL
+        while len(self.task_results) != 0:
+            task_id, (completion_ts, _) = next(iter(self.task_results.items()))
+            if completion_ts > expiry_ts:
+                break
+
+            log.debug(f'Dropping the uncollected result of async task {task_id}')
+            self._forget_task(task_id)
 
     def _handle_killed_greenlets(self, greenlet: gevent.Greenlet) -> None:
         if not greenlet.exception:
@@ -450,6 +487,8 @@ class RestAPI:
         )
         greenlet.task_id = task_id
         greenlet.link_exception(self._handle_killed_greenlets)
+        with self.task_lock:
+            self.task_greenlets[task_id] = greenlet
         self.rotkehlchen.api_task_greenlets.append(greenlet)
         return api_response(_wrap_in_ok_result({'task_id': task_id}), status_code=HTTPStatus.OK)
 
@@ -488,47 +527,49 @@ class RestAPI:
             # If no task id is given return list of all pending and completed tasks
             completed = []
             pending = []
-            for greenlet in self.rotkehlchen.api_task_greenlets:
-                task_id = greenlet.task_id
-                if task_id in self.task_results:
-                    completed.append(task_id)
-                else:
-                    pending.append(task_id)
+            with self.task_lock:
+                self._expire_task_results()
+                for greenlet_task_id in self.task_greenlets:
+                    if greenlet_task_id in self.task_results:
+                        completed.append(greenlet_task_id)
+                    else:
+                        pending.append(greenlet_task_id)
 
             result = _wrap_in_ok_result({'pending': pending, 'completed': completed})
             return api_response(result=result, status_code=HTTPStatus.OK)
 
         with self.task_lock:
-            for idx, greenlet in enumerate(self.rotkehlchen.api_task_greenlets):
-                if greenlet.task_id == task_id:
-                    if task_id in self.task_results:
-                        # Task has completed and we just got the outcome
-                        function_response = self.task_results.pop(int(task_id), None)
-                        # The result of the original request
-                        result = function_response['result']
-                        # The message of the original request
-                        message = function_response['message']
-                        status_code = function_response.get('status_code')
-                        ret = {'result': result, 'message': message}
-                        returned_task_result = {
-                            'status': 'completed',
-                            'outcome': process_result(ret),
-                        }
-                        if status_code:
-                            returned_task_result['status_code'] = status_code
-                        result_dict = {
-                            'result': returned_task_result,
-                            'message': '',
-                        }
-                        # Also remove the greenlet from the api tasks
-                        self.rotkehlchen.api_task_greenlets.pop(idx)
-                        return api_response(result=result_dict, status_code=HTTPStatus.OK)
-                    # else task is still pending and the greenlet is running
-                    result_dict = {
-                        'result': {'status': 'pending', 'outcome': None},
-                        'message': f'The task with id {task_id} is still pending',
-                    }
-                    return api_response(result=result_dict, status_code=HTTPStatus.OK)
+            self._expire_task_results()
+            if task_id in self.task_results:
+                # Task has completed and we just got the outcome
+                function_response = self.task_results[task_id][1]
+                # Also remove the greenlet from the api tasks
+                self._forget_task(task_id)
+                # The result of the original request
+                result = function_response['result']
+                # The message of the original request
+                message = function_response['message']
+                status_code = function_response.get('status_code')
+                ret = {'result': result, 'message': message}
+                returned_task_result = {
+                    'status': 'completed',
+                    'outcome': process_result(ret),
+                }
+                if status_code:
+                    returned_task_result['status_code'] = status_code
+                result_dict = {
+                    'result': returned_task_result,
+                    'message': '',
+                }
+                return api_response(result=result_dict, status_code=HTTPStatus.OK)
+
+            if task_id in self.task_greenlets:
+                # else task is still pending and the greenlet is running
+                result_dict = {
+                    'result': {'status': 'pending', 'outcome': None},
+                    'message': f'The task with id {task_id} is still pending',
+                }
+                return api_response(result=result_dict, status_code=HTTPStatus.OK)
 
         # The task has not been found
         result_dict = {
@@ -540,20 +581,48 @@ class RestAPI:
     def delete_async_task(self, task_id: int) -> Response:
         """Tries to find and cancel the async task with the given task id"""
         with self.task_lock:
-            for idx, greenlet in enumerate(self.rotkehlchen.api_task_greenlets):  # noqa: B007 # var used right after loop
-                if (
-                        greenlet.dead is False and
-                        getattr(greenlet, 'task_id', None) == task_id
-                ):
-                    log.debug(f'Killing api task greenlet with {task_id=}')
-                    greenlet.kill(exception=GreenletKilledError('Killed due to api request'))
-                    break
-            else:  # greenlet not found
+            if (greenlet := self.task_greenlets.get(task_id)) is None or greenlet.dead is True:
                 return api_response(wrap_in_fail_result(f'Did not cancel task with id {task_id} because it could not be found'), status_code=HTTPStatus.NOT_FOUND)  # noqa: E501
 
-        self.rotkehlchen.api_task_greenlets.pop(idx)  # also pop from greenlets
+            log.debug(f'Killing api task greenlet with {task_id=}')
+            greenlet.kill(exception=GreenletKilledError('Killed due to api request'))
+            self._forget_task(task_id)  # also remove from greenlets
+
         return api_response(OK_RESULT, status_code=HTTPStatus.OK)
 
+    def get_background_tasks_stats(self) -> Response:
+        """Returns the scheduling statistics of the background tasks of the task manager"""
+        assert self.rotkehlchen.task_manager is not None, 'task manager should exist for a logged in user'  # noqa: E501
+        return api_response(
+            result=_wrap_in_ok_result(self.rotkehlchen.task_manager.get_tasks_stats()),
+            status_code=HTTPStatus.OK,
+        )
+
+    def get_rate_limits(self) -> Response:
+        """Returns the state of the rate limiters of the queried remote hosts"""
+        return api_response(
+            result=_wrap_in_ok_result(RateLimiters().serialize()),
+            status_code=HTTPStatus.OK,
+        )
+
+    def get_query_caches(self) -> Response:
+        """Returns the age and hit rate of the cached queries of the chains and exchanges"""
+        caches = [
+            {'owner': 'blockchain', **entry}
+            for entry in self.rotkehlchen.chains_aggregator.serialize_cache_stats()
+        ]
+        if (nfts := self.rotkehlchen.chains_aggregator.get_module('nfts')) is not None:
+            caches.extend({'owner': 'nfts', **entry} for entry in nfts.serialize_cache_stats())
+        for exchange in self.rotkehlchen.exchange_manager.iterate_exchanges():
+            caches.extend(
+                {'owner': exchange.name, **entry} for entry in exchange.serialize_cache_stats()
+            )
+
+        return api_response(
+            result=_wrap_in_ok_result(caches),
+            status_code=HTTPStatus.OK,
+        )
+
     @async_api_call()
     def get_exchange_rates(self, given_currencies: list[AssetWithOracles]) -> dict[str, Any]:
         currencies = given_currencies
@@ -970,6 +1039,8 @@ class RestAPI:
                         HISTORY_MAPPING_KEY_STATE: HISTORY_MAPPING_STATE_CUSTOMIZED,
                     },
                 )
+                if identifier is not None and event.entry_type in VALIDATOR_PROFIT_ENTRY_TYPES:
+                    DBEth2(self.rotkehlchen.data.db).update_daily_performance(cursor)
             except sqlcipher.DatabaseError as e:  # pylint: disable=no-member
                 error_msg = f'Failed to add event to the DB due to a DB error: {e!s}'
                 return api_response(wrap_in_fail_result(error_msg), status_code=HTTPStatus.CONFLICT)  # noqa: E501
@@ -1238,6 +1309,8 @@ class RestAPI:
         #   that is going to get complicated fast.
         gevent.killall(self.rotkehlchen.api_task_greenlets)
         with self.task_lock:
+            self.rotkehlchen.api_task_greenlets.clear()
+            self.task_greenlets = {}
             self.task_results = {}
         self.rotkehlchen.logout()
         result_dict['result'] = True
@@ -1602,7 +1675,7 @@ class RestAPI:
         """This method exports all history events for a timestamp range.
         It also exports the user settings & ignored action identifiers for PnL debugging.
         """
-        error_or_empty, events = self.rotkehlchen.history_querying_manager.get_history(
+        error_or_empty, events, _ = self.rotkehlchen.history_querying_manager.get_history(
             start_ts=from_timestamp,
             end_ts=to_timestamp,
             has_premium=self.rotkehlchen.premium is not None,
@@ -2134,6 +2207,7 @@ class RestAPI:
                 'max_logfiles_num': DEFAULT_MAX_LOG_BACKUP_FILES,
                 'max_size_in_mb_all_logs': DEFAULT_MAX_LOG_SIZE_IN_MB,
                 'sqlite_instructions': DEFAULT_SQL_VM_INSTRUCTIONS_CB,
+                'fval_backend': DEFAULT_FVAL_BACKEND,
             },
         }
         return api_response(_wrap_in_ok_result(result), status_code=HTTPStatus.OK)
@@ -3559,6 +3633,8 @@ class RestAPI:
             with self.rotkehlchen.data.db.conn.read_ctx() as cursor:
                 result_dict['userdb']['info'] = self.rotkehlchen.data.db.get_db_info(cursor)  # type: ignore
             result_dict['userdb']['backups'] = self.rotkehlchen.data.db.get_backups()  # type: ignore
+            if (read_pool := self.rotkehlchen.data.db.conn.read_pool) is not None:
+                result_dict['userdb']['read_pool'] = read_pool.serialize()  # type: ignore
 
         return api_response(_wrap_in_ok_result(result_dict), status_code=HTTPStatus.OK)
 
@@ -4140,6 +4216,10 @@ class RestAPI:
                 'value': self.rotkehlchen.args.sqlite_instructions,
                 'is_default': self.rotkehlchen.args.sqlite_instructions == DEFAULT_SQL_VM_INSTRUCTIONS_CB,  # noqa: E501
             },
+            'fval_backend': {
+                'value': (fval_backend := get_fval_backend()),
+                'is_default': fval_backend == DEFAULT_FVAL_BACKEND,
+            },
         }
         return api_response(_wrap_in_ok_result(config), status_code=HTTPStatus.OK)
 
@@ -4681,71 +4761,78 @@ class RestAPI:
             filter_query: HistoryBaseEntryFilterQuery,
             directory_path: Path | None,
     ) -> dict[str, Any] | Response:
-        """Export or Download history events data to a CSV file."""
-        dbevents = DBHistoryEvents(self.rotkehlchen.data.db)
-        with self.rotkehlchen.data.db.conn.read_ctx() as cursor:
-            history_events, _, _ = dbevents.get_history_events_and_limit_info(
-                cursor=cursor,
-                filter_query=filter_query,
-                has_premium=True,
-                entries_limit=None,
-            )
+        """Export or Download history events data to a CSV file.
 
-        if len(history_events) == 0:
-            return wrap_in_fail_result(
-                message='No history processed in order to perform an export',
-                status_code=HTTPStatus.CONFLICT,
-            )
+        The events are streamed from the DB and written to the file as they are read, so
+        they are never all in memory at once."""
+        db = self.rotkehlchen.data.db
+        dbevents = DBHistoryEvents(db)
+        with db.conn.read_ctx() as cursor:
+            if dbevents.get_history_events_count(cursor=cursor, query_filter=filter_query)[0] == 0:
+                return wrap_in_fail_result(
+                    message='No history processed in order to perform an export',
+                    status_code=HTTPStatus.CONFLICT,
+                )
 
-        with self.rotkehlchen.data.db.conn.read_ctx() as cursor:
             settings = self.rotkehlchen.get_settings(cursor)
             currency = settings.main_currency.resolve_to_asset_with_oracles()
 
-        serialized_history_events = []
-        headers: dict[str, None] = {}
-        for event in history_events:
-            if currency != A_USD or (currency == A_USD and event.balance.usd_value == ZERO):
-                try:  # ask oracles for the price in the given timestamp and currency
-                    price = PriceHistorian.query_historical_price(
-                        from_asset=event.asset,
-                        to_asset=currency,
-                        timestamp=ts_ms_to_sec(event.timestamp),
-                    )
-                except (PriceQueryUnsupportedAsset, RemoteError):
-                    fiat_value = ZERO
-                except NoPriceForGivenTimestamp as e:
-                    # In the case of NoPriceForGivenTimestamp when we got rate limited
-                    if e.rate_limited is True:
-                        return wrap_in_fail_result(
-                            message='Price query got rate limited for all the oracles. Try again later',  # noqa: E501
-                            status_code=HTTPStatus.BAD_GATEWAY,
-                        )
-                    fiat_value = ZERO
-                else:
-                    fiat_value = event.balance.amount * price
-            else:  # if the asset is USD we don't need to ask for the price, is already queried
-                fiat_value = event.balance.usd_value
-
-            serialized_event = event.serialize_for_csv(fiat_value)
-            serialized_history_events.append(serialized_event)
-            # maintain insertion order without storing extra info
-            headers.update(dict.fromkeys(serialized_event))
-
+        ascending = True  # the events are paged by timestamp so only its direction matters
+        if filter_query.order_by is not None:
+            ascending = next((
+                rule_ascending for attribute, rule_ascending in filter_query.order_by.rules
+                if attribute == 'timestamp'
+            ), True)
+
+        def serialize_events() -> Iterator[dict[str, Any]]:
+            """May raise NoPriceForGivenTimestamp if the price queries got rate limited"""
+            with db.conn.read_ctx() as cursor:
+                events = dbevents.iterate_history_events(
+                    cursor=cursor,
+                    filter_query=filter_query,
+                    has_premium=True,
+                    ascending=ascending,
+                )
+                yield from (event.serialize_for_csv(fiat_value(event)) for event in events)
+
+        def fiat_value(event: 'HistoryBaseEntry') -> FVal:
+            """May raise NoPriceForGivenTimestamp if the price queries got rate limited"""
+            if currency == A_USD and event.balance.usd_value != ZERO:
+                return event.balance.usd_value  # the USD price is already queried
+
+            try:  # ask oracles for the price in the given timestamp and currency
+                price = PriceHistorian.query_historical_price(
+                    from_asset=event.asset,
+                    to_asset=currency,
+                    timestamp=ts_ms_to_sec(event.timestamp),
+                )
+            except (PriceQueryUnsupportedAsset, RemoteError):
+                return ZERO
+            except NoPriceForGivenTimestamp as e:
+                # In the case of NoPriceForGivenTimestamp when we got rate limited
+                if e.rate_limited is True:
+                    raise
+                return ZERO
+
+            return event.balance.amount * price
+
+        rate_limited_result = wrap_in_fail_result(
+            message='Price query got rate limited for all the oracles. Try again later',
+            status_code=HTTPStatus.BAD_GATEWAY,
+        )
         if directory_path is None:  # on download
             with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as temp_dir:  # needed on windows, see https://tinyurl.com/tmp-win-err  # noqa: E501
                 file_path = Path(temp_dir) / FILENAME_HISTORY_EVENTS_CSV
                 try:
-                    dict_to_csv_file(
-                        file_path,
-                        serialized_history_events,
-                        headers.keys(),
-                    )
+                    dict_to_csv_file_with_all_keys(file_path, serialize_events())
                     return send_file(
                         path_or_file=file_path,
                         mimetype='text/csv',
                         as_attachment=True,
                         download_name=FILENAME_HISTORY_EVENTS_CSV,
                     )
+                except NoPriceForGivenTimestamp:
+                    return rate_limited_result
                 except (CSVWriteError, PermissionError) as e:
                     return wrap_in_fail_result(
                         message=str(e),
@@ -4760,11 +4847,10 @@ class RestAPI:
         try:  # from here and below we do a direct export to filesystem
             directory_path.mkdir(parents=True, exist_ok=True)
             file_path = directory_path / FILENAME_HISTORY_EVENTS_CSV
-            dict_to_csv_file(
-                file_path,
-                serialized_history_events,
-                headers.keys(),
-            )
+            dict_to_csv_file_with_all_keys(file_path, serialize_events())
+        except NoPriceForGivenTimestamp:
+            file_path.unlink(missing_ok=True)  # don't leave a partially written export
+            return rate_limited_result
         except (CSVWriteError, PermissionError) as e:
             return wrap_in_fail_result(message=str(e), status_code=HTTPStatus.CONFLICT)
 
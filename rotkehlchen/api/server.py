@@ -45,6 +45,7 @@ from rotkehlchen.api.v1.resources import (
     AssetUpdatesResource,
     AssociatedLocations,
     AsyncTasksResource,
+    BackgroundTasksResource,
     BinanceAvailableMarkets,
     BinanceSavingsResource,
     BinanceUserMarkets,
@@ -130,6 +131,8 @@ from rotkehlchen.api.v1.resources import (
     PickleDillResource,
     PingResource,
     QueriedAddressesResource,
+    QueryCachesResource,
+    RateLimitsResource,
     RefreshGeneralCacheResource,
     ReverseEnsResource,
     RpcNodesResource,
@@ -176,6 +179,9 @@ URLS_V1: URLS = [
     ('/settings/configuration', ConfigurationsResource),
     ('/tasks', AsyncTasksResource),
     ('/tasks/<int:task_id>', AsyncTasksResource, 'specific_async_tasks_resource'),
+    ('/tasks/background', BackgroundTasksResource),
+    ('/ratelimits', RateLimitsResource),
+    ('/cache/queries', QueryCachesResource),
     ('/exchange_rates', ExchangeRatesResource),
     ('/external_services', ExternalServicesResource),
     ('/oracles', OraclesResource),
@@ -512,6 +512,27 @@ class AsyncTasksResource(BaseMethodView):
         return self.rest_api.delete_async_task(task_id=task_id)
 
 
+class BackgroundTasksResource(BaseMethodView):
+
+    @require_loggedin_user()
+    def get(self) -> Response:
+        return self.rest_api.get_background_tasks_stats()
+
+
+class RateLimitsResource(BaseMethodView):
+
+    @require_loggedin_user()
+    def get(self) -> Response:
+        return self.rest_api.get_rate_limits()
+
+
+class QueryCachesResource(BaseMethodView):
+
+    @require_loggedin_user()
+    def get(self) -> Response:
+        return self.rest_api.get_query_caches()
+
+
 class ExchangeRatesResource(BaseMethodView):
 
     get_schema = ExchangeRatesSchema()
@@ -13,9 +13,9 @@ from marshmallow import INCLUDE, Schema, fields, post_load, validate, validates_
 from marshmallow.exceptions import ValidationError
 from werkzeug.datastructures import FileStorage
 
+from rotkehlchen.accounting.mixins.event import AccountingEventType
 from rotkehlchen.accounting.structures.balance import Balance, BalanceType
 from rotkehlchen.accounting.structures.types import ActionType
-from rotkehlchen.accounting.types import SchemaEventType
 from rotkehlchen.assets.asset import Asset, AssetWithNameAndType, AssetWithOracles, EvmToken
 from rotkehlchen.assets.types import AssetType
 from rotkehlchen.assets.utils import IgnoredAssetsHandling
@@ -1660,7 +1660,8 @@ class AccountingReportsSchema(Schema):
 
 class AccountingReportDataSchema(TimestampRangeSchema, DBPaginationSchema, DBOrderBySchema):
     report_id = fields.Integer(load_default=None)
-    event_type = SerializableEnumField(enum_class=SchemaEventType, load_default=None)
+    event_type = SerializableEnumField(enum_class=AccountingEventType, load_default=None)
+    asset = AssetField(expected_type=Asset, load_default=None)
 
     @validates_schema
     def validate_report_schema(
@@ -1668,7 +1669,10 @@ class AccountingReportDataSchema(TimestampRangeSchema, DBPaginationSchema, DBOrd
             data: dict[str, Any],
             **_kwargs: Any,
     ) -> None:
-        valid_ordering_attr = {None, 'timestamp'}
+        valid_ordering_attr = {
+            None, 'timestamp', 'type', 'asset', 'free_amount', 'taxable_amount',
+            'pnl_taxable', 'pnl_free',
+        }
         if (
             data['order_by_attributes'] is not None and
             not set(data['order_by_attributes']).issubset(valid_ordering_attr)
@@ -1700,6 +1704,7 @@ class AccountingReportDataSchema(TimestampRangeSchema, DBPaginationSchema, DBOrd
             offset=data['offset'],
             report_id=report_id,
             event_type=event_type,
+            asset=data['asset'],
             from_ts=data['from_timestamp'],
             to_ts=data['to_timestamp'],
         )
@@ -27,6 +27,10 @@ class WSMessageType(Enum):
     EVM_UNDECODED_TRANSACTIONS = auto()
     CALENDAR_REMINDER = auto()
     PROTOCOL_CACHE_UPDATES = auto()
+    ASYNC_TASK_COMPLETED = auto()
+    CSV_IMPORT_PROGRESS = auto()
+    EXCHANGE_HISTORY_SYNC = auto()
+    BALANCE_SOURCE_QUERIED = auto()
 
     def __str__(self) -> str:
         return self.name.lower()  # pylint: disable=no-member
@@ -43,6 +47,15 @@ class TransactionStatusStep(Enum):
         return self.name.lower()  # pylint: disable=no-member
 
 
+class ExchangeHistorySyncStep(Enum):
+    STARTED = auto()
+    FINISHED = auto()
+    FAILED = auto()
+
+    def __str__(self) -> str:
+        return self.name.lower()  # pylint: disable=no-member
+
+
 class HistoryEventsStep(Enum):
     QUERYING_EVENTS_STARTED = auto()
     QUERYING_EVENTS_STATUS_UPDATE = auto()
@@ -131,6 +131,16 @@ def app_args(prog: str, description: str) -> argparse.ArgumentParser:
         default=DEFAULT_SQL_VM_INSTRUCTIONS_CB,
         type=_positive_int_or_zero,
     )
+    p.add_argument(
+        '--fval-backend',
+        help=(
+            'The implementation of the numbers used in calculations. "fixed" is faster for '
+            'amounts with up to 36 decimals and gives the same results as "decimal". If not '
+            'given the ROTKI_FVAL_BACKEND environment variable is used, or "decimal" if unset.'
+        ),
+        choices=['decimal', 'fixed'],
+        default=None,
+    )
     p.add_argument(
         'version',
         help='Shows the rotki version',
@@ -43,14 +43,17 @@ class AssetResolver:
 
     @staticmethod
     def clean_memory_cache(identifier: str | None = None) -> None:
-        """Clean the memory cache of either a single or all assets"""
+        """Clean the memory cache of either a single or all assets. The evm tokens are
+        also removed from the memory cache of GlobalDBHandler.get_evm_token"""
         assert AssetResolver.__instance is not None, 'when cleaning the cache instance should be set'  # noqa: E501
+        from rotkehlchen.globaldb.handler import GlobalDBHandler  # pylint: disable=import-outside-toplevel  # isort:skip
         if identifier is not None:
             AssetResolver.__instance.assets_cache.remove(identifier)
             AssetResolver.__instance.types_cache.remove(identifier)
         else:
             AssetResolver.__instance.assets_cache.clear()
             AssetResolver.__instance.types_cache.clear()
+        GlobalDBHandler.clean_evm_token_cache(identifier=identifier)
 
     @staticmethod
     def resolve_asset(identifier: str) -> 'AssetWithNameAndType':
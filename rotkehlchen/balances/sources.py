@@ -0,0 +1,94 @@
+import logging
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Final, Generic, TypeVar
+
+from gevent.pool import Pool
+
+from rotkehlchen.api.websockets.typedefs import WSMessageType
+from rotkehlchen.errors.misc import EthSyncError, RemoteError
+from rotkehlchen.logging import RotkehlchenLogsAdapter
+
+if TYPE_CHECKING:
+    from rotkehlchen.fval import FVal
+    from rotkehlchen.user_messages import MessagesAggregator
+
+logger = logging.getLogger(__name__)
+log = RotkehlchenLogsAdapter(logger)
+
+# Max number of balance sources (chains, exchanges) that are queried at the same time
+MAX_PARALLEL_BALANCE_QUERIES: Final = 6
+
+T = TypeVar('T')
+
+
+@dataclass(init=True, repr=True, eq=False, order=False, unsafe_hash=False, frozen=True)
+class BalanceSource(Generic[T]):
+    """A source of balances that can be queried independently of the others"""
+    location: str
+    name: str
+    query: Callable[[], T]
+    # Gives the total usd value of the result of a successful query
+    usd_value: Callable[[T], 'FVal']
+
+
+def query_balance_sources(
+        sources: Sequence[BalanceSource[T]],
+        msg_aggregator: 'MessagesAggregator',
+        max_parallel: int = MAX_PARALLEL_BALANCE_QUERIES,
+) -> tuple[list[tuple[BalanceSource[T], T]], list[tuple[BalanceSource[T], Exception]]]:
+    """Query the given balance sources in parallel with up to max_parallel at a time.
+
+    The result or error of each source is sent over the websockets as soon as it is queried,
+    along with the time its query took. Returns the results and the errors of the sources
+    in the order of the given sources.
+
+    May raise:
+    - Any unexpected exception a source raised, after all sources are queried. RemoteError
+    and EthSyncError of a source are returned in the errors instead.
+    """
+    def query_source(source: BalanceSource[T]) -> T | Exception:
+        start = time.monotonic()
+        try:
+            result = source.query()
+        except (RemoteError, EthSyncError) as e:
+            duration = time.monotonic() - start
+            log.error(f'Querying {source.name} balances failed after {duration:.2f} seconds due to {e!s}')  # noqa: E501
+            msg_aggregator.add_message(
+                message_type=WSMessageType.BALANCE_SOURCE_QUERIED,
+                data={
+                    'location': source.location,
+                    'name': source.name,
+                    'status': 'failed',
+                    'duration': round(duration, 3),
+                    'error': str(e),
+                },
+            )
+            return e
+
+        duration = time.monotonic() - start
+        log.debug(f'Queried {source.name} balances in {duration:.2f} seconds')
+        msg_aggregator.add_message(
+            message_type=WSMessageType.BALANCE_SOURCE_QUERIED,
+            data={
+                'location': source.location,
+                'name': source.name,
+                'status': 'finished',
+                'duration': round(duration, 3),
+                'usd_value': str(source.usd_value(result)),
+            },
+        )
+        return result
+
+    pool = Pool(size=max_parallel)
+    greenlets = [pool.spawn(query_source, source) for source in sources]
+    pool.join()
+    results, errors = [], []
+    for source, greenlet in zip(sources, greenlets, strict=True):
+        if isinstance(outcome := greenlet.get(), Exception):  # get re-raises unexpected errors
+            errors.append((source, outcome))
+        else:
+            results.append((source, outcome))
+
+    return results, errors
@@ -15,6 +15,7 @@ from web3.exceptions import BadFunctionCallOutput, Web3Exception
 from rotkehlchen.accounting.structures.balance import Balance, BalanceSheet
 from rotkehlchen.api.websockets.typedefs import WSMessageType
 from rotkehlchen.assets.asset import CryptoAsset, EvmToken
+from rotkehlchen.balances.sources import BalanceSource, query_balance_sources
 from rotkehlchen.chain.accounts import BlockchainAccountData, BlockchainAccounts
 from rotkehlchen.chain.arbitrum_one.modules.gearbox.balances import (
     GearboxBalances as GearboxBalancesArbitrumOne,
@@ -93,6 +94,7 @@ from rotkehlchen.types import (
     ChecksumEvmAddress,
     Eth2PubKey,
     ListOfBlockchainAddresses,
+    Location,
     ModuleName,
     Price,
     SupportedBlockchain,
@@ -519,7 +521,7 @@ class ChainsAggregator(CacheableMixIn, LockableQueryMixIn):
             )
 
     @protect_with_lock(arguments_matter=True)
-    @cache_response_timewise(forward_ignore_cache=True)
+    @cache_response_timewise(forward_ignore_cache=True, stale_while_revalidate=True)
     def query_balances(
             self,
             blockchain: SupportedBlockchain | None = None,
@@ -536,22 +538,84 @@ class ChainsAggregator(CacheableMixIn, LockableQueryMixIn):
         - EthSyncError if querying the token balances through a provided ethereum
         client and the chain is not synced
         """
-        xpub_manager = XpubManager(chains_aggregator=self)
         if blockchain is not None:
-            query_method = f'query_{blockchain.get_key()}_balances'
-            getattr(self, query_method)(ignore_cache=ignore_cache)
-            if ignore_cache is True and blockchain.is_bitcoin():
-                xpub_manager.check_for_new_xpub_addresses(blockchain=blockchain)  # type: ignore # is checked in the if
-        else:  # all chains
-            for chain in SupportedBlockchain:
-                query_method = f'query_{chain.get_key()}_balances'
-                getattr(self, query_method)(ignore_cache=ignore_cache)
-                if ignore_cache is True and chain.is_bitcoin():
-                    xpub_manager.check_for_new_xpub_addresses(blockchain=chain)  # type: ignore # is checked in the if
+            self._query_chain_balances(chain=blockchain, ignore_cache=ignore_cache)
+        else:  # all chains with accounts, in parallel since they are independent
+            _, errors = query_balance_sources(
+                sources=[
+                    self._chain_balance_source(chain=chain, ignore_cache=ignore_cache)
+                    for chain in self._chains_to_query(ignore_cache=ignore_cache)
+                ],
+                msg_aggregator=self.msg_aggregator,
+            )
+            if len(errors) != 0:
+                raise errors[0][1]
 
         self.totals = self.balances.recalculate_totals()
         return self.get_balances_update(blockchain)
 
+    def _chains_to_query(self, ignore_cache: bool) -> list[SupportedBlockchain]:
+        """The chains whose balances need to be queried when querying all of them.
+
+        Those are the chains with accounts, the beaconchain if the eth2 module is active
+        and, if ignore_cache is true, the bitcoin chains with xpubs since new xpub
+        addresses may have been used even if none of them is tracked yet.
+        """
+        chains = []
+        with self.database.conn.read_ctx() as cursor:
+            for chain in SupportedBlockchain:
+                if chain == SupportedBlockchain.ETHEREUM_BEACONCHAIN:
+                    should_query = self.get_module('eth2') is not None
+                else:
+                    should_query = len(self.accounts.get(chain)) != 0 or (
+                        ignore_cache is True and chain.is_bitcoin() and
+                        len(self.database.get_bitcoin_xpub_data(cursor, chain)) != 0  # type: ignore  # is checked in the if
+                    )
+
+                if should_query:
+                    chains.append(chain)
+
+        return chains
+
+    def _query_chain_balances(self, chain: SupportedBlockchain, ignore_cache: bool) -> None:
+        """Queries the balances of a chain and populates the state
+
+        May raise:
+        - RemoteError if an external service is queried and there is a problem with its query.
+        - EthSyncError if querying the token balances through a provided ethereum
+        client and the chain is not synced
+        """
+        getattr(self, f'query_{chain.get_key()}_balances')(ignore_cache=ignore_cache)
+        if ignore_cache is True and chain.is_bitcoin():
+            XpubManager(chains_aggregator=self).check_for_new_xpub_addresses(blockchain=chain)  # type: ignore # is checked in the if
+
+    def _chain_balance_source(
+            self,
+            chain: SupportedBlockchain,
+            ignore_cache: bool,
+    ) -> BalanceSource[None]:
+        return BalanceSource(
+            location=str(Location.BLOCKCHAIN),
+            name=chain.serialize(),
+            query=lambda: self._query_chain_balances(chain=chain, ignore_cache=ignore_cache),
+            usd_value=lambda _: self._chain_usd_value(chain),
+        )
+
+    def _chain_usd_value(self, chain: SupportedBlockchain) -> FVal:
+        """The net usd value of the balances of all accounts of a chain"""
+        usd_value = ZERO
+        for entry in self.balances.get(chain).values():
+            if isinstance(entry, Balance):  # bitcoin chains
+                usd_value += entry.usd_value
+                continue
+
+            for balance in entry.assets.values():
+                usd_value += balance.usd_value
+            for balance in entry.liabilities.values():
+                usd_value -= balance.usd_value
+
+        return usd_value
+
     @protect_with_lock()
     @cache_response_timewise()
     def query_btc_balances(
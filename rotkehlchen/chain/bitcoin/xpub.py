@@ -1,6 +1,7 @@
 import logging
 from typing import TYPE_CHECKING, Any, Literal, NamedTuple
 
+import gevent
 from gevent.lock import Semaphore
 
 from rotkehlchen.accounting.structures.balance import Balance
@@ -72,29 +73,64 @@ class XpubDerivedAddressData(NamedTuple):
     balance: FVal
 
 
+def _derive_addresses_batch(
+        account_index: int,
+        start_index: int,
+        root: HDKey,
+        gap_limit: int,
+        derived_addresses: dict[tuple[int, int], BTCAddress],
+) -> list[tuple[int, BTCAddress]]:
+    """Derive the addresses of the given batch of indices. Already derived addresses are
+    taken from derived_addresses and the newly derived ones are added to it."""
+    batch_addresses = []
+    for idx in range(start_index, start_index + gap_limit):
+        if (address := derived_addresses.get((account_index, idx))) is None:
+            address = derived_addresses[(account_index, idx)] = root.derive_child(idx).address()
+        batch_addresses.append((idx, address))
+
+    return batch_addresses
+
+
 def _derive_addresses_loop(
         account_index: int,
         start_index: int,
         root: HDKey,
         gap_limit: int,
         blockchain: Literal[SupportedBlockchain.BITCOIN, SupportedBlockchain.BITCOIN_CASH],
+        derived_addresses: dict[tuple[int, int], BTCAddress],
 ) -> list[XpubDerivedAddressData]:
-    """May raise:
+    """Query batches of gap_limit addresses for activity until a batch has none. The next
+    batch is derived while the activity of the previous one is queried.
+
+    If the query fails the derivation of the next batch is left to finish on its own
+    since it only adds addresses to derived_addresses.
+
+    May raise:
     - RemoteError: if blockstream/blockchain.info can't be reached
     """
+    have_transactions = have_bitcoin_transactions if blockchain == SupportedBlockchain.BITCOIN else have_bch_transactions  # noqa: E501
     step_index = start_index
     addresses: list[XpubDerivedAddressData] = []
+    batch_addresses = _derive_addresses_batch(
+        account_index=account_index,
+        start_index=step_index,
+        root=root,
+        gap_limit=gap_limit,
+        derived_addresses=derived_addresses,
+    )
     should_continue = True
     while should_continue:
-        batch_addresses: list[tuple[int, BTCAddress]] = []
-        for idx in range(step_index, step_index + gap_limit):
-            child = root.derive_child(idx)
-            batch_addresses.append((idx, child.address()))
-
-        if blockchain == SupportedBlockchain.BITCOIN:
-            have_tx_mapping = have_bitcoin_transactions([x[1] for x in batch_addresses])
-        else:
-            have_tx_mapping = have_bch_transactions([x[1] for x in batch_addresses])
+        # derive the next batch while waiting for the activity query of this one
+        next_batch = gevent.spawn(
+            _derive_addresses_batch,
+            account_index=account_index,
+            start_index=step_index + gap_limit,
+            root=root,
+            gap_limit=gap_limit,
+            derived_addresses=derived_addresses,
+        )
+        have_tx_mapping = have_transactions([x[1] for x in batch_addresses])
+        next_batch_addresses = next_batch.get()
         should_continue = False
         for idx, address in batch_addresses:
             have_tx, balance = have_tx_mapping[address]
@@ -122,6 +158,7 @@ def _derive_addresses_loop(
                     ))
 
         step_index += gap_limit
+        batch_addresses = next_batch_addresses
 
     return addresses
 
@@ -131,11 +168,15 @@ def _derive_addresses_from_xpub_data(
         start_receiving_index: int,
         start_change_index: int,
         gap_limit: int,
+        derived_addresses: dict[tuple[int, int], BTCAddress],
 ) -> list[XpubDerivedAddressData]:
     """Derive all addresses from the xpub that have had transactions. Also includes
     any addresses until the biggest index derived addresses that have had no transactions.
     This is to make it easier to later derive and check more addresses
 
+    derived_addresses holds the already derived addresses of the xpub keyed by account
+    and derived index. Any address derived here is added to it.
+
     May raise:
     - RemoteError: if blockstream/blockchain.info/haskoin and others can't be reached
     """
@@ -153,6 +194,7 @@ def _derive_addresses_from_xpub_data(
             root=receiving_xpub,
             gap_limit=gap_limit,
             blockchain=xpub_data.blockchain,
+            derived_addresses=derived_addresses,
         ),
     )
     change_xpub = account_xpub.derive_child(1)
@@ -163,6 +205,7 @@ def _derive_addresses_from_xpub_data(
             root=change_xpub,
             gap_limit=gap_limit,
             blockchain=xpub_data.blockchain,
+            derived_addresses=derived_addresses,
         ),
     )
     return addresses
@@ -190,11 +233,14 @@ class XpubManager:
         """
         with self.db.conn.read_ctx() as cursor:
             last_receiving_idx, last_change_idx = self.db.get_last_consecutive_xpub_derived_indices(cursor, xpub_data)  # noqa: E501
+            derived_addresses = self.db.get_xpub_derived_addresses(cursor, xpub_data)
+            cached_keys = set(derived_addresses)
             derived_addresses_data = _derive_addresses_from_xpub_data(
                 xpub_data=xpub_data,
                 start_receiving_index=last_receiving_idx,
                 start_change_index=last_change_idx,
                 gap_limit=self.chains_aggregator.btc_derivation_gap_limit,
+                derived_addresses=derived_addresses,
             )
             known_addresses = getattr(self.db.get_blockchain_accounts(cursor), xpub_data.blockchain.get_key())  # noqa: E501
 
@@ -248,6 +294,11 @@ class XpubManager:
                 xpub_data=xpub_data,
                 derived_addresses_data=derived_addresses_data,
             )
+            self.db.add_xpub_derived_addresses(
+                write_cursor=write_cursor,
+                xpub_data=xpub_data,
+                derived_addresses={k: v for k, v in derived_addresses.items() if k not in cached_keys},  # noqa: E501
+            )
 
         # also add queried balances
         if xpub_data.blockchain == SupportedBlockchain.BITCOIN:
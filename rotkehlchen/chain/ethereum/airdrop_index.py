@@ -0,0 +1,157 @@
+"""Compact on disk index of the airdrop data files, mapping addresses to a value.
+
+The index is built once per downloaded airdrop file and memory mapped when looking up
+addresses, so checking the tracked addresses is a binary search per address instead of
+a pass over the whole file. The index is rebuilt when the source file no longer has the
+size and modification time stored in its header. The layout of the file is:
+
+- header: magic, version, size and modification time of the source file, number of
+  addresses and length of the invalid row
+- the invalid row of the source file as JSON, if it had one
+- the sorted 20 byte addresses
+- number of addresses + 1 little endian uint32 offsets of the values
+- the utf8 encoded values
+"""
+import json
+import logging
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+from pathlib import Path
+from types import TracebackType
+from typing import Final
+
+from rotkehlchen.logging import RotkehlchenLogsAdapter
+
+logger = logging.getLogger(__name__)
+log = RotkehlchenLogsAdapter(logger)
+
+INDEX_SUFFIX: Final = '.idx'
+INDEX_MAGIC: Final = b'RKAI'
+INDEX_VERSION: Final = 2
+ADDRESS_SIZE: Final = 20
+HEADER: Final = struct.Struct('<4sBQqII')
+OFFSET: Final = struct.Struct('<I')
+
+
+def address_to_key(address: str) -> bytes | None:
+    """Returns the 20 bytes of a hex address or None if it's not a valid address"""
+    try:
+        key = bytes.fromhex(address.removeprefix('0x'))
+    except ValueError:
+        return None
+
+    return key if len(key) == ADDRESS_SIZE else None
+
+
+def source_signature(source: Path) -> tuple[int, int]:
+    """Returns the size and modification time in nanoseconds of the source file of an index
+
+    May raise:
+    - OSError if the file can't be accessed
+    """
+    stat = source.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def write_address_index(
+        path: Path,
+        entries: Mapping[bytes, str],
+        signature: tuple[int, int],
+        invalid_row: list[str] | None = None,
+) -> None:
+    """Writes the index of the given address keys to values. The signature is the one of
+    the source file taken before reading it, so that a change while reading is detected.
+    The index is written to a temporary file first so that a half written index is
+    never read."""
+    keys = sorted(entries)
+    values = [entries[key].encode('utf8') for key in keys]
+    invalid_row_data = b'' if invalid_row is None else json.dumps(invalid_row).encode('utf8')
+    tmp_path = path.with_name(f'{path.name}.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(
+            INDEX_MAGIC,
+            INDEX_VERSION,
+            *signature,
+            len(keys),
+            len(invalid_row_data),
+        ))
+        f.write(invalid_row_data)
+        f.write(b''.join(keys))
+        offset = 0
+        f.write(OFFSET.pack(offset))
+        for value in values:
+            offset += len(value)
+            f.write(OFFSET.pack(offset))
+        f.write(b''.join(values))
+
+    os.replace(tmp_path, path)
+    log.debug(f'Wrote airdrop index {path} of {len(keys)} addresses')
+
+
+def is_address_index(path: Path, source: Path) -> bool:
+    """Checks that the path is an index of the current version built from the source
+    file as it is now"""
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+        signature = source_signature(source)
+    except OSError:
+        return False
+
+    return (
+        len(header) == HEADER.size and
+        HEADER.unpack(header)[:4] == (INDEX_MAGIC, INDEX_VERSION, *signature)
+    )
+
+
+class AddressIndex:
+    """Read only memory mapped view of an address index. Should be used as a context
+    manager so that the file is unmapped after the lookups."""
+
+    def __init__(self, path: Path) -> None:
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        *_, self.count, invalid_row_len = HEADER.unpack_from(self._mmap)
+        self.invalid_row: list[str] | None = None
+        if invalid_row_len != 0:
+            self.invalid_row = json.loads(self._mmap[HEADER.size:HEADER.size + invalid_row_len])
+        self._addresses_offset = HEADER.size + invalid_row_len
+        self._offsets_offset = self._addresses_offset + self.count * ADDRESS_SIZE
+        self._values_offset = self._offsets_offset + (self.count + 1) * OFFSET.size
+
+    def __enter__(self) -> 'AddressIndex':
+        return self
+
+    def __exit__(
+            self,
+            exc_type: type[BaseException] | None,
+            exc_val: BaseException | None,
+            exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def _key_at(self, idx: int) -> bytes:
+        start = self._addresses_offset + idx * ADDRESS_SIZE
+        return self._mmap[start:start + ADDRESS_SIZE]
+
+    def get(self, key: bytes) -> str | None:
+        """Returns the value of the address key or None if it's not in the index"""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low == self.count or self._key_at(low) != key:
+            return None
+
+        start = self._offsets_offset + low * OFFSET.size
+        value_start, value_end = struct.unpack_from('<II', self._mmap, start)
+        return self._mmap[self._values_offset + value_start:self._values_offset + value_end].decode('utf8')  # noqa: E501
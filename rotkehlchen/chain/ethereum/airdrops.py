@@ -1,7 +1,7 @@
 import csv
 import logging
 from collections import defaultdict
-from collections.abc import Callable, Iterator, Sequence
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
 from http import HTTPStatus
 from json.decoder import JSONDecodeError
@@ -14,8 +14,15 @@ from requests import Response
 from rotkehlchen.assets.asset import Asset, CryptoAsset
 from rotkehlchen.assets.types import AssetType
 from rotkehlchen.assets.utils import get_or_create_evm_token
+from rotkehlchen.chain.ethereum.airdrop_index import (
+    INDEX_SUFFIX,
+    AddressIndex,
+    address_to_key,
+    is_address_index,
+    source_signature,
+    write_address_index,
+)
 from rotkehlchen.chain.ethereum.utils import token_normalized_value_decimals
-from rotkehlchen.chain.evm.types import string_to_evm_address
 from rotkehlchen.constants import ZERO
 from rotkehlchen.constants.misc import AIRDROPSDIR_NAME, AIRDROPSPOAPDIR_NAME, APPDIR_NAME
 from rotkehlchen.db.dbhandler import DBHandler
@@ -35,7 +42,7 @@ from rotkehlchen.serialization.deserialize import deserialize_int
 from rotkehlchen.types import CacheType, ChainID, ChecksumEvmAddress, FValWithTolerance, Timestamp
 from rotkehlchen.user_messages import MessagesAggregator
 from rotkehlchen.utils.misc import is_production, ts_now
-from rotkehlchen.utils.serialization import jsonloads_dict, rlk_jsondumps
+from rotkehlchen.utils.serialization import jsonloads_dict, jsonloads_list, rlk_jsondumps
 
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
@@ -279,10 +286,61 @@ def _maybe_get_updated_file(
     return filename
 
 
-def get_airdrop_data(airdrop_data: CSVAirdrop, name: str, data_dir: Path) -> Iterator[list[str]]:
-    """Yields the rows from airdrop's CSV file after downloading it locally for the first time.
-    If a new CSV is found in the index, it will be downloaded again to update the local CSV file
-    and yield new data."""
+def _build_csv_airdrop_index(filename: Path) -> None:
+    """Builds the address index of an airdrop CSV file. If the CSV contains an invalid row
+    the rows after it are not indexed and the row is kept in the index instead."""
+    entries: dict[bytes, str] = {}
+    invalid_row = None
+    signature = source_signature(filename)
+    with open(filename, encoding='utf8') as csvfile:
+        iterator = csv.reader(csvfile)
+        next(iterator)  # skip header
+        for row in iterator:
+            if len(row) < 2:
+                invalid_row = row
+                break
+            if (key := address_to_key(row[0])) is not None:
+                entries[key] = row[1]
+
+    write_address_index(
+        path=filename.with_suffix(INDEX_SUFFIX),
+        entries=entries,
+        signature=signature,
+        invalid_row=invalid_row,
+    )
+
+
+def _build_poap_airdrop_index(filename: Path) -> None:
+    """Builds the address index of a POAP airdrop JSON file with the assets of each address"""
+    signature = source_signature(filename)
+    write_address_index(
+        path=filename.with_suffix(INDEX_SUFFIX),
+        entries={
+            key: rlk_jsondumps(assets)
+            for addr, assets in jsonloads_dict(filename.read_text(encoding='utf8')).items()
+            if (key := address_to_key(addr)) is not None
+        },
+        signature=signature,
+    )
+
+
+def _get_airdrop_index(
+        filename: Path,
+        build_index: Callable[[Path], None],
+) -> AddressIndex:
+    """Opens the address index of the airdrop file. Builds it if the file was downloaded
+    before the indexes existed, the index is of an older version or the file changed
+    since the index was built."""
+    if not is_address_index(index_path := filename.with_suffix(INDEX_SUFFIX), source=filename):
+        build_index(filename)
+
+    return AddressIndex(index_path)
+
+
+def get_airdrop_data(airdrop_data: CSVAirdrop, name: str, data_dir: Path) -> AddressIndex:
+    """Returns the address index of the airdrop's CSV file after downloading it locally for
+    the first time. If a new CSV is found in the index, it will be downloaded again to update
+    the local CSV file and its address index."""
     airdrops_dir = data_dir / APPDIR_NAME / AIRDROPSDIR_NAME
 
     def _process_csv(response: Response, filename: Path) -> None:
@@ -301,6 +359,8 @@ def get_airdrop_data(airdrop_data: CSVAirdrop, name: str, data_dir: Path) -> Ite
                 f'File {filename} contains invalid data. Check logs.',
             ) from e
 
+        _build_csv_airdrop_index(filename)
+
     filename = _maybe_get_updated_file(
         data_dir=airdrops_dir,
         file_hash=airdrop_data.csv_hash,
@@ -308,18 +368,13 @@ def get_airdrop_data(airdrop_data: CSVAirdrop, name: str, data_dir: Path) -> Ite
         remote_url=airdrop_data.csv_path,
         process_response=_process_csv,
     )
-
-    # Verify the CSV file
-    with open(filename, encoding='utf8') as csvfile:
-        iterator = csv.reader(csvfile)
-        next(iterator)  # skip header
-        yield from iterator
+    return _get_airdrop_index(filename=filename, build_index=_build_csv_airdrop_index)
 
 
-def get_poap_airdrop_data(airdrop_data: list[str], name: str, data_dir: Path) -> dict[str, Any]:
-    """Returns a dictionary of POAP airdrop data after downloading it locally for the first time.
-    If a new JSON is found in the index, it will be downloaded again to update the local JSON file
-    and return its data."""
+def get_poap_airdrop_data(airdrop_data: list[str], name: str, data_dir: Path) -> AddressIndex:
+    """Returns the address index of the POAP airdrop's assets after downloading its JSON
+    locally for the first time. If a new JSON is found in the index, it will be downloaded
+    again to update the local JSON file and its address index."""
     airdrops_dir = data_dir / APPDIR_NAME / AIRDROPSPOAPDIR_NAME
 
     def _process_json(response: Response, filename: Path) -> None:
@@ -330,6 +385,7 @@ def get_poap_airdrop_data(airdrop_data: list[str], name: str, data_dir: Path) ->
             json_data = {}
 
         filename.write_text(rlk_jsondumps(json_data), encoding='utf8')
+        _build_poap_airdrop_index(filename)
 
     filename = _maybe_get_updated_file(
         data_dir=airdrops_dir,
@@ -338,8 +394,7 @@ def get_poap_airdrop_data(airdrop_data: list[str], name: str, data_dir: Path) ->
         remote_url=f'{AIRDROPS_REPO_BASE}/{airdrop_data[0]}',
         process_response=_process_json,
     )
-
-    return jsonloads_dict(Path(filename).read_text(encoding='utf8'))
+    return _get_airdrop_index(filename=filename, build_index=_build_poap_airdrop_index)
 
 
 def calculate_claimed_airdrops(
@@ -472,14 +527,15 @@ def process_airdrop_with_api_data(
 
 def _process_csv_airdrop(
         msg_aggregator: MessagesAggregator,
-        addresses: Sequence[ChecksumEvmAddress],
+        address_keys: dict[ChecksumEvmAddress, bytes],
         data_dir: Path,
         airdrop_data: CSVAirdrop,
         protocol_name: str,
         tolerance_for_amount_check: FVal,
         current_time: Timestamp,
 ) -> tuple[list[AirdropClaimEventQueryParams], dict[ChecksumEvmAddress, dict]]:
-    """Process csv to find the addresses that have a claimable amount.
+    """Look up the addresses in the index of the airdrop csv to find the ones that have
+    a claimable amount. address_keys maps the addresses to their index keys.
 
     It returns a list of `AirdropClaimEventQueryParams` used to filter the history
     events with the expected amount received and the combination of types and a mapping
@@ -501,25 +557,25 @@ def _process_csv_airdrop(
     # temporarily store this protocol's data here
     temp_found_data: dict[ChecksumEvmAddress, dict] = defaultdict(lambda: defaultdict(dict))
     temp_airdrop_tuples = []
-    for row in get_airdrop_data(airdrop_data, protocol_name, data_dir):
-        if len(row) < 2:
-            msg_aggregator.add_warning(f'Skipping airdrop CSV for {protocol_name} because it contains an invalid row: {row}')  # noqa: E501
-            break
-        addr, amount, *_ = row
-        # not doing to_checksum_address() here since the file addresses are checksummed
-        # and doing to_checksum_address() so many times hits performance
-        if protocol_name in {
-            'cornichon',
-            'tornado',
-            'grain',
-            'lido',
-            'sdl',
-            'cow_mainnet',
-            'cow_gnosis',
-        }:
-            amount = token_normalized_value_decimals(int(amount), 18)  # type: ignore
-        if addr in addresses:
-            addr = string_to_evm_address(addr)
+    with get_airdrop_data(airdrop_data, protocol_name, data_dir) as airdrop_index:
+        if airdrop_index.invalid_row is not None:
+            msg_aggregator.add_warning(f'Skipping airdrop CSV for {protocol_name} because it contains an invalid row: {airdrop_index.invalid_row}')  # noqa: E501
+            return [], {}
+
+        for addr, key in address_keys.items():
+            if (amount := airdrop_index.get(key)) is None:
+                continue
+
+            if protocol_name in {
+                'cornichon',
+                'tornado',
+                'grain',
+                'lido',
+                'sdl',
+                'cow_mainnet',
+                'cow_gnosis',
+            }:
+                amount = token_normalized_value_decimals(int(amount), 18)  # type: ignore
             temp_found_data[addr][protocol_name] = {
                 'amount': str(amount),
                 'asset': airdrop_data.asset,
@@ -544,10 +600,8 @@ def _process_csv_airdrop(
                     ),
                 ),
             )
-    else:  # if all rows are valid, return the information
-        return temp_airdrop_tuples, temp_found_data
 
-    return [], {}
+    return temp_airdrop_tuples, temp_found_data
 
 
 def check_airdrops(
@@ -566,12 +620,16 @@ def check_airdrops(
     airdrop_tuples = []
     current_time = ts_now()
     airdrops, poap_airdrops = fetch_airdrops_metadata(database=database)
+    address_keys = {
+        address: key for address in addresses
+        if (key := address_to_key(address)) is not None
+    }
 
     for protocol_name, airdrop_data in airdrops.items():
         if isinstance(airdrop_data, CSVAirdrop):
             temp_airdrop_tuples, temp_found_data = _process_csv_airdrop(
                 msg_aggregator=msg_aggregator,
-                addresses=addresses,
+                address_keys=address_keys,
                 data_dir=data_dir,
                 airdrop_data=airdrop_data,
                 protocol_name=protocol_name,
@@ -599,17 +657,17 @@ def check_airdrops(
         found_data[event_tuple[0]][asset_to_protocol[event_tuple[1]]]['claimed'] = True
 
     for protocol_name, poap_airdrop_data in poap_airdrops.items():
-        data_dict = get_poap_airdrop_data(poap_airdrop_data, protocol_name, data_dir)
-        for addr, assets in data_dict.items():
-            # not doing to_checksum_address() here since the file addresses are checksummed
-            # and doing to_checksum_address() so many times hits performance
-            if addr in addresses:
-                if 'poap' not in found_data[addr]:  # type: ignore[index]
-                    found_data[addr]['poap'] = []  # type: ignore[index]
-
-                found_data[addr]['poap'].append({  # type: ignore[index]
+        with get_poap_airdrop_data(poap_airdrop_data, protocol_name, data_dir) as poap_index:
+            for addr, key in address_keys.items():
+                if (assets := poap_index.get(key)) is None:
+                    continue
+
+                if 'poap' not in found_data[addr]:
+                    found_data[addr]['poap'] = []
+
+                found_data[addr]['poap'].append({
                     'event': protocol_name,
-                    'assets': assets,
+                    'assets': jsonloads_list(assets),
                     'link': poap_airdrop_data[1],
                     'name': poap_airdrop_data[2],
                 })
@@ -1,20 +1,22 @@
 from collections import defaultdict
 from collections.abc import Iterator
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from rotkehlchen.accounting.mixins.event import AccountingEventType
+from rotkehlchen.assets.asset import Asset
 from rotkehlchen.chain.evm.accounting.interfaces import ModuleAccountantInterface
 from rotkehlchen.chain.evm.accounting.structures import EventsAccountantCallback
 from rotkehlchen.chain.evm.decoding.aave.constants import CPT_AAVE_V2
 from rotkehlchen.chain.evm.types import string_to_evm_address
 from rotkehlchen.constants import ZERO
+from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.fval import FVal
 from rotkehlchen.history.events.structures.base import get_event_type_identifier
 from rotkehlchen.history.events.structures.types import HistoryEventSubType, HistoryEventType
+from rotkehlchen.serialization.deserialize import deserialize_fval
 
 if TYPE_CHECKING:
     from rotkehlchen.accounting.pot import AccountingPot
-    from rotkehlchen.assets.asset import Asset
     from rotkehlchen.history.events.structures.evm_event import EvmEvent
     from rotkehlchen.types import ChecksumEvmAddress
 
@@ -25,6 +27,28 @@ class Aavev2Accountant(ModuleAccountantInterface):
         self.assets_borrowed: dict[tuple[ChecksumEvmAddress, Asset], FVal] = defaultdict(FVal)
         self.assets_supplied: dict[tuple[ChecksumEvmAddress, Asset], FVal] = defaultdict(FVal)
 
+    def serialize_state(self) -> dict[str, Any]:
+        return {
+            name: [[address, asset.identifier, str(amount)] for (address, asset), amount in balances.items()]  # noqa: E501
+            for name, balances in (
+                ('assets_borrowed', self.assets_borrowed),
+                ('assets_supplied', self.assets_supplied),
+            )
+        }
+
+    def deserialize_state(self, state: dict[str, Any]) -> None:
+        try:
+            for name, balances in (
+                    ('assets_borrowed', self.assets_borrowed),
+                    ('assets_supplied', self.assets_supplied),
+            ):
+                for address, identifier, amount in state[name]:
+                    balances[(string_to_evm_address(address), Asset(identifier))] = deserialize_fval(amount, name=name, location='aave v2 accountant state')  # noqa: E501
+        except KeyError as e:
+            raise DeserializationError(f'Missing key {e!s} in aave v2 accountant state') from e
+        except ValueError as e:
+            raise DeserializationError(f'Invalid aave v2 accountant state entry: {e!s}') from e
+
     def _process_borrow(
             self,
             pot: 'AccountingPot',  # pylint: disable=unused-argument
@@ -46,7 +46,6 @@ from .structures import (
     ValidatorDetailsWithStatus,
     ValidatorID,
 )
-from .utils import create_profit_filter_queries
 
 if TYPE_CHECKING:
     from rotkehlchen.chain.ethereum.node_inquirer import EthereumInquirer
@@ -206,20 +205,12 @@ class Eth2(EthereumModule):
 
         with self.database.conn.read_ctx() as cursor:
             accounts = self.database.get_blockchain_accounts(cursor)
-
-        withdrawals_filter_query, exits_filter_query, execution_filter_query = create_profit_filter_queries(  # noqa: E501
-            from_ts=from_ts,
-            to_ts=to_ts,
-            validator_indices=list(to_filter_indices) if to_filter_indices is not None else None,
-            tracked_addresses=accounts.eth,  # needed to exclude block recipients not tracked
-        )
-
-        with self.database.conn.read_ctx() as cursor:
             withdrawals_amounts, exits_pnl, execution_rewards_amounts = dbeth2.get_validators_profit(  # noqa: E501
                 cursor=cursor,
-                exits_filter_query=exits_filter_query,
-                withdrawals_filter_query=withdrawals_filter_query,
-                execution_filter_query=execution_filter_query,
+                from_ts=from_ts,
+                to_ts=to_ts,
+                validator_indices=to_filter_indices,
+                tracked_addresses=accounts.eth,  # needed to exclude block recipients not tracked
             )
 
         pnls: defaultdict[int, dict] = defaultdict(dict)
@@ -377,6 +368,8 @@ class Eth2(EthereumModule):
                 self.query_single_address_withdrawals(address, to_ts)
 
             self.detect_exited_validators()
+            with self.database.user_write() as write_cursor:
+                DBEth2(self.database).update_daily_performance(write_cursor)
 
     def query_single_address_withdrawals(self, address: ChecksumEvmAddress, to_ts: Timestamp) -> None:  # noqa: E501
         with self.database.conn.read_ctx() as cursor:
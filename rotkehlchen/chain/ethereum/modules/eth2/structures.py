@@ -15,6 +15,7 @@ from rotkehlchen.history.events.structures.types import EventDirection
 from rotkehlchen.history.price import PriceHistorian
 from rotkehlchen.serialization.deserialize import deserialize_fval, deserialize_timestamp
 from rotkehlchen.types import ChecksumEvmAddress, Eth2PubKey, Location, Timestamp
+from rotkehlchen.utils.mixins.enums import DBCharEnumMixIn
 
 if TYPE_CHECKING:
     from rotkehlchen.accounting.pot import AccountingPot
@@ -246,3 +247,11 @@ class PerformanceStatusFilter(StrEnum):
     ALL = auto()
     ACTIVE = auto()
     EXITED = auto()
+
+
+class ValidatorProfitType(DBCharEnumMixIn):
+    """The kinds of validator profit whose daily cumulative amounts are kept in
+    the eth2_daily_performance table"""
+    WITHDRAWALS = 1
+    EXITS = 2
+    EXECUTION = 3
@@ -1,15 +1,17 @@
 from collections import defaultdict
 from collections.abc import Iterator
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Any, cast
 
 from rotkehlchen.accounting.mixins.event import AccountingEventType
 from rotkehlchen.chain.evm.accounting.interfaces import ModuleAccountantInterface
 from rotkehlchen.chain.evm.accounting.structures import EventsAccountantCallback
 from rotkehlchen.constants import ZERO
 from rotkehlchen.constants.assets import A_DAI
+from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.fval import FVal
 from rotkehlchen.history.events.structures.base import get_event_type_identifier
 from rotkehlchen.history.events.structures.types import HistoryEventSubType, HistoryEventType
+from rotkehlchen.serialization.deserialize import deserialize_fval
 from rotkehlchen.types import ChecksumEvmAddress
 
 from .constants import CPT_DSR, CPT_VAULT
@@ -25,6 +27,21 @@ class MakerdaoAccountant(ModuleAccountantInterface):
         self.vault_balances: dict[str, FVal] = defaultdict(FVal)
         self.dsr_balances: dict[ChecksumEvmAddress, FVal] = defaultdict(FVal)
 
+    def serialize_state(self) -> dict[str, Any]:
+        return {
+            'vault_balances': {cdp_id: str(amount) for cdp_id, amount in self.vault_balances.items()},  # noqa: E501
+            'dsr_balances': {address: str(amount) for address, amount in self.dsr_balances.items()},  # noqa: E501
+        }
+
+    def deserialize_state(self, state: dict[str, Any]) -> None:
+        try:
+            for cdp_id, amount in state['vault_balances'].items():
+                self.vault_balances[cdp_id] = deserialize_fval(amount, name='vault balance', location='makerdao accountant state')  # noqa: E501
+            for address, amount in state['dsr_balances'].items():
+                self.dsr_balances[address] = deserialize_fval(amount, name='dsr balance', location='makerdao accountant state')  # noqa: E501
+        except KeyError as e:
+            raise DeserializationError(f'Missing key {e!s} in makerdao accountant state') from e
+
     def _process_vault_dai_generation(
             self,
             pot: 'AccountingPot',  # pylint: disable=unused-argument
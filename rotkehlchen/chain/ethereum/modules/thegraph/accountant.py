@@ -1,15 +1,17 @@
 from collections import defaultdict
 from collections.abc import Iterator
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Any, cast
 
 from rotkehlchen.accounting.mixins.event import AccountingEventType
 from rotkehlchen.chain.evm.accounting.interfaces import ModuleAccountantInterface
 from rotkehlchen.chain.evm.accounting.structures import EventsAccountantCallback
 from rotkehlchen.chain.evm.decoding.thegraph.constants import CPT_THEGRAPH
 from rotkehlchen.constants import ZERO
+from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.fval import FVal
 from rotkehlchen.history.events.structures.base import get_event_type_identifier
 from rotkehlchen.history.events.structures.types import HistoryEventSubType, HistoryEventType
+from rotkehlchen.serialization.deserialize import deserialize_fval
 
 if TYPE_CHECKING:
     from rotkehlchen.accounting.pot import AccountingPot
@@ -21,6 +23,16 @@ class ThegraphAccountant(ModuleAccountantInterface):
     def reset(self) -> None:
         self.assets_supplied: dict[ChecksumEvmAddress, FVal] = defaultdict(FVal)
 
+    def serialize_state(self) -> dict[str, Any]:
+        return {'assets_supplied': {address: str(amount) for address, amount in self.assets_supplied.items()}}  # noqa: E501
+
+    def deserialize_state(self, state: dict[str, Any]) -> None:
+        try:
+            for address, amount in state['assets_supplied'].items():
+                self.assets_supplied[address] = deserialize_fval(amount, name='supplied amount', location='thegraph accountant state')  # noqa: E501
+        except KeyError as e:
+            raise DeserializationError(f'Missing key {e!s} in thegraph accountant state') from e
+
     def _process_deposit(
             self,
             pot: 'AccountingPot',  # pylint: disable=unused-argument
@@ -17,6 +17,7 @@ from rotkehlchen.chain.evm.decoding.structures import (
 from rotkehlchen.chain.evm.decoding.types import CounterpartyDetails
 from rotkehlchen.chain.evm.decoding.uniswap.constants import CPT_UNISWAP_V2, UNISWAP_ICON
 from rotkehlchen.chain.evm.decoding.uniswap.utils import decode_basic_uniswap_info
+from rotkehlchen.chain.evm.decoding.utils import decodes_topics
 from rotkehlchen.chain.evm.structures import EvmTxReceiptLog
 from rotkehlchen.chain.evm.types import string_to_evm_address
 from rotkehlchen.constants import ZERO
@@ -66,6 +67,7 @@ class Uniswapv2Decoder(DecoderInterface):
             native_currency=self.evm_inquirer.native_token,
         )
 
+    @decodes_topics(SWAP_SIGNATURE)
     def _maybe_decode_v2_swap(
             self,
             token: EvmToken | None,  # pylint: disable=unused-argument
@@ -96,6 +98,7 @@ class Uniswapv2Decoder(DecoderInterface):
 
         return DEFAULT_DECODING_OUTPUT
 
+    @decodes_topics(MINT_SIGNATURE, BURN_SIGNATURE)
     def _maybe_decode_v2_liquidity_addition_and_removal(
             self,
             token: EvmToken | None,  # pylint: disable=unused-argument
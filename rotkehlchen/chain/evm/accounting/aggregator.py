@@ -3,9 +3,10 @@ import logging
 import pkgutil
 from contextlib import suppress
 from types import ModuleType
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from rotkehlchen.errors.misc import ModuleLoadingError
+from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.user_messages import MessagesAggregator
 
@@ -94,6 +95,21 @@ class EVMAccountingAggregator:
         for accountant in self.accountants.values():
             accountant.reset()
 
+    def serialize_state(self) -> dict[str, Any]:
+        """Get the state of all submodule accountants that keep one, keyed by their name"""
+        return {
+            name: state for name, accountant in self.accountants.items()
+            if (state := accountant.serialize_state()) is not None
+        }
+
+    def deserialize_state(self, state: dict[str, Any]) -> None:
+        """Restore the state of the submodule accountants. May raise DeserializationError"""
+        for name, accountant_state in state.items():
+            if (accountant := self.accountants.get(name)) is None:
+                raise DeserializationError(f'Unknown accountant {name} in accounting state')
+
+            accountant.deserialize_state(accountant_state)
+
 
 class EVMAccountingAggregators:
     """
@@ -120,3 +136,16 @@ class EVMAccountingAggregators:
         """Reset the state of all initialized submodule accountants"""
         for aggregator in self.aggregators:
             aggregator.reset()
+
+    def serialize_state(self) -> dict[str, Any]:
+        """Get the state of the accountants of all chains, keyed by chain id"""
+        return {
+            str(aggregator.node_inquirer.chain_id.serialize()): state
+            for aggregator in self.aggregators if len(state := aggregator.serialize_state()) != 0
+        }
+
+    def deserialize_state(self, state: dict[str, Any]) -> None:
+        """Restore the state of the accountants of all chains. May raise DeserializationError"""
+        for aggregator in self.aggregators:
+            if (chain_state := state.get(str(aggregator.node_inquirer.chain_id.serialize()))) is not None:  # noqa: E501
+                aggregator.deserialize_state(chain_state)
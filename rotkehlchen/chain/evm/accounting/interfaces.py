@@ -1,7 +1,7 @@
 import logging
 from abc import ABC, abstractmethod
 from collections.abc import Iterator
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from rotkehlchen.accounting.mixins.event import AccountingEventType
 from rotkehlchen.constants import ZERO
@@ -52,6 +52,20 @@ class ModuleAccountantInterface(ABC):
         """Subclasses may implement this to reset state between accounting runs"""
         return None
 
+    def serialize_state(self) -> dict[str, Any] | None:
+        """Subclasses that keep state between events implement this to return it, so that
+        it can be saved in accounting checkpoints"""
+        return None
+
+    def deserialize_state(self, state: dict[str, Any]) -> None:  # pylint: disable=unused-argument
+        """Subclasses that implement serialize_state restore their state from its data here.
+        Called right after reset.
+
+        May raise:
+        - DeserializationError if the data is not valid
+        """
+        return None
+
 
 class DepositableAccountantInterface(ModuleAccountantInterface):
     """
@@ -7,7 +7,7 @@ from collections.abc import Callable, Sequence
 from contextlib import suppress
 from dataclasses import dataclass
 from types import ModuleType
-from typing import TYPE_CHECKING, Any, Optional, Protocol
+from typing import TYPE_CHECKING, Any, Final, Optional, Protocol
 
 from gevent.lock import Semaphore
 
@@ -63,7 +63,7 @@ from .structures import (
     EnricherContext,
     TransferEnrichmentOutput,
 )
-from .utils import maybe_reshuffle_events
+from .utils import decodes_topics, index_event_rules, maybe_reshuffle_events
 
 if TYPE_CHECKING:
     from rotkehlchen.chain.evm.node_inquirer import EvmNodeInquirer, EvmNodeInquirerWithDSProxy
@@ -77,6 +77,9 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
+# How many undecoded transactions are read, decoded and saved together
+DECODING_CHUNK_SIZE: Final = 100
+
 
 class EventDecoderFunction(Protocol):
 
@@ -180,6 +183,9 @@ class EVMTransactionDecoder(ABC):
         self._add_builtin_decoders(self.rules)
         # Recursively check all submodules to get all decoder address mappings and rules
         self.rules += self._recursively_initialize_decoders(self.chain_modules_root)
+        # Index the event rules by the log topic they decode so that for each log we only
+        # try the rules that can match it plus the ones that don't declare any topic
+        self.event_rules_by_topic, self.dynamic_event_rules = index_event_rules(self.rules.event_rules)  # noqa: E501
         self.undecoded_tx_query_lock = Semaphore()
 
     def _add_builtin_decoders(self, rules: DecodingRules) -> None:
@@ -328,11 +334,15 @@ class EVMTransactionDecoder(ABC):
         """
         Execute event rules for the current tx log. Returns None when no
         new event or actions need to be propagated.
+
+        Only the rules that can match the log's first topic are tried, in the
+        order in which they were registered.
         """
-        for rule in self.rules.event_rules:
-            if len(tx_log.topics) == 0:
-                continue  # ignore anonymous events
+        if len(tx_log.topics) == 0:
+            return None  # ignore anonymous events
 
+        rules = self.event_rules_by_topic.get(tx_log.topics[0], self.dynamic_event_rules)
+        for rule in rules:
             try:
                 decoding_output = rule(token=token, tx_log=tx_log, transaction=transaction, decoded_events=decoded_events, action_items=action_items, all_logs=all_logs)  # noqa: E501
             except (DeserializationError, IndexError) as e:
@@ -417,6 +427,27 @@ class EVMTransactionDecoder(ABC):
         Decodes an evm transaction and its receipt and saves result in the DB.
         Returns the list of decoded events and a flag which is True if balances refresh is needed.
         """
+        events, refresh_balances = self._decode_transaction_events(
+            transaction=transaction,
+            tx_receipt=tx_receipt,
+        )
+        with self.database.user_write() as write_cursor:
+            self._write_decoded_events(
+                write_cursor=write_cursor,
+                transaction=transaction,
+                events=events,
+            )
+
+        return events, refresh_balances  # Propagate for post processing in the caller
+
+    def _decode_transaction_events(
+            self,
+            transaction: EvmTransaction,
+            tx_receipt: EvmTxReceipt,
+    ) -> tuple[list['EvmEvent'], bool]:
+        """Decodes an evm transaction and its receipt without saving anything in the DB.
+        Returns the list of decoded events and a flag which is True if balances refresh is needed.
+        """
         self.base.reset_sequence_counter()
         # check if any eth transfer happened in the transaction, including in internal transactions
         events = self._maybe_decode_simple_transactions(transaction, tx_receipt)
@@ -489,55 +520,149 @@ class EVMTransactionDecoder(ABC):
         if len(events) == 0 and (eth_event := self._get_eth_transfer_event(transaction)) is not None:  # noqa: E501
             events = [eth_event]
 
-        with self.database.user_write() as write_cursor:
-            if len(events) > 0:
-                self.dbevents.add_history_events(
+        events = sorted(events, key=lambda x: x.sequence_index, reverse=False)
+        return events, refresh_balances
+
+    def _write_decoded_events(
+            self,
+            write_cursor: 'DBCursor',
+            transaction: EvmTransaction,
+            events: list['EvmEvent'],
+    ) -> None:
+        """Saves the decoded events of a transaction in the DB and marks it as decoded"""
+        if len(events) > 0:
+            self.dbevents.add_history_events(
+                write_cursor=write_cursor,
+                history=events,
+            )
+        else:
+            # This is probably a phishing zero value token transfer tx.
+            # Details here: https://github.com/rotki/rotki/issues/5749
+            with suppress(InputError):  # We don't care if it's already in the DB
+                self.database.add_to_ignored_action_ids(
                     write_cursor=write_cursor,
-                    history=events,
+                    action_type=ActionType.HISTORY_EVENT,
+                    identifiers=[transaction.identifier],
                 )
-            else:
-                # This is probably a phishing zero value token transfer tx.
-                # Details here: https://github.com/rotki/rotki/issues/5749
-                with suppress(InputError):  # We don't care if it's already in the DB
-                    self.database.add_to_ignored_action_ids(
-                        write_cursor=write_cursor,
-                        action_type=ActionType.HISTORY_EVENT,
-                        identifiers=[transaction.identifier],
-                    )
-            tx_id = transaction.get_or_query_db_id(write_cursor)
-            write_cursor.execute(
-                'INSERT OR IGNORE INTO evm_tx_mappings(tx_id, value) VALUES(?, ?)',
-                (tx_id, HISTORY_MAPPING_STATE_DECODED),
-            )
-
-        events = sorted(events, key=lambda x: x.sequence_index, reverse=False)
-        return events, refresh_balances  # Propagate for post processing in the caller
+        tx_id = transaction.get_or_query_db_id(write_cursor)
+        write_cursor.execute(
+            'INSERT OR IGNORE INTO evm_tx_mappings(tx_id, value) VALUES(?, ?)',
+            (tx_id, HISTORY_MAPPING_STATE_DECODED),
+        )
 
     def get_and_decode_undecoded_transactions(
             self,
             limit: int | None = None,
             send_ws_notifications: bool = False,
+            chunk_size: int = DECODING_CHUNK_SIZE,
     ) -> None:
         """Checks the DB for up to `limit` undecoded transactions and decodes them.
-        If a list of addresses is provided then only the transactions involving those
-        addresses are decoded.
+
+        Transactions are read from the DB in chunks of `chunk_size`. The events of each
+        transaction are saved before decoding the next one since some decoders read the
+        events of earlier transactions from the DB.
 
         This is protected by concurrent access from a lock"""
         with self.undecoded_tx_query_lock:
             log.debug(f'Starting task to process undecoded transactions for {self.evm_inquirer.chain_name} with {limit=}')  # noqa: E501
-            hashes = self.dbevmtx.get_transaction_hashes_not_decoded(
+            total_transactions = self.dbevmtx.count_hashes_not_decoded(
                 chain_id=self.evm_inquirer.chain_id,
-                limit=limit,
             )
-            if len(hashes) != 0:
-                log.debug(f'Will decode {len(hashes)} transactions for {self.evm_inquirer.chain_name}')  # noqa: E501
-                self.decode_transaction_hashes(
-                    ignore_cache=False,
-                    tx_hashes=hashes,
+            if limit is not None:
+                total_transactions = min(total_transactions, limit)
+            if total_transactions != 0:
+                log.debug(f'Will decode {total_transactions} transactions for {self.evm_inquirer.chain_name}')  # noqa: E501
+                self._decode_undecoded_transactions_in_chunks(
+                    total_transactions=total_transactions,
+                    chunk_size=chunk_size,
                     send_ws_notifications=send_ws_notifications,
                 )
             log.debug(f'Finished task to process undecoded transactions for {self.evm_inquirer.chain_name} with {limit=}')  # noqa: E501
 
+    def _decode_undecoded_transactions_in_chunks(
+            self,
+            total_transactions: int,
+            chunk_size: int,
+            send_ws_notifications: bool,
+    ) -> None:
+        """Decode up to `total_transactions` undecoded transactions. For each chunk the
+        transactions and their receipts are read from the DB at once and then each
+        transaction is decoded and its events saved in order.
+
+        May raise:
+        - DeserializationError if there is a problem with contacting a remote to get receipts
+        - RemoteError if there is a problem with contacting a remote to get receipts
+        - InputError if a transaction whose data is missing from the DB can't be queried
+        """
+        refresh_balances = False
+        processed = 0
+        with self.database.conn.read_ctx() as cursor:
+            self.reload_data(cursor)
+
+        while processed < total_transactions:
+            if send_ws_notifications:
+                self.msg_aggregator.add_message(
+                    message_type=WSMessageType.EVM_UNDECODED_TRANSACTIONS,
+                    data={
+                        'chain': self.evm_inquirer.chain_name,
+                        'total': total_transactions,
+                        'processed': processed,
+                    },
+                )
+
+            with self.database.conn.read_ctx() as cursor:
+                tx_hashes, transactions = self.dbevmtx.get_transactions_and_receipts_not_decoded(
+                    cursor=cursor,
+                    chain_id=self.evm_inquirer.chain_id,
+                    limit=min(chunk_size, total_transactions - processed),
+                )
+            if len(tx_hashes) == 0:
+                break  # something else decoded the rest in the meantime
+
+            for tx_hash in tx_hashes:
+                if (tx_and_receipt := transactions.get(tx_hash)) is None:
+                    with self.database.conn.read_ctx() as cursor:
+                        try:
+                            tx_and_receipt = self.transactions.get_or_create_transaction(
+                                cursor=cursor,
+                                tx_hash=tx_hash,
+                                relevant_address=None,
+                            )
+                        except RemoteError as e:
+                            raise InputError(f'{self.evm_inquirer.chain_name} hash {tx_hash.hex()} does not correspond to a transaction. {e}') from e  # noqa: E501
+
+                transaction, tx_receipt = tx_and_receipt
+                events, new_refresh_balances = self._decode_transaction_events(
+                    transaction=transaction,
+                    tx_receipt=tx_receipt,
+                )
+                if new_refresh_balances is True:
+                    refresh_balances = True
+
+                # save the events before decoding the next transaction of the chunk as
+                # decoders like eigenlayer's query the events of earlier transactions
+                with self.database.user_write() as write_cursor:
+                    self._write_decoded_events(
+                        write_cursor=write_cursor,
+                        transaction=transaction,
+                        events=events,
+                    )
+
+            processed += len(tx_hashes)
+
+        if send_ws_notifications:
+            self.msg_aggregator.add_message(
+                message_type=WSMessageType.EVM_UNDECODED_TRANSACTIONS,
+                data={
+                    'chain': self.evm_inquirer.chain_name,
+                    'total': total_transactions,
+                    'processed': total_transactions,
+                },
+            )
+
+        self._post_process(refresh_balances=refresh_balances)
+        log.debug(f'Decoded {processed} {self.evm_inquirer.chain_name} transactions. EVM token cache stats: {GlobalDBHandler.get_evm_token_cache_stats()}')  # noqa: E501
+
     def decode_transaction_hashes(
             self,
             ignore_cache: bool,
@@ -611,6 +736,7 @@ class EVMTransactionDecoder(ABC):
             )
 
         self._post_process(refresh_balances=refresh_balances)
+        log.debug(f'Decoded {total_transactions} {self.evm_inquirer.chain_name} transactions. EVM token cache stats: {GlobalDBHandler.get_evm_token_cache_stats()}')  # noqa: E501
         return events
 
     def _get_or_decode_transaction_events(
@@ -729,6 +855,7 @@ class EVMTransactionDecoder(ABC):
             counterparty=counterparty,
         )
 
+    @decodes_topics(ERC20_APPROVE)
     def _maybe_decode_erc20_approve(
             self,
             token: EvmToken | None,
@@ -857,6 +984,7 @@ class EVMTransactionDecoder(ABC):
             events.append(eth_event)
         return events
 
+    @decodes_topics(ERC20_OR_ERC721_TRANSFER)
     def _maybe_decode_erc20_721_transfer(
             self,
             token: EvmToken | None,
@@ -1,5 +1,5 @@
-from collections.abc import Sequence
-from typing import TYPE_CHECKING, Optional
+from collections.abc import Callable, Sequence
+from typing import TYPE_CHECKING, Final, Optional, TypeVar
 
 from rotkehlchen.assets.asset import AssetWithSymbol
 from rotkehlchen.chain.evm.decoding.types import CounterpartyDetails
@@ -11,6 +11,48 @@ if TYPE_CHECKING:
     from rotkehlchen.chain.evm.structures import EvmTxReceiptLog
     from rotkehlchen.history.events.structures.evm_event import EvmEvent
 
+T = TypeVar('T', bound=Callable)
+# name of the attribute in which an event rule stores the log topics it can decode
+RULE_TOPICS_ATTRIBUTE: Final = 'decoded_topics'
+
+
+def decodes_topics(*topics: bytes) -> Callable[[T], T]:
+    """Decorator for event decoding rules that declares which log topics[0] the rule can
+    possibly match. Such rules are only tried for logs with one of those topics.
+
+    All the event rules should use it. Rules without it are considered dynamic and are
+    tried for every log, which is only meant for rules that can't know the topics they
+    decode before seeing the log."""
+    def wrapper(rule: T) -> T:
+        setattr(rule, RULE_TOPICS_ATTRIBUTE, frozenset(topics))
+        return rule
+
+    return wrapper
+
+
+def index_event_rules(event_rules: Sequence[T]) -> tuple[dict[bytes, list[T]], list[T]]:
+    """Build an index from a log's topics[0] to the event rules that may decode it.
+
+    Returns the index and the list of dynamic rules, which is what should be tried
+    for a topic not in the index. Each list keeps the order of `event_rules` so that
+    the first rule that matches is the same as when trying all of them in sequence."""
+    all_topics: set[bytes] = set()
+    for rule in event_rules:
+        all_topics.update(getattr(rule, RULE_TOPICS_ATTRIBUTE, ()))
+
+    index: dict[bytes, list[T]] = {topic: [] for topic in all_topics}
+    dynamic_rules: list[T] = []
+    for rule in event_rules:
+        if (rule_topics := getattr(rule, RULE_TOPICS_ATTRIBUTE, None)) is None:
+            dynamic_rules.append(rule)
+            for rules in index.values():
+                rules.append(rule)
+        else:
+            for topic in rule_topics:
+                index[topic].append(rule)
+
+    return index, dynamic_rules
+
 
 def maybe_reshuffle_events(
         ordered_events: Sequence[Optional['EvmEvent']],
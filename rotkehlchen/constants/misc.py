@@ -25,6 +25,7 @@ KRAKEN_API_VERSION = '0'
 DEFAULT_MAX_LOG_SIZE_IN_MB = 300
 DEFAULT_MAX_LOG_BACKUP_FILES = 3
 DEFAULT_SQL_VM_INSTRUCTIONS_CB = 5000
+DEFAULT_FVAL_BACKEND = 'decimal'
 
 GLOBALDIR_NAME: Final = 'global'
 GLOBALDB_NAME: Final = 'global.db'
@@ -25,3 +25,4 @@ SPAM_ASSETS_DETECTION_REFRESH: Final = HOUR_IN_SECONDS * 6
 AUGMENTED_SPAM_ASSETS_DETECTION_REFRESH: Final = DAY_IN_SECONDS
 OWNED_ASSETS_UPDATE: Final = HOUR_IN_SECONDS
 AAVE_V3_ASSETS_UPDATE: Final = WEEK_IN_SECONDS
+ASYNC_TASK_RESULT_TTL: Final = HOUR_IN_SECONDS  # time after which uncollected results are dropped
@@ -1,4 +1,6 @@
 import os
+from collections.abc import Iterable
+from typing import IO
 
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
@@ -14,12 +16,17 @@ AES_BLOCK_SIZE = 16
 # cryptography library seem to suggest it's the safest options. Problem is the
 # already encrypted and saved database files and how to handle the previous encryption
 # We need to keep a versioning of encryption used for each file.
+def _aes_key(key: bytes) -> bytes:
+    """Use SHA-256 over our key to get a proper-sized AES key"""
+    digest = hashes.Hash(hashes.SHA256())
+    digest.update(key)
+    return digest.finalize()
+
+
 def encrypt(key: bytes, source: bytes) -> bytes:
     assert isinstance(key, bytes), 'key should be given in bytes'
     assert isinstance(source, bytes), 'source should be given in bytes'
-    digest = hashes.Hash(hashes.SHA256())
-    digest.update(key)
-    key = digest.finalize()  # use SHA-256 over our key to get a proper-sized AES key
+    key = _aes_key(key)
     iv = os.urandom(AES_BLOCK_SIZE)
     cipher = Cipher(algorithms.AES(key), modes.CBC(iv))
     encryptor = cipher.encryptor()
@@ -30,6 +37,22 @@ def encrypt(key: bytes, source: bytes) -> bytes:
     return data
 
 
+def encrypt_stream(key: bytes, source: Iterable[bytes], destination: IO[bytes]) -> None:
+    """Encrypts the chunks of source into destination one by one. The result is the same
+    as encrypt() of all the chunks joined, without keeping them all in memory."""
+    assert isinstance(key, bytes), 'key should be given in bytes'
+    iv = os.urandom(AES_BLOCK_SIZE)
+    encryptor = Cipher(algorithms.AES(_aes_key(key)), modes.CBC(iv)).encryptor()
+    destination.write(iv)
+    length = 0
+    for chunk in source:
+        length += len(chunk)
+        destination.write(encryptor.update(chunk))
+
+    padding = AES_BLOCK_SIZE - length % AES_BLOCK_SIZE
+    destination.write(encryptor.update(bytes([padding]) * padding) + encryptor.finalize())
+
+
 def decrypt(key: bytes, source: bytes) -> bytes:
     """
     Decrypts the given source data we with the given key.
@@ -39,9 +62,7 @@ def decrypt(key: bytes, source: bytes) -> bytes:
     """
     assert isinstance(key, bytes), 'key should be given in bytes'
     assert isinstance(source, bytes), 'source should be given in bytes'
-    digest = hashes.Hash(hashes.SHA256())
-    digest.update(key)
-    key = digest.finalize()  # use SHA-256 over our key to get a proper-sized AES key
+    key = _aes_key(key)
     iv = source[:AES_BLOCK_SIZE]  # extract the iv from the beginning
     cipher = Cipher(algorithms.AES(key), modes.CBC(iv))
     decryptor = cipher.decryptor()
@@ -4,12 +4,15 @@ import logging
 import shutil
 import tempfile
 import zlib
+from collections.abc import Iterator
+from contextlib import ExitStack
 from pathlib import Path
+from typing import IO
 
 
 from rotkehlchen.assets.asset import Asset
 from rotkehlchen.constants.misc import USERDB_NAME, USERSDIR_NAME
-from rotkehlchen.crypto import decrypt, encrypt
+from rotkehlchen.crypto import decrypt, encrypt_stream
 from rotkehlchen.db.dbhandler import DBHandler
 from rotkehlchen.db.settings import ModifiableDBSettings
 from rotkehlchen.errors.api import AuthenticationError
@@ -22,6 +25,8 @@ logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
 BUFFERSIZE = 64 * 1024
+# Size up to which the encrypted DB backup is kept in memory before spilling to disk
+SPOOLED_BACKUP_MAX_MEMORY = 8 * 1024 * 1024
 
 
 class DataHandler:
@@ -185,35 +190,48 @@ class DataHandler:
 
         return users
 
-    def compress_and_encrypt_db(self) -> tuple[bytes, str]:
+    def compress_and_encrypt_db(self) -> tuple[IO[bytes], str]:
         """Decrypt the DB, dump in temporary plaintextdb, compress it,
         and then re-encrypt it
 
-        Returns a b64 encoded binary blob"""
+        The plaintext DB is read, hashed, compressed and encrypted one block at a time
+        into a spooled temporary file so that memory use does not grow with the DB size.
+
+        Returns the encrypted data as a file positioned at its start, which the caller
+        should close, and the b64 encoded hash of the plaintext DB"""
         compressor = zlib.compressobj(level=9)
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.db') as tempdbfile:
+        source_hash = hashlib.sha256()
+        with (
+            tempfile.NamedTemporaryFile(delete=False, suffix='.db') as tempdbfile,
+            ExitStack() as stack,
+        ):
             tempdbpath = Path(tempdbfile.name)
             log.info(f'Compress and encrypt DB at temporary path: {tempdbpath}')
             tempdbfile.close()  # close the file to allow re-opening by export_unencrypted in windows https://github.com/rotki/rotki/issues/5051  # noqa: E501
+            # closed if anything below fails, otherwise the caller closes it when done with it
+            encrypted_file = stack.enter_context(tempfile.SpooledTemporaryFile(max_size=SPOOLED_BACKUP_MAX_MEMORY))  # noqa: E501
             self.db.export_unencrypted(tempdbpath)
-            source_data = bytearray()
-            compressed_data = bytearray()
-            with open(tempdbpath, 'rb') as src_f:
-                block = src_f.read(BUFFERSIZE)
-                while block:
-                    source_data += block
-                    compressed_data += compressor.compress(block)
-                    block = src_f.read(BUFFERSIZE)
-
-                compressed_data += compressor.flush()
-
-        original_data_hash = base64.b64encode(
-            hashlib.sha256(source_data).digest(),
-        ).decode()
-        encrypted_data = encrypt(self.db.password.encode(), bytes(compressed_data))
+
+            def compressed_blocks() -> Iterator[bytes]:
+                with open(tempdbpath, 'rb') as src_f:
+                    while block := src_f.read(BUFFERSIZE):
+                        source_hash.update(block)
+                        yield compressor.compress(block)
+
+                yield compressor.flush()
+
+            encrypt_stream(
+                key=self.db.password.encode(),
+                source=compressed_blocks(),
+                destination=encrypted_file,
+            )
+            stack.pop_all()
+
+        original_data_hash = base64.b64encode(source_hash.digest()).decode()
         # cleanup temp file to avoid windows problem (https://github.com/rotki/rotki/issues/5051)
         tempdbpath.unlink()
-        return encrypted_data, original_data_hash
+        encrypted_file.seek(0)
+        return encrypted_file, original_data_hash
 
     def decompress_and_decrypt_db(self, encrypted_data: bytes) -> None:
         """Decrypt and decompress the encrypted data we receive from the server
@@ -2,6 +2,7 @@ import abc
 import csv
 import logging
 from collections import Counter, defaultdict
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Final
 
@@ -38,6 +39,7 @@ from rotkehlchen.utils.misc import ts_sec_to_ms
 
 if TYPE_CHECKING:
     from rotkehlchen.assets.asset import AssetWithOracles
+    from rotkehlchen.db.dbhandler import DBHandler
 
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
@@ -45,6 +47,7 @@ log = RotkehlchenLogsAdapter(logger)
 BinanceCsvRow = dict[str, Any]
 BINANCE_TRADE_OPERATIONS = {'Buy', 'Sell', 'Fee'}
 EVENT_IDENTIFIER_PREFIX = 'BNC_'
+BINANCE_REQUIRED_COLUMNS: Final = {'UTC_Time', 'Coin', 'Change'}
 
 
 class BinanceEntry(abc.ABC):  # noqa: B024
@@ -656,34 +659,75 @@ MULTIPLE_BINANCE_ENTRIES: list[BinanceMultipleEntry] = [
 ]
 
 
-def _group_binance_rows(
-        rows: list[BinanceCsvRow],
-        timestamp_format: str = '%Y-%m-%d %H:%M:%S',
-) -> tuple[int, dict[Timestamp, list[BinanceCsvRow]]]:
-    """Groups Binance rows by timestamp and deletes unused columns"""
-    multirows: dict[Timestamp, list[BinanceCsvRow]] = defaultdict(list)
-    skipped_count = 0
-    for csv_row in rows:
-        try:
-            timestamp = deserialize_timestamp_from_date(
-                date=csv_row['UTC_Time'],
-                formatstr=timestamp_format,
-                location='binance',
-            )
-            csv_row['Coin'] = asset_from_binance(csv_row['Coin'])
-            csv_row['Change'] = deserialize_asset_amount(csv_row['Change'])
-            multirows[timestamp].append(csv_row)
-        except (DeserializationError, UnknownAsset, UnsupportedAsset) as e:
-            log.warning(f'Skipped binance csv row {csv_row} because of {e!s}')
-            skipped_count += 1
-        except KeyError as e:
-            log.error(f'Malformed binance csv columns! Broke on row {csv_row}. {e!s}')
-            return len(rows), {}
+class BinanceImporter(BaseExchangeImporter):
 
-    return skipped_count, multirows
+    def __init__(self, db: 'DBHandler') -> None:
+        super().__init__(db=db)
+        self.bad_rows_count = 0
 
+    @staticmethod
+    def _binance_rows_are_sorted(
+            rows: Iterable[BinanceCsvRow],
+            timestamp_format: str = '%Y-%m-%d %H:%M:%S',
+    ) -> bool:
+        """Checks if the timestamps of the rows are in ascending or descending order.
+        Rows with a timestamp that can't be deserialized are not taken into account."""
+        ascending = descending = True
+        last_timestamp: Timestamp | None = None
+        for csv_row in rows:
+            try:
+                timestamp = deserialize_timestamp_from_date(
+                    date=csv_row['UTC_Time'],
+                    formatstr=timestamp_format,
+                    location='binance',
+                )
+            except DeserializationError:
+                continue
 
-class BinanceImporter(BaseExchangeImporter):
+            if last_timestamp is not None:
+                ascending &= timestamp >= last_timestamp
+                descending &= timestamp <= last_timestamp
+                if not (ascending or descending):
+                    return False
+
+            last_timestamp = timestamp
+
+        return True
+
+    def _group_binance_rows(
+            self,
+            rows: Iterable[BinanceCsvRow],
+            rows_are_sorted: bool,
+            timestamp_format: str = '%Y-%m-%d %H:%M:%S',
+    ) -> Iterator[tuple[Timestamp, list[BinanceCsvRow]]]:
+        """Groups Binance rows by timestamp and deletes unused columns
+
+        If the rows are sorted by time the rows of a timestamp are consecutive, so each
+        group is yielded once a row of another timestamp is read and the rows are
+        streamed. Otherwise all the rows are grouped before the first group is yielded.
+        Rows that can't be deserialized are counted in bad_rows_count.
+        """
+        multirows: dict[Timestamp, list[BinanceCsvRow]] = defaultdict(list)
+        for csv_row in rows:
+            try:
+                timestamp = deserialize_timestamp_from_date(
+                    date=csv_row['UTC_Time'],
+                    formatstr=timestamp_format,
+                    location='binance',
+                )
+                csv_row['Coin'] = asset_from_binance(csv_row['Coin'])
+                csv_row['Change'] = deserialize_asset_amount(csv_row['Change'])
+            except (DeserializationError, UnknownAsset, UnsupportedAsset) as e:
+                log.warning(f'Skipped binance csv row {csv_row} because of {e!s}')
+                self.bad_rows_count += 1
+                continue
+
+            if rows_are_sorted and len(multirows) != 0 and timestamp not in multirows:
+                yield multirows.popitem()
+
+            multirows[timestamp].append(csv_row)
+
+        yield from multirows.items()
 
     def _process_single_binance_entries(
             self,
@@ -747,11 +791,11 @@ class BinanceImporter(BaseExchangeImporter):
     def _process_binance_rows(
             self,
             write_cursor: DBCursor,
-            multi: dict[Timestamp, list[BinanceCsvRow]],
+            multi: Iterable[tuple[Timestamp, list[BinanceCsvRow]]],
     ) -> None:
         stats: dict[BinanceEntry, int] = defaultdict(int)
-        skipped_rows: list[Any] = []
-        for timestamp, rows in multi.items():
+        skipped_count = 0
+        for timestamp, rows in multi:
             single_processed, rows_without_single = self._process_single_binance_entries(
                 write_cursor=write_cursor,
                 timestamp=timestamp,
@@ -767,27 +811,17 @@ class BinanceImporter(BaseExchangeImporter):
             )
             if multiple_type is not None and multiple_count > 0:
                 stats[multiple_type] += multiple_count
-                rows_without_multiple = []
-            else:
-                rows_without_multiple = rows_without_single
+                continue
 
-            if len(rows_without_multiple) > 0:
-                skipped_rows.append([timestamp, rows_without_multiple])
+            if len(rows_without_single) > 0:
+                # logged as they are found so that they are not kept in memory
+                if {el['Operation'] for el in rows_without_single}.issubset(BINANCE_TRADE_OPERATIONS):  # noqa: E501
+                    log.debug(f'Skipped Binance trade rows: {[timestamp, rows_without_single]}')
+                else:
+                    log.debug(f'Skipped Binance non-trade rows {[timestamp, rows_without_single]}')
+                skipped_count += len(rows_without_single)
 
-        skipped_nontrade_rows = []
-        skipped_trade_rows = []
-        for skipped_rows_group in skipped_rows:
-            cur_operations = {el['Operation'] for el in skipped_rows_group[1]}
-            if cur_operations.issubset(BINANCE_TRADE_OPERATIONS):
-                skipped_trade_rows.append(skipped_rows_group)
-            else:
-                skipped_nontrade_rows.append(skipped_rows_group)
         total_found = sum(stats.values())
-        skipped_count = 0
-        for _, rows in skipped_rows:
-            skipped_count += len(rows)
-        log.debug(f'Skipped Binance trade rows: {skipped_trade_rows}')
-        log.debug(f'Skipped Binance non-trade rows {skipped_nontrade_rows}')
         log.debug(f'Total found Binance entries: {total_found}')
         log.debug(f'Total skipped Binance csv rows: {skipped_count}')
         log.debug(f'Binance import stats: {[{type(entry_class).__name__: amount} for entry_class, amount in stats.items()]}')  # noqa: E501
@@ -802,11 +836,24 @@ class BinanceImporter(BaseExchangeImporter):
         Group and process binance CSV entries. May raise:
         - InputError
         """
-        with open(filepath, encoding='utf-8-sig') as csvfile:
-            input_rows = list(csv.DictReader(csvfile))
-            skipped_count, multirows = _group_binance_rows(rows=input_rows, **kwargs)
-            if skipped_count > 0:
+        with self.open_csv(filepath) as csvfile:
+            rows = csv.DictReader(csvfile)
+            if len(missing_columns := BINANCE_REQUIRED_COLUMNS.difference(rows.fieldnames or ())) != 0:  # noqa: E501
+                log.error(f'Malformed binance csv columns! Missing {missing_columns}')
+                self.bad_rows_count += sum(1 for _ in rows)
+            else:  # read the file twice to not keep it in memory if it's sorted by time
+                rows_are_sorted = self._binance_rows_are_sorted(rows=rows, **kwargs)
+                csvfile.seek(0)
+                self._process_binance_rows(
+                    write_cursor=write_cursor,
+                    multi=self._group_binance_rows(
+                        rows=csv.DictReader(csvfile),
+                        rows_are_sorted=rows_are_sorted,
+                        **kwargs,
+                    ),
+                )
+
+            if self.bad_rows_count > 0:
                 self.db.msg_aggregator.add_warning(
-                    f'{skipped_count} Binance rows have bad format. Check logs for details.',
+                    f'{self.bad_rows_count} Binance rows have bad format. Check logs for details.',
                 )
-            self._process_binance_rows(write_cursor=write_cursor, multi=multirows)
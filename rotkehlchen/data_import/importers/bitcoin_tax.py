@@ -259,7 +259,7 @@ class BitcoinTaxImporter(BaseExchangeImporter):
         May raise:
         - InputError if one of the rows is malformed
         """
-        with open(filepath, encoding='utf-8-sig') as csvfile:
+        with self.open_csv(filepath) as csvfile:
             data = csv.DictReader(csvfile)
             csv_type = determine_csv_type(data)
             for row in data:
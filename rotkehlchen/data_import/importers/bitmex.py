@@ -110,7 +110,7 @@ class BitMEXImporter(BaseExchangeImporter):
         - UnsupportedCSVEntry if operation not supported
         - InputError if a column we need is missing
         """
-        with open(filepath, encoding='utf-8-sig') as csvfile:
+        with self.open_csv(filepath) as csvfile:
             data = csv.DictReader(csvfile)
             for row in data:
                 try:
@@ -139,7 +139,7 @@ class BitstampTransactionsImporter(BaseExchangeImporter):
         """
         Import trades from bitstamp.
         """
-        with open(filepath, encoding='utf-8-sig') as csvfile:
+        with self.open_csv(filepath) as csvfile:
             data = csv.DictReader(csvfile)
             for row in data:
                 try:
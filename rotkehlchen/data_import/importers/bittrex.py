@@ -169,7 +169,7 @@ class BittrexImporter(BaseExchangeImporter):
         """
         consumer_fn: Callable[[dict[str, Any], BittrexFileType, str], AssetMovement] | Callable[[dict[str, Any], BittrexFileType, str], Trade]  # noqa: E501
         save_fn: Callable[[DBCursor, Trade], None] | Callable[[DBCursor, AssetMovement], None]
-        with open(filepath, encoding='utf-8-sig') as csvfile:
+        with self.open_csv(filepath) as csvfile:
             while True:
                 saved_pos = csvfile.tell()
                 line = csvfile.readline()
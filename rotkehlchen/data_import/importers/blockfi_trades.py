@@ -71,7 +71,7 @@ class BlockfiTradesImporter(BaseExchangeImporter):
         May raise:
         - InputError if one of the rows is malformed
         """
-        with open(filepath, encoding='utf-8-sig') as csvfile:
+        with self.open_csv(filepath) as csvfile:
             data = csv.DictReader(csvfile)
             for row in data:
                 try:
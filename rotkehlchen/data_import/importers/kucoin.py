@@ -33,7 +33,7 @@ class KucoinImporter(BaseExchangeImporter):
         - UnsupportedCSVEntry if operation not supported
         - InputError if a column we need is missing
         """
-        with open(filepath, encoding='utf-8-sig') as csvfile:
+        with self.open_csv(filepath) as csvfile:
             start_pos = csvfile.tell()
             first_line = csvfile.readline()
             if 'tradeCreatedAt,symbol,side,price,size,funds,fee,feeCurrency' in first_line:
@@ -1,9 +1,13 @@
 import hashlib
+import os
+import time
 from abc import ABC, abstractmethod
-from collections.abc import Mapping
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 
+from rotkehlchen.api.websockets.typedefs import WSMessageType
 from rotkehlchen.assets.asset import Asset, AssetWithOracles
 from rotkehlchen.assets.converters import LOCATION_TO_ASSET_MAPPING, asset_from_common_identifier
 from rotkehlchen.db.dbhandler import DBHandler
@@ -16,6 +20,8 @@ from rotkehlchen.serialization.deserialize import deserialize_asset_amount, dese
 from rotkehlchen.types import Fee, Location, TimestampMS
 
 ITEMS_PER_DB_WRITE = 400
+# Minimum seconds between two progress messages of a CSV import
+PROGRESS_NOTIFICATION_INTERVAL = 1
 
 
 class BaseExchangeImporter(ABC):
@@ -26,6 +32,10 @@ class BaseExchangeImporter(ABC):
         self._margin_trades: list[MarginPosition] = []
         self._asset_movements: list[AssetMovement] = []
         self._history_events: list[HistoryBaseEntry] = []
+        self.imported_entries = 0
+        self._csv_file: IO[bytes] | None = None
+        self._csv_file_size = 0
+        self._last_notification = 0.0
 
     def import_csv(self, filepath: Path, **kwargs: Any) -> tuple[bool, str]:
         try:
@@ -35,8 +45,40 @@ class BaseExchangeImporter(ABC):
         except InputError as e:
             return False, str(e)
         else:
+            self._notify_progress(finished=True)
             return True, ''
 
+    @contextmanager
+    def open_csv(self, filepath: Path) -> Iterator[IO[str]]:
+        """Open the CSV file so that its rows can be streamed. The read position in the
+        file is used to report the progress of the import."""
+        with open(filepath, encoding='utf-8-sig') as csvfile:
+            self._csv_file = csvfile.buffer
+            self._csv_file_size = os.fstat(csvfile.fileno()).st_size
+            yield csvfile
+
+        self._csv_file = None
+
+    def _notify_progress(self, finished: bool = False) -> None:
+        """Send the progress of the import over the websockets if it has been more than
+        PROGRESS_NOTIFICATION_INTERVAL seconds since the last message"""
+        if finished is False and time.monotonic() - self._last_notification < PROGRESS_NOTIFICATION_INTERVAL:  # noqa: E501
+            return
+
+        processed_bytes = self._csv_file_size
+        if finished is False and self._csv_file is not None and self._csv_file.closed is False:
+            processed_bytes = self._csv_file.tell()
+
+        self.db.msg_aggregator.add_message(
+            message_type=WSMessageType.CSV_IMPORT_PROGRESS,
+            data={
+                'processed_bytes': processed_bytes,
+                'total_bytes': self._csv_file_size,
+                'imported_entries': self.imported_entries,
+            },
+        )
+        self._last_notification = time.monotonic()
+
     @abstractmethod
     def _import_csv(self, write_cursor: DBCursor, filepath: Path, **kwargs: Any) -> None:
         """The method that processes csv. Should be implemented by subclasses.
@@ -65,6 +107,10 @@ class BaseExchangeImporter(ABC):
             self.flush_all(cursor)
 
     def flush_all(self, write_cursor: DBCursor) -> None:
+        if (entries := len(self._trades) + len(self._margin_trades) + len(self._asset_movements) + len(self._history_events)) == 0:  # noqa: E501
+            return
+
+        self.imported_entries += entries
         self.db.add_trades(write_cursor, trades=self._trades)
         self.db.add_margin_positions(write_cursor, margin_positions=self._margin_trades)
         self.db.add_asset_movements(write_cursor, asset_movements=self._asset_movements)
@@ -73,6 +119,7 @@ class BaseExchangeImporter(ABC):
         self._margin_trades = []
         self._asset_movements = []
         self._history_events = []
+        self._notify_progress()
 
 
 class UnsupportedCSVEntry(Exception):
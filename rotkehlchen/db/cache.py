@@ -38,6 +38,11 @@ class LabeledLocationIdArgsType(LabeledLocationArgsType):
     account_id: str
 
 
+class LabeledLocationSymbolArgsType(LabeledLocationArgsType):
+    """Type of kwargs, used to get the value of `DBCacheDynamic.LAST_TRADE_ID`"""
+    symbol: str
+
+
 class AddressArgType(TypedDict):
     """Type of kwargs, used to get the value of `DBCacheDynamic.WITHDRAWALS_TS` and `DBCacheDynamic.WITHDRAWALS_IDX`"""  # noqa: E501
     address: ChecksumEvmAddress
@@ -64,6 +69,8 @@ class DBCacheDynamic(Enum):
     LAST_QUERY_TS: Final = '{location}_{location_name}_{account_id}_last_query_ts', _deserialize_timestamp_from_str  # noqa: E501
     LAST_QUERY_ID: Final = '{location}_{location_name}_{account_id}_last_query_id', lambda x: x  # return it as is, a string  # noqa: E501
     LAST_BLOCK_ID: Final = '{location}_{location_name}_{account_id}_last_block_id', _deserialize_int_from_str  # noqa: E501
+    # ends with the location name so that it's deleted with the exchange's query ranges
+    LAST_TRADE_ID: Final = '{location}_{symbol}_last_trade_id_{location_name}', _deserialize_int_from_str  # noqa: E501
     WITHDRAWALS_TS: Final = 'ethwithdrawalsts_{address}', _deserialize_timestamp_from_str
     WITHDRAWALS_IDX: Final = 'ethwithdrawalsidx_{address}', _deserialize_int_from_str
     EXTRA_INTERNAL_TX: Final = f'{EXTRAINTERNALTXPREFIX}_{{tx_hash}}_{{receiver}}', string_to_evm_address  # noqa: E501
@@ -76,6 +83,10 @@ class DBCacheDynamic(Enum):
     def get_db_key(self, **kwargs: Unpack[LabeledLocationIdArgsType]) -> str:
         ...
 
+    @overload
+    def get_db_key(self, **kwargs: Unpack[LabeledLocationSymbolArgsType]) -> str:
+        ...
+
     @overload
     def get_db_key(self, **kwargs: Unpack[AddressArgType]) -> str:
         ...
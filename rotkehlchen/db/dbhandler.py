@@ -48,6 +48,7 @@ from rotkehlchen.db.cache import (
     ExtraTxArgType,
     LabeledLocationArgsType,
     LabeledLocationIdArgsType,
+    LabeledLocationSymbolArgsType,
 )
 from rotkehlchen.db.constants import (
     BINANCE_MARKETS_KEY,
@@ -157,6 +158,8 @@ log = RotkehlchenLogsAdapter(logger)
 KDF_ITER = 64000
 DBINFO_FILENAME = 'dbinfo.json'
 TRANSIENT_DB_NAME = 'rotkehlchen_transient.db'
+# Max number of read only connections per DB used for the reads of different greenlets
+DB_READ_CONNECTIONS = 4
 
 
 # Tuples that contain first the name of a table and then the columns that
@@ -486,12 +489,8 @@ class DBHandler:
                 f'Could not open database file: {fullpath}. Permission errors?',
             ) from e
 
-        password_for_sqlcipher = protect_password_sqlcipher(self.password)
-        script = f'PRAGMA key="{password_for_sqlcipher}";'
-        if self.sqlcipher_version == 3:
-            script += f'PRAGMA kdf_iter={KDF_ITER};'
         try:
-            conn.executescript(script)
+            conn.executescript(self._key_script())
             conn.execute('PRAGMA foreign_keys=ON')
             # Optimizations for the combined trades view
             # the following will fail with DatabaseError in case of wrong password.
@@ -505,8 +504,20 @@ class DBHandler:
                 'Wrong password or invalid/corrupt database for user',
             ) from e
 
+        conn.enable_read_pool(size=DB_READ_CONNECTIONS, setup_script=self._read_connection_script())  # noqa: E501
         setattr(self, conn_attribute, conn)
 
+    def _key_script(self) -> str:
+        password_for_sqlcipher = protect_password_sqlcipher(self.password)
+        script = f'PRAGMA key="{password_for_sqlcipher}";'
+        if self.sqlcipher_version == 3:
+            script += f'PRAGMA kdf_iter={KDF_ITER};'
+        return script
+
+    def _read_connection_script(self) -> str:
+        """The script that sets up the read only connections of the DB connections' pools"""
+        return self._key_script() + 'PRAGMA cache_size = -32768;'
+
     def _change_password(
             self,
             new_password: str,
@@ -541,6 +552,10 @@ class DBHandler:
         )
         if result is True:
             self.password = new_password
+            # the pooled connections were opened with the old key
+            for conn in (self.conn, self.conn_transient):
+                if conn.read_pool is not None:
+                    conn.read_pool.reset(setup_script=self._read_connection_script())
         return result
 
     def disconnect(self, conn_attribute: Literal['conn', 'conn_transient'] = 'conn') -> None:
@@ -726,6 +741,15 @@ class DBHandler:
     ) -> int | None:
         ...
 
+    @overload
+    def get_dynamic_cache(
+            self,
+            cursor: 'DBCursor',
+            name: Literal[DBCacheDynamic.LAST_TRADE_ID],
+            **kwargs: Unpack[LabeledLocationSymbolArgsType],
+    ) -> int | None:
+        ...
+
     @overload
     def get_dynamic_cache(
             self,
@@ -806,6 +830,16 @@ class DBHandler:
     ) -> None:
         ...
 
+    @overload
+    def set_dynamic_cache(
+            self,
+            write_cursor: 'DBCursor',
+            name: Literal[DBCacheDynamic.LAST_TRADE_ID],
+            value: int,
+            **kwargs: Unpack[LabeledLocationSymbolArgsType],
+    ) -> None:
+        ...
+
     @overload
     def set_dynamic_cache(
             self,
@@ -1729,6 +1763,17 @@ class DBHandler:
                 (new_name, location.serialize_for_db(), name),
             )
 
+            # and the keys of the last trade ids from which the trades of each market are queried
+            write_cursor.executemany(
+                'UPDATE OR REPLACE key_value_cache SET name=? WHERE name=?',
+                [
+                    (key.removesuffix(name) + new_name, key) for (key,) in write_cursor.execute(
+                        'SELECT name FROM key_value_cache WHERE name LIKE ? ESCAPE ?',
+                        (f'{location!s}\\_%\\_last\\_trade\\_id\\_%', '\\'),
+                    ).fetchall() if key.endswith(f'_last_trade_id_{name}')
+                ],
+            )
+
     def remove_exchange(self, write_cursor: 'DBCursor', name: str, location: Location) -> None:
         """
         Removes the exchange location from user_credentials and from
@@ -3208,6 +3253,45 @@ class DBHandler:
 
         return data
 
+    def get_xpub_derived_addresses(
+            self,
+            cursor: 'DBCursor',
+            xpub_data: XpubData,
+    ) -> dict[tuple[int, int], BTCAddress]:
+        """Get the cached addresses derived from the given xpub keyed by their account
+        and derived index"""
+        cursor.execute(
+            'SELECT account_index, derived_index, address FROM xpub_derived_addresses '
+            'WHERE xpub=? AND derivation_path=? AND blockchain=?',
+            (
+                xpub_data.xpub.xpub,
+                xpub_data.serialize_derivation_path_for_db(),
+                xpub_data.blockchain.value,
+            ),
+        )
+        return {(account_index, derived_index): address for account_index, derived_index, address in cursor}  # noqa: E501
+
+    def add_xpub_derived_addresses(
+            self,
+            write_cursor: 'DBCursor',
+            xpub_data: XpubData,
+            derived_addresses: dict[tuple[int, int], BTCAddress],
+    ) -> None:
+        """Cache the given addresses derived from the xpub keyed by their account
+        and derived index"""
+        write_cursor.executemany(
+            'INSERT OR IGNORE INTO xpub_derived_addresses(xpub, derivation_path, blockchain, '
+            'account_index, derived_index, address) VALUES(?, ?, ?, ?, ?, ?)',
+            [(
+                xpub_data.xpub.xpub,
+                xpub_data.serialize_derivation_path_for_db(),
+                xpub_data.blockchain.value,
+                account_index,
+                derived_index,
+                address,
+            ) for (account_index, derived_index), address in derived_addresses.items()],
+        )
+
     def ensure_xpub_mappings_exist(
             self,
             write_cursor: 'DBCursor',
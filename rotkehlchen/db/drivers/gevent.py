@@ -4,6 +4,7 @@ but heavily modified"""
 
 import random
 import sqlite3
+import time
 from collections.abc import Generator, Sequence
 from contextlib import contextmanager
 from enum import Enum, auto
@@ -28,6 +29,8 @@ UnderlyingCursor: TypeAlias = sqlite3.Cursor | sqlcipher.Cursor  # pylint: disab
 UnderlyingConnection: TypeAlias = sqlite3.Connection | sqlcipher.Connection  # pylint: disable=no-member
 
 CONTEXT_SWITCH_WAIT = 1  # seconds to wait for a status change in a DB context switch
+# Seconds a read waits for a free pooled connection before using the main connection instead
+MAX_READ_CONNECTION_WAIT = 0.5
 import logging
 
 logger: 'RotkehlchenLogger' = logging.getLogger(__name__)  # type: ignore
@@ -176,7 +179,7 @@ class DBConnectionType(Enum):
 CONNECTION_MAP: dict[DBConnectionType, 'DBConnection'] = {}
 
 
-def _progress_callback(connection: Optional['DBConnection']) -> int:
+def _progress_callback(connection: Optional['DBConnection | DBReadConnection']) -> int:
     """Needs to be a static function. Cannot be a connection class method
     or sqlite breaks in funny ways. Raises random Operational errors.
     """
@@ -227,6 +230,225 @@ CALLBACK_MAP = {
     DBConnectionType.GLOBAL: global_callback,
 }
 
+# The same hack for the connections of the read pools. A pooled connection is only used by
+# the greenlet that acquired it, so the progress callback gets it from the pool as the
+# connection of the current greenlet.
+READ_POOL_MAP: dict[DBConnectionType, 'DBReadConnectionPool'] = {}
+
+
+def _read_progress_callback(connection_type: DBConnectionType) -> int:
+    if (pool := READ_POOL_MAP.get(connection_type)) is None:
+        return 0
+
+    entry = pool.greenlet_connections.get(id(gevent.getcurrent()))
+    return _progress_callback(None if entry is None else entry[0])
+
+
+def user_read_callback() -> int:
+    return _read_progress_callback(DBConnectionType.USER)
+
+
+def transient_read_callback() -> int:
+    return _read_progress_callback(DBConnectionType.TRANSIENT)
+
+
+def global_read_callback() -> int:
+    return _read_progress_callback(DBConnectionType.GLOBAL)
+
+
+READ_CALLBACK_MAP = {
+    DBConnectionType.USER: user_read_callback,
+    DBConnectionType.TRANSIENT: transient_read_callback,
+    DBConnectionType.GLOBAL: global_read_callback,
+}
+
+
+def _connect(path: str | Path, connection_type: DBConnectionType) -> UnderlyingConnection:
+    if connection_type == DBConnectionType.GLOBAL:
+        return sqlite3.connect(
+            database=path,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+
+    return sqlcipher.connect(  # pylint: disable=no-member
+        database=str(path),
+        check_same_thread=False,
+        isolation_level=None,
+    )
+
+
+class DBReadConnection:
+    """A read only connection of a read connection pool"""
+
+    def __init__(
+            self,
+            conn: UnderlyingConnection,
+            connection_type: DBConnectionType,
+            generation: int,
+    ) -> None:
+        self._conn = conn
+        self.connection_type = connection_type
+        self.generation = generation
+        self.in_callback = gevent.lock.Semaphore()
+
+    def close(self) -> None:
+        with self.in_callback:
+            self._conn.close()
+
+
+class DBReadConnectionPool:
+    """Pool of read only connections to a database in WAL mode so that reads of different
+    greenlets don't wait for each other or for the writes of the main connection.
+
+    The connections are opened when needed, up to `size`. A greenlet uses the same pooled
+    connection for all its nested reads so that it never holds more than one. There can be
+    only one pool per connection type as its connections are found by type in READ_POOL_MAP.
+    """
+
+    def __init__(
+            self,
+            path: str | Path,
+            connection_type: DBConnectionType,
+            sql_vm_instructions_cb: int,
+            size: int,
+            setup_script: str,
+    ) -> None:
+        self.path = path
+        self.connection_type = connection_type
+        self.sql_vm_instructions_cb = sql_vm_instructions_cb
+        self.size = size
+        self.setup_script = setup_script
+        self.semaphore = gevent.lock.BoundedSemaphore(size)
+        self.idle: list[DBReadConnection] = []
+        # connection and read nesting depth by id of the greenlet using it
+        self.greenlet_connections: dict[int, tuple[DBReadConnection, int]] = {}
+        # connections of an older generation are closed instead of reused when released
+        self.generation = 0
+        self.closed = False
+        self.opened = 0  # connections currently open
+        self.acquisitions = 0
+        self.waits = 0  # acquisitions that had to wait for a free connection
+        self.fallbacks = 0  # acquisitions that gave up waiting and used the main connection
+        self.waiting = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        READ_POOL_MAP[connection_type] = self
+
+    def _open(self) -> DBReadConnection:
+        conn = _connect(path=self.path, connection_type=self.connection_type)
+        try:
+            conn.executescript(self.setup_script)
+            conn.execute('PRAGMA query_only=ON')
+        except Exception:
+            conn.close()
+            raise
+
+        reader = DBReadConnection(
+            conn=conn,
+            connection_type=self.connection_type,
+            generation=self.generation,
+        )
+        conn.set_progress_handler(
+            READ_CALLBACK_MAP.get(self.connection_type),
+            self.sql_vm_instructions_cb,
+        )
+        self.opened += 1
+        return reader
+
+    def _close(self, reader: DBReadConnection) -> None:
+        reader.close()
+        self.opened -= 1
+
+    def acquire(self) -> DBReadConnection | None:
+        """Get a free connection, opening one if needed. Returns None if none got free
+        within MAX_READ_CONNECTION_WAIT, in which case the main connection should be used."""
+        start = time.monotonic()
+        if self.semaphore.locked():
+            self.waits += 1
+            self.waiting += 1
+            try:
+                acquired = self.semaphore.acquire(timeout=MAX_READ_CONNECTION_WAIT)
+            finally:
+                self.waiting -= 1
+            waited = time.monotonic() - start
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+            if acquired is False:
+                self.fallbacks += 1
+                return None
+        else:
+            self.semaphore.acquire()
+
+        self.acquisitions += 1
+        if len(self.idle) != 0:
+            return self.idle.pop()
+
+        try:
+            return self._open()
+        except Exception:
+            self.semaphore.release()
+            raise
+
+    def release(self, reader: DBReadConnection) -> None:
+        if self.closed or reader.generation != self.generation:
+            self._close(reader)
+        else:
+            self.idle.append(reader)
+        self.semaphore.release()
+
+    @contextmanager
+    def connection(self) -> Generator[DBReadConnection | None, None, None]:
+        """Give the connection of the current greenlet, acquiring one if it has none"""
+        greenlet_id = id(gevent.getcurrent())
+        if (entry := self.greenlet_connections.get(greenlet_id)) is not None:
+            reader, depth = entry
+            self.greenlet_connections[greenlet_id] = (reader, depth + 1)
+        elif (acquired := self.acquire()) is None:
+            yield None
+            return
+        else:
+            reader = acquired
+            self.greenlet_connections[greenlet_id] = (reader, 1)
+
+        try:
+            yield reader
+        finally:
+            reader, depth = self.greenlet_connections[greenlet_id]
+            if depth == 1:
+                del self.greenlet_connections[greenlet_id]
+                self.release(reader)
+            else:
+                self.greenlet_connections[greenlet_id] = (reader, depth - 1)
+
+    def reset(self, setup_script: str | None = None) -> None:
+        """Close all the connections so that new ones are opened, optionally with a new setup
+        script. Connections in use are closed when released. Needed when the key changes."""
+        if setup_script is not None:
+            self.setup_script = setup_script
+        self.generation += 1
+        while len(self.idle) != 0:
+            self._close(self.idle.pop())
+
+    def close(self) -> None:
+        self.closed = True
+        self.reset()
+        if READ_POOL_MAP.get(self.connection_type) is self:
+            READ_POOL_MAP.pop(self.connection_type)
+
+    def serialize(self) -> dict[str, Any]:
+        return {
+            'size': self.size,
+            'open': self.opened,
+            'in_use': self.size - self.semaphore.counter,
+            'waiting': self.waiting,
+            'acquisitions': self.acquisitions,
+            'waits': self.waits,
+            'fallbacks': self.fallbacks,
+            'total_wait': round(self.total_wait, 3),
+            'max_wait': round(self.max_wait, 3),
+        }
+
 
 class DBConnection:
 
@@ -253,18 +475,9 @@ class DBConnection:
         # https://www.gevent.org/api/gevent.greenlet.html#gevent.Greenlet.minimal_ident
         self.savepoint_greenlet_id: str | None = None
         self.write_greenlet_id: str | None = None
-        if connection_type == DBConnectionType.GLOBAL:
-            self._conn = sqlite3.connect(
-                database=path,
-                check_same_thread=False,
-                isolation_level=None,
-            )
-        else:
-            self._conn = sqlcipher.connect(  # pylint: disable=no-member
-                database=str(path),
-                check_same_thread=False,
-                isolation_level=None,
-            )
+        self.path = path
+        self.read_pool: DBReadConnectionPool | None = None
+        self._conn = _connect(path=path, connection_type=connection_type)
         self._set_progress_handler()
         self.minimized_schema = None
         if connection_type == DBConnectionType.USER:
@@ -323,16 +536,52 @@ class DBConnection:
         return DBCursor(connection=self, cursor=self._conn.cursor())
 
     def close(self) -> None:
+        if self.read_pool is not None:
+            self.read_pool.close()
+            self.read_pool = None
         self._conn.close()
         CONNECTION_MAP.pop(self.connection_type, None)
 
+    def enable_read_pool(self, size: int, setup_script: str) -> None:
+        """Make reads use a pool of up to `size` read only connections. The database
+        must be in WAL mode. `setup_script` is run by each new connection, e.g. to set the key."""
+        self.read_pool = DBReadConnectionPool(
+            path=self.path,
+            connection_type=self.connection_type,
+            sql_vm_instructions_cb=self.sql_vm_instructions_cb,
+            size=size,
+            setup_script=setup_script,
+        )
+
     @contextmanager
     def read_ctx(self) -> Generator['DBCursor', None, None]:
-        cursor = self.cursor()
-        try:
-            yield cursor
-        finally:
-            cursor.close()
+        """Opens a cursor for reading. If there is a read pool the cursor is of a pooled
+        connection, unless the current greenlet has an open write transaction or savepoint
+        in which case it needs to read from the main connection to see its own writes.
+
+        A cursor of a pooled connection does not see the uncommitted writes of a write
+        transaction or savepoint that its greenlet opens while the cursor is open. Reads that
+        need to see them have to use the write cursor or a read_ctx opened inside the write."""
+        if self.read_pool is None or get_greenlet_name(gevent.getcurrent()) in (
+            self.write_greenlet_id,
+            self.savepoint_greenlet_id,
+        ):
+            cursor = self.cursor()
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+            return
+
+        with self.read_pool.connection() as reader:
+            cursor = self.cursor() if reader is None else DBCursor(
+                connection=self,
+                cursor=reader._conn.cursor(),
+            )
+            try:
+                yield cursor
+            finally:
+                cursor.close()
 
     @contextmanager
     def write_ctx(self, commit_ts: bool = False) -> Generator['DBCursor', None, None]:
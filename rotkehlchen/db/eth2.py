@@ -1,5 +1,7 @@
 import logging
-from typing import TYPE_CHECKING, Literal
+from collections import defaultdict
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Final, Literal
 
 from pysqlcipher3 import dbapi2 as sqlcipher
 
@@ -7,21 +9,18 @@ from rotkehlchen.chain.ethereum.modules.eth2.structures import (
     ValidatorDailyStats,
     ValidatorDetails,
     ValidatorDetailsWithStatus,
+    ValidatorProfitType,
 )
 from rotkehlchen.chain.ethereum.modules.eth2.utils import form_withdrawal_notes
 from rotkehlchen.constants import ONE, ZERO
 from rotkehlchen.constants.timing import DAY_IN_SECONDS, HOUR_IN_SECONDS
-from rotkehlchen.db.filtering import (
-    ETH_STAKING_EVENT_JOIN,
-    EthStakingEventFilterQuery,
-    EthWithdrawalFilterQuery,
-)
 from rotkehlchen.errors.misc import InputError
 from rotkehlchen.fval import FVal
 from rotkehlchen.history.events.structures.base import HistoryBaseEntryType
+from rotkehlchen.history.events.structures.types import HistoryEventSubType, HistoryEventType
 from rotkehlchen.logging import RotkehlchenLogsAdapter
-from rotkehlchen.types import ChecksumEvmAddress, Eth2PubKey, Timestamp
-from rotkehlchen.utils.misc import ts_ms_to_sec
+from rotkehlchen.types import ChecksumEvmAddress, Eth2PubKey, Timestamp, TimestampMS
+from rotkehlchen.utils.misc import ts_ms_to_sec, ts_sec_to_ms
 
 if TYPE_CHECKING:
     from rotkehlchen.db.dbhandler import DBHandler
@@ -31,6 +30,26 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
+# The staking events that count in the profit of the validators. Partial withdrawals and
+# exits are withdrawal events and execution layer rewards are block production/mev events
+VALIDATOR_PROFIT_EVENTS_JOIN: Final = (
+    'FROM history_events H INNER JOIN eth_staking_events_info S ON H.identifier=S.identifier '
+    'WHERE H.type=? AND ((H.entry_type=? AND H.subtype=?) OR '
+    '(H.entry_type=? AND H.subtype IN (?, ?)))'
+)
+VALIDATOR_PROFIT_ENTRY_TYPES: Final = (
+    HistoryBaseEntryType.ETH_WITHDRAWAL_EVENT,
+    HistoryBaseEntryType.ETH_BLOCK_EVENT,
+)
+VALIDATOR_PROFIT_EVENTS_BINDINGS: Final = (
+    HistoryEventType.STAKING.serialize(),
+    HistoryBaseEntryType.ETH_WITHDRAWAL_EVENT.value,
+    HistoryEventSubType.REMOVE_ASSET.serialize(),
+    HistoryBaseEntryType.ETH_BLOCK_EVENT.value,
+    HistoryEventSubType.BLOCK_PRODUCTION.serialize(),
+    HistoryEventSubType.MEV_REWARD.serialize(),
+)
+
 
 class DBEth2:
 
@@ -252,6 +271,8 @@ class DBEth2:
                 'UPDATE history_events SET notes=? WHERE identifier=?',
                 (form_withdrawal_notes(is_exit=True, validator_index=index, amount=latest_result[2]), latest_result[0]),  # noqa: E501
             )
+            # the withdrawal now counts as an exit in the daily performance
+            self.refresh_daily_performance(write_cursor, from_ts=ts_ms_to_sec(latest_result[1]))
 
     def add_or_update_validators_except_ownership(
             self,
@@ -346,47 +367,177 @@ class DBEth2:
                 f'({",".join(question_marks)})) AND entry_type != ?',
                 (*validator_indices, HistoryBaseEntryType.ETH_DEPOSIT_EVENT.serialize_for_db()),
             )
+            self.update_daily_performance(cursor)
 
     @staticmethod
-    def _validator_stats_process_queries(
+    def _query_validator_profit_events(
             cursor: 'DBCursor',
-            amount_querystr: str,
-            filter_query: EthStakingEventFilterQuery,
-    ) -> dict[int, FVal]:
-        """Execute DB query and extract numerical value per validator after using filter_query
+            from_ms: TimestampMS,
+            to_ms: TimestampMS | None = None,
+            validator_indices: set[int] | None = None,
+    ) -> list[tuple[int, Timestamp, ValidatorProfitType, str, FVal, int]]:
+        """Query the staking events that count in the profit of the validators from from_ms
+        until to_ms (inclusive) ordered by timestamp, optionally only of the given validators.
+
+        Returns a list of validator index, day, profit type, recipient, amount and identifier
+        of each event. The amount of exits is their profit over the 32 ETH deposit.
+        """
+        querystr = (
+            'SELECT S.validator_index, H.timestamp, H.entry_type, S.is_exit_or_blocknumber, '
+            f'H.location_label, H.amount, H.identifier {VALIDATOR_PROFIT_EVENTS_JOIN} '
+            'AND H.timestamp >= ?'
+        )
+        bindings: list[str | int] = [*VALIDATOR_PROFIT_EVENTS_BINDINGS, from_ms]
+        if to_ms is not None:
+            querystr += ' AND H.timestamp <= ?'
+            bindings.append(to_ms)
+        if validator_indices is not None:
+            querystr += f' AND S.validator_index IN ({",".join(["?"] * len(validator_indices))})'
+            bindings.extend(validator_indices)
 
-        Return a dict of validator index to sum of amounts per validator in the filter
+        events = []
+        for validator_index, timestamp, entry_type, is_exit_or_blocknumber, location_label, amount, identifier in cursor.execute(querystr + ' ORDER BY H.timestamp', bindings).fetchall():  # noqa: E501
+            if entry_type == HistoryBaseEntryType.ETH_BLOCK_EVENT.value:
+                profit_type, recipient, profit = ValidatorProfitType.EXECUTION, location_label, FVal(amount)  # noqa: E501
+            elif is_exit_or_blocknumber == 1:
+                profit_type, recipient, profit = ValidatorProfitType.EXITS, '', FVal(amount) - 32
+            else:
+                profit_type, recipient, profit = ValidatorProfitType.WITHDRAWALS, '', FVal(amount)
+
+            day = Timestamp(ts_ms_to_sec(timestamp) // DAY_IN_SECONDS * DAY_IN_SECONDS)
+            events.append((validator_index, day, profit_type, recipient, profit, identifier))
+
+        return events
+
+    @staticmethod
+    def _get_cumulative_profit(
+            cursor: 'DBCursor',
+            before_ts: Timestamp,
+            validator_indices: set[int] | None = None,
+    ) -> dict[tuple[int, ValidatorProfitType, str], FVal]:
+        """Get the cumulative profit of each validator, profit type and recipient
+        from the daily performance of the days before before_ts, optionally only of
+        the given validators"""
+        querystr = 'FROM eth2_daily_performance WHERE timestamp < ?'
+        bindings: list[int] = [before_ts]
+        if validator_indices is not None:
+            querystr += f' AND validator_index IN ({",".join(["?"] * len(validator_indices))})'
+            bindings.extend(validator_indices)
+        cursor.execute(  # sqlite takes the bare columns from the row of the MAX
+            'SELECT validator_index, type, recipient, MAX(timestamp), cumulative_amount '
+            f'{querystr} GROUP BY validator_index, type, recipient',
+            bindings,
+        )
+        return {
+            (validator_index, ValidatorProfitType.deserialize_from_db(profit_type), recipient): FVal(amount)  # noqa: E501
+            for validator_index, profit_type, recipient, _, amount in cursor
+        }
+
+    def refresh_daily_performance(self, write_cursor: 'DBCursor', from_ts: Timestamp) -> None:
+        """Recalculate the daily cumulative profit of all validators from the day of
+        from_ts onwards using the staking events"""
+        from_day = Timestamp(from_ts // DAY_IN_SECONDS * DAY_IN_SECONDS)
+        cumulative_profit = self._get_cumulative_profit(write_cursor, before_ts=from_day)
+        days: dict[tuple[int, ValidatorProfitType, str, Timestamp], tuple[FVal, int, int]] = {}
+        for validator_index, day, profit_type, recipient, amount, identifier in self._query_validator_profit_events(  # noqa: E501
+                cursor=write_cursor,
+                from_ms=ts_sec_to_ms(from_day),
+        ):
+            key = (validator_index, profit_type, recipient)
+            cumulative_profit[key] = cumulative_profit.get(key, ZERO) + amount
+            _, events_num, last_identifier = days.get((*key, day), (ZERO, 0, 0))
+            days[(*key, day)] = (cumulative_profit[key], events_num + 1, max(last_identifier, identifier))  # noqa: E501
+
+        write_cursor.execute('DELETE FROM eth2_daily_performance WHERE timestamp >= ?', (from_day,))  # noqa: E501
+        write_cursor.executemany(
+            'INSERT INTO eth2_daily_performance(validator_index, type, recipient, timestamp, '
+            'cumulative_amount, events, last_identifier) VALUES(?, ?, ?, ?, ?, ?, ?)',
+            [
+                (validator_index, profit_type.serialize_for_db(), recipient, day, str(amount), events_num, last_identifier)  # noqa: E501
+                for (validator_index, profit_type, recipient, day), (amount, events_num, last_identifier) in days.items()  # noqa: E501
+            ],
+        )
+        log.debug(f'Refreshed the daily performance of validators from {from_day} with {len(days)} days')  # noqa: E501
+
+    def update_daily_performance(self, write_cursor: 'DBCursor') -> None:
+        """Bring the daily cumulative profit of the validators up to date with the staking
+        events so that the profit in any period can be read from it.
+
+        Only the days from the earliest event added since the last update onwards are
+        recalculated. If events that were already accounted for got deleted everything is
+        recalculated. Edits of accounted events need to take care of the affected days.
         """
-        base_query = f'SELECT validator_index, {amount_querystr} ' + ETH_STAKING_EVENT_JOIN
-        query, bindings = filter_query.prepare(with_pagination=False, with_order=False)
-        cursor.execute(base_query + query + ' GROUP BY eth_staking_events_info.validator_index', bindings)  # noqa: E501
+        last_identifier, events_num = write_cursor.execute(
+            'SELECT MAX(last_identifier), SUM(events) FROM eth2_daily_performance',
+        ).fetchone()
+        if last_identifier is None:
+            last_identifier, events_num = 0, 0
+
+        write_cursor.execute(
+            f'SELECT COUNT(*) {VALIDATOR_PROFIT_EVENTS_JOIN} AND H.identifier <= ?',
+            (*VALIDATOR_PROFIT_EVENTS_BINDINGS, last_identifier),
+        )
+        if write_cursor.fetchone()[0] != events_num:
+            from_ts = Timestamp(0)  # accounted events got deleted
+        else:
+            write_cursor.execute(
+                f'SELECT MIN(H.timestamp) {VALIDATOR_PROFIT_EVENTS_JOIN} AND H.identifier > ?',
+                (*VALIDATOR_PROFIT_EVENTS_BINDINGS, last_identifier),
+            )
+            if (earliest_new_ts := write_cursor.fetchone()[0]) is None:
+                return  # already up to date
+
+            from_ts = ts_ms_to_sec(earliest_new_ts)
 
-        return {entry[0]: FVal(entry[1]) for entry in cursor}
+        self.refresh_daily_performance(write_cursor, from_ts=from_ts)
 
     def get_validators_profit(
             self,
             cursor: 'DBCursor',
-            withdrawals_filter_query: EthWithdrawalFilterQuery,
-            exits_filter_query: EthWithdrawalFilterQuery,
-            execution_filter_query: EthStakingEventFilterQuery,
+            from_ts: Timestamp,
+            to_ts: Timestamp,
+            validator_indices: set[int] | None,
+            tracked_addresses: Sequence[ChecksumEvmAddress],
     ) -> tuple[dict[int, FVal], dict[int, FVal], dict[int, FVal]]:
-        """Query withdrawals, exits, EL rewards amounts for the given filter.
+        """Query withdrawals, exits, EL rewards amounts in the given period optionally
+        only for the given validators. EL rewards only count if they went to a tracked
+        address, since otherwise they went to a block builder.
+
+        The whole days of the period are read from the daily performance, which is updated
+        when staking events are written, and the partial days at the edges of the period
+        from the events.
 
         Returns each of the different amount sums for the period per validator
         """
-        withdrawals_amounts = self._validator_stats_process_queries(
-            cursor=cursor,
-            amount_querystr='SUM(CAST(amount AS REAL))',
-            filter_query=withdrawals_filter_query,
-        )
-        exits_pnl = self._validator_stats_process_queries(
-            cursor=cursor,
-            amount_querystr='CAST(amount AS REAL) - 32',
-            filter_query=exits_filter_query,
-        )
-        execution_rewards_amounts = self._validator_stats_process_queries(
-            cursor=cursor,
-            amount_querystr='SUM(CAST(amount AS REAL))',
-            filter_query=execution_filter_query,
+        first_day = Timestamp(-(-from_ts // DAY_IN_SECONDS) * DAY_IN_SECONDS)
+        end_day = Timestamp(to_ts // DAY_IN_SECONDS * DAY_IN_SECONDS)
+        profits: defaultdict[tuple[int, ValidatorProfitType, str], FVal] = defaultdict(FVal)
+        edges = [(ts_sec_to_ms(from_ts), ts_sec_to_ms(to_ts))]
+        if first_day < end_day:
+            for key, amount in self._get_cumulative_profit(cursor, before_ts=end_day, validator_indices=validator_indices).items():  # noqa: E501
+                profits[key] += amount
+            for key, amount in self._get_cumulative_profit(cursor, before_ts=first_day, validator_indices=validator_indices).items():  # noqa: E501
+                profits[key] -= amount
+
+            edges = [
+                (ts_sec_to_ms(from_ts), TimestampMS(ts_sec_to_ms(first_day) - 1)),
+                (ts_sec_to_ms(end_day), ts_sec_to_ms(to_ts)),
+            ]
+
+        for from_ms, to_ms in edges:
+            for validator_index, _, profit_type, recipient, amount, _ in self._query_validator_profit_events(cursor, from_ms=from_ms, to_ms=to_ms, validator_indices=validator_indices):  # noqa: E501
+                profits[(validator_index, profit_type, recipient)] += amount
+
+        tracked = set(tracked_addresses)
+        result: dict[ValidatorProfitType, dict[int, FVal]] = {x: {} for x in ValidatorProfitType}
+        for (validator_index, profit_type, recipient), amount in profits.items():
+            if profit_type == ValidatorProfitType.EXECUTION and recipient not in tracked:
+                continue
+
+            result[profit_type][validator_index] = result[profit_type].get(validator_index, ZERO) + amount  # noqa: E501
+
+        return (
+            result[ValidatorProfitType.WITHDRAWALS],
+            result[ValidatorProfitType.EXITS],
+            result[ValidatorProfitType.EXECUTION],
         )
-        return withdrawals_amounts, exits_pnl, execution_rewards_amounts
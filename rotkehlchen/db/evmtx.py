@@ -1,5 +1,6 @@
 import logging
-from typing import TYPE_CHECKING, Any, get_args
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any, Final, get_args
 
 from pysqlcipher3 import dbapi2 as sqlcipher
 
@@ -37,6 +38,7 @@ from rotkehlchen.types import (
     deserialize_evm_tx_hash,
 )
 from rotkehlchen.utils.hexbytes import hexstring_to_bytes
+from rotkehlchen.utils.misc import get_chunks
 
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
@@ -47,6 +49,8 @@ if TYPE_CHECKING:
 
 from rotkehlchen.constants.limits import FREE_ETH_TX_LIMIT
 
+# Keeps the number of bound variables of the IN queries well below the sqlite limit
+TX_IDS_QUERY_CHUNK_SIZE: Final = 500
 TRANSACTIONS_MISSING_DECODING_QUERY = (
     'evmtx_receipts AS A LEFT OUTER JOIN evm_tx_mappings AS B ON A.tx_id=B.tx_id '
     'LEFT JOIN evm_transactions AS C on A.tx_id=C.identifier '
@@ -354,10 +358,10 @@ class DBEvmTx:
             status = 1
 
         contract_address = deserialize_evm_address(data['contractAddress']) if data['contractAddress'] else None  # noqa: E501
-        tx_id = write_cursor.execute(
-            'SELECT identifier from evm_transactions WHERE tx_hash=? AND chain_id=?',
+        tx_id, block_number = write_cursor.execute(
+            'SELECT identifier, block_number from evm_transactions WHERE tx_hash=? AND chain_id=?',
             (tx_hash_b, serialized_chain_id),
-        ).fetchone()[0]
+        ).fetchone()
 
         try:
             write_cursor.execute(
@@ -371,7 +375,9 @@ class DBEvmTx:
                 raise
             return  # otherwise something else added the receipt so we continue
 
+        index_tuples = []
         for log_entry in data['logs']:
+            log_address = deserialize_evm_address(log_entry['address'])
             write_cursor.execute(
                 'INSERT INTO evmtx_receipt_logs (tx_id, log_index, data, address, removed) '
                 'VALUES(? ,? ,? ,? ,?)',
@@ -379,11 +385,18 @@ class DBEvmTx:
                     tx_id,
                     log_entry['logIndex'],
                     hexstring_to_bytes(log_entry['data']),
-                    deserialize_evm_address(log_entry['address']),
+                    log_address,
                     int(log_entry['removed']),
                 ),
             )
             log_id = write_cursor.lastrowid
+            index_tuples.append((
+                log_id,
+                serialized_chain_id,
+                log_address,
+                hexstring_to_bytes(log_entry['topics'][0]) if len(log_entry['topics']) != 0 else None,  # noqa: E501
+                block_number,
+            ))
             topic_tuples = []
             for idx, topic in enumerate(log_entry['topics']):
                 topic_tuples.append((
@@ -398,6 +411,13 @@ class DBEvmTx:
                     topic_tuples,
                 )
 
+        if len(index_tuples) != 0:
+            write_cursor.executemany(
+                'INSERT INTO evmtx_receipt_log_index (log, chain_id, address, topic0, block_number) '  # noqa: E501
+                'VALUES(?, ?, ?, ?, ?)',
+                index_tuples,
+            )
+
     def get_receipt(
             self,
             cursor: 'DBCursor',
@@ -449,6 +469,186 @@ class DBEvmTx:
 
         return tx_receipt
 
+    def iter_logs(
+            self,
+            cursor: 'DBCursor',
+            chain_id: ChainID,
+            address: ChecksumEvmAddress | None = None,
+            topic0: bytes | None = None,
+            block_range: tuple[int, int] | None = None,
+    ) -> Iterator[tuple[EVMTxHash, int, EvmTxReceiptLog]]:
+        """Iterate over the logs of the saved receipts of the given chain that were emitted
+        by the given address and have the given first topic within the given inclusive
+        block range. Any filter that is None is not applied.
+
+        The logs are looked up in the receipt log index and read in pages, ordered by block.
+        Each one is returned along with the hash and the block number of its transaction.
+        Each page is fully read before its logs are returned so the cursor can be used
+        by the caller in between.
+        """
+        filters = ['I.chain_id=?']
+        bindings: list[int | str | bytes] = [chain_id.serialize_for_db()]
+        if address is not None:
+            filters.append('I.address=?')
+            bindings.append(address)
+        if topic0 is not None:
+            filters.append('I.topic0=?')
+            bindings.append(topic0)
+        if block_range is not None:
+            filters.append('I.block_number BETWEEN ? AND ?')
+            bindings.extend(block_range)
+
+        query = (
+            'SELECT I.log, I.block_number, T.tx_hash, L.log_index, L.data, L.address, L.removed '
+            'FROM evmtx_receipt_log_index AS I '
+            'INNER JOIN evmtx_receipt_logs AS L ON I.log=L.identifier '
+            'INNER JOIN evm_transactions AS T ON L.tx_id=T.identifier '
+            f'WHERE {" AND ".join(filters)} '
+        )
+        last_position: tuple[int, int] | None = None  # (block_number, log) of the last log
+        while True:
+            if last_position is None:
+                page = cursor.execute(
+                    query + 'ORDER BY I.block_number, I.log LIMIT ?',
+                    (*bindings, TX_IDS_QUERY_CHUNK_SIZE),
+                ).fetchall()
+            else:
+                page = cursor.execute(
+                    query + 'AND (I.block_number, I.log) > (?, ?) '
+                    'ORDER BY I.block_number, I.log LIMIT ?',
+                    (*bindings, *last_position, TX_IDS_QUERY_CHUNK_SIZE),
+                ).fetchall()
+            if len(page) == 0:
+                return
+
+            log_id_to_log = {}
+            for log_id, _, _, log_index, data, log_address, removed in page:
+                log_id_to_log[log_id] = EvmTxReceiptLog(
+                    log_index=log_index,
+                    data=data,
+                    address=log_address,
+                    removed=bool(removed),  # works since value is either 0 or 1
+                )
+
+            cursor.execute(
+                f'SELECT log, topic FROM evmtx_receipt_log_topics WHERE log IN '
+                f'({",".join("?" * len(log_id_to_log))}) ORDER BY log, topic_index ASC',
+                list(log_id_to_log),
+            )
+            for log_id, topic in cursor.fetchall():
+                log_id_to_log[log_id].topics.append(topic)
+
+            for log_id, block_number, tx_hash, *_ in page:
+                yield deserialize_evm_tx_hash(tx_hash), block_number, log_id_to_log[log_id]
+
+            if len(page) < TX_IDS_QUERY_CHUNK_SIZE:
+                return
+            last_position = (page[-1][1], page[-1][0])
+
+    def get_transactions_and_receipts_not_decoded(
+            self,
+            cursor: 'DBCursor',
+            chain_id: ChainID,
+            limit: int,
+    ) -> tuple[list[EVMTxHash], dict[EVMTxHash, tuple[EvmTransaction, EvmTxReceipt]]]:
+        """Get up to `limit` transactions of the given chain that have not been decoded
+        along with their receipts, using a fixed number of queries instead of a few
+        queries per transaction as `get_receipt` does.
+
+        Returns the hashes of the transactions in the same order as
+        `get_transaction_hashes_not_decoded` and a mapping of hash to transaction and
+        receipt. Transactions whose data in the DB is not complete enough to be decoded
+        are not in the mapping and should be retrieved using the transactions module.
+        """
+        query, bindings = TransactionsNotDecodedFilterQuery.make(
+            limit=limit,
+            chain_id=chain_id,
+        ).prepare()
+        tx_ids = [x[0] for x in cursor.execute(
+            'SELECT A.tx_id from ' + TRANSACTIONS_MISSING_DECODING_QUERY + query,
+            bindings,
+        )]
+        if len(tx_ids) == 0:
+            return [], {}
+
+        id_to_tx: dict[int, EvmTransaction] = {}
+        id_to_receipt: dict[int, EvmTxReceipt] = {}
+        log_id_to_log: dict[int, EvmTxReceiptLog] = {}
+        for chunk in get_chunks(tx_ids, n=TX_IDS_QUERY_CHUNK_SIZE):
+            placeholders = ','.join('?' * len(chunk))
+            querystr, query_bindings = self._form_evm_transaction_dbquery(
+                query=f'WHERE evm_transactions.identifier IN ({placeholders})',
+                bindings=list(chunk),
+                has_premium=True,
+            )
+            for result in cursor.execute(querystr, query_bindings):
+                if self._tx_data_is_complete(result) is False:
+                    continue
+
+                try:
+                    tx = self._build_evm_transaction(result)
+                except DeserializationError as e:
+                    log.error(f'Failed to deserialize evm transaction {result[0]} from the DB due to {e!s}')  # noqa: E501
+                    continue
+
+                id_to_tx[tx.db_id] = tx
+
+            cursor.execute(
+                f'SELECT tx_id, contract_address, status, type FROM evmtx_receipts '
+                f'WHERE tx_id IN ({placeholders})',
+                chunk,
+            )
+            for tx_id, contract_address, status, tx_type in cursor:
+                if (receipt_tx := id_to_tx.get(tx_id)) is None:
+                    continue
+
+                id_to_receipt[tx_id] = EvmTxReceipt(
+                    tx_hash=receipt_tx.tx_hash,
+                    chain_id=chain_id,
+                    contract_address=contract_address,
+                    status=bool(status),  # works since value is either 0 or 1
+                    tx_type=tx_type,
+                )
+
+            cursor.execute(
+                f'SELECT identifier, tx_id, log_index, data, address, removed FROM '
+                f'evmtx_receipt_logs WHERE tx_id IN ({placeholders}) ORDER BY tx_id, log_index',
+                chunk,
+            )
+            for log_id, tx_id, log_index, data, address, removed in cursor:
+                if (receipt := id_to_receipt.get(tx_id)) is None:
+                    continue
+
+                log_id_to_log[log_id] = EvmTxReceiptLog(
+                    log_index=log_index,
+                    data=data,
+                    address=address,
+                    removed=bool(removed),  # works since value is either 0 or 1
+                )
+                receipt.logs.append(log_id_to_log[log_id])
+
+        for chunk in get_chunks(list(log_id_to_log), n=TX_IDS_QUERY_CHUNK_SIZE):
+            cursor.execute(
+                f'SELECT log, topic FROM evmtx_receipt_log_topics WHERE log IN '
+                f'({",".join("?" * len(chunk))}) ORDER BY log, topic_index ASC',
+                chunk,
+            )
+            for log_id, topic in cursor:
+                log_id_to_log[log_id].topics.append(topic)
+
+        tx_hashes, transactions = [], {}
+        for tx_id in tx_ids:
+            if (db_tx := id_to_tx.get(tx_id)) is not None:
+                tx_hashes.append(db_tx.tx_hash)
+                transactions[db_tx.tx_hash] = (db_tx, id_to_receipt[tx_id])
+            else:  # no complete data in the DB. Let the caller query it by hash
+                result = cursor.execute(
+                    'SELECT tx_hash FROM evm_transactions WHERE identifier=?', (tx_id,),
+                ).fetchone()
+                tx_hashes.append(deserialize_evm_tx_hash(result[0]))
+
+        return tx_hashes, transactions
+
     def delete_transactions(
             self,
             write_cursor: 'DBCursor',
@@ -641,6 +841,11 @@ class DBEvmTx:
             [FREE_ETH_TX_LIMIT] + bindings,
         )
 
+    def _tx_data_is_complete(self, result: tuple[Any, ...]) -> bool:  # pylint: disable=unused-argument
+        """Check if a row returned by the `_form_evm_transaction_dbquery` query has all
+        the data needed to build the transaction without querying a remote"""
+        return True
+
     def _build_evm_transaction(self, result: tuple[Any, ...]) -> EvmTransaction:
         """Build a transaction object from queried data
 
@@ -5,7 +5,7 @@ from dataclasses import dataclass, field
 from enum import Enum, auto
 from typing import Any, Generic, Literal, NamedTuple, TypeVar
 
-from rotkehlchen.accounting.types import SchemaEventType
+from rotkehlchen.accounting.mixins.event import AccountingEventType
 from rotkehlchen.api.v1.types import IncludeExcludeFilterData
 from rotkehlchen.assets.asset import Asset
 from rotkehlchen.assets.types import AssetType
@@ -75,7 +75,7 @@ class DBFilterOrder(NamedTuple):
         for idx, (attribute, ascending) in enumerate(self.rules):
             if idx != 0:
                 querystr += ','
-            if attribute in {'amount', 'fee', 'rate', 'last_price', 'last_price_asset', 'manual_price'}:  # noqa: E501
+            if attribute in {'amount', 'fee', 'rate', 'last_price', 'last_price_asset', 'manual_price', 'free_amount', 'taxable_amount', 'pnl_taxable', 'pnl_free'}:  # noqa: E501
                 order_by = f'CAST({attribute} AS REAL)'
             else:
                 order_by = attribute
@@ -255,22 +255,10 @@ class DBReportDataReportIDFilter(DBFilter):
 
 @dataclass(init=True, repr=True, eq=True, order=False, unsafe_hash=False, frozen=False)
 class DBReportDataEventTypeFilter(DBFilter):
-    event_type: str | SchemaEventType | None = None
+    event_type: AccountingEventType
 
     def prepare(self) -> tuple[list[str], list[Any]]:
-        if self.event_type is None:
-            return [], []
-
-        if isinstance(self.event_type, str):
-            try:
-                value = SchemaEventType.deserialize_from_db(self.event_type)
-            except DeserializationError as e:
-                log.error(f'Failed to filter a DB transaction query by event_type: {e!s}')
-                return [], []
-        else:
-            value = self.event_type
-
-        return ['event_type=?'], [str(value)]
+        return ['type=?'], [self.event_type.serialize()]
 
 
 @dataclass(init=True, repr=True, eq=True, order=False, unsafe_hash=False, frozen=False)
@@ -818,12 +806,6 @@ class ReportDataFilterQuery(DBFilterQuery, FilterWithTimestamp):
             return self.filters[0]
         return None
 
-    @property
-    def event_type_filter(self) -> DBReportDataEventTypeFilter | None:
-        if len(self.filters) >= 2 and isinstance(self.filters[1], DBReportDataEventTypeFilter):
-            return self.filters[1]
-        return None
-
     @property
     def report_id(self) -> str | int | None:
         report_id_filter = self.report_id_filter
@@ -831,13 +813,6 @@ class ReportDataFilterQuery(DBFilterQuery, FilterWithTimestamp):
             return None
         return report_id_filter.report_id
 
-    @property
-    def event_type(self) -> str | SchemaEventType | None:
-        event_type_filter = self.event_type_filter
-        if event_type_filter is None:
-            return None
-        return event_type_filter.event_type
-
     @classmethod
     def make(
             cls: type['ReportDataFilterQuery'],
@@ -846,7 +821,8 @@ class ReportDataFilterQuery(DBFilterQuery, FilterWithTimestamp):
             limit: int | None = None,
             offset: int | None = None,
             report_id: int | None = None,
-            event_type: str | None = None,
+            event_type: AccountingEventType | None = None,
+            asset: Asset | None = None,
             from_ts: Timestamp | None = None,
             to_ts: Timestamp | None = None,
     ) -> 'ReportDataFilterQuery':
@@ -864,6 +840,8 @@ class ReportDataFilterQuery(DBFilterQuery, FilterWithTimestamp):
             filters.append(DBReportDataReportIDFilter(and_op=True, report_id=report_id))
         if event_type is not None:
             filters.append(DBReportDataEventTypeFilter(and_op=True, event_type=event_type))
+        if asset is not None:
+            filters.append(DBAssetFilter(and_op=True, asset=asset, asset_key='asset'))
 
         filter_query.timestamp_filter = DBTimestampFilter(
             and_op=True,
@@ -1895,7 +1873,7 @@ class TransactionsNotDecodedFilterQuery(DBFilterQuery):
         filter_query = cls.create(
             and_op=True,
             limit=limit,
-            offset=None,
+            offset=None if limit is None else 0,  # pagination is only applied with an offset
             order_by_rules=None,
         )
         filters: list[DBFilter] = []
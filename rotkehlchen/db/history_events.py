@@ -1,8 +1,8 @@
 import copy
 import json
 import logging
-from collections.abc import Sequence
-from typing import TYPE_CHECKING, Any, Literal, Optional, overload
+from collections.abc import Iterator, Sequence
+from typing import TYPE_CHECKING, Any, Final, Literal, Optional, overload
 
 from pysqlcipher3 import dbapi2 as sqlcipher
 
@@ -20,12 +20,14 @@ from rotkehlchen.db.constants import (
     HISTORY_MAPPING_STATE_CUSTOMIZED,
     HISTORY_MAPPING_STATE_DECODED,
 )
+from rotkehlchen.db.eth2 import VALIDATOR_PROFIT_ENTRY_TYPES, DBEth2
 from rotkehlchen.db.filtering import (
     ALL_EVENTS_DATA_JOIN,
     EVM_EVENT_JOIN,
     DBEqualsFilter,
     DBIgnoredAssetsFilter,
     DBIgnoreValuesFilter,
+    DBMultiIntegerFilter,
     EthDepositEventFilterQuery,
     EthWithdrawalFilterQuery,
     EvmEventFilterQuery,
@@ -65,6 +67,39 @@ logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
 
+HISTORY_EVENTS_PAGE_SIZE: Final = 5000
+ENTRY_TYPES_WITH_EVM_FIELDS: Final = {
+    HistoryBaseEntryType.EVM_EVENT,
+    HistoryBaseEntryType.ETH_DEPOSIT_EVENT,
+}
+ENTRY_TYPES_WITH_ETH_STAKING_FIELDS: Final = {
+    HistoryBaseEntryType.ETH_WITHDRAWAL_EVENT,
+    HistoryBaseEntryType.ETH_BLOCK_EVENT,
+    HistoryBaseEntryType.ETH_DEPOSIT_EVENT,
+}
+EVM_EVENTS_INFO_LEFT_JOIN: Final = 'LEFT JOIN evm_events_info ON history_events.identifier=evm_events_info.identifier '  # noqa: E501
+ETH_STAKING_EVENTS_INFO_LEFT_JOIN: Final = 'LEFT JOIN eth_staking_events_info ON history_events.identifier=eth_staking_events_info.identifier '  # noqa: E501
+EVM_EVENT_NULL_FIELDS: Final = ', '.join(f'NULL AS {x.strip()}' for x in EVM_EVENT_FIELDS.split(','))  # noqa: E501
+ETH_STAKING_EVENT_NULL_FIELDS: Final = ', '.join(f'NULL AS {x.strip()}' for x in ETH_STAKING_EVENT_FIELDS.split(','))  # noqa: E501
+
+
+def _filter_entry_types(filter_query: HistoryBaseEntryFilterQuery) -> set[HistoryBaseEntryType]:
+    """Returns the entry types of the events that the given filter can match"""
+    entry_types = set(HistoryBaseEntryType)
+    if filter_query.and_op is False:  # any of the filters may match an event
+        return entry_types
+
+    for db_filter in filter_query.filters:
+        if isinstance(db_filter, DBMultiIntegerFilter) and db_filter.column == 'entry_type':
+            values = {HistoryBaseEntryType(x) for x in db_filter.values}
+            if db_filter.operator == 'IN':
+                entry_types &= values
+            else:
+                entry_types -= values
+
+    return entry_types
+
+
 def filter_ignore_asset_query(include_ignored_assets: bool = False) -> str:
     """Create and return the subquery to filter ignored assets. If `include_ignored_assets`
     is true then the filter is returned to include them."""
@@ -151,6 +186,13 @@ class DBHistoryEvents:
         NOTE: It edits all the fields except the extra_data one.
         """
         with self.db.user_write() as write_cursor:
+            old_timestamp = None
+            if event.entry_type in VALIDATOR_PROFIT_ENTRY_TYPES:
+                old_timestamp = write_cursor.execute(
+                    'SELECT timestamp FROM history_events WHERE identifier=?',
+                    (event.identifier,),
+                ).fetchone()
+
             for idx, (_, updatestr, bindings) in enumerate(event.serialize_for_db()):
                 if idx == 0:  # base history event data
                     try:
@@ -173,6 +215,11 @@ class DBHistoryEvents:
                 'VALUES(?, ?, ?)',
                 (event.identifier, HISTORY_MAPPING_KEY_STATE, HISTORY_MAPPING_STATE_CUSTOMIZED),
             )
+            if old_timestamp is not None:  # the profit of the validators changed from then on
+                DBEth2(self.db).refresh_daily_performance(
+                    write_cursor=write_cursor,
+                    from_ts=ts_ms_to_sec(TimestampMS(min(old_timestamp[0], event.timestamp))),
+                )
 
         return True, ''
 
@@ -210,11 +257,13 @@ class DBHistoryEvents:
                         )
 
             with self.db.user_write() as write_cursor:
-                write_cursor.execute(
-                    'DELETE FROM history_events WHERE identifier=?', (identifier,),
-                )
-                affected_rows = write_cursor.rowcount
-            if affected_rows != 1:
+                deleted_entry_types = write_cursor.execute(
+                    'DELETE FROM history_events WHERE identifier=? RETURNING entry_type',
+                    (identifier,),
+                ).fetchall()
+                if len(deleted_entry_types) == 1 and HistoryBaseEntryType.deserialize_from_db(deleted_entry_types[0][0]) in VALIDATOR_PROFIT_ENTRY_TYPES:  # noqa: E501
+                    DBEth2(self.db).update_daily_performance(write_cursor)
+            if len(deleted_entry_types) != 1:
                 return (
                     f'Tried to remove history event with id {identifier} which does not exist'
                 )
@@ -327,9 +376,22 @@ class DBHistoryEvents:
             entries_limit: int,
             has_premium: bool,
             group_by_event_ids: bool = False,
+            with_order: bool = True,
     ) -> tuple[str, list]:
-        """Returns the sql queries and bindings for the history events without pagination."""
-        base_suffix = f'{HISTORY_BASE_ENTRY_FIELDS}, {EVM_EVENT_FIELDS}, {ETH_STAKING_EVENT_FIELDS} {ALL_EVENTS_DATA_JOIN}'  # noqa: E501
+        """Returns the sql queries and bindings for the history events without pagination.
+
+        Only the tables of the entry types the filter can match are joined. The columns of
+        the other tables are selected as NULL so that all rows have the same layout."""
+        entry_types = _filter_entry_types(filter_query)
+        join_query, evm_fields, staking_fields = 'FROM history_events ', EVM_EVENT_NULL_FIELDS, ETH_STAKING_EVENT_NULL_FIELDS  # noqa: E501
+        if not entry_types.isdisjoint(ENTRY_TYPES_WITH_EVM_FIELDS):
+            join_query += EVM_EVENTS_INFO_LEFT_JOIN
+            evm_fields = EVM_EVENT_FIELDS
+        if not entry_types.isdisjoint(ENTRY_TYPES_WITH_ETH_STAKING_FIELDS):
+            join_query += ETH_STAKING_EVENTS_INFO_LEFT_JOIN
+            staking_fields = ETH_STAKING_EVENT_FIELDS
+
+        base_suffix = f'{HISTORY_BASE_ENTRY_FIELDS}, {evm_fields}, {staking_fields} {join_query}'
         if (ignore_asset_filter := maybe_filter_ignore_asset(filter_query, include_ignored_assets=True)) != '':  # noqa: E501
             ignore_asset_filter = (
                 f' WHERE event_identifier NOT IN '
@@ -352,15 +414,66 @@ class DBHistoryEvents:
             filters, query_bindings = filter_query.prepare(
                 with_group_by=True,
                 with_pagination=False,
+                with_order=with_order,
                 without_ignored_asset_filter=True,
             )
             prefix = 'SELECT COUNT(*), *'
         else:
-            filters, query_bindings = filter_query.prepare(with_pagination=False)
+            filters, query_bindings = filter_query.prepare(
+                with_pagination=False,
+                with_order=with_order,
+            )
             prefix = 'SELECT *'
 
         return f'{prefix} FROM (SELECT {suffix}) {filters}', limit + query_bindings
 
+    @staticmethod
+    def _deserialize_history_event(
+            entry: tuple[Any, ...],
+            type_idx: int,
+    ) -> HistoryEvent | EvmEvent | EthWithdrawalEvent | EthBlockEvent | EthDepositEvent:
+        """Deserialize a row of the history events query depending on the event type
+
+        May raise:
+        - DeserializationError
+        - UnknownAsset
+        """
+        entry_type = HistoryBaseEntryType(entry[type_idx])
+        data_start_idx = type_idx + 1
+        if entry_type == HistoryBaseEntryType.EVM_EVENT:
+            data = (
+                entry[data_start_idx:data_start_idx + HISTORY_BASE_ENTRY_LENGTH + 1] +
+                entry[data_start_idx + HISTORY_BASE_ENTRY_LENGTH + 1:data_start_idx + HISTORY_BASE_ENTRY_LENGTH + EVM_FIELD_LENGTH + 1]    # noqa: E501
+            )
+            return EvmEvent.deserialize_from_db(data)
+
+        if entry_type in (
+                HistoryBaseEntryType.ETH_WITHDRAWAL_EVENT,
+                HistoryBaseEntryType.ETH_BLOCK_EVENT,
+        ):
+            data = (
+                entry[data_start_idx:data_start_idx + 4] +
+                entry[data_start_idx + 5:data_start_idx + 6] +
+                entry[data_start_idx + 7:data_start_idx + 9] +
+                entry[data_start_idx + 11:data_start_idx + 12] +
+                entry[data_start_idx + HISTORY_BASE_ENTRY_LENGTH + EVM_FIELD_LENGTH:data_start_idx + HISTORY_BASE_ENTRY_LENGTH + EVM_FIELD_LENGTH + ETH_STAKING_FIELD_LENGTH + 1]  # noqa: E501
+            )
+            if entry_type == HistoryBaseEntryType.ETH_WITHDRAWAL_EVENT:
+                return EthWithdrawalEvent.deserialize_from_db(data)
+            return EthBlockEvent.deserialize_from_db(data)
+
+        if entry_type == HistoryBaseEntryType.ETH_DEPOSIT_EVENT:
+            data = (
+                entry[data_start_idx:data_start_idx + 4] +
+                entry[data_start_idx + 5:data_start_idx + 6] +
+                entry[data_start_idx + 7:data_start_idx + 9] +
+                entry[data_start_idx + HISTORY_BASE_ENTRY_LENGTH:data_start_idx + HISTORY_BASE_ENTRY_LENGTH + 1] +  # noqa: E501
+                entry[data_start_idx + HISTORY_BASE_ENTRY_LENGTH + EVM_FIELD_LENGTH:data_start_idx + HISTORY_BASE_ENTRY_LENGTH + EVM_FIELD_LENGTH + 1]  # noqa: E501
+            )
+            return EthDepositEvent.deserialize_from_db(data)
+
+        return HistoryEvent.deserialize_from_db(entry[data_start_idx:])
+
     @overload
     def get_history_events(
             self,
@@ -443,11 +556,7 @@ class DBHistoryEvents:
         list[tuple[int, EthDepositEvent]] | list[EthDepositEvent] |
         list[tuple[int, EthWithdrawalEvent]] | list[EthWithdrawalEvent]
     ):
-        """Get all events from the DB, deserialized depending on the event type
-
-        TODO: To not query all columns with all joins for all cases, we perhaps can
-        peek on the entry type of the filter and adjust the SELECT fields accordingly?
-        """
+        """Get all events from the DB, deserialized depending on the event type"""
         base_query, filters_bindings = self._create_history_events_query(
             has_premium=has_premium,
             filter_query=filter_query,
@@ -461,47 +570,9 @@ class DBHistoryEvents:
         cursor.execute(base_query, filters_bindings)
         output: list[HistoryBaseEntry] | list[tuple[int, HistoryBaseEntry]] = []
         type_idx = 1 if group_by_event_ids else 0
-        data_start_idx = type_idx + 1
         for entry in cursor:
-            entry_type = HistoryBaseEntryType(entry[type_idx])
             try:
-                deserialized_event: HistoryEvent | (EvmEvent | (EthWithdrawalEvent | EthBlockEvent))  # noqa: E501
-                # Deserialize event depending on its type
-                if entry_type == HistoryBaseEntryType.EVM_EVENT:
-                    data = (
-                        entry[data_start_idx:data_start_idx + HISTORY_BASE_ENTRY_LENGTH + 1] +
-                        entry[data_start_idx + HISTORY_BASE_ENTRY_LENGTH + 1:data_start_idx + HISTORY_BASE_ENTRY_LENGTH + EVM_FIELD_LENGTH + 1]    # noqa: E501
-                    )
-                    deserialized_event = EvmEvent.deserialize_from_db(data)
-                elif entry_type in (
-                        HistoryBaseEntryType.ETH_WITHDRAWAL_EVENT,
-                        HistoryBaseEntryType.ETH_BLOCK_EVENT,
-                ):
-                    data = (
-                        entry[data_start_idx:data_start_idx + 4] +
-                        entry[data_start_idx + 5:data_start_idx + 6] +
-                        entry[data_start_idx + 7:data_start_idx + 9] +
-                        entry[data_start_idx + 11:data_start_idx + 12] +
-                        entry[data_start_idx + HISTORY_BASE_ENTRY_LENGTH + EVM_FIELD_LENGTH:data_start_idx + HISTORY_BASE_ENTRY_LENGTH + EVM_FIELD_LENGTH + ETH_STAKING_FIELD_LENGTH + 1]  # noqa: E501
-                    )
-                    if entry_type == HistoryBaseEntryType.ETH_WITHDRAWAL_EVENT:
-                        deserialized_event = EthWithdrawalEvent.deserialize_from_db(data)
-                    else:
-                        deserialized_event = EthBlockEvent.deserialize_from_db(data)
-
-                elif entry_type == HistoryBaseEntryType.ETH_DEPOSIT_EVENT:
-                    data = (
-                        entry[data_start_idx:data_start_idx + 4] +
-                        entry[data_start_idx + 5:data_start_idx + 6] +
-                        entry[data_start_idx + 7:data_start_idx + 9] +
-                        entry[data_start_idx + HISTORY_BASE_ENTRY_LENGTH:data_start_idx + HISTORY_BASE_ENTRY_LENGTH + 1] +  # noqa: E501
-                        entry[data_start_idx + HISTORY_BASE_ENTRY_LENGTH + EVM_FIELD_LENGTH:data_start_idx + HISTORY_BASE_ENTRY_LENGTH + EVM_FIELD_LENGTH + 1]  # noqa: E501
-                    )
-                    deserialized_event = EthDepositEvent.deserialize_from_db(data)
-
-                else:
-                    data = entry[data_start_idx:HISTORY_BASE_ENTRY_LENGTH + 1]
-                    deserialized_event = HistoryEvent.deserialize_from_db(entry[data_start_idx:])
+                deserialized_event = self._deserialize_history_event(entry, type_idx)
             except (DeserializationError, UnknownAsset) as e:
                 log.debug(f'Failed to deserialize history event {entry} due to {e!s}')
                 continue
@@ -513,6 +584,59 @@ class DBHistoryEvents:
 
         return output
 
+    def iterate_history_events(
+            self,
+            cursor: 'DBCursor',
+            filter_query: HistoryBaseEntryFilterQuery,
+            has_premium: bool,
+            page_size: int = HISTORY_EVENTS_PAGE_SIZE,
+            ascending: bool = True,
+    ) -> Iterator[HistoryBaseEntry]:
+        """Lazily yield the events matching the filter, deserialized depending on their type.
+
+        Events are read from the DB in pages of `page_size` so that memory use does not
+        grow with the number of events. Each page is a separate query that continues
+        after the last event of the previous one, so writes that happen while iterating
+        do not invalidate the iteration.
+
+        The events are ordered by timestamp in seconds, in the order given by `ascending`,
+        and then by sequence index and identifier. This is the order the accountant
+        processes them in. The order and pagination of the filter are ignored.
+        """
+        base_query, filters_bindings = self._create_history_events_query(
+            has_premium=has_premium,
+            filter_query=filter_query,
+            entries_limit=FREE_HISTORY_EVENTS_LIMIT,
+            with_order=False,
+        )
+        timestamp_order, timestamp_comparison = ('ASC', '>') if ascending else ('DESC', '<')
+        last_key: list[Any] = []
+        while True:
+            page_query = f'SELECT * FROM ({base_query}) '
+            if len(last_key) != 0:
+                page_query += (
+                    f'WHERE timestamp / 1000 {timestamp_comparison} ? OR (timestamp / 1000 = ? '
+                    'AND (sequence_index, history_events_identifier) > (?, ?)) '
+                )
+
+            entries = cursor.execute(
+                page_query +
+                f'ORDER BY timestamp / 1000 {timestamp_order}, sequence_index, '
+                'history_events_identifier LIMIT ?',
+                filters_bindings + last_key + [page_size],
+            ).fetchall()
+            for entry in entries:
+                try:
+                    yield self._deserialize_history_event(entry, type_idx=0)
+                except (DeserializationError, UnknownAsset) as e:
+                    log.debug(f'Failed to deserialize history event {entry} due to {e!s}')
+
+            if len(entries) < page_size:
+                break
+
+            last_timestamp = entries[-1][4] // 1000
+            last_key = [last_timestamp, last_timestamp, entries[-1][3], entries[-1][1]]
+
     @overload
     def get_history_events_and_limit_info(
             self,
@@ -678,6 +802,7 @@ class DBHistoryEvents:
             filter_query=query_filter,
             group_by_event_ids=group_by_event_ids,
             entries_limit=free_limit,
+            with_order=False,  # the order does not matter for counting
         )
         count_without_limit = cursor.execute(
             f'SELECT COUNT(*) FROM ({premium_query})',
@@ -692,6 +817,7 @@ class DBHistoryEvents:
             filter_query=query_filter,
             group_by_event_ids=group_by_event_ids,
             entries_limit=free_limit,
+            with_order=False,
         )
         count_with_limit = cursor.execute(
             f'SELECT COUNT(*) FROM ({free_query})',
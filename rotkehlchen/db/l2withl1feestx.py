@@ -54,6 +54,10 @@ class DBL2WithL1FeesTx(DBEvmTx):
             [FREE_ETH_TX_LIMIT] + bindings,
         )
 
+    def _tx_data_is_complete(self, result: tuple[Any, ...]) -> bool:
+        """The l1 fee may not be in the DB yet in which case it has to be queried"""
+        return result[12] is not None
+
     def _build_evm_transaction(self, result: tuple[Any, ...]) -> L2WithL1FeesTransaction:
         return L2WithL1FeesTransaction(
             tx_hash=deserialize_evm_tx_hash(result[0]),
@@ -22,6 +22,7 @@ MINIMIZED_USER_DB_SCHEMA = {
     "evmtx_receipts": "tx_idintegernotnullprimarykey,contract_addresstext,statusintegernotnullcheck(statusin(0,1)),typeintegernotnull,foreignkey(tx_id)referencesevm_transactions(identifier)ondeletecascadeonupdatecascade",
     "evmtx_receipt_logs": "identifierintegernotnullprimarykey,tx_idintegernotnull,log_indexintegernotnull,datablobnotnull,addresstextnotnull,removedintegernotnullcheck(removedin(0,1)),foreignkey(tx_id)referencesevmtx_receipts(tx_id)ondeletecascadeonupdatecascade,unique(tx_id,log_index)",
     "evmtx_receipt_log_topics": "logintegernotnull,topicblobnotnull,topic_indexintegernotnull,foreignkey(log)referencesevmtx_receipt_logs(identifier)ondeletecascadeonupdatecascade,primarykey(log,topic_index)",
+    "evmtx_receipt_log_index": "logintegernotnullprimarykey,chain_idintegernotnull,addresstextnotnull,topic0blob,block_numberintegernotnull,foreignkey(log)referencesevmtx_receipt_logs(identifier)ondeletecascadeonupdatecascade",
     "evmtx_address_mappings": "tx_idintegernotnull,addresstextnotnull,foreignkey(tx_id)referencesevm_transactions(identifier)onupdatecascadeondeletecascade,primarykey(tx_id,address)",
     "zksynclite_tx_type": "typechar(1)primarykeynotnull,seqintegerunique",
     "zksynclite_transactions": "identifierintegernotnullprimarykey,tx_hashblobnotnullunique,typechar(1)notnulldefault('a')referenceszksynclite_tx_type(type),is_decodedintegernotnulldefault0check(is_decodedin(0,1)),timestampintegernotnull,block_numberintegernotnull,from_addresstextnotnull,to_addresstext,assettextnotnull,amounttextnotnull,feetext,foreignkey(asset)referencesassets(identifier)onupdatecascade",
@@ -35,8 +36,10 @@ MINIMIZED_USER_DB_SCHEMA = {
     "tag_mappings": "object_referencetext,tag_nametext,foreignkey(tag_name)referencestags(name)primarykey(object_reference,tag_name)",
     "xpubs": "xpubtextnotnull,derivation_pathtextnotnull,labeltext,blockchaintextnotnull,primarykey(xpub,derivation_path,blockchain)",
     "xpub_mappings": "addresstextnotnull,xpubtextnotnull,derivation_pathtextnotnull,account_indexinteger,derived_indexinteger,blockchaintextnotnull,foreignkey(blockchain,address)referencesblockchain_accounts(blockchain,account)ondeletecascadeforeignkey(xpub,derivation_path,blockchain)referencesxpubs(xpub,derivation_path,blockchain)ondeletecascadeprimarykey(address,xpub,derivation_path,blockchain)",
+    "xpub_derived_addresses": "xpubtextnotnull,derivation_pathtextnotnull,blockchaintextnotnull,account_indexintegernotnull,derived_indexintegernotnull,addresstextnotnull,foreignkey(xpub,derivation_path,blockchain)referencesxpubs(xpub,derivation_path,blockchain)ondeletecascadeprimarykey(xpub,derivation_path,blockchain,account_index,derived_index)",
     "eth2_validators": "identifierintegernotnullprimarykey,validator_indexintegerunique,public_keytextnotnullunique,ownership_proportiontextnotnull,withdrawal_addresstext,activation_timestampinteger,withdrawable_timestampinteger",
     "eth2_daily_staking_details": "validator_indexintegernotnull,timestampintegernotnull,pnltextnotnull,foreignkey(validator_index)referenceseth2_validators(validator_index)onupdatecascadeondeletecascade,primarykey(validator_index,timestamp)",
+    "eth2_daily_performance": "validator_indexintegernotnull,typechar(1)notnull,recipienttextnotnull,timestampintegernotnull,cumulative_amounttextnotnull,eventsintegernotnull,last_identifierintegernotnull,primarykey(validator_index,type,recipient,timestamp)",
     "history_events": "identifierintegernotnullprimarykey,entry_typeintegernotnull,event_identifiertextnotnull,sequence_indexintegernotnull,timestampintegernotnull,locationchar(1)notnulldefault('a')referenceslocation(location),location_labeltext,assettextnotnull,amounttextnotnull,usd_valuetextnotnull,notestext,typetextnotnull,subtypetextnotnull,foreignkey(asset)referencesassets(identifier)onupdatecascade,unique(event_identifier,sequence_index)",
     "evm_events_info": "identifierintegerprimarykey,tx_hashblobnotnull,counterpartytext,producttext,addresstext,extra_datatext,foreignkey(identifier)referenceshistory_events(identifier)onupdatecascadeondeletecascade",
     "eth_staking_events_info": "identifierintegerprimarykey,validator_indexintegernotnull,is_exit_or_blocknumberintegernotnull,foreignkey(identifier)referenceshistory_events(identifier)onupdatecascadeondeletecascade",
@@ -1,6 +1,7 @@
 import logging
 from collections.abc import Callable
 from copy import deepcopy
+from json import JSONDecodeError
 from typing import TYPE_CHECKING, Any, Literal, overload
 
 from pysqlcipher3 import dbapi2 as sqlcipher
@@ -12,8 +13,10 @@ from rotkehlchen.db.settings import DBSettings
 from rotkehlchen.errors.misc import InputError
 from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.logging import RotkehlchenLogsAdapter
+from rotkehlchen.serialization.deserialize import deserialize_fval
 from rotkehlchen.types import Timestamp
 from rotkehlchen.utils.misc import ts_now
+from rotkehlchen.utils.serialization import jsonloads_dict, rlk_jsondumps
 
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
@@ -214,33 +217,158 @@ class DBAccountingReports:
                     f'Could not delete PnL report {report_id} from the DB. Report was not found',
                 )
 
-    def add_report_data(
+    def add_report_events(
             self,
             report_id: int,
-            time: Timestamp,
             ts_converter: Callable[[Timestamp], str],
-            event: ProcessedAccountingEvent,
+            events: list[ProcessedAccountingEvent],
     ) -> None:
-        """Adds a new entry to a transient report for the PnL history in a given time range
+        """Adds many processed events to a report at once. Events that can't be serialized
+        are logged and skipped.
+
         May raise:
-        - DeserializationError if there is a conflict at serialization of the event
-        - InputError if the event can not be written to the DB. Probably report id does not exist.
+        - InputError if the events can not be written to the DB. Probably report id does
+        not exist.
         """
-        data = event.serialize_for_db(ts_converter)
-        query = """
-        INSERT INTO pnl_events(
-            report_id, timestamp, data
-        )
-        VALUES(?, ?, ?);"""
+        event_tuples = []
+        for event in events:
+            try:
+                event_tuples.append((report_id, event.timestamp, *event.serialize_for_db(ts_converter)))  # noqa: E501
+            except DeserializationError as e:
+                log.error(f'Could not save processed event {event} of report {report_id}: {e!s}')
+
         with self.db.transient_write() as cursor:
             try:
-                cursor.execute(query, (report_id, time, data))
+                cursor.executemany(
+                    'INSERT INTO pnl_events(report_id, timestamp, type, location, asset, '
+                    'free_amount, taxable_amount, pnl_taxable, pnl_free, data) '
+                    'VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    event_tuples,
+                )
             except sqlcipher.IntegrityError as e:  # pylint: disable=no-member
                 raise InputError(
-                    f'Could not write {event} data to the DB due to {e!s}. '
+                    f'Could not write {len(event_tuples)} events to the DB due to {e!s}. '
                     f'Probably report {report_id} does not exist?',
                 ) from e
 
+    def get_checkpoints(self, until_ts: Timestamp) -> list[tuple[Timestamp, str, int]]:
+        """Get the timestamp, events hash and number of processed actions of the accounting
+        checkpoints up to the given timestamp in ascending order"""
+        with self.db.conn_transient.read_ctx() as cursor:
+            return cursor.execute(
+                'SELECT timestamp, events_hash, processed_actions FROM pnl_checkpoints '
+                'WHERE timestamp <= ? ORDER BY timestamp ASC',
+                (until_ts,),
+            ).fetchall()
+
+    def get_checkpoint(
+            self,
+            timestamp: Timestamp,
+    ) -> tuple[dict[str, Any], list[ProcessedAccountingEvent]]:
+        """Get the pot state saved in the checkpoint of the given timestamp and the events
+        processed between the previous checkpoint and this one
+
+        May raise:
+        - DeserializationError if the checkpoint does not exist or its data can't be read
+        """
+        with self.db.conn_transient.read_ctx() as cursor:
+            result = cursor.execute(
+                'SELECT state FROM pnl_checkpoints WHERE timestamp=?', (timestamp,),
+            ).fetchone()
+            if result is None:
+                raise DeserializationError(f'Accounting checkpoint at {timestamp} was not found')
+
+            try:
+                state = jsonloads_dict(result[0])
+            except JSONDecodeError as e:
+                raise DeserializationError(f'Could not decode accounting checkpoint state due to {e!s}') from e  # noqa: E501
+
+            events = []
+            for event_ts, data in cursor.execute(
+                    'SELECT timestamp, data FROM pnl_checkpoint_events WHERE checkpoint_ts=? '
+                    'ORDER BY identifier ASC',
+                    (timestamp,),
+            ):
+                try:
+                    event_data = jsonloads_dict(data)
+                except JSONDecodeError as e:
+                    raise DeserializationError(f'Could not decode accounting checkpoint event due to {e!s}') from e  # noqa: E501
+
+                event = ProcessedAccountingEvent.deserialize_from_dict(event_ts, event_data)
+                if event.cost_basis is not None:  # restore the costs that the CSV export uses
+                    try:
+                        event.cost_basis = event.cost_basis._replace(
+                            taxable_amount=deserialize_fval(event_data['cost_basis']['taxable_amount'], name='taxable_amount', location='accounting checkpoint'),  # noqa: E501
+                            taxable_bought_cost=deserialize_fval(event_data['cost_basis']['taxable_bought_cost'], name='taxable_bought_cost', location='accounting checkpoint'),  # noqa: E501
+                            taxfree_bought_cost=deserialize_fval(event_data['cost_basis']['taxfree_bought_cost'], name='taxfree_bought_cost', location='accounting checkpoint'),  # noqa: E501
+                        )
+                    except KeyError as e:
+                        raise DeserializationError(f'Missing key {e!s} in accounting checkpoint event') from e  # noqa: E501
+                events.append(event)
+
+        return state, events
+
+    def add_checkpoint(
+            self,
+            timestamp: Timestamp,
+            inputs_hash: str,
+            events_hash: str,
+            processed_actions: int,
+            state: dict[str, Any],
+            ts_converter: Callable[[Timestamp], str],
+            events: list[ProcessedAccountingEvent],
+    ) -> None:
+        """Save an accounting checkpoint along with the events processed since the previous one.
+
+        Checkpoints at or after the given timestamp are deleted since their events were
+        processed from an older chain of checkpoints.
+        """
+        event_tuples = []
+        for event in events:
+            data = event.serialize_to_dict(ts_converter)
+            if event.cost_basis is not None:
+                data['cost_basis'] |= {
+                    'taxable_amount': str(event.cost_basis.taxable_amount),
+                    'taxable_bought_cost': str(event.cost_basis.taxable_bought_cost),
+                    'taxfree_bought_cost': str(event.cost_basis.taxfree_bought_cost),
+                }
+            event_tuples.append((timestamp, event.timestamp, rlk_jsondumps(data)))
+
+        with self.db.transient_write() as cursor:
+            cursor.execute('DELETE FROM pnl_checkpoints WHERE timestamp >= ?', (timestamp,))
+            cursor.execute(
+                'INSERT INTO pnl_checkpoints(timestamp, inputs_hash, events_hash, '
+                'processed_actions, state) VALUES(?, ?, ?, ?, ?)',
+                (timestamp, inputs_hash, events_hash, processed_actions, rlk_jsondumps(state)),
+            )
+            cursor.executemany(
+                'INSERT INTO pnl_checkpoint_events(checkpoint_ts, timestamp, data) '
+                'VALUES(?, ?, ?)',
+                event_tuples,
+            )
+
+    def delete_checkpoints(
+            self,
+            from_ts: Timestamp | None = None,
+            inputs_hash: str | None = None,
+    ) -> None:
+        """Delete the accounting checkpoints at or after the given timestamp or the ones
+        made with other inputs than the given hash. With no arguments deletes all of them."""
+        conditions: list[str] = []
+        bindings: list[str | int] = []
+        if from_ts is not None:
+            conditions.append('timestamp >= ?')
+            bindings.append(from_ts)
+        if inputs_hash is not None:
+            conditions.append('inputs_hash != ?')
+            bindings.append(inputs_hash)
+
+        query = 'DELETE FROM pnl_checkpoints'
+        if len(conditions) != 0:
+            query += f' WHERE {" OR ".join(conditions)}'
+        with self.db.transient_write() as cursor:
+            cursor.execute(query, bindings)
+
     def get_report_data(
             self,
             filter_: 'ReportDataFilterQuery',
@@ -263,13 +391,16 @@ class DBAccountingReports:
             )
 
         query, bindings = filter_.prepare()
-        query = f'SELECT timestamp, data FROM pnl_events {query}'
+        query = (
+            'SELECT timestamp, type, location, asset, free_amount, taxable_amount, '
+            f'pnl_taxable, pnl_free, data FROM pnl_events {query}'
+        )
         cursor.execute(query, bindings)
 
         records = []
         for result in cursor:
             try:
-                record = ProcessedAccountingEvent.deserialize_from_db(result[0], result[1])
+                record = ProcessedAccountingEvent.deserialize_from_db(result[0], result[1:])
             except DeserializationError as e:
                 self.db.msg_aggregator.add_error(
                     f'Error deserializing AccountingEvent from the DB. Skipping it.'
@@ -180,6 +180,7 @@ CREATE TABLE IF NOT EXISTS timed_balances (
     FOREIGN KEY(currency) REFERENCES assets(identifier) ON UPDATE CASCADE,
     PRIMARY KEY (timestamp, currency, category)
 );
+CREATE INDEX IF NOT EXISTS idx_timed_balances_currency ON timed_balances(currency, timestamp);
 """
 
 DB_CREATE_TIMED_LOCATION_DATA = """
@@ -267,6 +268,25 @@ CREATE TABLE IF NOT EXISTS xpub_mappings (
 );
 """
 
+# Cache of the addresses derived from each xpub so that they don't need to be derived
+# again each time new xpub addresses are checked for activity
+DB_CREATE_XPUB_DERIVED_ADDRESSES = """
+CREATE TABLE IF NOT EXISTS xpub_derived_addresses (
+    xpub TEXT NOT NULL,
+    derivation_path TEXT NOT NULL,
+    blockchain TEXT NOT NULL,
+    account_index INTEGER NOT NULL,
+    derived_index INTEGER NOT NULL,
+    address TEXT NOT NULL,
+    FOREIGN KEY(xpub, derivation_path, blockchain) REFERENCES xpubs(
+        xpub,
+        derivation_path,
+        blockchain
+    ) ON DELETE CASCADE
+    PRIMARY KEY (xpub, derivation_path, blockchain, account_index, derived_index)
+);
+"""
+
 
 # Store information about the tokens queried for each combination of account and blockchain.
 # The table is designed to have a key-value structure where we use the key `token` to
@@ -385,6 +405,7 @@ CREATE TABLE IF NOT EXISTS evm_transactions (
     nonce INTEGER NOT NULL,
     UNIQUE(tx_hash, chain_id)
 );
+CREATE INDEX IF NOT EXISTS idx_evm_transactions_timestamp ON evm_transactions(timestamp);
 """
 
 # The table can be used by any L2 chain that has an extra L1 fee structure
@@ -445,6 +466,19 @@ CREATE TABLE IF NOT EXISTS evmtx_receipt_log_topics (
 );
 """
 
+DB_CREATE_EVMTX_RECEIPT_LOG_INDEX = """
+CREATE TABLE IF NOT EXISTS evmtx_receipt_log_index (
+    log INTEGER NOT NULL PRIMARY KEY,
+    chain_id INTEGER NOT NULL,
+    address TEXT NOT NULL,
+    topic0 BLOB,  /* null for anonymous logs without topics */
+    block_number INTEGER NOT NULL,
+    FOREIGN KEY(log) REFERENCES evmtx_receipt_logs(identifier) ON DELETE CASCADE ON UPDATE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_evmtx_receipt_log_index_address ON evmtx_receipt_log_index(chain_id, address, topic0, block_number);
+CREATE INDEX IF NOT EXISTS idx_evmtx_receipt_log_index_topic ON evmtx_receipt_log_index(chain_id, topic0, block_number);
+"""  # noqa: E501
+
 DB_CREATE_EVMTX_ADDRESS_MAPPINGS = """
 CREATE TABLE IF NOT EXISTS evmtx_address_mappings (
     tx_id INTEGER NOT NULL,
@@ -452,6 +486,7 @@ CREATE TABLE IF NOT EXISTS evmtx_address_mappings (
     FOREIGN KEY(tx_id) references evm_transactions(identifier) ON UPDATE CASCADE ON DELETE CASCADE,
     PRIMARY KEY (tx_id, address)
 );
+CREATE INDEX IF NOT EXISTS idx_evmtx_address_mappings_address ON evmtx_address_mappings(address);
 """
 
 
@@ -557,6 +592,23 @@ CREATE TABLE IF NOT EXISTS  eth2_daily_staking_details (
 );
 """  # noqa: E501
 
+# Cumulative profit of each validator per profit type up to and including the day of
+# timestamp. Recipient is the fee recipient for execution rewards and empty otherwise.
+# It's derived from the eth staking history events and updated whenever they are written
+DB_CREATE_ETH2_DAILY_PERFORMANCE = """
+CREATE TABLE IF NOT EXISTS eth2_daily_performance (
+    validator_index INTEGER NOT NULL,
+    type CHAR(1) NOT NULL,
+    recipient TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    cumulative_amount TEXT NOT NULL,
+    events INTEGER NOT NULL,
+    last_identifier INTEGER NOT NULL,
+    PRIMARY KEY (validator_index, type, recipient, timestamp)
+);
+CREATE INDEX IF NOT EXISTS idx_eth2_daily_performance_timestamp ON eth2_daily_performance(timestamp);
+"""  # noqa: E501
+
 
 DB_CREATE_SKIPPED_EXTERNAL_EVENTS = """
 CREATE TABLE IF NOT EXISTS skipped_external_events (
@@ -586,7 +638,12 @@ CREATE TABLE IF NOT EXISTS history_events (
     FOREIGN KEY(asset) REFERENCES assets(identifier) ON UPDATE CASCADE,
     UNIQUE(event_identifier, sequence_index)
 );
-"""
+CREATE INDEX IF NOT EXISTS idx_history_events_timestamp ON history_events(timestamp, sequence_index);
+CREATE INDEX IF NOT EXISTS idx_history_events_location ON history_events(location, timestamp);
+CREATE INDEX IF NOT EXISTS idx_history_events_location_label ON history_events(location_label, timestamp);
+CREATE INDEX IF NOT EXISTS idx_history_events_asset ON history_events(asset, event_identifier);
+CREATE INDEX IF NOT EXISTS idx_history_events_type ON history_events(type, subtype);
+"""  # noqa: E501
 
 
 # Table that extends history_events table and stores data specific to evm events.
@@ -600,6 +657,8 @@ CREATE TABLE IF NOT EXISTS evm_events_info(
     extra_data TEXT,
     FOREIGN KEY(identifier) REFERENCES history_events(identifier) ON UPDATE CASCADE ON DELETE CASCADE
 );
+CREATE INDEX IF NOT EXISTS idx_evm_events_info_tx_hash ON evm_events_info(tx_hash);
+CREATE INDEX IF NOT EXISTS idx_evm_events_info_counterparty ON evm_events_info(counterparty);
 """  # noqa: E501
 
 # Table that extends history events table and stores data specific to ethereum staking
@@ -781,6 +840,7 @@ BEGIN TRANSACTION;
 {DB_CREATE_EVMTX_RECEIPTS}
 {DB_CREATE_EVMTX_RECEIPT_LOGS}
 {DB_CREATE_EVMTX_RECEIPT_LOG_TOPICS}
+{DB_CREATE_EVMTX_RECEIPT_LOG_INDEX}
 {DB_CREATE_EVMTX_ADDRESS_MAPPINGS}
 {DB_CREATE_ZKSYNCLITE_TX_TYPE}
 {DB_CREATE_ZKSYNCLITE_TRANSACTIONS}
@@ -794,8 +854,10 @@ BEGIN TRANSACTION;
 {DB_CREATE_TAG_MAPPINGS}
 {DB_CREATE_XPUBS}
 {DB_CREATE_XPUB_MAPPINGS}
+{DB_CREATE_XPUB_DERIVED_ADDRESSES}
 {DB_CREATE_ETH2_VALIDATORS}
 {DB_CREATE_ETH2_DAILY_STAKING_DETAILS}
+{DB_CREATE_ETH2_DAILY_PERFORMANCE}
 {DB_CREATE_HISTORY_EVENTS}
 {DB_CREATE_EVM_EVENTS_INFO}
 {DB_CREATE_ETH_STAKING_EVENTS_INFO}
@@ -37,16 +37,57 @@ CREATE TABLE IF NOT EXISTS pnl_report_settings (
 """
 
 # Many records for events related through foreign key to each PnL report.
+# The fields that reports are filtered, sorted and aggregated by have their own
+# columns and the rest of the event is kept as json in data.
 DB_CREATE_PNL_EVENTS = """
 CREATE TABLE IF NOT EXISTS pnl_events (
     identifier INTEGER NOT NULL PRIMARY KEY,
     report_id INTEGER NOT NULL,
     timestamp INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    location CHAR(1) NOT NULL,
+    asset TEXT NOT NULL,
+    free_amount TEXT NOT NULL,
+    taxable_amount TEXT NOT NULL,
+    pnl_taxable TEXT NOT NULL,
+    pnl_free TEXT NOT NULL,
     data TEXT NOT NULL,
     FOREIGN KEY (report_id) REFERENCES pnl_reports(identifier) ON DELETE CASCADE ON UPDATE CASCADE
 );
 """
 
+DB_CREATE_PNL_EVENTS_INDICES = """
+CREATE INDEX IF NOT EXISTS idx_pnl_events_report_timestamp ON pnl_events(report_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_pnl_events_report_type ON pnl_events(report_id, type);
+CREATE INDEX IF NOT EXISTS idx_pnl_events_report_asset ON pnl_events(report_id, asset);
+"""
+
+# State of the accounting pot at a timestamp that later PnL reports can resume from.
+# The events hash covers all history events before the timestamp and the inputs hash the
+# settings, ignored actions and rules that affect processing, so that any change to them
+# makes the checkpoint unusable.
+DB_CREATE_PNL_CHECKPOINTS = """
+CREATE TABLE IF NOT EXISTS pnl_checkpoints (
+    timestamp INTEGER NOT NULL PRIMARY KEY,
+    inputs_hash TEXT NOT NULL,
+    events_hash TEXT NOT NULL,
+    processed_actions INTEGER NOT NULL,
+    state TEXT NOT NULL
+);
+"""
+
+# The processed events between the previous checkpoint and this one
+DB_CREATE_PNL_CHECKPOINT_EVENTS = """
+CREATE TABLE IF NOT EXISTS pnl_checkpoint_events (
+    identifier INTEGER NOT NULL PRIMARY KEY,
+    checkpoint_ts INTEGER NOT NULL,
+    timestamp INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    FOREIGN KEY (checkpoint_ts) REFERENCES pnl_checkpoints(timestamp)
+    ON DELETE CASCADE ON UPDATE CASCADE
+);
+"""
+
 DB_CREATE_SETTINGS = """
 CREATE TABLE IF NOT EXISTS settings (
     name VARCHAR[24] NOT NULL PRIMARY KEY,
@@ -61,6 +102,9 @@ BEGIN TRANSACTION;
 {DB_CREATE_REPORT_SETTINGS}
 {DB_CREATE_REPORT_TOTALS}
 {DB_CREATE_PNL_EVENTS}
+{DB_CREATE_PNL_EVENTS_INDICES}
+{DB_CREATE_PNL_CHECKPOINTS}
+{DB_CREATE_PNL_CHECKPOINT_EVENTS}
 {DB_CREATE_SETTINGS}
 COMMIT;
 PRAGMA foreign_keys=on;
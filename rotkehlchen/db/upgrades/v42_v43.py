@@ -36,14 +36,101 @@ def _add_new_supported_locations(write_cursor: 'DBCursor') -> None:
     )
 
 
+@enter_exit_debug_log()
+def _add_receipt_log_index(write_cursor: 'DBCursor') -> None:
+    """Create the index of the receipt logs by chain, address, first topic and block
+    and populate it with the logs of the receipts already in the DB"""
+    write_cursor.execute("""
+    CREATE TABLE IF NOT EXISTS evmtx_receipt_log_index (
+        log INTEGER NOT NULL PRIMARY KEY,
+        chain_id INTEGER NOT NULL,
+        address TEXT NOT NULL,
+        topic0 BLOB,  /* null for anonymous logs without topics */
+        block_number INTEGER NOT NULL,
+        FOREIGN KEY(log) REFERENCES evmtx_receipt_logs(identifier) ON DELETE CASCADE ON UPDATE CASCADE
+    );""")  # noqa: E501
+    write_cursor.execute(
+        'CREATE INDEX IF NOT EXISTS idx_evmtx_receipt_log_index_address ON '
+        'evmtx_receipt_log_index(chain_id, address, topic0, block_number);',
+    )
+    write_cursor.execute(
+        'CREATE INDEX IF NOT EXISTS idx_evmtx_receipt_log_index_topic ON '
+        'evmtx_receipt_log_index(chain_id, topic0, block_number);',
+    )
+    write_cursor.execute(
+        'INSERT OR IGNORE INTO evmtx_receipt_log_index(log, chain_id, address, topic0, block_number) '  # noqa: E501
+        'SELECT L.identifier, T.chain_id, L.address, P.topic, T.block_number '
+        'FROM evmtx_receipt_logs AS L INNER JOIN evm_transactions AS T ON L.tx_id=T.identifier '
+        'LEFT JOIN evmtx_receipt_log_topics AS P ON P.log=L.identifier AND P.topic_index=0',
+    )
+
+
+@enter_exit_debug_log()
+def _add_xpub_derived_addresses_table(write_cursor: 'DBCursor') -> None:
+    """Create the cache of the addresses derived from the xpubs"""
+    write_cursor.execute("""
+    CREATE TABLE IF NOT EXISTS xpub_derived_addresses (
+        xpub TEXT NOT NULL,
+        derivation_path TEXT NOT NULL,
+        blockchain TEXT NOT NULL,
+        account_index INTEGER NOT NULL,
+        derived_index INTEGER NOT NULL,
+        address TEXT NOT NULL,
+        FOREIGN KEY(xpub, derivation_path, blockchain) REFERENCES xpubs(
+            xpub,
+            derivation_path,
+            blockchain
+        ) ON DELETE CASCADE
+        PRIMARY KEY (xpub, derivation_path, blockchain, account_index, derived_index)
+    );""")
+
+
+@enter_exit_debug_log()
+def _add_eth2_daily_performance_table(write_cursor: 'DBCursor') -> None:
+    """Create the table of the daily cumulative profit of the validators. It gets
+    populated from the staking events the next time they are queried"""
+    write_cursor.execute("""
+    CREATE TABLE IF NOT EXISTS eth2_daily_performance (
+        validator_index INTEGER NOT NULL,
+        type CHAR(1) NOT NULL,
+        recipient TEXT NOT NULL,
+        timestamp INTEGER NOT NULL,
+        cumulative_amount TEXT NOT NULL,
+        events INTEGER NOT NULL,
+        last_identifier INTEGER NOT NULL,
+        PRIMARY KEY (validator_index, type, recipient, timestamp)
+    );""")
+    write_cursor.execute('CREATE INDEX IF NOT EXISTS idx_eth2_daily_performance_timestamp ON eth2_daily_performance(timestamp);')  # noqa: E501
+
+
+@enter_exit_debug_log()
+def _add_history_query_indexes(write_cursor: 'DBCursor') -> None:
+    """Create the indexes used by the filters of the history events and transactions
+    queries and by the timed balances of an asset"""
+    write_cursor.execute('CREATE INDEX IF NOT EXISTS idx_history_events_timestamp ON history_events(timestamp, sequence_index);')  # noqa: E501
+    write_cursor.execute('CREATE INDEX IF NOT EXISTS idx_history_events_location ON history_events(location, timestamp);')  # noqa: E501
+    write_cursor.execute('CREATE INDEX IF NOT EXISTS idx_history_events_location_label ON history_events(location_label, timestamp);')  # noqa: E501
+    write_cursor.execute('CREATE INDEX IF NOT EXISTS idx_history_events_asset ON history_events(asset, event_identifier);')  # noqa: E501
+    write_cursor.execute('CREATE INDEX IF NOT EXISTS idx_history_events_type ON history_events(type, subtype);')  # noqa: E501
+    write_cursor.execute('CREATE INDEX IF NOT EXISTS idx_evm_events_info_tx_hash ON evm_events_info(tx_hash);')  # noqa: E501
+    write_cursor.execute('CREATE INDEX IF NOT EXISTS idx_evm_events_info_counterparty ON evm_events_info(counterparty);')  # noqa: E501
+    write_cursor.execute('CREATE INDEX IF NOT EXISTS idx_evm_transactions_timestamp ON evm_transactions(timestamp);')  # noqa: E501
+    write_cursor.execute('CREATE INDEX IF NOT EXISTS idx_evmtx_address_mappings_address ON evmtx_address_mappings(address);')  # noqa: E501
+    write_cursor.execute('CREATE INDEX IF NOT EXISTS idx_timed_balances_currency ON timed_balances(currency, timestamp);')  # noqa: E501
+
+
 @enter_exit_debug_log(name='UserDB v42->v43 upgrade')
 def upgrade_v42_to_v43(db: 'DBHandler', progress_handler: 'DBUpgradeProgressHandler') -> None:
     """Upgrades the DB from v42 to v43. This was in v1.34 release.
 
     - add usd_price to the nfts table
     - change hop protocol counterparty value
+    - add the receipt log index
+    - add the cache of the addresses derived from xpubs
+    - add the daily cumulative profit of the validators
+    - add the indexes of the history queries
     """
-    progress_handler.set_total_steps(3)
+    progress_handler.set_total_steps(7)
     with db.user_write() as write_cursor:
         _add_usd_price_nft_table(write_cursor)
         progress_handler.new_step()
@@ -51,3 +138,11 @@ def upgrade_v42_to_v43(db: 'DBHandler', progress_handler: 'DBUpgradeProgressHand
         progress_handler.new_step()
         _add_new_supported_locations(write_cursor)
         progress_handler.new_step()
+        _add_receipt_log_index(write_cursor)
+        progress_handler.new_step()
+        _add_xpub_derived_addresses_table(write_cursor)
+        progress_handler.new_step()
+        _add_eth2_daily_performance_table(write_cursor)
+        progress_handler.new_step()
+        _add_history_query_indexes(write_cursor)
+        progress_handler.new_step()
@@ -11,6 +11,7 @@ from typing import TYPE_CHECKING, Any, Final, Literal
 from urllib.parse import urlencode
 
 import gevent
+import gevent.pool
 import requests
 
 from rotkehlchen.accounting.structures.balance import Balance
@@ -18,6 +19,7 @@ from rotkehlchen.assets.asset import AssetWithOracles
 from rotkehlchen.assets.converters import asset_from_binance
 from rotkehlchen.constants import ZERO
 from rotkehlchen.constants.assets import A_USD
+from rotkehlchen.db.cache import DBCacheDynamic
 from rotkehlchen.db.constants import BINANCE_MARKETS_KEY
 from rotkehlchen.db.history_events import DBHistoryEvents
 from rotkehlchen.db.ranges import DBQueryRanges
@@ -97,6 +99,15 @@ V3_METHODS: Final = (
 PUBLIC_METHODS: Final = ('exchangeInfo', 'time')
 
 RETRY_AFTER_LIMIT: Final = 60
+# Request weight per minute allowed by the spot api, which is shared by all requests of an IP
+# https://binance-docs.github.io/apidocs/spot/en/#limits
+BINANCE_REQUEST_WEIGHT_LIMIT: Final = 6000
+BINANCEUS_REQUEST_WEIGHT_LIMIT: Final = 1200
+# Part of the weight limit we use. The used weight is only known from the responses,
+# so the rest is kept for the requests in flight and for other clients of the IP.
+REQUEST_WEIGHT_BUDGET: Final = 0.8
+# Number of markets whose trades are queried concurrently
+MY_TRADES_CONCURRENCY: Final = 5
 # Binance api error codes we check for (all below apis seem to have the same)
 # https://binance-docs.github.io/apidocs/spot/en/#error-codes-2
 # https://binance-docs.github.io/apidocs/futures/en/#error-codes-2
@@ -229,6 +240,13 @@ class Binance(ExchangeInterface, ExchangeWithExtras):
         self.msg_aggregator = msg_aggregator
         self.offset_ms = 0
         self.selected_pairs = binance_selected_trade_pairs
+        self.request_weight_limit = BINANCEUS_REQUEST_WEIGHT_LIMIT if exchange_location == Location.BINANCEUS else BINANCE_REQUEST_WEIGHT_LIMIT  # noqa: E501
+        # request weight used in the current minute of the server as reported by binance
+        self.used_weight = 0
+        self.used_weight_minute = 0
+        # last processed trade id of each market in the last trade history query. Saved
+        # in the DB together with the trades by save_trade_history_state()
+        self.last_trade_ids: dict[str, int] = {}
 
     def first_connection(self) -> None:
         if self.first_connection_made:
@@ -293,6 +311,37 @@ class Binance(ExchangeInterface, ExchangeWithExtras):
 
         return True, ''
 
+    def _wait_for_request_weight(self) -> None:
+        """Wait until the next minute of the server if the request weight used in the
+        current one is over the budget"""
+        now_ms = ts_now_in_ms() + self.offset_ms
+        if (
+            now_ms // 60000 != self.used_weight_minute or
+            self.used_weight < self.request_weight_limit * REQUEST_WEIGHT_BUDGET
+        ):
+            return
+
+        wait_secs = (60000 - now_ms % 60000) / 1000
+        log.debug(
+            f'{self.name} used {self.used_weight} request weight in the current minute. '
+            f'Waiting {wait_secs} seconds before the next request',
+        )
+        gevent.sleep(wait_secs)
+
+    def _update_used_weight(self, response: requests.Response) -> None:
+        """Keep the request weight used in the current minute from the response headers"""
+        try:
+            used_weight = int(response.headers['x-mbx-used-weight-1m'])
+        except (KeyError, ValueError):
+            return
+
+        minute = (ts_now_in_ms() + self.offset_ms) // 60000
+        if minute != self.used_weight_minute:
+            self.used_weight_minute = minute
+            self.used_weight = used_weight
+        else:  # responses of concurrent requests may arrive out of order
+            self.used_weight = max(self.used_weight, used_weight)
+
     def api_query(
             self,
             api_type: BINANCE_API_TYPE,
@@ -344,6 +393,8 @@ class Binance(ExchangeInterface, ExchangeWithExtras):
                 f'https://{api_subdomain}.{self.uri}{api_type}/v{api_version!s}/{method}'
             )
             log.debug(f'{self.name} API request', request_url=request_url)
+            if api_type == 'api':  # only the spot api reports its used weight
+                self._wait_for_request_weight()
             try:
                 response = self.session.request(  # type: ignore[misc]  # keyword is a string as typed above
                     method=request_method,
@@ -356,6 +407,9 @@ class Binance(ExchangeInterface, ExchangeWithExtras):
                     f'{self.name} API request failed due to {e!s}',
                 ) from e
 
+            if api_type == 'api':
+                self._update_used_weight(response)
+
             if response.status_code not in {200, 418, 429}:
                 code = 'no code found'
                 msg = 'no message found'
@@ -1102,7 +1156,7 @@ class Binance(ExchangeInterface, ExchangeWithExtras):
         return balances
 
     @protect_with_lock()
-    @cache_response_timewise()
+    @cache_response_timewise(stale_while_revalidate=True)
     def query_balances(self) -> ExchangeQueryBalances:
         try:
             self.first_connection()
@@ -1136,12 +1190,57 @@ class Binance(ExchangeInterface, ExchangeWithExtras):
         )
         return dict(returned_balances), ''
 
+    def _query_market_trades(self, symbol: str, from_id: int) -> list[dict[str, Any]]:
+        """Query the trades of a market with an id greater or equal to `from_id`
+
+        May raise:
+        - RemoteError
+        - BinancePermissionError
+        """
+        raw_data = []
+        # Limit of results to return. 1000 is max limit according to docs
+        limit = 1000
+        len_result = limit
+        while len_result == limit:
+            # We know that myTrades returns a list from the api docs
+            result = self.api_query_list(
+                'api',
+                'myTrades',
+                options={
+                    'symbol': symbol,
+                    'fromId': from_id,
+                    'limit': limit,
+                    # Not specifying them since binance does not seem to
+                    # respect them and always return all trades
+                })
+            if result:
+                try:
+                    from_id = int(result[-1]['id']) + 1
+                except (ValueError, KeyError, IndexError) as e:
+                    raise RemoteError(
+                        f'Could not parse id from Binance myTrades api query result: {result}',
+                    ) from e
+
+            len_result = len(result)
+            log.debug(f'{self.name} myTrades query result', symbol=symbol, results_num=len_result)
+            for r in result:
+                r['symbol'] = symbol
+            raw_data.extend(result)
+
+        return raw_data
+
     def query_online_trade_history(
             self,
             start_ts: Timestamp,
             end_ts: Timestamp,
     ) -> tuple[list[Trade], tuple[Timestamp, Timestamp]]:
-        """
+        """Query the trades of all markets after the last trade seen in each of them
+
+        The id of the last processed trade of each market is saved in the DB along with
+        the trades by save_trade_history_state() so that later queries only ask for
+        newer trades. Because of that all the new trades up to
+        `end_ts` are returned, even the ones before `start_ts`, as they were never
+        returned before.
 
         May raise due to api query and unexpected id:
         - RemoteError
@@ -1153,41 +1252,36 @@ class Binance(ExchangeInterface, ExchangeWithExtras):
         else:
             iter_markets = list(self._symbols_to_pair.keys())
 
-        raw_data = []
-        # Limit of results to return. 1000 is max limit according to docs
-        limit = 1000
-        for symbol in iter_markets:
-            last_trade_id = 0
-            len_result = limit
-            while len_result == limit:
-                # We know that myTrades returns a list from the api docs
-                result = self.api_query_list(
-                    'api',
-                    'myTrades',
-                    options={
-                        'symbol': symbol,
-                        'fromId': last_trade_id,
-                        'limit': limit,
-                        # Not specifying them since binance does not seem to
-                        # respect them and always return all trades
-                    })
-                if result:
-                    try:
-                        last_trade_id = int(result[-1]['id']) + 1
-                    except (ValueError, KeyError, IndexError) as e:
-                        raise RemoteError(
-                            f'Could not parse id from Binance myTrades api query result: {result}',
-                        ) from e
+        with self.db.conn.read_ctx() as cursor:
+            from_ids = {}
+            for symbol in iter_markets:
+                last_trade_id = self.db.get_dynamic_cache(
+                    cursor=cursor,
+                    name=DBCacheDynamic.LAST_TRADE_ID,
+                    location=self.location.serialize(),
+                    location_name=self.name,
+                    symbol=symbol,
+                )
+                from_ids[symbol] = 0 if last_trade_id is None else last_trade_id + 1
 
-                len_result = len(result)
-                log.debug(f'{self.name} myTrades query result', results_num=len_result)
-                for r in result:
-                    r['symbol'] = symbol
-                raw_data.extend(result)
+        def query_market(symbol: str) -> list[dict[str, Any]] | RemoteError:
+            """Return the error instead of raising it in the pool's greenlet"""
+            try:
+                return self._query_market_trades(symbol=symbol, from_id=from_ids[symbol])
+            except RemoteError as e:
+                return e
+
+        raw_data = []
+        for result in gevent.pool.Pool(size=MY_TRADES_CONCURRENCY).map(query_market, iter_markets):
+            if isinstance(result, RemoteError):
+                raise result
 
-            raw_data.sort(key=operator.itemgetter('time'))
+            raw_data.extend(result)
 
+        raw_data.sort(key=operator.itemgetter('time'))
         trades = []
+        last_trade_ids: dict[str, int] = {}
+        failed_markets: set[str] = set()  # the last trade id is not advanced past a failed trade  # noqa: E501
         for raw_trade in raw_data:
             try:
                 trade = trade_from_binance(
@@ -1195,19 +1289,22 @@ class Binance(ExchangeInterface, ExchangeWithExtras):
                     binance_symbols_to_pair=self.symbols_to_pair,
                     location=self.location,
                 )
+                trade_id = int(raw_trade['id'])
             except UnknownAsset as e:
                 log.error(
                     f'Found {self.name} trade with unknown asset '
                     f'{e.identifier}. Ignoring it.',
                 )
+                failed_markets.add(raw_trade['symbol'])
                 continue
             except UnsupportedAsset as e:
                 log.error(
                     f'Found {self.name} trade with unsupported asset '
                     f'{e.identifier}. Ignoring it.',
                 )
+                failed_markets.add(raw_trade['symbol'])
                 continue
-            except (DeserializationError, KeyError) as e:
+            except (DeserializationError, KeyError, ValueError) as e:
                 msg = str(e)
                 if isinstance(e, KeyError):
                     msg = f'Missing key entry for {msg}.'
@@ -1220,24 +1317,39 @@ class Binance(ExchangeInterface, ExchangeWithExtras):
                     trade=raw_trade,
                     error=msg,
                 )
+                failed_markets.add(raw_trade['symbol'])
                 continue
 
-            # Since binance does not respect the given timestamp range, limit the range here
-            if trade.timestamp < start_ts:
-                continue
-
+            # Since binance does not respect the given timestamp range, limit the range here.
+            # Later trades are queried again next time.
             if trade.timestamp > end_ts:
                 break
 
             trades.append(trade)
+            if raw_trade['symbol'] not in failed_markets:
+                last_trade_ids[raw_trade['symbol']] = trade_id
 
         fiat_payments = self._query_online_fiat_payments(start_ts=start_ts, end_ts=end_ts)
         if fiat_payments:
             trades += fiat_payments
             trades.sort(key=lambda x: x.timestamp)
 
+        self.last_trade_ids = last_trade_ids
         return trades, (start_ts, end_ts)
 
+    def save_trade_history_state(self, write_cursor: 'DBCursor') -> None:
+        for symbol, trade_id in self.last_trade_ids.items():
+            self.db.set_dynamic_cache(
+                write_cursor=write_cursor,
+                name=DBCacheDynamic.LAST_TRADE_ID,
+                value=trade_id,
+                location=self.location.serialize(),
+                location_name=self.name,
+                symbol=symbol,
+            )
+
+        self.last_trade_ids = {}
+
     def _query_online_fiat_payments(self, start_ts: Timestamp, end_ts: Timestamp) -> list[Trade]:
         if self.location == Location.BINANCEUS:
             return []  # dont exist for Binance US: https://github.com/rotki/rotki/issues/3664
@@ -841,7 +841,7 @@ class Bitfinex(ExchangeInterface):
         self.first_connection_made = True
 
     @protect_with_lock()
-    @cache_response_timewise()
+    @cache_response_timewise(stale_while_revalidate=True)
     def query_balances(self) -> ExchangeQueryBalances:
         """Return the account exchange balances on Bitfinex
 
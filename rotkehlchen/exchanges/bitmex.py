@@ -239,7 +239,7 @@ class Bitmex(ExchangeInterface):
         return result
 
     @protect_with_lock()
-    @cache_response_timewise()
+    @cache_response_timewise(stale_while_revalidate=True)
     def query_balances(self) -> ExchangeQueryBalances:
         returned_balances: dict[AssetWithOracles, Balance] = {}
         try:
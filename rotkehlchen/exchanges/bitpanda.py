@@ -465,7 +465,7 @@ class Bitpanda(ExchangeInterface):
 
     # ---- General exchanges interface ----
     @protect_with_lock()
-    @cache_response_timewise()
+    @cache_response_timewise(stale_while_revalidate=True)
     def query_balances(self) -> ExchangeQueryBalances:
         try:
             wallets, _, _ = self._api_query('wallets')
@@ -154,7 +154,7 @@ class Bitstamp(ExchangeInterface):
         return changed
 
     @protect_with_lock()
-    @cache_response_timewise()
+    @cache_response_timewise(stale_while_revalidate=True)
     def query_balances(self) -> ExchangeQueryBalances:
         """Return the account balances on Bistamp
 
@@ -467,7 +467,7 @@ class Coinbase(ExchangeInterface):
         return all_items
 
     @protect_with_lock()
-    @cache_response_timewise()
+    @cache_response_timewise(stale_while_revalidate=True)
     def query_balances(self) -> ExchangeQueryBalances:
         try:
             resp = self._api_query('accounts')
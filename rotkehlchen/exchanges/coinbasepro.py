@@ -318,7 +318,7 @@ class Coinbasepro(ExchangeInterface):
         return self.account_to_currency
 
     @protect_with_lock()
-    @cache_response_timewise()
+    @cache_response_timewise(stale_while_revalidate=True)
     def query_balances(self) -> ExchangeQueryBalances:
         try:
             accounts, _ = self._api_query('accounts')
@@ -1,11 +1,11 @@
 import logging
+import time
 from abc import abstractmethod
 from collections.abc import Callable
 from typing import TYPE_CHECKING, Any
 
-import requests
-
 from rotkehlchen.accounting.structures.balance import Balance
+from rotkehlchen.api.websockets.typedefs import ExchangeHistorySyncStep, WSMessageType
 from rotkehlchen.assets.asset import AssetWithOracles
 from rotkehlchen.db.filtering import (
     AssetMovementsFilterQuery,
@@ -30,9 +30,11 @@ from rotkehlchen.types import (
 from rotkehlchen.utils.misc import set_user_agent
 from rotkehlchen.utils.mixins.cacheable import CacheableMixIn
 from rotkehlchen.utils.mixins.lockable import LockableQueryMixIn, protect_with_lock
+from rotkehlchen.utils.rate_limit import RateLimitedSession
 
 if TYPE_CHECKING:
     from rotkehlchen.db.dbhandler import DBHandler
+    from rotkehlchen.db.drivers.gevent import DBCursor
     from rotkehlchen.history.events.structures.base import HistoryEvent
 
 logger = logging.getLogger(__name__)
@@ -89,7 +91,7 @@ class ExchangeInterface(CacheableMixIn, LockableQueryMixIn):
         self.api_key = api_key
         self.secret = secret
         self.first_connection_made = False
-        self.session = requests.session()
+        self.session = RateLimitedSession(api_key_getter=lambda: self.api_key)
         set_user_agent(self.session)
         log.info(f'Initialized {location!s} exchange {name}')
 
@@ -188,6 +190,14 @@ class ExchangeInterface(CacheableMixIn, LockableQueryMixIn):
             'query_online_trade_history() should only be implemented by subclasses',
         )
 
+    def save_trade_history_state(self, write_cursor: 'DBCursor') -> None:
+        """Saves the state of the last query_online_trade_history() call in the same
+        transaction that saves the trades it returned.
+
+        Should be implemented by subclasses that keep state of the queried trades, such
+        as where to continue the next query from, so that it's never saved without them.
+        """
+
     def query_online_margin_history(
             self,
             start_ts: Timestamp,
@@ -281,6 +291,8 @@ class ExchangeInterface(CacheableMixIn, LockableQueryMixIn):
                     if len(new_trades) != 0:
                         self.db.add_trades(write_cursor=write_cursor, trades=new_trades)
 
+                    self.save_trade_history_state(write_cursor)
+
                     # and also set the used queried timestamp range for the exchange
                     ranges.update_used_query_range(
                         write_cursor=write_cursor,
@@ -467,39 +479,56 @@ class ExchangeInterface(CacheableMixIn, LockableQueryMixIn):
     ) -> None:
         """Queries the historical event endpoints for this exchange and performs actions.
         The results are saved in the DB.
-        In case of failure passes the error to failure_callback
+        In case of failure passes the error to failure_callback and goes on with the next
+        endpoint since the queried ranges of each endpoint are saved separately.
 
         `new_step_data` argument contains callback and exchange name to be used for steps.
+        The progress of each endpoint is also sent over the websockets.
         """
-        if new_step_data is not None:
-            new_step_callback, exchange_name = new_step_data
-            new_step_callback(f'Querying {exchange_name} trades history')
-        try:
-            self.query_trade_history(
+        endpoint_queries: tuple[tuple[str, str, Callable[[], list]], ...] = (
+            ('trades', 'trades', lambda: self.query_trade_history(
                 start_ts=start_ts,
                 end_ts=end_ts,
                 only_cache=False,
-            )
-            if new_step_data is not None:
-                new_step_callback(f'Querying {exchange_name} margin history')
-            self.query_margin_history(
+            )),
+            ('margin_positions', 'margin', lambda: self.query_margin_history(
                 start_ts=start_ts,
                 end_ts=end_ts,
-            )
-            if new_step_data is not None:
-                new_step_callback(f'Querying {exchange_name} asset movements history')
-            self.query_deposits_withdrawals(
+            )),
+            ('asset_movements', 'asset movements', lambda: self.query_deposits_withdrawals(
                 start_ts=start_ts,
                 end_ts=end_ts,
                 only_cache=False,
-            )
-            if new_step_data is not None:
-                new_step_callback(f'Querying {exchange_name} events history')
-            self.query_income_loss_expense(
+            )),
+            ('history_events', 'events', lambda: self.query_income_loss_expense(
                 start_ts=start_ts,
                 end_ts=end_ts,
                 only_cache=False,
+            )),
+        )
+        for endpoint, step_name, query in endpoint_queries:
+            if new_step_data is not None:
+                new_step_callback, exchange_name = new_step_data
+                new_step_callback(f'Querying {exchange_name} {step_name} history')
+            self._notify_history_sync(endpoint=endpoint, step=ExchangeHistorySyncStep.STARTED)
+            query_start = time.monotonic()
+            try:
+                entries = len(query())
+            except RemoteError as e:
+                fail_callback(str(e))
+                self._notify_history_sync(endpoint=endpoint, step=ExchangeHistorySyncStep.FAILED)
+                continue
+
+            duration = time.monotonic() - query_start
+            self._notify_history_sync(
+                endpoint=endpoint,
+                step=ExchangeHistorySyncStep.FINISHED,
+                duration=round(duration, 3),
+                entries=entries,
+                entries_per_second=round(entries / duration, 3) if duration != 0 else None,
             )
+
+        try:
             # No new step for exchange_specific_history since it is not used in any exchange atm.
             self.query_exchange_specific_history(
                 start_ts=start_ts,
@@ -507,3 +536,19 @@ class ExchangeInterface(CacheableMixIn, LockableQueryMixIn):
             )
         except RemoteError as e:
             fail_callback(str(e))
+
+    def _notify_history_sync(
+            self,
+            endpoint: str,
+            step: ExchangeHistorySyncStep,
+            **kwargs: Any,
+    ) -> None:
+        self.db.msg_aggregator.add_message(
+            message_type=WSMessageType.EXCHANGE_HISTORY_SYNC,
+            data={
+                'location': str(self.location),
+                'name': self.name,
+                'endpoint': endpoint,
+                'status': str(step),
+            } | kwargs,
+        )
@@ -293,7 +293,7 @@ class Gemini(ExchangeInterface):
         return json_ret
 
     @protect_with_lock()
-    @cache_response_timewise()
+    @cache_response_timewise(stale_while_revalidate=True)
     def query_balances(self) -> ExchangeQueryBalances:
         try:
             balances = self._private_api_query('balances')
@@ -383,7 +383,7 @@ class Kraken(ExchangeInterface, ExchangeWithExtras):
 
     # ---- General exchanges interface ----
     @protect_with_lock()
-    @cache_response_timewise()
+    @cache_response_timewise(stale_while_revalidate=True)
     def query_balances(self) -> ExchangeQueryBalances:
         try:
             kraken_balances = self.api_query('Balance', req={})
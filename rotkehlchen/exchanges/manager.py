@@ -5,10 +5,17 @@ from importlib import import_module
 from types import ModuleType
 from typing import TYPE_CHECKING, Any, Optional
 
+from gevent.pool import Pool
+
 from rotkehlchen.db.constants import BINANCE_MARKETS_KEY, KRAKEN_ACCOUNT_TYPE_KEY
 from rotkehlchen.errors.misc import InputError
 from rotkehlchen.exchanges.binance import BINANCE_BASE_URL, BINANCEUS_BASE_URL
-from rotkehlchen.exchanges.exchange import ExchangeInterface, ExchangeWithExtras
+from rotkehlchen.exchanges.exchange import (
+    ExchangeHistoryFailCallback,
+    ExchangeHistoryNewStepCallback,
+    ExchangeInterface,
+    ExchangeWithExtras,
+)
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.types import (
     ApiKey,
@@ -16,6 +23,7 @@ from rotkehlchen.types import (
     ExchangeApiCredentials,
     ExchangeAuthCredentials,
     Location,
+    Timestamp,
 )
 from rotkehlchen.user_messages import MessagesAggregator
 
@@ -28,6 +36,9 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
+# Maximum number of exchanges whose history is queried at the same time
+MAX_PARALLEL_EXCHANGE_QUERIES = 4
+
 
 class ExchangeManager:
 
@@ -70,6 +81,31 @@ class ExchangeManager:
                 if exchange.location_id() not in excluded:
                     yield exchange
 
+    def query_history_with_callbacks(
+            self,
+            start_ts: Timestamp,
+            end_ts: Timestamp,
+            fail_callback: ExchangeHistoryFailCallback,
+            new_step_callback: ExchangeHistoryNewStepCallback | None = None,
+            max_parallel: int = MAX_PARALLEL_EXCHANGE_QUERIES,
+    ) -> None:
+        """Queries the history of all connected and syncing exchanges and saves it in the DB
+
+        Each exchange is queried in its own greenlet with at most max_parallel of them at
+        the same time, so that a slow exchange doesn't delay the rest.
+        """
+        pool = Pool(size=max_parallel)
+        greenlets = [pool.spawn(
+            exchange.query_history_with_callbacks,
+            start_ts=start_ts,
+            end_ts=end_ts,
+            fail_callback=fail_callback,
+            new_step_data=None if new_step_callback is None else (new_step_callback, exchange.name),  # noqa: E501
+        ) for exchange in self.iterate_exchanges()]
+        pool.join()
+        for greenlet in greenlets:
+            greenlet.get()  # raise any unexpected error of the exchange queries
+
     def edit_exchange(
             self,
             name: str,
@@ -146,7 +182,7 @@ class ExchangeManager:
         Deletes an exchange with the specified name + location from both connected_exchanges
         and the DB.
         """
-        if self.get_exchange(name=name, location=location) is None:
+        if (exchange := self.get_exchange(name=name, location=location)) is None:
             return False, f'{location!s} exchange {name} is not registered'
 
         exchanges_list = self.connected_exchanges.get(location)
@@ -157,6 +193,7 @@ class ExchangeManager:
             self.connected_exchanges.pop(location)
         else:
             self.connected_exchanges[location] = [x for x in exchanges_list if x.name != name]
+        exchange.kill_cache_refreshes()
         with self.database.user_write() as write_cursor:  # Also remove it from the db
             self.database.remove_exchange(write_cursor=write_cursor, name=name, location=location)
             self.database.delete_used_query_range_for_exchange(
@@ -168,6 +205,9 @@ class ExchangeManager:
 
     def delete_all_exchanges(self) -> None:
         """Deletes all exchanges from the manager. Not from the DB"""
+        for exchanges in self.connected_exchanges.values():
+            for exchange in exchanges:
+                exchange.kill_cache_refreshes()
         self.connected_exchanges.clear()
 
     def get_connected_exchanges_info(self) -> list[dict[str, Any]]:
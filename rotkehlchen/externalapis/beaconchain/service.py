@@ -13,6 +13,7 @@ from rotkehlchen.chain.ethereum.modules.eth2.structures import ValidatorDailySta
 from rotkehlchen.chain.ethereum.modules.eth2.utils import calculate_query_chunks
 from rotkehlchen.constants.misc import ZERO
 from rotkehlchen.db.cache import DBCacheStatic
+from rotkehlchen.db.eth2 import DBEth2
 from rotkehlchen.db.history_events import DBHistoryEvents
 from rotkehlchen.db.settings import CachedSettings
 from rotkehlchen.errors.misc import RemoteError
@@ -35,6 +36,7 @@ from rotkehlchen.utils.misc import (
     ts_now,
     ts_sec_to_ms,
 )
+from rotkehlchen.utils.rate_limit import RateLimitedSession
 from rotkehlchen.utils.serialization import jsonloads_dict
 
 if TYPE_CHECKING:
@@ -53,7 +55,7 @@ class BeaconChain(ExternalServiceWithApiKey):
         super().__init__(database=database, service_name=ExternalService.BEACONCHAIN)
         self.db: DBHandler  # specifying DB is not optional
         self.msg_aggregator = msg_aggregator
-        self.session = requests.session()
+        self.session = RateLimitedSession(api_key_getter=lambda: self.api_key)
         self.warning_given = False
         set_user_agent(self.session)
         self.url = f'{BEACONCHAIN_ROOT_URL}/api/v1/'
@@ -335,6 +337,7 @@ class BeaconChain(ExternalServiceWithApiKey):
                     name=DBCacheStatic.LAST_PRODUCED_BLOCKS_QUERY_TS,
                     value=ts_now(),
                 )
+                DBEth2(self.db).update_daily_performance(write_cursor)
 
         except KeyError as e:  # raising and not continuing since if 1 key missing something is off  # noqa: E501
             raise RemoteError(
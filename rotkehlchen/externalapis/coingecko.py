@@ -1,5 +1,6 @@
 import json
 import logging
+from collections import defaultdict
 from http import HTTPStatus
 from typing import Any, Literal, NamedTuple, overload
 from urllib.parse import urlencode
@@ -20,8 +21,15 @@ from rotkehlchen.history.types import HistoricalPrice, HistoricalPriceOracle
 from rotkehlchen.interfaces import HistoricalPriceOracleWithCoinListInterface
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.types import ChainID, EvmTokenKind, Price, Timestamp
-from rotkehlchen.utils.misc import create_timestamp, set_user_agent, timestamp_to_date, ts_now
+from rotkehlchen.utils.misc import (
+    create_timestamp,
+    get_chunks,
+    set_user_agent,
+    timestamp_to_date,
+    ts_now,
+)
 from rotkehlchen.utils.mixins.penalizable_oracle import PenalizablePriceOracleMixin
+from rotkehlchen.utils.rate_limit import RateLimitedSession
 
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
@@ -451,6 +459,8 @@ DELISTED_ASSETS = {
     evm_address_to_identifier(address='0xCB5A05beF3257613E984C17DbcF039952B6d883F', chain_id=ChainID.ETHEREUM, token_type=EvmTokenKind.ERC20),  # noqa: E501
 }
 
+# Number of coins queried in a single request to the simple/price endpoint
+COINGECKO_SIMPLE_PRICE_IDS_LIMIT = 100
 COINGECKO_SIMPLE_VS_CURRENCIES = [
     'btc',
     'eth',
@@ -518,7 +528,7 @@ class Coingecko(HistoricalPriceOracleWithCoinListInterface, PenalizablePriceOrac
     def __init__(self) -> None:
         HistoricalPriceOracleWithCoinListInterface.__init__(self, oracle_name='coingecko')
         PenalizablePriceOracleMixin.__init__(self)
-        self.session = requests.session()
+        self.session = RateLimitedSession()
         set_user_agent(self.session)
         self.last_rate_limit = 0
 
@@ -721,6 +731,62 @@ class Coingecko(HistoricalPriceOracleWithCoinListInterface, PenalizablePriceOrac
             )
             return ZERO_PRICE, False
 
+    def query_multiple_current_prices(
+            self,
+            from_assets: list[AssetWithOracles],
+            to_asset: AssetWithOracles,
+    ) -> dict[AssetWithOracles, Price]:
+        """Returns the simple prices of many assets to to_asset in coingecko querying
+        the simple/price endpoint with multiple ids per request.
+
+        May raise:
+        - RemoteError if there is a problem querying coingecko
+        """
+        vs_currency = Coingecko.check_vs_currencies(
+            from_asset=from_assets[0],
+            to_asset=to_asset,
+            location='simple prices',
+        )
+        if not vs_currency:
+            return {}
+
+        id_to_assets: defaultdict[str, list[AssetWithOracles]] = defaultdict(list)
+        for from_asset in from_assets:
+            try:
+                id_to_assets[from_asset.to_coingecko()].append(from_asset)
+            except UnsupportedAsset:
+                log.warning(
+                    f'Tried to query coingecko simple price from {from_asset.identifier} '
+                    f'to {to_asset.identifier}. But from_asset is not supported in coingecko',
+                )
+
+        prices = {}
+        for coingecko_ids in get_chunks(list(id_to_assets), n=COINGECKO_SIMPLE_PRICE_IDS_LIMIT):
+            result = self._query(
+                module='simple/price',
+                options={
+                    'ids': ','.join(coingecko_ids),
+                    'vs_currencies': vs_currency,
+                })
+            for coingecko_id in coingecko_ids:
+                try:
+                    price = Price(FVal(result[coingecko_id][vs_currency]))
+                except KeyError as e:
+                    log.warning(
+                        f'Queried coingecko simple price for {coingecko_id} to '
+                        f'{to_asset.identifier}. But got key error for {e!s} when '
+                        f'processing the result.',
+                    )
+                    continue
+
+                if price == ZERO_PRICE:
+                    continue
+
+                for from_asset in id_to_assets[coingecko_id]:
+                    prices[from_asset] = price
+
+        return prices
+
     def can_query_history(
             self,
             from_asset: Asset,  # pylint: disable=unused-argument
@@ -1,5 +1,6 @@
 import logging
-from collections import deque
+from collections import defaultdict, deque
+from collections.abc import Iterator
 from json.decoder import JSONDecodeError
 from typing import TYPE_CHECKING, Any, Literal, Optional
 
@@ -53,6 +54,7 @@ from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.types import ExternalService, Price, Timestamp
 from rotkehlchen.utils.misc import pairwise, set_user_agent, ts_now
 from rotkehlchen.utils.mixins.penalizable_oracle import PenalizablePriceOracleMixin
+from rotkehlchen.utils.rate_limit import RateLimitedSession
 from rotkehlchen.utils.serialization import jsonloads_dict
 
 if TYPE_CHECKING:
@@ -159,6 +161,24 @@ CRYPTOCOMPARE_SPECIAL_CASES_MAPPING = {
 }
 CRYPTOCOMPARE_SPECIAL_CASES = CRYPTOCOMPARE_SPECIAL_CASES_MAPPING.keys()
 CRYPTOCOMPARE_HOURQUERYLIMIT = 2000
+# Max length of the comma separated symbols of the pricemulti endpoint
+CRYPTOCOMPARE_FSYMS_MAX_LENGTH = 300
+
+
+def _chunk_symbols(symbols: list[str]) -> Iterator[list[str]]:
+    """Split the symbols in chunks that fit in the fsyms parameter of a single query"""
+    chunk: list[str] = []
+    length = 0
+    for symbol in symbols:
+        if len(chunk) != 0 and length + len(symbol) > CRYPTOCOMPARE_FSYMS_MAX_LENGTH:
+            yield chunk
+            chunk, length = [], 0
+
+        chunk.append(symbol)
+        length += len(symbol) + 1  # +1 for the separating comma
+
+    if len(chunk) != 0:
+        yield chunk
 
 
 def _multiply_str_nums(a: str, b: str) -> str:
@@ -198,7 +218,7 @@ class Cryptocompare(ExternalServiceWithApiKey, HistoricalPriceOracleWithCoinList
             service_name=ExternalService.CRYPTOCOMPARE,
         )
         PenalizablePriceOracleMixin.__init__(self)
-        self.session = requests.session()
+        self.session = RateLimitedSession(api_key_getter=lambda: self.api_key)
         set_user_agent(self.session)
         self.last_histohour_query_ts = 0
         self.last_rate_limit = 0
@@ -483,6 +503,60 @@ class Cryptocompare(ExternalServiceWithApiKey, HistoricalPriceOracleWithCoinList
 
         return Price(FVal(result[cc_to_asset_symbol])), False
 
+    def query_multiple_current_prices(
+            self,
+            from_assets: list[AssetWithOracles],
+            to_asset: AssetWithOracles,
+    ) -> dict[AssetWithOracles, Price]:
+        """Returns the current prices of many assets to to_asset using the pricemulti
+        endpoint. Special case assets are queried one by one via their intermediaries.
+
+        - May raise RemoteError if there is a problem reaching the cryptocompare server
+        or with reading the response returned by the server
+        """
+        if to_asset.identifier in CRYPTOCOMPARE_SPECIAL_CASES:
+            return super().query_multiple_current_prices(from_assets=from_assets, to_asset=to_asset)  # noqa: E501
+
+        try:
+            cc_to_asset_symbol = to_asset.to_cryptocompare()
+        except UnsupportedAsset:
+            log.warning(f'Tried to query cryptocompare prices to unsupported {to_asset.identifier}')  # noqa: E501
+            return {}
+
+        special_assets = []
+        symbol_to_assets: defaultdict[str, list[AssetWithOracles]] = defaultdict(list)
+        for from_asset in from_assets:
+            if from_asset.identifier in CRYPTOCOMPARE_SPECIAL_CASES:
+                special_assets.append(from_asset)
+                continue
+
+            try:
+                symbol_to_assets[from_asset.to_cryptocompare()].append(from_asset)
+            except UnsupportedAsset:
+                log.warning(
+                    f'Tried to query cryptocompare price of {from_asset.identifier} '
+                    f'but it is not supported by cryptocompare',
+                )
+
+        prices = {}
+        for symbols in _chunk_symbols(list(symbol_to_assets)):
+            result = self._api_query(path=f'pricemulti?fsyms={",".join(symbols)}&tsyms={cc_to_asset_symbol}')  # noqa: E501
+            for symbol in symbols:
+                # symbols without a price are missing from the result
+                if (raw_price := result.get(symbol, {}).get(cc_to_asset_symbol)) is None:
+                    continue
+
+                if (price := Price(FVal(raw_price))) == ZERO_PRICE:
+                    continue
+
+                for from_asset in symbol_to_assets[symbol]:
+                    prices[from_asset] = price
+
+        if len(special_assets) != 0:
+            prices |= super().query_multiple_current_prices(from_assets=special_assets, to_asset=to_asset)  # noqa: E501
+
+        return prices
+
     def query_endpoint_pricehistorical(
             self,
             from_asset: AssetWithOracles,
@@ -1,5 +1,6 @@
 import json
 import logging
+from collections import defaultdict
 from http import HTTPStatus
 from typing import Any
 from urllib.parse import urlencode
@@ -25,12 +26,14 @@ from rotkehlchen.inquirer import Inquirer
 from rotkehlchen.interfaces import HistoricalPriceOracleInterface
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.types import ChainID, Price, Timestamp
-from rotkehlchen.utils.misc import create_timestamp, timestamp_to_date, ts_now
+from rotkehlchen.utils.misc import create_timestamp, get_chunks, timestamp_to_date, ts_now
 from rotkehlchen.utils.mixins.penalizable_oracle import PenalizablePriceOracleMixin
+from rotkehlchen.utils.rate_limit import RateLimitedSession
 
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 MIN_DEFILLAMA_CONFIDENCE = FVal('0.20')
+DEFILLAMA_COINS_PER_QUERY = 50
 
 
 class Defillama(HistoricalPriceOracleInterface, PenalizablePriceOracleMixin):
@@ -38,7 +41,7 @@ class Defillama(HistoricalPriceOracleInterface, PenalizablePriceOracleMixin):
     def __init__(self) -> None:
         HistoricalPriceOracleInterface.__init__(self, oracle_name='defillama')
         PenalizablePriceOracleMixin.__init__(self)
-        self.session = requests.session()
+        self.session = RateLimitedSession()
         self.session.headers.update({'User-Agent': 'rotkehlchen'})
         self.last_rate_limit = 0
 
@@ -195,6 +198,52 @@ class Defillama(HistoricalPriceOracleInterface, PenalizablePriceOracleMixin):
         rate_price = Inquirer.find_price(from_asset=A_USD, to_asset=to_asset)
         return Price(usd_price * rate_price), False
 
+    def query_multiple_current_prices(
+            self,
+            from_assets: list[AssetWithOracles],
+            to_asset: AssetWithOracles,
+    ) -> dict[AssetWithOracles, Price]:
+        """Returns the current prices of many assets to to_asset in Defillama querying
+        multiple coins per request.
+
+        May raise:
+        - RemoteError if there is a problem querying defillama
+        """
+        id_to_assets: defaultdict[str, list[AssetWithOracles]] = defaultdict(list)
+        for from_asset in from_assets:
+            try:
+                id_to_assets[self._get_asset_id(from_asset)].append(from_asset)
+            except UnsupportedAsset:
+                log.warning(
+                    f'Tried to query current price using Defillama from {from_asset} to '
+                    f'{to_asset} but {from_asset} is not an EVM token and is not '
+                    f'supported by defillama',
+                )
+
+        usd_prices = {}
+        for coin_ids in get_chunks(list(id_to_assets), n=DEFILLAMA_COINS_PER_QUERY):
+            result = self._query(module='prices', subpath=f'current/{",".join(coin_ids)}')
+            for coin_id in coin_ids:
+                if coin_id not in result.get('coins', {}):
+                    continue  # coins without a price are missing from the result
+
+                if (usd_price := self._deserialize_price(
+                    result=result,
+                    coin_id=coin_id,
+                    from_asset=id_to_assets[coin_id][0],
+                    to_asset=to_asset,
+                )) == ZERO:
+                    continue
+
+                for from_asset in id_to_assets[coin_id]:
+                    usd_prices[from_asset] = usd_price
+
+        if len(usd_prices) == 0 or to_asset == A_USD:
+            return usd_prices
+
+        rate_price = Inquirer.find_price(from_asset=A_USD, to_asset=to_asset)
+        return {asset: Price(usd_price * rate_price) for asset, usd_price in usd_prices.items()}
+
     def can_query_history(
             self,
             from_asset: Asset,  # pylint: disable=unused-argument
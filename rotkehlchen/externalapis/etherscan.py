@@ -42,6 +42,7 @@ from rotkehlchen.types import (
 )
 from rotkehlchen.utils.data_structures import LRUCacheWithRemove
 from rotkehlchen.utils.misc import hex_or_bytes_to_int, set_user_agent
+from rotkehlchen.utils.rate_limit import RateLimitedSession
 from rotkehlchen.utils.serialization import jsonloads_dict
 
 if TYPE_CHECKING:
@@ -107,7 +108,7 @@ class Etherscan(ExternalServiceWithApiKey, ABC):
             SupportedBlockchain.SCROLL,
         ) else 'api-'
         self.base_url = base_url
-        self.session = requests.session()
+        self.session = RateLimitedSession(api_key_getter=lambda: self.api_key)
         self.warning_given = False
         set_user_agent(self.session)
         self.timestamp_to_block_cache: LRUCacheWithRemove[Timestamp, int] = LRUCacheWithRemove(maxsize=32)  # noqa: E501
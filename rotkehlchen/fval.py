@@ -1,6 +1,9 @@
+import logging
+import os
+import re
 from decimal import Decimal, DefaultContext, InvalidOperation, setcontext
 from math import ceil, log10
-from typing import Any, Union
+from typing import Any, Literal, Union
 
 from rotkehlchen.errors.serialization import ConversionError
 
@@ -8,9 +11,18 @@ from rotkehlchen.errors.serialization import ConversionError
 AcceptableFValInitInput = Union[float, bytes, Decimal, int, str, 'FVal']
 AcceptableFValOtherInput = Union[int, 'FVal']
 
+logger = logging.getLogger(__name__)
+
 DefaultContext.prec = ceil(log10(2 ** 256))  # support upto uint256 max value
 setcontext(DefaultContext)
 
+FVAL_BACKEND_ENV = 'ROTKI_FVAL_BACKEND'
+FIXED_POINT_MAX_DECIMALS = 36  # enough for the product of two 18 decimal token amounts
+# coefficients with more digits than the Decimal precision would be rounded by Decimal
+FIXED_POINT_MAX_COEFFICIENT = 10 ** DefaultContext.prec
+_POWERS_OF_TEN = [10 ** x for x in range(FIXED_POINT_MAX_DECIMALS + 1)]
+_FIXED_POINT_RE = re.compile(rf'(-?[0-9]+)\.?([0-9]{{0,{FIXED_POINT_MAX_DECIMALS}}})')
+
 
 class FVal:
     """A value to represent numbers for financial applications. At the moment
@@ -195,3 +207,262 @@ def _evaluate_input(other: Any) -> Decimal | int:
         raise NotImplementedError(f'Expected either FVal or int. Got {type(other)}: {other}')
     # else
     return other
+
+
+class FixedPointFVal(FVal):
+    """An FVal backend that keeps values with up to FIXED_POINT_MAX_DECIMALS decimal digits
+    as an integer coefficient and the number of decimal digits, so that most operations on
+    amounts and prices are python int operations instead of Decimal ones.
+
+    The results are exactly those of the Decimal backend, including the number of decimal
+    digits kept in the string representation. Values that can't be represented like that,
+    such as the results of most divisions or values that Decimal would round, are kept
+    as a Decimal and operations on them fall back to Decimal.
+    """
+
+    # The fast paths check exact types since bool is an int and should not be taken
+    # as one, and since isinstance is noticeably slower in these hot paths
+    # pylint: disable=unidiomatic-typecheck
+    __slots__ = ('_coef', '_dec', '_exp')
+    _coef: int
+    _exp: int  # number of decimal digits
+    _dec: Decimal | None  # set only for values that can't be fixed point
+
+    def __init__(self, data: AcceptableFValInitInput = 0):
+        if type(data) is int and -FIXED_POINT_MAX_COEFFICIENT < data < FIXED_POINT_MAX_COEFFICIENT:
+            self._coef, self._exp, self._dec = data, 0, None
+        elif type(data) is FixedPointFVal:
+            self._coef, self._exp, self._dec = data._coef, data._exp, data._dec
+        elif (
+            type(data) is str and
+            (match := _FIXED_POINT_RE.fullmatch(data)) is not None and
+            -FIXED_POINT_MAX_COEFFICIENT < (coef := int(match[1] + match[2])) < FIXED_POINT_MAX_COEFFICIENT and  # noqa: E501
+            (coef != 0 or data[0] != '-')  # negative zero is kept as Decimal
+        ):
+            self._coef, self._exp, self._dec = coef, len(match[2]), None
+        else:  # the Decimal value set by FVal goes through the num setter
+            super().__init__(data)
+
+    @property
+    def num(self) -> Decimal:
+        if self._dec is not None:
+            return self._dec
+        if self._exp == 0:
+            return Decimal(self._coef)
+        return Decimal(self._coef).scaleb(-self._exp)
+
+    @num.setter
+    def num(self, value: Decimal) -> None:
+        self._coef, self._exp, self._dec = _split_decimal(value)
+
+    def __str__(self) -> str:
+        if self._dec is not None:
+            return f'{self._dec:f}'
+        if self._exp == 0:
+            return str(self._coef)
+        if self._coef >= 0:
+            sign, digits = '', str(self._coef)
+        else:
+            sign, digits = '-', str(-self._coef)
+        if len(digits) <= self._exp:
+            digits = digits.rjust(self._exp + 1, '0')
+        return f'{sign}{digits[:-self._exp]}.{digits[-self._exp:]}'
+
+    def __hash__(self) -> int:
+        if self._dec is None and self._exp == 0:
+            return hash(self._coef)
+        return hash(self.num)
+
+    def _aligned(self, other: Any) -> tuple[int, int, int] | None:
+        """Returns the coefficients of self and other with the same number of decimals and
+        that number, or None if any of them is not a fixed point value"""
+        if self._dec is not None:
+            return None
+        if type(other) is FixedPointFVal:
+            if other._dec is not None:
+                return None
+            if self._exp == other._exp:
+                return self._coef, other._coef, self._exp
+            if self._exp > other._exp:
+                return self._coef, other._coef * _POWERS_OF_TEN[self._exp - other._exp], self._exp
+            return self._coef * _POWERS_OF_TEN[other._exp - self._exp], other._coef, other._exp
+        if type(other) is int:
+            return self._coef, other * _POWERS_OF_TEN[self._exp], self._exp
+        return None
+
+    def __gt__(self, other: AcceptableFValOtherInput) -> bool:
+        if (aligned := self._aligned(other)) is not None:
+            return aligned[0] > aligned[1]
+        return super().__gt__(other)
+
+    def __lt__(self, other: AcceptableFValOtherInput) -> bool:
+        if (aligned := self._aligned(other)) is not None:
+            return aligned[0] < aligned[1]
+        return super().__lt__(other)
+
+    def __le__(self, other: AcceptableFValOtherInput) -> bool:
+        if (aligned := self._aligned(other)) is not None:
+            return aligned[0] <= aligned[1]
+        return super().__le__(other)
+
+    def __ge__(self, other: AcceptableFValOtherInput) -> bool:
+        if (aligned := self._aligned(other)) is not None:
+            return aligned[0] >= aligned[1]
+        return super().__ge__(other)
+
+    def __eq__(self, other: object) -> bool:
+        if (aligned := self._aligned(other)) is not None:
+            return aligned[0] == aligned[1]
+        return super().__eq__(other)
+
+    def __add__(self, other: AcceptableFValOtherInput) -> 'FVal':
+        if (aligned := self._aligned(other)) is not None:
+            return _new_fixed_point(aligned[0] + aligned[1], aligned[2])
+        return _new_from_decimal(self.num.__add__(_evaluate_input(other)))
+
+    def __sub__(self, other: AcceptableFValOtherInput) -> 'FVal':
+        if (aligned := self._aligned(other)) is not None:
+            return _new_fixed_point(aligned[0] - aligned[1], aligned[2])
+        return _new_from_decimal(self.num.__sub__(_evaluate_input(other)))
+
+    def __radd__(self, other: AcceptableFValOtherInput) -> 'FVal':
+        return self.__add__(other)
+
+    def __rsub__(self, other: AcceptableFValOtherInput) -> 'FVal':
+        if (aligned := self._aligned(other)) is not None:
+            return _new_fixed_point(aligned[1] - aligned[0], aligned[2])
+        return _new_from_decimal(self.num.__rsub__(_evaluate_input(other)))
+
+    def __mul__(self, other: AcceptableFValOtherInput) -> 'FVal':
+        if self._dec is None:
+            if type(other) is FixedPointFVal and other._dec is None:
+                other_coef, exp = other._coef, self._exp + other._exp
+            elif type(other) is int:
+                other_coef, exp = other, self._exp
+            else:
+                return _new_from_decimal(self.num.__mul__(_evaluate_input(other)))
+
+            coef = self._coef * other_coef
+            # a zero product of a negative value has a negative sign in Decimal
+            if coef != 0 or (self._coef < 0) == (other_coef < 0):
+                return _new_fixed_point(coef, exp)
+
+        return _new_from_decimal(self.num.__mul__(_evaluate_input(other)))
+
+    def __rmul__(self, other: AcceptableFValOtherInput) -> 'FVal':
+        return self.__mul__(other)
+
+    def __truediv__(self, other: AcceptableFValOtherInput) -> 'FVal':
+        return _new_from_decimal(self.num.__truediv__(_evaluate_input(other)))
+
+    def __floordiv__(self, other: AcceptableFValOtherInput) -> 'FVal':
+        return _new_from_decimal(self.num.__floordiv__(_evaluate_input(other)))
+
+    def __pow__(self, other: AcceptableFValOtherInput) -> 'FVal':
+        return _new_from_decimal(self.num.__pow__(_evaluate_input(other)))
+
+    def __rtruediv__(self, other: AcceptableFValOtherInput) -> 'FVal':
+        return _new_from_decimal(self.num.__rtruediv__(_evaluate_input(other)))
+
+    def __rfloordiv__(self, other: AcceptableFValOtherInput) -> 'FVal':
+        return _new_from_decimal(self.num.__rfloordiv__(_evaluate_input(other)))
+
+    def __mod__(self, other: AcceptableFValOtherInput) -> 'FVal':
+        return _new_from_decimal(self.num.__mod__(_evaluate_input(other)))
+
+    def __rmod__(self, other: AcceptableFValOtherInput) -> 'FVal':
+        return _new_from_decimal(self.num.__rmod__(_evaluate_input(other)))
+
+    def __round__(self, ndigits: int) -> 'FVal':
+        return _new_from_decimal(round(self.num, ndigits))
+
+    def __float__(self) -> float:
+        if self._dec is None:  # int true division is correctly rounded like float(Decimal)
+            return self._coef / _POWERS_OF_TEN[self._exp]
+        return float(self._dec)
+
+    def __neg__(self) -> 'FVal':
+        if self._dec is None:  # Decimal negation of zero gives a positive zero as well
+            return _new_fixed_point(-self._coef, self._exp)
+        return _new_from_decimal(self._dec.__neg__())
+
+    def __abs__(self) -> 'FVal':
+        if self._dec is None:
+            return _new_fixed_point(abs(self._coef), self._exp)
+        return _new_from_decimal(self._dec.copy_abs())
+
+    def fma(self, other: AcceptableFValOtherInput, third: AcceptableFValOtherInput) -> 'FVal':
+        return _new_from_decimal(self.num.fma(_evaluate_input(other), _evaluate_input(third)))
+
+
+def _split_decimal(value: Decimal) -> tuple[int, int, Decimal | None]:
+    """Split a Decimal to the coefficient and the number of decimals of a fixed point value.
+    If it can't be represented as one it's returned as the last element of the tuple."""
+    sign, digits, exponent = value.as_tuple()
+    if (
+        not isinstance(exponent, int) or  # NaN or infinity
+        not -FIXED_POINT_MAX_DECIMALS <= exponent <= 0 or  # a positive one changes results of division  # noqa: E501
+        len(digits) > DefaultContext.prec or
+        (sign == 1 and value.is_zero())  # negative zero
+    ):
+        return 0, 0, value
+
+    if exponent == 0:
+        return int(value), 0, None
+    return int(value.scaleb(-exponent)), -exponent, None
+
+
+def _new_fixed_point(coef: int, exp: int) -> FixedPointFVal:
+    """Create a FixedPointFVal from a coefficient and its number of decimals. Values that
+    don't fit in fixed point are rounded to the Decimal precision like Decimal would do."""
+    if exp > FIXED_POINT_MAX_DECIMALS or not -FIXED_POINT_MAX_COEFFICIENT < coef < FIXED_POINT_MAX_COEFFICIENT:  # noqa: E501
+        return _new_from_decimal(Decimal(coef).scaleb(-exp))
+
+    value = object.__new__(FixedPointFVal)
+    value._coef, value._exp, value._dec = coef, exp, None
+    return value
+
+
+def _new_from_decimal(num: Decimal) -> FixedPointFVal:
+    value = object.__new__(FixedPointFVal)
+    value._coef, value._exp, value._dec = _split_decimal(num)
+    return value
+
+
+def _new_fixed_point_fval(cls: type[FVal], data: AcceptableFValInitInput = 0) -> FVal:  # pylint: disable=unused-argument
+    return object.__new__(FixedPointFVal) if cls is FVal else object.__new__(cls)
+
+
+def _new_decimal_fval(cls: type[FVal], data: AcceptableFValInitInput = 0) -> FVal:  # pylint: disable=unused-argument
+    return object.__new__(cls)
+
+
+def set_fval_backend(backend: Literal['decimal', 'fixed']) -> None:
+    """Select the implementation of the FVals created from now on. It happens at import
+    time from the ROTKI_FVAL_BACKEND environment variable so that all values, including
+    the constants, are created with the same backend, and again at startup if the
+    --fval-backend argument is given. Values of both backends can be used together but
+    operations between them don't take the fixed point fast path."""
+    if backend == 'fixed':
+        FVal.__new__ = staticmethod(_new_fixed_point_fval)  # type: ignore[method-assign,assignment]
+    elif backend == 'decimal':
+        if '__new__' in FVal.__dict__:  # deleting it would not restore object.__new__
+            FVal.__new__ = staticmethod(_new_decimal_fval)  # type: ignore[method-assign,assignment]
+    else:
+        raise ValueError(f'Unknown FVal backend {backend}. Should be one of decimal, fixed')
+
+
+def get_fval_backend() -> Literal['decimal', 'fixed']:
+    """Returns the implementation of the FVals created from now on"""
+    return 'fixed' if FVal.__new__ is _new_fixed_point_fval else 'decimal'
+
+
+def _set_fval_backend_from_env() -> None:
+    """Select the backend from the environment, keeping the decimal one if it's invalid"""
+    try:
+        set_fval_backend(os.environ.get(FVAL_BACKEND_ENV, 'decimal'))  # type: ignore[arg-type]  # checked in the function
+    except ValueError as e:
+        logger.error(f'Invalid {FVAL_BACKEND_ENV} environment variable. {e}. Using decimal')
+
+
+_set_fval_backend_from_env()
@@ -1,10 +1,14 @@
 import logging
+import operator
 import os
 import shutil
 import sqlite3
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Literal, Optional, cast, overload
+from typing import TYPE_CHECKING, Any, Final, Literal, Optional, cast, overload
 
 from gevent.lock import Semaphore
 
@@ -45,6 +49,7 @@ from rotkehlchen.types import (
     Price,
     Timestamp,
 )
+from rotkehlchen.utils.data_structures import LRUCacheWithRemove
 from rotkehlchen.utils.misc import timestamp_to_date, ts_now
 from rotkehlchen.utils.serialization import (
     deserialize_asset_with_oracles_from_db,
@@ -52,6 +57,7 @@ from rotkehlchen.utils.serialization import (
 )
 
 from .migrations.manager import LAST_DATA_MIGRATION, maybe_apply_globaldb_migrations
+from .price_chunks import add_chunked_prices, is_chunked_source, query_chunked_prices
 from .schema import DB_SCRIPT_CREATE_TABLES
 from .upgrades.manager import maybe_upgrade_globaldb
 from .utils import GLOBAL_DB_VERSION, globaldb_get_setting_value
@@ -63,6 +69,8 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
+EVM_TOKEN_CACHE_SIZE: Final = 2048
+HISTORICAL_PRICES_CACHE_SIZE: Final = 128  # asset pairs
 
 _ALL_ASSETS_TABLES_JOINS = """
 FROM {dbprefix}assets LEFT JOIN {dbprefix}common_asset_details on {dbprefix}assets.identifier={dbprefix}common_asset_details.identifier
@@ -199,6 +207,12 @@ def _initialize_global_db_directory(
     )
 
 
+def _closest_price_entry(entries: list[tuple], timestamp: int) -> tuple:
+    """Returns the price_history row closest to the timestamp. Of equally close rows the
+    earliest is preferred and then the one of the first source type"""
+    return min(entries, key=lambda x: (abs(x[3] - timestamp), x[3], x[2]))
+
+
 class GlobalDBHandler:
     """A singleton class controlling the global DB"""
     __instance: Optional['GlobalDBHandler'] = None
@@ -207,6 +221,15 @@ class GlobalDBHandler:
     conn: DBConnection
     used_backup: bool  # specifies if the global DB was restored from a backup
     packaged_db_lock: Semaphore
+    # Memory cache of get_evm_token. Maps (address, chain) to the token or to None
+    # if there is no token with that address so that misses are also cached
+    evm_token_cache: LRUCacheWithRemove[tuple[ChecksumEvmAddress, ChainID], EvmToken | None]
+    evm_token_cache_hits: int = 0
+    evm_token_cache_misses: int = 0
+    # Memory cache of the historical prices used by get_historical_price while enabled
+    # by historical_prices_cache(). Maps the lowercased (from_asset, to_asset) identifiers
+    # of the most recently used pairs to the timestamps and rows of all their prices.
+    historical_prices: LRUCacheWithRemove[tuple[str, str], tuple[list[int], list[tuple]]] | None
 
     def __new__(
             cls,
@@ -229,6 +252,10 @@ class GlobalDBHandler:
         GlobalDBHandler.__instance._data_directory = data_dir
         GlobalDBHandler.__instance.conn, GlobalDBHandler.__instance.used_backup = _initialize_global_db_directory(data_dir, sql_vm_instructions_cb)  # noqa: E501
         GlobalDBHandler.__instance.packaged_db_lock = Semaphore()
+        GlobalDBHandler.__instance.evm_token_cache = LRUCacheWithRemove(maxsize=EVM_TOKEN_CACHE_SIZE)  # noqa: E501
+        GlobalDBHandler.__instance.evm_token_cache_hits = 0
+        GlobalDBHandler.__instance.evm_token_cache_misses = 0
+        GlobalDBHandler.__instance.historical_prices = None
         return GlobalDBHandler.__instance
 
     def filepath(self) -> Path:
@@ -729,10 +756,12 @@ class GlobalDBHandler:
             underlying_tokens: list[UnderlyingToken],
             chain_id: ChainID,
     ) -> None:
-        """Add the underlying tokens for the parent token
+        """Add the underlying tokens for the parent token and remove the parent and the newly
+        tracked underlying tokens from the memory cache of get_evm_token
 
         May raise InputError
         """
+        GlobalDBHandler.clean_evm_token_cache(identifier=parent_token_identifier)
         for underlying_token in underlying_tokens:
             # make sure underlying token address is tracked if not already there
             asset_id = GlobalDBHandler.get_evm_token_identifier(
@@ -768,6 +797,11 @@ class GlobalDBHandler:
                         f'Failed to add underlying tokens for {parent_token_identifier} '
                         f'due to {e!s}',
                     ) from e
+                # the address may have been cached as not being a token
+                GlobalDBHandler.clean_evm_token_cache(
+                    address=underlying_token.address,
+                    chain_id=chain_id,
+                )
             try:
                 write_cursor.execute(
                     'INSERT INTO underlying_tokens_list(identifier, weight, parent_token_entry) '
@@ -828,7 +862,23 @@ class GlobalDBHandler:
         """Gets all details for an evm token by its address
 
         If no token for the given address can be found None is returned.
+
+        Results, including not finding a token, are kept in a memory cache which
+        is cleaned whenever evm tokens are modified.
         """
+        globaldb = GlobalDBHandler()
+        if (address, chain_id) in globaldb.evm_token_cache:
+            globaldb.evm_token_cache_hits += 1
+            return globaldb.evm_token_cache.get((address, chain_id))
+
+        globaldb.evm_token_cache_misses += 1
+        token = GlobalDBHandler._query_evm_token(address=address, chain_id=chain_id)
+        globaldb.evm_token_cache.add((address, chain_id), token)
+        return token
+
+    @staticmethod
+    def _query_evm_token(address: ChecksumEvmAddress, chain_id: ChainID) -> EvmToken | None:
+        """Queries the DB for all details of an evm token by its address"""
         with GlobalDBHandler().conn.read_ctx() as cursor:
             cursor.execute(
                 'SELECT A.identifier, B.address, B.chain, B.token_kind, B.decimals, C.name, '
@@ -857,6 +907,41 @@ class GlobalDBHandler:
             )
             return None
 
+    @staticmethod
+    def clean_evm_token_cache(
+            address: ChecksumEvmAddress | None = None,
+            chain_id: ChainID | None = None,
+            identifier: str | None = None,
+    ) -> None:
+        """Clean the memory cache of get_evm_token.
+
+        If address and chain_id are given only that entry is removed. If identifier is
+        given the entry of the token with that identifier is removed. If nothing is
+        given the entire cache is cleared.
+        """
+        if GlobalDBHandler.__instance is None:
+            return  # not initialized yet so nothing is cached
+
+        cache = GlobalDBHandler.__instance.evm_token_cache
+        if address is not None and chain_id is not None:
+            cache.remove((address, chain_id))
+        if identifier is not None:
+            for key, token in list(cache.cache.items()):
+                if token is not None and token.identifier == identifier:
+                    cache.remove(key)
+        if address is None and identifier is None:
+            cache.clear()
+
+    @staticmethod
+    def get_evm_token_cache_stats() -> dict[str, int]:
+        """Returns the hits, misses and current size of the get_evm_token memory cache"""
+        globaldb = GlobalDBHandler()
+        return {
+            'hits': globaldb.evm_token_cache_hits,
+            'misses': globaldb.evm_token_cache_misses,
+            'size': len(globaldb.evm_token_cache),
+        }
+
     @staticmethod
     def get_evm_tokens(
             chain_id: ChainID,
@@ -959,6 +1044,8 @@ class GlobalDBHandler:
                 msg = f'Ethereum token with identifier {entry.identifier} already exists in the DB'
             raise InputError(msg) from e
 
+        # the address may have been cached as not being a token
+        GlobalDBHandler.clean_evm_token_cache(address=entry.evm_address, chain_id=entry.chain_id)
         if entry.underlying_tokens is not None:
             GlobalDBHandler._add_underlying_tokens(
                 write_cursor=write_cursor,
@@ -1041,6 +1128,12 @@ class GlobalDBHandler:
                 f'Failed to update DB entry for EVM token with address {entry.evm_address} at chain {entry.chain_id}'  # noqa: E501
                 f'due to a constraint being hit. Make sure the new values are valid ',
             ) from e
+        finally:  # the token's address may have changed so remove both old and new entries
+            GlobalDBHandler.clean_evm_token_cache(
+                address=entry.evm_address,
+                chain_id=entry.chain_id,
+                identifier=entry.identifier,
+            )
 
         return rotki_id
 
@@ -1067,6 +1160,7 @@ class GlobalDBHandler:
             )
         asset_identifier = result[0]
         GlobalDBHandler().delete_asset_by_identifier(asset_identifier)
+        GlobalDBHandler.clean_evm_token_cache(address=address, chain_id=chain_id)
         return asset_identifier
 
     @staticmethod
@@ -1160,6 +1254,8 @@ class GlobalDBHandler:
                     f'but it was not found in the DB',
                 )
 
+        GlobalDBHandler.clean_evm_token_cache(identifier=identifier)
+
     @staticmethod
     def get_assets_with_symbol(
             symbol: str,
@@ -1235,24 +1331,154 @@ class GlobalDBHandler:
 
         If no price can be found returns None
         """
-        querystr = (
-            'SELECT from_asset, to_asset, source_type, timestamp, '
-            'price, MIN(ABS(timestamp - ?)) FROM price_history '
-            'WHERE from_asset=? AND to_asset=? '
-            'AND timestamp between ? AND ?'
-        )
-        querylist = [timestamp, from_asset.identifier, to_asset.identifier, timestamp - max_seconds_distance, timestamp + max_seconds_distance]  # noqa: E501
-        if source is not None:
-            querystr += ' AND source_type=? '
-            querylist.append(source.serialize_for_db())
+        if (cache := GlobalDBHandler().historical_prices) is not None:
+            return GlobalDBHandler._get_cached_historical_price(
+                cache=cache,
+                from_asset=from_asset,
+                to_asset=to_asset,
+                timestamp=timestamp,
+                max_seconds_distance=max_seconds_distance,
+                source=source,
+            )
 
         with GlobalDBHandler().conn.read_ctx() as cursor:
-            result = cursor.execute(querystr, tuple(querylist)).fetchone()
-            if result[0] is None:
-                return None
+            return GlobalDBHandler._get_closest_historical_price(
+                cursor=cursor,
+                from_asset=from_asset,
+                to_asset=to_asset,
+                timestamp=timestamp,
+                max_seconds_distance=max_seconds_distance,
+                source=source,
+            )
+
+    @staticmethod
+    def _query_historical_prices(
+            cursor: DBCursor,
+            from_asset: 'Asset',
+            to_asset: 'Asset',
+            source: HistoricalPriceOracle | None = None,
+            from_ts: Timestamp | None = None,
+            to_ts: Timestamp | None = None,
+    ) -> list[tuple]:
+        """Returns the price_history rows of the pair in the given time range. The prices
+        of the price oracles are read from the chunks that overlap the range."""
+        entries: list[tuple] = []
+        if source is None or not is_chunked_source(source):
+            querystr = (
+                'SELECT from_asset, to_asset, source_type, timestamp, price FROM price_history '
+                'WHERE from_asset=? AND to_asset=?'
+            )
+            bindings: list[str | int] = [from_asset.identifier, to_asset.identifier]
+            if source is not None:
+                querystr += ' AND source_type=?'
+                bindings.append(source.serialize_for_db())
+            if from_ts is not None and to_ts is not None:
+                querystr += ' AND timestamp BETWEEN ? AND ?'
+                bindings.extend((from_ts, to_ts))
+            entries.extend(cursor.execute(querystr, bindings))
+
+        if source is None or is_chunked_source(source):
+            entries.extend(query_chunked_prices(
+                cursor=cursor,
+                from_asset=from_asset.identifier,
+                to_asset=to_asset.identifier,
+                source=source,
+                from_ts=from_ts,
+                to_ts=to_ts,
+            ))
+
+        return entries
+
+    @staticmethod
+    def _get_closest_historical_price(
+            cursor: DBCursor,
+            from_asset: 'Asset',
+            to_asset: 'Asset',
+            timestamp: Timestamp,
+            max_seconds_distance: int,
+            source: HistoricalPriceOracle | None,
+    ) -> Optional['HistoricalPrice']:
+        """Finds the price closest to the timestamp in the allowed distance"""
+        if len(entries := GlobalDBHandler._query_historical_prices(
+            cursor=cursor,
+            from_asset=from_asset,
+            to_asset=to_asset,
+            source=source,
+            from_ts=Timestamp(timestamp - max_seconds_distance),
+            to_ts=Timestamp(timestamp + max_seconds_distance),
+        )) == 0:
+            return None
+
+        return HistoricalPrice.deserialize_from_db(_closest_price_entry(entries, timestamp))
+
+    @staticmethod
+    def _get_cached_historical_price(
+            cache: LRUCacheWithRemove[tuple[str, str], tuple[list[int], list[tuple]]],
+            from_asset: 'Asset',
+            to_asset: 'Asset',
+            timestamp: Timestamp,
+            max_seconds_distance: int,
+            source: HistoricalPriceOracle | None,
+    ) -> Optional['HistoricalPrice']:
+        """Like get_historical_price but finds the prices in the allowed distance with a
+        binary search in the memory cache. All the prices of the pair are loaded with one
+        query on first use"""
+        key = (from_asset.identifier.lower(), to_asset.identifier.lower())
+        if (pair_prices := cache.get(key)) is None:
+            with GlobalDBHandler().conn.read_ctx() as cursor:
+                entries = sorted(GlobalDBHandler._query_historical_prices(
+                    cursor=cursor,
+                    from_asset=from_asset,
+                    to_asset=to_asset,
+                ), key=operator.itemgetter(3))
+            pair_prices = ([x[3] for x in entries], entries)
+            cache.add(key, pair_prices)
+
+        timestamps, entries = pair_prices
+        entries = entries[
+            bisect_left(timestamps, timestamp - max_seconds_distance):
+            bisect_right(timestamps, timestamp + max_seconds_distance)
+        ]
+        if source is not None:
+            entries = [x for x in entries if x[2] == source.serialize_for_db()]
+
+        if len(entries) == 0:
+            return None
+        return HistoricalPrice.deserialize_from_db(_closest_price_entry(entries, timestamp))
+
+    @staticmethod
+    @contextmanager
+    def historical_prices_cache() -> Iterator[None]:
+        """Keep the historical prices queried by get_historical_price in memory while in the
+        context. Meant for processes that query the prices of the same assets at many
+        timestamps, such as generating a PnL report.
+
+        The cached prices of a pair are cleaned when prices of it are written to the DB.
+        """
+        globaldb = GlobalDBHandler()
+        if globaldb.historical_prices is not None:  # already enabled by an outer context
+            yield
+            return
+
+        globaldb.historical_prices = LRUCacheWithRemove(maxsize=HISTORICAL_PRICES_CACHE_SIZE)
+        try:
+            yield
+        finally:
+            globaldb.historical_prices = None
+
+    @staticmethod
+    def clean_historical_prices_cache(pairs: list[tuple['Asset', 'Asset']] | None = None) -> None:
+        """Remove the given asset pairs from the historical prices memory cache if it's
+        enabled. If no pairs are given the entire cache is cleared."""
+        if (cache := GlobalDBHandler().historical_prices) is None:
+            return
+
+        if pairs is None:
+            cache.clear()
+            return
 
-        # The result tuple last entry MIN(ABS()) is disregarded in deserialize_from_db
-        return HistoricalPrice.deserialize_from_db(result)
+        for from_asset, to_asset in pairs:
+            cache.remove((from_asset.identifier.lower(), to_asset.identifier.lower()))
 
     @staticmethod
     def get_historical_prices(
@@ -1263,42 +1489,33 @@ class GlobalDBHandler:
         """Given a list of from/to/timestamp data to query returns all values
         that could be found in the DB and None for those that could not be found.
         """
-        querystr = (
-            'SELECT from_asset, to_asset, source_type, timestamp, price, MIN(ABS(timestamp - ?)) '
-            'FROM price_history WHERE from_asset=? AND to_asset=? AND timestamp BETWEEN ? AND ?'
-        )
-        querylist: list[tuple] = []
-        if source is not None:
-            querystr += ' AND source_type=? '
-            serialized_source = source.serialize_for_db()
-            for from_asset, to_asset, timestamp in query_data:
-                querylist.append((timestamp, from_asset.identifier, to_asset.identifier, timestamp - max_seconds_distance, timestamp + max_seconds_distance, serialized_source))  # noqa: E501
-
-        else:
-            for from_asset, to_asset, timestamp in query_data:
-                querylist.append((timestamp, from_asset.identifier, to_asset.identifier, timestamp - max_seconds_distance, timestamp + max_seconds_distance))  # noqa: E501
-
-        prices_results = []
         with GlobalDBHandler().conn.read_ctx() as cursor:
-            for entry in querylist:
-                result = cursor.execute(querystr, entry).fetchone()  # below last index of the result tuple is ignored in deserialize  # noqa: E501
-                prices_results.append(None if result[0] is None else HistoricalPrice.deserialize_from_db(result))  # noqa: E501
-
-        return prices_results
+            return [GlobalDBHandler._get_closest_historical_price(
+                cursor=cursor,
+                from_asset=from_asset,
+                to_asset=to_asset,
+                timestamp=timestamp,
+                max_seconds_distance=max_seconds_distance,
+                source=source,
+            ) for from_asset, to_asset, timestamp in query_data]
 
     @staticmethod
     def add_historical_prices(entries: list['HistoricalPrice']) -> None:
-        """Adds the given historical price entries in the DB
+        """Adds the given historical price entries in the DB. The prices of the price
+        oracles are merged into the chunks of their pairs.
 
         If any addition causes a DB error it's skipped and an error is logged
         """
+        chunked_entries = [x for x in entries if is_chunked_source(x.source)]
+        row_entries = [x for x in entries if not is_chunked_source(x.source)]
         try:
             with GlobalDBHandler().conn.write_ctx() as write_cursor:
+                add_chunked_prices(write_cursor=write_cursor, entries=chunked_entries)
                 write_cursor.executemany(
                     """INSERT OR IGNORE INTO price_history(
                     from_asset, to_asset, source_type, timestamp, price
                     ) VALUES (?, ?, ?, ?, ?)
-                    """, [x.serialize_for_db() for x in entries],
+                    """, [x.serialize_for_db() for x in row_entries],
                 )
         except sqlite3.IntegrityError as e:
             # roll back any of the executemany that may have gone in
@@ -1308,7 +1525,8 @@ class GlobalDBHandler:
             )
 
             with GlobalDBHandler().conn.write_ctx() as write_cursor:
-                for entry in entries:
+                add_chunked_prices(write_cursor=write_cursor, entries=chunked_entries)
+                for entry in row_entries:
                     try:
                         write_cursor.execute(
                             """INSERT OR IGNORE INTO price_history(
@@ -1320,6 +1538,8 @@ class GlobalDBHandler:
                         log.error(
                             f'Failed to add {entry!s} due to {entry_error!s}. Skipping entry addition',  # noqa: E501
                         )
+        finally:  # after the commit so that reloading the pairs sees the new prices
+            GlobalDBHandler.clean_historical_prices_cache(pairs=[(x.from_asset, x.to_asset) for x in entries])  # noqa: E501
 
     @staticmethod
     def add_single_historical_price(entry: HistoricalPrice) -> bool:
@@ -1329,6 +1549,16 @@ class GlobalDBHandler:
         If the price for the specified asset pair, oracle type and timestamp already exists,
         it is replaced.
         """
+        if is_chunked_source(entry.source):
+            with GlobalDBHandler().conn.write_ctx() as write_cursor:
+                success = add_chunked_prices(
+                    write_cursor=write_cursor,
+                    entries=[entry],
+                    replace=True,
+                )
+            GlobalDBHandler.clean_historical_prices_cache(pairs=[(entry.from_asset, entry.to_asset)])  # noqa: E501
+            return success
+
         try:
             with GlobalDBHandler().conn.write_ctx() as write_cursor:
                 serialized = entry.serialize_for_db()
@@ -1344,6 +1574,8 @@ class GlobalDBHandler:
                 f'Failed to add single historical price. {e!s}. ',
             )
             return False
+        finally:
+            GlobalDBHandler.clean_historical_prices_cache(pairs=[(entry.from_asset, entry.to_asset)])  # noqa: E501
 
         return True
 
@@ -1408,6 +1640,7 @@ class GlobalDBHandler:
             )
             assets_to_invalidate = {Asset(asset) for entry in write_cursor for asset in entry}
 
+        GlobalDBHandler.clean_historical_prices_cache()
         return assets_to_invalidate
 
     @staticmethod
@@ -1469,7 +1702,8 @@ class GlobalDBHandler:
                     f'Not found manual current price to delete for asset {asset!s}',
                 )
 
-            return assets_to_invalidate
+        GlobalDBHandler.clean_historical_prices_cache()
+        return assets_to_invalidate
 
     @staticmethod
     def get_manual_prices(
@@ -1529,6 +1763,7 @@ class GlobalDBHandler:
             )
             return False
 
+        GlobalDBHandler.clean_historical_prices_cache(pairs=[(entry.from_asset, entry.to_asset)])
         return True
 
     @staticmethod
@@ -1560,6 +1795,7 @@ class GlobalDBHandler:
                 )
                 return False
 
+        GlobalDBHandler.clean_historical_prices_cache(pairs=[(from_asset, to_asset)])
         return True
 
     @staticmethod
@@ -1568,7 +1804,7 @@ class GlobalDBHandler:
             to_asset: 'Asset',
             source: HistoricalPriceOracle | None = None,
     ) -> None:
-        querystr = 'DELETE FROM price_history WHERE from_asset=? AND to_asset=?'
+        querystr = 'DELETE FROM {table} WHERE from_asset=? AND to_asset=?'
         query_list = [from_asset.identifier, to_asset.identifier]
         if source is not None:
             querystr += ' AND source_type=?'
@@ -1576,12 +1812,15 @@ class GlobalDBHandler:
 
         try:
             with GlobalDBHandler().conn.write_ctx() as write_cursor:
-                write_cursor.execute(querystr, tuple(query_list))
+                for table in ('price_history', 'price_history_chunks'):
+                    write_cursor.execute(querystr.format(table=table), tuple(query_list))
         except sqlite3.IntegrityError as e:
             log.error(
                 f'Failed to delete historical prices from {from_asset} to {to_asset} '
                 f'and source: {source!s} due to {e!s}',
             )
+        else:
+            GlobalDBHandler.clean_historical_prices_cache(pairs=[(from_asset, to_asset)])
 
     @staticmethod
     def get_historical_price_range(
@@ -1589,30 +1828,40 @@ class GlobalDBHandler:
             to_asset: 'Asset',
             source: HistoricalPriceOracle | None = None,
     ) -> tuple[Timestamp, Timestamp] | None:
-        querystr = 'SELECT MIN(timestamp), MAX(timestamp) FROM price_history WHERE from_asset=? AND to_asset=?'  # noqa: E501
+        source_filter = ''
         query_list = [from_asset.identifier, to_asset.identifier]
         if source is not None:
-            querystr += ' AND source_type=?'
+            source_filter = 'AND source_type=?'
             query_list.append(source.serialize_for_db())
+        querystr = (
+            f'SELECT MIN(timestamp), MAX(timestamp) FROM price_history WHERE from_asset=? AND to_asset=? {source_filter} UNION ALL '  # noqa: E501
+            f'SELECT MIN(first_timestamp), MAX(last_timestamp) FROM price_history_chunks WHERE from_asset=? AND to_asset=? {source_filter}'  # noqa: E501
+        )
 
         with GlobalDBHandler().conn.read_ctx() as cursor:
-            query = cursor.execute(querystr, tuple(query_list))
-            result = query.fetchone()
-            if result is None or None in (result[0], result[1]):
-                return None
-            return result[0], result[1]
+            results = [x for x in cursor.execute(querystr, tuple(query_list) * 2) if None not in x]
+
+        if len(results) == 0:
+            return None
+        return min(x[0] for x in results), max(x[1] for x in results)
 
     @staticmethod
     def get_historical_price_data(source: HistoricalPriceOracle) -> list[dict[str, Any]]:
         """Return a list of assets and first/last ts
 
         Only used by the API so just returning it as List of dicts from here"""
-        with GlobalDBHandler().conn.read_ctx() as cursor:
-            query = cursor.execute(
+        if is_chunked_source(source):
+            querystr = (
+                'SELECT from_asset, to_asset, MIN(first_timestamp), MAX(last_timestamp) FROM '
+                'price_history_chunks WHERE source_type=? GROUP BY from_asset, to_asset'
+            )
+        else:
+            querystr = (
                 'SELECT from_asset, to_asset, MIN(timestamp), MAX(timestamp) FROM '
-                'price_history WHERE source_type=? GROUP BY from_asset, to_asset',
-                (source.serialize_for_db(),),
+                'price_history WHERE source_type=? GROUP BY from_asset, to_asset'
             )
+        with GlobalDBHandler().conn.read_ctx() as cursor:
+            query = cursor.execute(querystr, (source.serialize_for_db(),))
             return [
                 {'from_asset': entry[0],
                  'to_asset': entry[1],
@@ -1697,6 +1946,7 @@ class GlobalDBHandler:
                 finally:  # on the way out always detach the DB. Make sure no transaction is active
                     with self.conn.critical_section_and_transaction_lock():
                         read_cursor.execute('DETACH DATABASE "clean_db";')
+                    self.clean_evm_token_cache()
 
         return True, ''
 
@@ -1754,6 +2004,7 @@ class GlobalDBHandler:
             finally:  # on the way out always detach the DB. Make sure no transaction is active
                 with self.conn.transaction_lock, self.conn.read_ctx() as read_cursor:
                     read_cursor.execute('DETACH DATABASE "clean_db";')
+                self.clean_evm_token_cache()
 
         return True, ''
 
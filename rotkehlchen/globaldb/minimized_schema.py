@@ -12,6 +12,7 @@ MINIMIZED_GLOBAL_DB_SCHEMA = {
     "user_owned_assets": "asset_idvarchar[24]notnullprimarykey,foreignkey(asset_id)referencesassets(identifier)onupdatecascadeondeletecascade",
     "price_history_source_types": "typechar(1)primarykeynotnull,seqintegerunique",
     "price_history": "from_assettextnotnullcollatenocase,to_assettextnotnullcollatenocase,source_typechar(1)notnulldefault('a')referencesprice_history_source_types(type),timestampintegernotnull,pricetextnotnull,foreignkey(from_asset)referencesassets(identifier)onupdatecascadeondeletecascade,foreignkey(to_asset)referencesassets(identifier)onupdatecascadeondeletecascade,primarykey(from_asset,to_asset,source_type,timestamp)",
+    "price_history_chunks": "from_assettextnotnullcollatenocase,to_assettextnotnullcollatenocase,source_typechar(1)notnullreferencesprice_history_source_types(type),chunk_startintegernotnull,first_timestampintegernotnull,last_timestampintegernotnull,prices_numintegernotnull,datablobnotnull,block_indexblobnotnull,foreignkey(from_asset)referencesassets(identifier)onupdatecascadeondeletecascade,foreignkey(to_asset)referencesassets(identifier)onupdatecascadeondeletecascade,primarykey(from_asset,to_asset,source_type,chunk_start)",
     "binance_pairs": "pairtextnotnull,base_assettextnotnull,quote_assettextnotnull,locationtextnotnull,foreignkey(base_asset)referencesassets(identifier)onupdatecascadeondeletecascade,foreignkey(quote_asset)referencesassets(identifier)onupdatecascadeondeletecascade,primarykey(pair,location)",
     "address_book": "addresstextnotnull,blockchaintext,nametextnotnull,primarykey(address,blockchain)",
     "custom_assets": "identifiertextnotnullprimarykey,notestext,typetextnotnullcollatenocase,foreignkey(identifier)referencesassets(identifier)onupdatecascadeondeletecascade",
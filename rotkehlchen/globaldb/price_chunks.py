@@ -0,0 +1,292 @@
+"""Storage of the historical prices of the price oracles in chunks of a month per pair.
+
+Each row of the price_history_chunks table holds all the prices of an asset pair and
+source whose timestamps fall in the same fixed size period. The prices are encoded in a
+blob as a varint scale followed by, for each price, the varint delta of its timestamp from
+the previous one and the zigzag varint delta of the price as an integer multiplied by
+10^scale from the previous one. The scale is the max number of decimals of the prices of
+the chunk, so the values of the prices are stored exactly. Their string form is not kept,
+as the prices are decoded without trailing zeros after the decimal point.
+
+The prices are split in blocks of PRICE_BLOCK_SIZE whose first price is encoded as a delta
+from the chunk start and 0. The block_index blob holds the offset of the first timestamp of
+each block from the chunk start followed by the byte offset of each block in the data, as
+little endian uint32. So looking up a timestamp only decodes the block it falls in.
+
+The manual prices are edited by the user one by one so they stay in price_history.
+"""
+import logging
+import sqlite3
+import struct
+from bisect import bisect_right
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from decimal import Decimal, InvalidOperation
+from typing import TYPE_CHECKING, Final
+
+from rotkehlchen.constants.timing import MONTH_IN_SECONDS
+from rotkehlchen.history.types import HistoricalPrice, HistoricalPriceOracle
+from rotkehlchen.logging import RotkehlchenLogsAdapter
+
+if TYPE_CHECKING:
+    from rotkehlchen.db.drivers.gevent import DBCursor
+
+logger = logging.getLogger(__name__)
+log = RotkehlchenLogsAdapter(logger)
+
+PRICE_CHUNK_SECONDS: Final = MONTH_IN_SECONDS
+PRICE_BLOCK_SIZE: Final = 8
+ROW_PRICE_SOURCES: Final = (HistoricalPriceOracle.MANUAL, HistoricalPriceOracle.MANUAL_CURRENT)
+
+
+def is_chunked_source(source: HistoricalPriceOracle) -> bool:
+    """Whether the prices of the source are stored in chunks instead of price_history"""
+    return source not in ROW_PRICE_SOURCES
+
+
+def price_chunk_start(timestamp: int) -> int:
+    return timestamp - timestamp % PRICE_CHUNK_SECONDS
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, idx: int) -> tuple[int, int]:
+    """Returns the varint at idx and the index after it"""
+    value, shift = 0, 0
+    while True:
+        byte = data[idx]
+        idx += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, idx
+        shift += 7
+
+
+def _to_fixed_point(price: str) -> tuple[int, int]:
+    """Returns the price as an integer and the number of decimals it was multiplied with
+
+    May raise:
+    - ValueError if the price is not a finite number
+    """
+    try:
+        sign, digits, exponent = Decimal(price).as_tuple()
+    except InvalidOperation as e:
+        raise ValueError(f'Invalid price {price}') from e
+    if not isinstance(exponent, int):
+        raise ValueError(f'Invalid price {price}')
+
+    mantissa = int(''.join(str(x) for x in digits)) * (-1 if sign else 1)
+    if exponent >= 0:
+        return mantissa * 10 ** exponent, 0
+    return mantissa, -exponent
+
+
+def _from_fixed_point(value: int, scale: int) -> str:
+    """Returns the price string of the integer price with the given number of decimals,
+    without trailing zeros after the decimal point"""
+    if scale == 0:
+        return str(value)
+
+    sign = '-' if value < 0 else ''
+    digits = str(abs(value)).rjust(scale + 1, '0')
+    decimals = digits[-scale:].rstrip('0')
+    return f'{sign}{digits[:-scale]}.{decimals}' if decimals else f'{sign}{digits[:-scale]}'
+
+
+def encode_price_chunk(chunk_start: int, prices: list[tuple[int, str]]) -> tuple[bytes, bytes]:
+    """Encodes the (timestamp, price) entries of a chunk sorted by timestamp. Returns the
+    data and the block index of the chunk.
+
+    May raise:
+    - ValueError if any price is not a finite number
+    """
+    fixed_prices = [_to_fixed_point(price) for _, price in prices]
+    scale = max((x[1] for x in fixed_prices), default=0)
+    out = bytearray()
+    _write_varint(out, scale)
+    block_timestamps, block_offsets = [], []
+    for idx, ((timestamp, _), (fixed_price, price_scale)) in enumerate(zip(prices, fixed_prices, strict=True)):  # noqa: E501
+        if idx % PRICE_BLOCK_SIZE == 0:
+            block_timestamps.append(timestamp - chunk_start)
+            block_offsets.append(len(out))
+            last_timestamp, last_value = chunk_start, 0
+        value = fixed_price * 10 ** (scale - price_scale)
+        _write_varint(out, timestamp - last_timestamp)
+        delta = value - last_value
+        _write_varint(out, delta * 2 if delta >= 0 else -delta * 2 - 1)
+        last_timestamp, last_value = timestamp, value
+
+    block_index = struct.pack(f'<{2 * len(block_offsets)}I', *block_timestamps, *block_offsets)
+    return bytes(out), block_index
+
+
+def _block_offset(chunk_start: int, block_index: bytes, timestamp: int) -> int | None:
+    """Returns the byte offset of the last block of the chunk that starts at or before the
+    timestamp or None if the timestamp is before the first block"""
+    values = struct.unpack(f'<{len(block_index) // 4}I', block_index)
+    blocks_num = len(values) // 2
+    if (block := bisect_right(values, timestamp - chunk_start, 0, blocks_num) - 1) < 0:
+        return None
+    return values[blocks_num + block]
+
+
+def _iterate_price_chunk(
+        chunk_start: int,
+        data: bytes,
+        offset: int | None = None,
+) -> Iterator[tuple[int, int, int]]:
+    """Yields the timestamp, integer price and scale of each entry of a chunk. If the byte
+    offset of a block is given the entries before that block are skipped."""
+    scale, idx = _read_varint(data, 0)
+    if offset is not None:
+        idx = offset
+    entry = 0
+    while idx < len(data):
+        if entry % PRICE_BLOCK_SIZE == 0:
+            timestamp, value = chunk_start, 0
+        timestamp_delta, idx = _read_varint(data, idx)
+        value_delta, idx = _read_varint(data, idx)
+        timestamp += timestamp_delta
+        value += value_delta // 2 if value_delta % 2 == 0 else -(value_delta + 1) // 2
+        entry += 1
+        yield timestamp, value, scale
+
+
+def decode_price_chunk(chunk_start: int, data: bytes) -> list[tuple[int, str]]:
+    """Decodes the (timestamp, price) entries of a chunk sorted by timestamp"""
+    return [
+        (timestamp, _from_fixed_point(value, scale))
+        for timestamp, value, scale in _iterate_price_chunk(chunk_start, data)
+    ]
+
+
+def make_price_chunks(prices: Iterable[tuple[int, str]]) -> Iterator[tuple[int, int, int, int, bytes, bytes]]:  # noqa: E501
+    """Groups the (timestamp, price) entries sorted by timestamp in chunks. Yields the chunk
+    start, first and last timestamp, number of prices, encoded data and block index of
+    each chunk. Entries with invalid prices are skipped.
+    """
+    chunk: list[tuple[int, str]] = []
+    chunk_start = -1  # no chunk starts before 0
+    for timestamp, price in prices:
+        if (start := price_chunk_start(timestamp)) != chunk_start:
+            if len(chunk) != 0:
+                yield from _make_price_chunk(chunk_start, chunk)
+            chunk, chunk_start = [], start
+        chunk.append((timestamp, price))
+
+    if len(chunk) != 0:
+        yield from _make_price_chunk(chunk_start, chunk)
+
+
+def _make_price_chunk(chunk_start: int, prices: list[tuple[int, str]]) -> Iterator[tuple[int, int, int, int, bytes, bytes]]:  # noqa: E501
+    try:
+        data, block_index = encode_price_chunk(chunk_start, prices)
+    except ValueError:  # find the invalid prices and skip them
+        valid_prices = []
+        for timestamp, price in prices:
+            try:
+                _to_fixed_point(price)
+            except ValueError as e:
+                log.error(f'Skipping price at {timestamp} due to {e!s}')
+            else:
+                valid_prices.append((timestamp, price))
+        if len(valid_prices) == 0:
+            return
+        prices = valid_prices
+        data, block_index = encode_price_chunk(chunk_start, valid_prices)
+
+    yield chunk_start, prices[0][0], prices[-1][0], len(prices), data, block_index
+
+
+def add_chunked_prices(
+        write_cursor: 'DBCursor',
+        entries: list[HistoricalPrice],
+        replace: bool = False,
+) -> bool:
+    """Merges the given prices into the chunks of their pairs. If replace is False the
+    existing prices at the same timestamps are kept, otherwise they are replaced.
+
+    If writing the chunk of an entry causes a DB error the entries of that chunk are
+    skipped and an error is logged. Returns False if any chunk was skipped.
+    """
+    success = True
+    chunk_entries: defaultdict[tuple[str, str, str, int], list[HistoricalPrice]] = defaultdict(list)  # noqa: E501
+    for entry in entries:
+        chunk_entries[(
+            entry.from_asset.identifier,
+            entry.to_asset.identifier,
+            entry.source.serialize_for_db(),
+            price_chunk_start(entry.timestamp),
+        )].append(entry)
+
+    for (from_asset, to_asset, source_type, chunk_start), new_entries in chunk_entries.items():
+        prices = {}
+        if (existing := write_cursor.execute(
+            'SELECT data FROM price_history_chunks WHERE from_asset=? AND to_asset=? '
+            'AND source_type=? AND chunk_start=?',
+            (from_asset, to_asset, source_type, chunk_start),
+        ).fetchone()) is not None:
+            prices = dict(decode_price_chunk(chunk_start, existing[0]))
+        for entry in new_entries:
+            if replace:
+                prices[entry.timestamp] = str(entry.price)
+            else:
+                prices.setdefault(entry.timestamp, str(entry.price))
+
+        try:
+            write_cursor.executemany(
+                'INSERT OR REPLACE INTO price_history_chunks(from_asset, to_asset, source_type, '
+                'chunk_start, first_timestamp, last_timestamp, prices_num, data, block_index) '
+                'VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [(from_asset, to_asset, source_type, *chunk) for chunk in make_price_chunks(sorted(prices.items()))],  # noqa: E501
+            )
+        except sqlite3.IntegrityError as e:
+            log.error(
+                f'Failed to add the {from_asset} -> {to_asset} prices of source {source_type} '
+                f'from {chunk_start} due to {e!s}. Skipping them',
+            )
+            success = False
+
+    return success
+
+
+def query_chunked_prices(
+        cursor: 'DBCursor',
+        from_asset: str,
+        to_asset: str,
+        source: HistoricalPriceOracle | None = None,
+        from_ts: int | None = None,
+        to_ts: int | None = None,
+) -> list[tuple[str, str, str, int, str]]:
+    """Returns the chunked prices of the pair in the given time range in the form of the
+    price_history rows. Only the blocks of the chunks that overlap the range are decoded."""
+    querystr = (
+        'SELECT from_asset, to_asset, source_type, chunk_start, data, block_index FROM '
+        'price_history_chunks WHERE from_asset=? AND to_asset=?'
+    )
+    bindings: list[str | int] = [from_asset, to_asset]
+    if source is not None:
+        querystr += ' AND source_type=?'
+        bindings.append(source.serialize_for_db())
+    if from_ts is not None:
+        querystr += ' AND chunk_start>?'
+        bindings.append(from_ts - PRICE_CHUNK_SECONDS)
+    if to_ts is not None:
+        querystr += ' AND chunk_start<=?'
+        bindings.append(to_ts)
+
+    entries = []
+    for chunk_from, chunk_to, source_type, chunk_start, data, block_index in cursor.execute(querystr, bindings):  # noqa: E501
+        offset = None if from_ts is None else _block_offset(chunk_start, block_index, from_ts)
+        for timestamp, value, scale in _iterate_price_chunk(chunk_start, data, offset):
+            if to_ts is not None and timestamp > to_ts:
+                break  # the entries are sorted so the rest are also out of the range
+            if from_ts is None or timestamp >= from_ts:
+                entries.append((chunk_from, chunk_to, source_type, timestamp, _from_fixed_point(value, scale)))  # noqa: E501
+
+    return entries
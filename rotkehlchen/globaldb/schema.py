@@ -227,6 +227,24 @@ CREATE TABLE IF NOT EXISTS price_history (
 );
 """
 
+# The prices of the price oracles of a pair packed in chunks of a month. Check price_chunks.py
+DB_CREATE_PRICE_HISTORY_CHUNKS = """
+CREATE TABLE IF NOT EXISTS price_history_chunks (
+    from_asset TEXT NOT NULL COLLATE NOCASE,
+    to_asset TEXT NOT NULL COLLATE NOCASE,
+    source_type CHAR(1) NOT NULL REFERENCES price_history_source_types(type),
+    chunk_start INTEGER NOT NULL,
+    first_timestamp INTEGER NOT NULL,
+    last_timestamp INTEGER NOT NULL,
+    prices_num INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    block_index BLOB NOT NULL,
+    FOREIGN KEY(from_asset) REFERENCES assets(identifier) ON UPDATE CASCADE ON DELETE CASCADE,
+    FOREIGN KEY(to_asset) REFERENCES assets(identifier) ON UPDATE CASCADE ON DELETE CASCADE,
+    PRIMARY KEY(from_asset, to_asset, source_type, chunk_start)
+);
+"""
+
 DB_CREATE_BINANCE_PAIRS = """
 CREATE TABLE IF NOT EXISTS binance_pairs (
     pair TEXT NOT NULL,
@@ -338,6 +356,7 @@ BEGIN TRANSACTION;
 {DB_CREATE_USER_OWNED_ASSETS}
 {DB_CREATE_PRICE_HISTORY_SOURCE_TYPES}
 {DB_CREATE_PRICE_HISTORY}
+{DB_CREATE_PRICE_HISTORY_CHUNKS}
 {DB_CREATE_BINANCE_PAIRS}
 {DB_CREATE_ADDRESS_BOOK}
 {DB_CREATE_CUSTOM_ASSET}
@@ -1,12 +1,24 @@
+import logging
+import struct
+from collections.abc import Iterator
+from decimal import Decimal, InvalidOperation
 from typing import TYPE_CHECKING, Final
 
 from rotkehlchen.db.utils import update_table_schema
-from rotkehlchen.logging import enter_exit_debug_log
+from rotkehlchen.logging import RotkehlchenLogsAdapter, enter_exit_debug_log
 from rotkehlchen.utils.misc import ts_now
 
 if TYPE_CHECKING:
     from rotkehlchen.db.drivers.gevent import DBConnection, DBCursor
 
+logger = logging.getLogger(__name__)
+log = RotkehlchenLogsAdapter(logger)
+
+# The price chunks format of v8. The encoder is copied here from price_chunks.py so that
+# changes to the runtime encoding don't change what this upgrade writes.
+PRICE_CHUNK_SECONDS: Final = 2419200  # 4 weeks
+PRICE_BLOCK_SIZE: Final = 8
+
 
 ASSETS_TO_WHITELIST: Final = (
     'eip155:1/erc20:0x2ecB13A8c458c379c4d9a7259e202De03c8F3D19',  # Block-Chain.com(BC)
@@ -148,6 +160,106 @@ def _update_contracts_abis(write_cursor: 'DBCursor') -> None:
     write_cursor.executescript('PRAGMA foreign_keys = ON;')
 
 
+def _write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _to_fixed_point(price: str) -> tuple[int, int] | None:
+    """Returns the price as an integer and the number of decimals it was multiplied with
+    or None if the price is not a finite number"""
+    try:
+        sign, digits, exponent = Decimal(price).as_tuple()
+    except InvalidOperation:
+        return None
+    if not isinstance(exponent, int):
+        return None
+
+    mantissa = int(''.join(str(x) for x in digits)) * (-1 if sign else 1)
+    if exponent >= 0:
+        return mantissa * 10 ** exponent, 0
+    return mantissa, -exponent
+
+
+def _encode_price_chunk(chunk_start: int, prices: list[tuple[int, tuple[int, int]]]) -> tuple[bytes, bytes]:  # noqa: E501
+    """Encodes the (timestamp, fixed point price) entries of a chunk sorted by timestamp.
+    Returns the data and the block index of the chunk."""
+    scale = max(price_scale for _, (_, price_scale) in prices)
+    out = bytearray()
+    _write_varint(out, scale)
+    block_timestamps, block_offsets = [], []
+    for idx, (timestamp, (fixed_price, price_scale)) in enumerate(prices):
+        if idx % PRICE_BLOCK_SIZE == 0:
+            block_timestamps.append(timestamp - chunk_start)
+            block_offsets.append(len(out))
+            last_timestamp, last_value = chunk_start, 0
+        value = fixed_price * 10 ** (scale - price_scale)
+        _write_varint(out, timestamp - last_timestamp)
+        delta = value - last_value
+        _write_varint(out, delta * 2 if delta >= 0 else -delta * 2 - 1)
+        last_timestamp, last_value = timestamp, value
+
+    block_index = struct.pack(f'<{2 * len(block_offsets)}I', *block_timestamps, *block_offsets)
+    return bytes(out), block_index
+
+
+def _make_price_chunks(prices: list[tuple[int, str]]) -> Iterator[tuple[int, int, int, int, bytes, bytes]]:  # noqa: E501
+    """Groups the (timestamp, price) entries sorted by timestamp in chunks. Yields the chunk
+    start, first and last timestamp, number of prices, encoded data and block index of
+    each chunk. Entries with invalid prices are skipped."""
+    chunks: dict[int, list[tuple[int, tuple[int, int]]]] = {}
+    for timestamp, price in prices:
+        if (fixed_price := _to_fixed_point(price)) is None:
+            log.error(f'Skipping price {price} at {timestamp} since it is not a valid number')
+            continue
+        chunks.setdefault(timestamp - timestamp % PRICE_CHUNK_SECONDS, []).append((timestamp, fixed_price))  # noqa: E501
+
+    for chunk_start, chunk in chunks.items():
+        yield (chunk_start, chunk[0][0], chunk[-1][0], len(chunk), *_encode_price_chunk(chunk_start, chunk))  # noqa: E501
+
+
+@enter_exit_debug_log()
+def _move_oracle_prices_to_chunks(write_cursor: 'DBCursor') -> None:
+    """Create the table of the chunked prices and move the prices of the price oracles from
+    price_history to it. The manual prices stay in price_history."""
+    write_cursor.execute("""
+    CREATE TABLE IF NOT EXISTS price_history_chunks (
+        from_asset TEXT NOT NULL COLLATE NOCASE,
+        to_asset TEXT NOT NULL COLLATE NOCASE,
+        source_type CHAR(1) NOT NULL REFERENCES price_history_source_types(type),
+        chunk_start INTEGER NOT NULL,
+        first_timestamp INTEGER NOT NULL,
+        last_timestamp INTEGER NOT NULL,
+        prices_num INTEGER NOT NULL,
+        data BLOB NOT NULL,
+        block_index BLOB NOT NULL,
+        FOREIGN KEY(from_asset) REFERENCES assets(identifier) ON UPDATE CASCADE ON DELETE CASCADE,
+        FOREIGN KEY(to_asset) REFERENCES assets(identifier) ON UPDATE CASCADE ON DELETE CASCADE,
+        PRIMARY KEY(from_asset, to_asset, source_type, chunk_start)
+    );""")
+    # A is MANUAL and E is MANUAL_CURRENT
+    series = write_cursor.execute(
+        'SELECT DISTINCT from_asset, to_asset, source_type FROM price_history '
+        "WHERE source_type NOT IN ('A', 'E')",
+    ).fetchall()
+    for from_asset, to_asset, source_type in series:
+        prices = write_cursor.execute(
+            'SELECT timestamp, price FROM price_history WHERE from_asset=? AND to_asset=? '
+            'AND source_type=? ORDER BY timestamp',
+            (from_asset, to_asset, source_type),
+        ).fetchall()
+        write_cursor.executemany(
+            'INSERT INTO price_history_chunks(from_asset, to_asset, source_type, chunk_start, '
+            'first_timestamp, last_timestamp, prices_num, data, block_index) '
+            'VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            [(from_asset, to_asset, source_type, *chunk) for chunk in _make_price_chunks(prices)],
+        )
+
+    write_cursor.execute("DELETE FROM price_history WHERE source_type NOT IN ('A', 'E')")
+
+
 @enter_exit_debug_log(name='globaldb v7->v8 upgrade')
 def migrate_to_v8(connection: 'DBConnection') -> None:
     """This globalDB upgrade does the following:
@@ -155,6 +267,7 @@ def migrate_to_v8(connection: 'DBConnection') -> None:
     - Adds UNIQUE constraint in asset_collections table.
     - Update balance scanner contract in scroll as the same version as in other chains
     - Rename the keys of curve cache to include chain_id
+    - Move the prices of the price oracles to chunks of a month per pair
 
     This upgrade takes place in v1.34.0"""
     with connection.write_ctx() as write_cursor:
@@ -163,3 +276,6 @@ def migrate_to_v8(connection: 'DBConnection') -> None:
         _update_scrollscan_contract(write_cursor)
         _rename_curve_tokens_cache_keys(write_cursor)
         _update_contracts_abis(write_cursor)
+        _move_oracle_prices_to_chunks(write_cursor)
+
+    connection.execute('VACUUM;')  # reclaim the space of the moved prices
@@ -43,7 +43,8 @@ def set_token_spam_protocol(
 ) -> None:
     """
     Set the protocol field of the provided token as `SPAM` depending on the `is_spam`
-    argument and clean the resolver cache. It overwrites the protocol field of the provided token
+    argument and clean the resolver and token caches. It overwrites the protocol field
+    of the provided token
     """
     write_cursor.execute(
         'UPDATE evm_tokens SET protocol=? WHERE identifier=?',
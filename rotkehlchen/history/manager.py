@@ -1,5 +1,7 @@
+import heapq
 import logging
 from collections import defaultdict
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 from typing import TYPE_CHECKING, Literal
 
@@ -47,6 +49,13 @@ NUM_HISTORY_QUERY_STEPS_EXCL_EXCHANGES = 3 + 3 * len(EVM_CHAINS_WITH_TRANSACTION
 STEPS_PER_CEX = 5
 
 
+def _accounting_sort_key(event: 'AccountingEventMixin') -> tuple[int, int]:
+    return (
+        event.get_timestamp(),
+        event.sequence_index if isinstance(event, HistoryBaseEntry) else 1,
+    )
+
+
 class HistoryQueryingManager:
 
     def __init__(
@@ -294,10 +303,13 @@ class HistoryQueryingManager:
             start_ts: Timestamp,
             end_ts: Timestamp,
             has_premium: bool,
-    ) -> tuple[str, list['AccountingEventMixin']]:
+    ) -> tuple[str, Iterable['AccountingEventMixin'], int]:
         """
-        Creates all events history from start_ts to end_ts. Returns it
-        sorted by ascending timestamp.
+        Creates all events history from start_ts to end_ts. Returns it as an iterator
+        sorted by ascending timestamp along with the number of events in it.
+
+        The history events are not loaded in memory all at once but read from the DB
+        in pages as the returned iterator is consumed.
         """
         self._reset_variables()
         step = 0
@@ -325,26 +337,33 @@ class HistoryQueryingManager:
             step = self._increase_progress(step, total_steps)
             self.processing_state_name = state_name
 
-        for exchange in self.exchange_manager.iterate_exchanges():
-            self.processing_state_name = f'Querying {exchange.name} exchange history'
-            exchange.query_history_with_callbacks(
-                # We need to have history of exchanges since before the range
-                start_ts=Timestamp(0),
-                end_ts=end_ts,
-                fail_callback=fail_history_cb,
-                new_step_data=(new_step_cb, exchange.name),
-            )
-            # each exchange instance executes STEPS_PER_CEX steps out of the total_steps
-            step = self._increase_progress(step, total_steps, step_by=STEPS_PER_CEX)
+        self.processing_state_name = 'Querying exchanges history'
+        self.exchange_manager.query_history_with_callbacks(
+            # We need to have history of exchanges since before the range
+            start_ts=Timestamp(0),
+            end_ts=end_ts,
+            fail_callback=fail_history_cb,
+            new_step_callback=new_step_cb,
+        )
+        # each exchange instance executes STEPS_PER_CEX steps out of the total_steps
+        step = self._increase_progress(
+            step=step,
+            total_steps=total_steps,
+            step_by=STEPS_PER_CEX * self.exchange_manager.connected_and_syncing_exchanges_num(),
+        )
 
         # Query all trades, asset movements and margin positions from the DB for all
-        # possible locations.
+        # possible locations. Exchanges are queried in parallel so the entries of different
+        # locations at the same timestamp are ordered by location to not depend on that.
         self.processing_state_name = 'Reading trades, asset movements and margin positions from the DB'  # noqa: E501
         with self.db.conn.read_ctx() as cursor:
             # Include all trades
             trades = self.db.get_trades(
                 cursor,
-                filter_query=TradesFilterQuery.make(to_ts=end_ts),
+                filter_query=TradesFilterQuery.make(
+                    to_ts=end_ts,
+                    order_by_rules=[('timestamp', True), ('location', True)],
+                ),
                 has_premium=True,  # we need all trades for accounting -- limit happens later
             )
             history.extend(trades)
@@ -352,7 +371,10 @@ class HistoryQueryingManager:
             # Include all asset movements
             asset_movements = self.db.get_asset_movements(
                 cursor,
-                filter_query=AssetMovementsFilterQuery.make(to_ts=end_ts),
+                filter_query=AssetMovementsFilterQuery.make(
+                    to_ts=end_ts,
+                    order_by_rules=[('timestamp', True), ('location', True)],
+                ),
                 has_premium=True,  # we need all trades for accounting -- limit happens later
             )
             history.extend(asset_movements)
@@ -415,25 +437,35 @@ class HistoryQueryingManager:
         step = self._increase_progress(step, total_steps)
         self.processing_state_name = 'Querying base history events'
         # Include all base history entries
-        history_events_db = DBHistoryEvents(self.db)
+        filter_query = HistoryEventFilterQuery.make(
+            # We need to have history since before the range
+            from_ts=Timestamp(0),
+            to_ts=end_ts,
+        )
         with self.db.conn.read_ctx() as cursor:
-            base_entries = history_events_db.get_history_events(
+            events_num = len(history) + DBHistoryEvents(self.db).get_history_events_count(
                 cursor=cursor,
-                filter_query=HistoryEventFilterQuery.make(
-                    # We need to have history since before the range
-                    from_ts=Timestamp(0),
-                    to_ts=end_ts,
-                ),
-                has_premium=True,  # ignore limits here. Limit applied at processing
-                group_by_event_ids=False,
-            )
-        history.extend(base_entries)
+                query_filter=filter_query,
+            )[0]
         self._increase_progress(step, total_steps)
 
-        history.sort(  # sort events first by timestamp and if history base by sequence index
-            key=lambda x: (
-                x.get_timestamp(),
-                x.sequence_index if isinstance(x, HistoryBaseEntry) else 1,
-            ),
+        # sort events first by timestamp and if history base by sequence index. The history
+        # events are streamed in that order so they only need to be merged with the rest
+        history.sort(key=_accounting_sort_key)
+        return (
+            empty_or_error,
+            heapq.merge(history, self._iterate_history_events(filter_query), key=_accounting_sort_key),  # noqa: E501
+            events_num,
         )
-        return empty_or_error, history
+
+    def _iterate_history_events(
+            self,
+            filter_query: HistoryEventFilterQuery,
+    ) -> Iterator[HistoryBaseEntry]:
+        """Lazily read the history events from the DB keeping a read cursor open until done"""
+        with self.db.conn.read_ctx() as cursor:
+            yield from DBHistoryEvents(self.db).iterate_history_events(
+                cursor=cursor,
+                filter_query=filter_query,
+                has_premium=True,  # ignore limits here. Limit applied at processing
+            )
@@ -3,7 +3,7 @@ import operator
 from collections.abc import Iterable, Sequence
 from contextlib import suppress
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, NamedTuple, Optional, Union, cast, overload
+from typing import TYPE_CHECKING, Any, NamedTuple, Optional, TypeVar, Union, cast, overload
 
 from rotkehlchen.assets.asset import Asset, AssetWithOracles, EvmToken, FiatAsset, UnderlyingToken
 from rotkehlchen.assets.utils import TokenEncounterInfo, get_or_create_evm_token
@@ -140,6 +140,7 @@ ASSETS_UNDERLYING_BTC = (
 )
 
 
+AssetT = TypeVar('AssetT', bound=Asset)
 CurrentPriceOracleInstance = Union[
     'Coingecko',
     'Cryptocompare',
@@ -671,6 +672,135 @@ class Inquirer:
             match_main_currency=match_main_currency,
         )
 
+    @staticmethod
+    def find_usd_prices(
+            assets: Iterable[AssetT],
+            ignore_cache: bool = False,
+    ) -> dict[AssetT, Price]:
+        """Returns the current usd price of each of the given assets. The price is ZERO_PRICE
+        for the assets whose price could not be found.
+
+        Assets whose price only comes from the price oracles are queried together. Each
+        oracle resolves as many of them as it can in one go and passes the rest down to the
+        next oracle. Assets that need special handling, such as fiat or tokens of known
+        protocols, are priced one by one as in find_usd_price.
+        """
+        prices: dict[AssetT, Price] = {}
+        batched_assets: dict[AssetT, AssetWithOracles] = {}
+        for asset in dict.fromkeys(assets):  # deduplicate keeping the order
+            if ignore_cache is False and (cache := Inquirer.get_cached_current_price_entry(
+                cache_key=(asset, A_USD),
+                match_main_currency=False,
+            )) is not None:
+                prices[asset] = cache.price
+                continue
+
+            if (resolved_asset := Inquirer._resolve_oracles_only_asset(asset)) is None:
+                prices[asset] = Inquirer.find_usd_price(asset=asset, ignore_cache=ignore_cache)
+                continue
+
+            # manual current prices take precedence over all the oracles
+            if (price := Inquirer._try_oracle_price_query(
+                oracle=CurrentPriceOracle.MANUALCURRENT,
+                oracle_instance=Inquirer._manualcurrent,
+                from_asset=resolved_asset,
+                to_asset=Inquirer.usd,
+                coming_from_latest_price=False,
+                match_main_currency=False,
+            )[0]) != ZERO_PRICE:
+                prices[asset] = price
+                continue
+
+            batched_assets[asset] = resolved_asset
+
+        if len(batched_assets) != 0:
+            oracle_prices = Inquirer._query_oracle_instances_multiple(
+                from_assets=list(batched_assets.values()),
+                to_asset=Inquirer.usd,
+            )
+            for asset, resolved_asset in batched_assets.items():
+                prices[asset] = oracle_prices.get(resolved_asset, ZERO_PRICE)
+
+        return prices
+
+    @staticmethod
+    def _resolve_oracles_only_asset(asset: Asset) -> AssetWithOracles | None:
+        """Resolves an asset whose usd price can only be found by the price oracles.
+        Returns None if the asset is unknown or its price needs special handling."""
+        if asset in (A_USD, A_BSQ, A_KFEE):
+            return None
+
+        try:
+            resolved_asset = asset.resolve()
+        except UnknownAsset:
+            return None
+
+        if not isinstance(resolved_asset, AssetWithOracles) or isinstance(resolved_asset, FiatAsset):  # noqa: E501
+            return None
+
+        if isinstance(resolved_asset, EvmToken) and (
+            resolved_asset.identifier in Inquirer.special_tokens or
+            resolved_asset.protocol in ProtocolsWithPriceLogic or
+            resolved_asset.underlying_tokens is not None
+        ):
+            return None
+
+        return resolved_asset
+
+    @staticmethod
+    def _query_oracle_instances_multiple(
+            from_assets: list[AssetWithOracles],
+            to_asset: AssetWithOracles,
+    ) -> dict[AssetWithOracles, Price]:
+        """Query the oracles for the prices of multiple assets. Each oracle is given
+        the assets whose price was not found by the oracles before it."""
+        instance = Inquirer()
+        assert instance._oracles is not None and instance._oracle_instances is not None, (
+            'Inquirer should never be called before setting the oracles'
+        )
+        prices: dict[AssetWithOracles, Price] = {}
+        remaining_assets = from_assets
+        for oracle, oracle_instance in zip(instance._oracles, instance._oracle_instances, strict=True):  # noqa: E501
+            if len(remaining_assets) == 0:
+                break
+
+            if (
+                oracle == CurrentPriceOracle.MANUALCURRENT or  # already checked per asset
+                oracle_instance.rate_limited_in_last(DEFAULT_RATE_LIMIT_WAITING_TIME) is True or
+                (isinstance(oracle_instance, PenalizablePriceOracleMixin) and oracle_instance.is_penalized() is True)  # noqa: E501
+            ):
+                continue
+
+            try:
+                oracle_prices = oracle_instance.query_multiple_current_prices(
+                    from_assets=remaining_assets,
+                    to_asset=to_asset,
+                )
+            except RemoteError as e:
+                log.warning(
+                    f'Current price oracle {oracle_instance} failed to request {to_asset!s} '
+                    f'prices for {len(remaining_assets)} assets due to: {e!s}.',
+                )
+                continue
+
+            now = ts_now()
+            for asset, price in oracle_prices.items():
+                prices[asset] = price
+                Inquirer.set_cached_price(
+                    cache_key=(asset, to_asset),
+                    cached_price=CachedPriceEntry(
+                        price=price,
+                        time=now,
+                        oracle=oracle,
+                        used_main_currency=False,
+                    ),
+                )
+
+            log.debug(f'Current price oracle {oracle} got {len(oracle_prices)} prices out of {len(remaining_assets)}')  # noqa: E501
+            remaining_assets = [x for x in remaining_assets if x not in oracle_prices]
+
+        return prices
+
     @staticmethod
     def _find_usd_price(
             asset: Asset,
@@ -6,6 +6,10 @@ from json import JSONDecodeError
 from typing import Any, Final
 
 from rotkehlchen.assets.asset import Asset, AssetWithOracles
+from rotkehlchen.constants.prices import ZERO_PRICE
+from rotkehlchen.errors.defi import DefiPoolError
+from rotkehlchen.errors.misc import RemoteError
+from rotkehlchen.errors.price import PriceQueryUnsupportedAsset
 from rotkehlchen.globaldb.cache import (
     globaldb_get_unique_cache_last_queried_ts_by_key,
     globaldb_get_unique_cache_value,
@@ -53,6 +57,40 @@ class CurrentPriceOracleInterface(abc.ABC):
         2. Whether returned price is in main currency
         """
 
+    def query_multiple_current_prices(
+            self,
+            from_assets: list[AssetWithOracles],
+            to_asset: AssetWithOracles,
+    ) -> dict[AssetWithOracles, Price]:
+        """Query the current price of multiple assets in `to_asset`. Returns the non zero
+        prices that were found. Assets whose price could not be found are omitted.
+
+        Oracles that can query many assets in a single request override this. By default
+        each asset is queried separately.
+
+        May raise:
+        - RemoteError if a request for multiple assets failed
+        """
+        prices = {}
+        for from_asset in from_assets:
+            try:
+                price, _ = self.query_current_price(
+                    from_asset=from_asset,
+                    to_asset=to_asset,
+                    match_main_currency=False,
+                )
+            except (DefiPoolError, PriceQueryUnsupportedAsset, RemoteError) as e:
+                log.warning(
+                    f'Current price oracle {self.name} failed to request {to_asset!s} '
+                    f'price for {from_asset.identifier} due to: {e!s}.',
+                )
+                continue
+
+            if price != ZERO_PRICE:
+                prices[from_asset] = price
+
+        return prices
+
 
 class HistoricalPriceOracleInterface(CurrentPriceOracleInterface, abc.ABC):
     """Query prices for certain timestamps. Oracle could be rate limited"""
@@ -11,7 +11,7 @@ from collections.abc import Sequence
 from enum import Enum
 from http import HTTPStatus
 from json import JSONDecodeError
-from typing import Any, Literal, NamedTuple, cast
+from typing import IO, Any, Literal, NamedTuple, cast
 from urllib.parse import urlencode
 
 import machineid
@@ -354,25 +354,27 @@ class Premium:
 
     def upload_data(
             self,
-            data_blob: bytes,
+            data_file: IO[bytes],
             our_hash: str,
             last_modify_ts: Timestamp,
             compression_type: Literal['zlib'],
     ) -> dict:
         """Uploads data to the server and returns the response dict. We upload the encrypted
-        database as a file in an http form.
+        database read from the given file as a file in an http form.
 
         May raise:
         - RemoteError if there are problems reaching the server or if
         there is an error returned by the server
         - PremiumAuthenticationError if the given key is rejected by the Rotkehlchen server
         """
+        length = data_file.seek(0, os.SEEK_END)
+        data_file.seek(0)
         data = self.sign(
             'backup',
             original_hash=our_hash,
             last_modify_ts=last_modify_ts,
             index=0,
-            length=len(data_blob),
+            length=length,
             compression=compression_type,
         )
 
@@ -380,7 +382,7 @@ class Premium:
             response = self.session.post(
                 self.rotki_nest + 'backup',
                 data=data,
-                files={'db_file': data_blob},
+                files={'db_file': data_file},
                 timeout=ROTKEHLCHEN_SERVER_BACKUP_TIMEOUT,
             )
         except requests.exceptions.RequestException as e:
@@ -1,4 +1,5 @@
 import logging
+import os
 import shutil
 from enum import Enum
 from typing import Any, Literal, NamedTuple
@@ -197,33 +198,15 @@ class PremiumSyncManager:
             return False, message
 
         data, our_hash = self.data.compress_and_encrypt_db()
-        log.debug(
-            'CAN_PUSH',
-            ours=our_hash,
-            theirs=metadata.data_hash,
-        )
-        if our_hash == metadata.data_hash and not force_upload:
-            log.debug('upload to server stopped -- same hash')
-            message = 'Remote database is up to date'
-            self.data.msg_aggregator.add_message(
-                message_type=WSMessageType.DATABASE_UPLOAD_RESULT,
-                data={'uploaded': False, 'actionable': True, 'message': message},
+        with data:  # the encrypted DB is kept in a temporary file until uploaded
+            log.debug(
+                'CAN_PUSH',
+                ours=our_hash,
+                theirs=metadata.data_hash,
             )
-            self.last_upload_attempt_ts = ts_now()
-            return False, message
-
-        data_bytes_size = len(data)
-        if data_bytes_size < metadata.data_size and not force_upload:
-            with self.data.db.conn.read_ctx() as cursor:
-                ask_user_upon_size_discrepancy = self.data.db.get_setting(
-                    cursor=cursor, name='ask_user_upon_size_discrepancy',
-                )
-            if ask_user_upon_size_discrepancy is True:
-                message = 'Remote database bigger than the local one'
-                log.debug(
-                    f'upload to server stopped -- remote db({metadata.data_size}) '
-                    f'bigger than local({data_bytes_size})',
-                )
+            if our_hash == metadata.data_hash and not force_upload:
+                log.debug('upload to server stopped -- same hash')
+                message = 'Remote database is up to date'
                 self.data.msg_aggregator.add_message(
                     message_type=WSMessageType.DATABASE_UPLOAD_RESULT,
                     data={'uploaded': False, 'actionable': True, 'message': message},
@@ -231,22 +214,41 @@ class PremiumSyncManager:
                 self.last_upload_attempt_ts = ts_now()
                 return False, message
 
-        try:
-            self.premium.upload_data(
-                data_blob=data,
-                our_hash=our_hash,
-                last_modify_ts=our_last_write_ts,
-                compression_type='zlib',
-            )
-        except (RemoteError, PremiumAuthenticationError) as e:
-            message = str(e)
-            log.debug('upload to server -- upload error', error=message)
-            self.data.msg_aggregator.add_message(
-                message_type=WSMessageType.DATABASE_UPLOAD_RESULT,
-                data={'uploaded': False, 'actionable': False, 'message': message},
-            )
-            self.last_upload_attempt_ts = ts_now()
-            return False, message
+            data_bytes_size = data.seek(0, os.SEEK_END)
+            if data_bytes_size < metadata.data_size and not force_upload:
+                with self.data.db.conn.read_ctx() as cursor:
+                    ask_user_upon_size_discrepancy = self.data.db.get_setting(
+                        cursor=cursor, name='ask_user_upon_size_discrepancy',
+                    )
+                if ask_user_upon_size_discrepancy is True:
+                    message = 'Remote database bigger than the local one'
+                    log.debug(
+                        f'upload to server stopped -- remote db({metadata.data_size}) '
+                        f'bigger than local({data_bytes_size})',
+                    )
+                    self.data.msg_aggregator.add_message(
+                        message_type=WSMessageType.DATABASE_UPLOAD_RESULT,
+                        data={'uploaded': False, 'actionable': True, 'message': message},
+                    )
+                    self.last_upload_attempt_ts = ts_now()
+                    return False, message
+
+            try:
+                self.premium.upload_data(
+                    data_file=data,
+                    our_hash=our_hash,
+                    last_modify_ts=our_last_write_ts,
+                    compression_type='zlib',
+                )
+            except (RemoteError, PremiumAuthenticationError) as e:
+                message = str(e)
+                log.debug('upload to server -- upload error', error=message)
+                self.data.msg_aggregator.add_message(
+                    message_type=WSMessageType.DATABASE_UPLOAD_RESULT,
+                    data={'uploaded': False, 'actionable': False, 'message': message},
+                )
+                self.last_upload_attempt_ts = ts_now()
+                return False, message
 
         # update the last data upload value
         self.last_data_upload_ts = ts_now()
@@ -21,6 +21,7 @@ from rotkehlchen.balances.manual import (
     account_for_manually_tracked_asset_balances,
     get_manually_tracked_balances,
 )
+from rotkehlchen.balances.sources import BalanceSource, query_balance_sources
 from rotkehlchen.chain.accounts import SingleBlockchainAccountData
 from rotkehlchen.chain.aggregator import ChainsAggregator
 from rotkehlchen.chain.arbitrum_one.manager import ArbitrumOneManager
@@ -105,10 +106,12 @@ from rotkehlchen.usage_analytics import maybe_submit_usage_analytics
 from rotkehlchen.user_messages import MessagesAggregator
 from rotkehlchen.utils.datadir import maybe_restructure_rotki_data_directory
 from rotkehlchen.utils.misc import combine_dicts
+from rotkehlchen.utils.rate_limit import RateLimiters
 
 if TYPE_CHECKING:
     from rotkehlchen.chain.bitcoin.xpub import XpubData
     from rotkehlchen.db.drivers.gevent import DBCursor
+    from rotkehlchen.exchanges.exchange import ExchangeInterface
     from rotkehlchen.exchanges.kraken import KrakenAccountType
 
 logger = logging.getLogger(__name__)
@@ -523,6 +526,7 @@ class Rotkehlchen:
 
         self.deactivate_premium_status()
         self.greenlet_manager.clear()
+        self.chains_aggregator.kill_cache_refreshes()
         del self.chains_aggregator
         self.exchange_manager.delete_all_exchanges()
 
@@ -533,6 +537,7 @@ class Rotkehlchen:
         self.data.logout()
         self.cryptocompare.unset_database()
         CachedSettings().reset()
+        RateLimiters().reset()
 
         # Make sure no messages leak to other user sessions
         self.msg_aggregator.consume_errors()
@@ -870,7 +875,7 @@ class Rotkehlchen:
             start_ts: Timestamp,
             end_ts: Timestamp,
     ) -> tuple[int, str]:
-        error_or_empty, events = self.history_querying_manager.get_history(
+        error_or_empty, events, events_num = self.history_querying_manager.get_history(
             start_ts=start_ts,
             end_ts=end_ts,
             has_premium=self.premium is not None,
@@ -879,9 +884,31 @@ class Rotkehlchen:
             start_ts=start_ts,
             end_ts=end_ts,
             events=events,
+            events_num=events_num,
         )
         return report_id, error_or_empty
 
+    @staticmethod
+    def _exchange_balance_source(
+            exchange: 'ExchangeInterface',
+            ignore_cache: bool,
+    ) -> BalanceSource[dict[Asset, Balance]]:
+        def query() -> dict[Asset, Balance]:
+            """May raise:
+            - RemoteError if the exchange balances could not be queried
+            """
+            exchange_balances, error_msg = exchange.query_balances(ignore_cache=ignore_cache)
+            if not isinstance(exchange_balances, dict):
+                raise RemoteError(error_msg)
+            return cast(dict[Asset, Balance], exchange_balances)
+
+        return BalanceSource(
+            location=str(exchange.location),
+            name=exchange.name,
+            query=query,
+            usd_value=lambda balances: sum((x.usd_value for x in balances.values()), ZERO),
+        )
+
     def query_balances(
             self,
             requested_save_data: bool = False,
@@ -911,31 +938,44 @@ class Rotkehlchen:
 
         balances: dict[str, dict[Asset, Balance]] = {}
         problem_free = True
-        for exchange in self.exchange_manager.iterate_exchanges():
-            exchange_balances, error_msg = exchange.query_balances(ignore_cache=ignore_cache)
+        # the chains are queried in parallel to the exchanges and to each other
+        blockchain_greenlet = gevent.spawn(
+            self.chains_aggregator.query_balances,
+            blockchain=None,
+            ignore_cache=ignore_cache,
+        )
+        try:
+            exchange_results, exchange_errors = query_balance_sources(
+                sources=[
+                    self._exchange_balance_source(exchange=exchange, ignore_cache=ignore_cache)
+                    for exchange in self.exchange_manager.iterate_exchanges()
+                ],
+                msg_aggregator=self.msg_aggregator,
+            )
+        except BaseException:  # don't leave the chains query running if the exchanges one fails
+            blockchain_greenlet.kill()
+            raise
+
+        for source, error in exchange_errors:
             # If we got an error, disregard that exchange but make sure we don't save data
-            if not isinstance(exchange_balances, dict):
-                problem_free = False
-                self.msg_aggregator.add_message(
-                    message_type=WSMessageType.BALANCE_SNAPSHOT_ERROR,
-                    data={'location': exchange.name, 'error': error_msg},
+            problem_free = False
+            self.msg_aggregator.add_message(
+                message_type=WSMessageType.BALANCE_SNAPSHOT_ERROR,
+                data={'location': source.name, 'error': str(error)},
+            )
+        for source, exchange_balances in exchange_results:
+            if source.location not in balances:
+                balances[source.location] = exchange_balances
+            else:  # multiple exchange of same type. Combine balances
+                balances[source.location] = combine_dicts(
+                    balances[source.location],
+                    exchange_balances,
                 )
-            else:
-                location_str = str(exchange.location)
-                if location_str not in balances:  # need to widen type at assignment here
-                    balances[location_str] = cast(dict[Asset, Balance], exchange_balances)
-                else:  # multiple exchange of same type. Combine balances
-                    balances[location_str] = combine_dicts(
-                        balances[location_str],
-                        exchange_balances,  # type: ignore
-                    )
 
         liabilities: dict[Asset, Balance]
         try:
-            blockchain_result = self.chains_aggregator.query_balances(
-                blockchain=None,
-                ignore_cache=ignore_cache,
-            )  # copies below since if cache is used we end up modifying the balance sheet object
+            blockchain_result = blockchain_greenlet.get()
+            # copies below since if cache is used we end up modifying the balance sheet object
             if len(blockchain_result.totals.assets) != 0:
                 balances[str(Location.BLOCKCHAIN)] = blockchain_result.totals.assets.copy()
             liabilities = blockchain_result.totals.liabilities.copy()
@@ -6,6 +6,7 @@ import gevent
 
 from rotkehlchen.api.server import APIServer, RestAPI
 from rotkehlchen.args import app_args
+from rotkehlchen.fval import set_fval_backend
 from rotkehlchen.logging import TRACE, RotkehlchenLogsAdapter, add_logging_level, configure_logging
 from rotkehlchen.rotkehlchen import Rotkehlchen
 
@@ -29,6 +30,8 @@ class RotkehlchenServer:
         self.args = arg_parser.parse_args()
         add_logging_level('TRACE', TRACE)
         configure_logging(self.args)
+        if self.args.fval_backend is not None:
+            set_fval_backend(self.args.fval_backend)
         self.rotkehlchen = Rotkehlchen(self.args)
         self.stop_event = gevent.event.Event()
         if ',' in self.args.api_cors:
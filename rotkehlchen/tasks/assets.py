@@ -95,6 +95,7 @@ def _add_spam_asset(
             query,
             [(SPAM_PROTOCOL, identifier) for identifier in detected_spam_assets],
         )
+    globaldb.clean_evm_token_cache()
 
     user_db.ignore_multiple_assets(
         write_cursor=user_db_write_cursor,
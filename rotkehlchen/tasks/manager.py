@@ -1,8 +1,9 @@
 import logging
 import random
+import time
 from collections import defaultdict
 from collections.abc import Callable
-from typing import TYPE_CHECKING, NamedTuple
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 import gevent
 
@@ -59,6 +60,7 @@ from rotkehlchen.tasks.calendar import (
     maybe_create_ens_reminders,
     notify_reminders,
 )
+from rotkehlchen.tasks.scheduling import TaskPriority, TaskStats
 from rotkehlchen.tasks.utils import query_missing_prices_of_base_entries, should_run_periodic_task
 from rotkehlchen.types import (
     EVM_CHAINS_WITH_TRANSACTIONS,
@@ -189,8 +191,38 @@ class TaskManager:
         ]
         if self.premium_sync_manager is not None:
             self.potential_tasks.append(self._maybe_schedule_db_upload)
+        # tasks not in here have normal priority
+        self.task_priorities: dict[Callable, TaskPriority] = {
+            self._maybe_query_evm_transactions: TaskPriority.HIGH,
+            self._maybe_schedule_evm_txreceipts: TaskPriority.HIGH,
+            self._maybe_decode_evm_transactions: TaskPriority.HIGH,
+            self._maybe_schedule_db_upload: TaskPriority.HIGH,
+            self._maybe_trigger_calendar_reminder: TaskPriority.HIGH,
+            self._maybe_schedule_cryptocompare_query: TaskPriority.LOW,
+            self._maybe_update_yearn_vaults: TaskPriority.LOW,
+            self._maybe_update_ilk_cache: TaskPriority.LOW,
+            self._maybe_detect_new_spam_tokens: TaskPriority.LOW,
+            self._maybe_augmented_detect_new_spam_tokens: TaskPriority.LOW,
+            self._maybe_update_owned_assets: TaskPriority.LOW,
+            self._maybe_update_aave_v3_underlying_assets: TaskPriority.LOW,
+            self._maybe_delete_past_calendar_events: TaskPriority.LOW,
+            self._maybe_query_graph_delegated_tokens: TaskPriority.LOW,
+        }
+        self.task_stats: dict[Callable, TaskStats] = {}
         self.schedule_lock = gevent.lock.Semaphore()
 
+    def _get_task_stats(self, scheduling_fn: Callable) -> TaskStats:
+        if (stats := self.task_stats.get(scheduling_fn)) is None:
+            stats = self.task_stats[scheduling_fn] = TaskStats(
+                name=scheduling_fn.__name__,
+                priority=self.task_priorities.get(scheduling_fn, TaskPriority.NORMAL),
+            )
+        return stats
+
+    def _set_task_backlog(self, scheduling_fn: Callable, backlog: int) -> None:
+        """Record the amount of pending work of a task which raises its weight"""
+        self._get_task_stats(scheduling_fn).backlog = backlog
+
     def _maybe_schedule_db_upload(self) -> Optional[list[gevent.Greenlet]]:
         assert self.premium_sync_manager is not None, 'caller should make sure premium sync manager exists'  # noqa: E501
         if self.premium_sync_manager.check_if_should_sync(force_upload=False) is False:
@@ -375,6 +407,7 @@ class TaskManager:
                 tx_filter_query=EvmTransactionsFilterQuery.make(chain_id=blockchain.to_chain_id()),  # type: ignore[arg-type]
                 limit=TX_RECEIPTS_QUERY_LIMIT,
             )
+            self._set_task_backlog(self._maybe_schedule_evm_txreceipts, len(hash_results))
             if len(hash_results) == 0:
                 return None
 
@@ -431,6 +464,7 @@ class TaskManager:
             query_filter=query_filter,
             ignored_assets=list(self.base_entries_ignore_set),
         )
+        self._set_task_backlog(self._maybe_query_missing_prices, len(entries))
         if len(entries) == 0:
             return None
 
@@ -460,6 +494,7 @@ class TaskManager:
             number_of_tx_to_decode = dbevmtx.count_hashes_not_decoded(
                 chain_id=blockchain.to_chain_id(),
             )
+            self._set_task_backlog(self._maybe_decode_evm_transactions, number_of_tx_to_decode)
             if number_of_tx_to_decode == 0:
                 return None
 
@@ -964,8 +999,24 @@ class TaskManager:
             addresses=self.chains_aggregator.accounts.eth,
         )]
 
+    @staticmethod
+    def _track_task_run(stats: TaskStats, greenlets: list[gevent.Greenlet]) -> None:
+        """Record the start of a task run and its duration once all its greenlets finish"""
+        stats.started()
+
+        def on_greenlet_finish(_: gevent.Greenlet) -> None:
+            if all(greenlet.dead for greenlet in greenlets):
+                stats.finished()
+
+        for greenlet in greenlets:
+            greenlet.rawlink(on_greenlet_finish)
+
     def _schedule(self) -> None:
-        """Schedules background tasks"""
+        """Schedules background tasks
+
+        The tasks are considered in order of their virtual time so that each gets a
+        share of the task slots proportional to its weight. See TaskStats.
+        """
         self.greenlet_manager.clear_finished()
         # Also clear methods mapping in the task manager
         self.running_greenlets = {
@@ -980,24 +1031,51 @@ class TaskManager:
             f'Max greenlets: {self.max_tasks_num}. '
             f'{"Will not schedule" if not_proceed else "Will schedule"}.',
         )
-        if not_proceed:
-            return  # too busy
-
+        # shuffle first so that tasks with equal virtual time are considered in random order
         random.shuffle(self.potential_tasks)
-        max_tasks = min(self.max_tasks_num - current_greenlets, len(self.potential_tasks))
-
+        scheduling_fns = sorted(
+            self.potential_tasks,
+            key=lambda fn: self._get_task_stats(fn).virtual_time,
+        )
+        max_tasks = 0 if not_proceed else min(self.max_tasks_num - current_greenlets, len(self.potential_tasks))  # noqa: E501
         spawned_new = 0
-        for scheduling_fn in self.potential_tasks:
-            if spawned_new >= max_tasks:
-                break  # no more task slots left
+        for scheduling_fn in scheduling_fns:
             if scheduling_fn in self.running_greenlets:
                 continue  # the specified task is already running
+
+            stats = self._get_task_stats(scheduling_fn)
+            if spawned_new >= max_tasks:
+                stats.waiting = True  # no more task slots left
+                continue
+
+            check_start = time.monotonic()
             new_greenlets = scheduling_fn()
+            stats.checked(duration=time.monotonic() - check_start)
             if new_greenlets is None:
                 continue  # The scheduling function for the specific task decided to not schedule it  # noqa: E501
+
+            self._track_task_run(stats=stats, greenlets=new_greenlets)
             self.running_greenlets[scheduling_fn] = new_greenlets
             spawned_new += 1
 
+    def get_tasks_stats(self) -> dict[str, Any]:
+        """Returns the scheduling statistics of all background tasks in the order in which
+        the scheduler would consider them"""
+        scheduling_fns = sorted(
+            self.potential_tasks,
+            key=lambda fn: self._get_task_stats(fn).virtual_time,
+        )
+        return {
+            'max_tasks_num': self.max_tasks_num,
+            'running_tasks_num': (
+                sum(not greenlet.dead for greenlet in self.greenlet_manager.greenlets) +
+                sum(not greenlet.dead for greenlet in self.api_task_greenlets)
+            ),
+            'tasks': [self._get_task_stats(fn).serialize(running=any(
+                not greenlet.dead for greenlet in self.running_greenlets.get(fn, [])
+            )) for fn in scheduling_fns],
+        }
+
     def schedule(self) -> None:
         """Schedules background task while holding the scheduling lock
 
@@ -0,0 +1,92 @@
+import math
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from rotkehlchen.types import Timestamp
+from rotkehlchen.utils.misc import ts_now
+from rotkehlchen.utils.mixins.enums import SerializableEnumNameMixin
+
+# Weight of the latest measured duration in the moving average of a task's duration
+DURATION_SMOOTHING = 0.3
+
+
+class TaskPriority(SerializableEnumNameMixin):
+    """The weight of a background task in the scheduling. A task with double the weight
+    of another gets about double the share of the task slots."""
+    LOW = 1
+    NORMAL = 2
+    HIGH = 4
+
+
+@dataclass(init=True, repr=True, eq=False, order=False, unsafe_hash=False, frozen=False)
+class TaskStats:
+    """Scheduling state and statistics of a background task of the task manager
+
+    Tasks are considered by the scheduler in order of their virtual time, as in weighted
+    fair queuing. The time spent checking if a task should run and running it advances
+    its virtual time, divided by the task's weight. So tasks that are cheap or have not
+    run for long are considered first and heavy tasks can't starve the rest.
+    """
+    name: str
+    priority: TaskPriority
+    virtual_time: float = 0
+    runs: int = 0
+    last_check_ts: Timestamp | None = None
+    last_run_ts: Timestamp | None = None
+    last_duration: float | None = None
+    average_duration: float | None = None
+    # Amount of pending work of the task (e.g. undecoded transactions) if it reports it
+    backlog: int | None = None
+    # True if the task was not considered in the last scheduling due to no free task slots
+    waiting: bool = False
+    started_at: float | None = None  # monotonic time when the current run started
+
+    def weight(self) -> float:
+        """The weight of the task which grows logarithmically with its backlog"""
+        return self.priority.value * (1 + math.log10(1 + (self.backlog or 0)))
+
+    def checked(self, duration: float) -> None:
+        """Record that the task's scheduling function ran for the given seconds"""
+        self.last_check_ts = ts_now()
+        self.waiting = False
+        self.virtual_time += duration / self.weight()
+
+    def started(self) -> None:
+        self.runs += 1
+        self.last_run_ts = ts_now()
+        self.started_at = time.monotonic()
+
+    def finished(self) -> None:
+        """Record the duration of the run that just finished"""
+        if self.started_at is None:
+            return  # already recorded
+
+        duration = time.monotonic() - self.started_at
+        self.started_at = None
+        self.last_duration = duration
+        if self.average_duration is None:
+            self.average_duration = duration
+        else:
+            self.average_duration += DURATION_SMOOTHING * (duration - self.average_duration)
+        self.virtual_time += duration / self.weight()
+
+    def serialize(self, running: bool) -> dict[str, Any]:
+        if running:
+            status = 'running'
+        elif self.waiting:
+            status = 'waiting'
+        else:
+            status = 'idle'
+
+        return {
+            'name': self.name.removeprefix('_maybe_'),
+            'priority': self.priority.serialize(),
+            'status': status,
+            'runs': self.runs,
+            'last_check_ts': self.last_check_ts,
+            'last_run_ts': self.last_run_ts,
+            'last_duration': None if self.last_duration is None else round(self.last_duration, 3),
+            'average_duration': None if self.average_duration is None else round(self.average_duration, 3),  # noqa: E501
+            'backlog': self.backlog,
+        }
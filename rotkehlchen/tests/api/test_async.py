@@ -5,6 +5,7 @@ import gevent
 import pytest
 import requests
 
+from rotkehlchen.constants.timing import ASYNC_TASK_RESULT_TTL
 from rotkehlchen.tests.utils.api import (
     api_url_for,
     assert_error_response,
@@ -15,6 +16,7 @@ from rotkehlchen.tests.utils.api import (
 )
 from rotkehlchen.tests.utils.exchanges import mock_binance_balance_response, try_get_first_exchange
 from rotkehlchen.types import Location
+from rotkehlchen.utils.misc import ts_now
 
 
 @pytest.mark.parametrize('added_exchanges', [(Location.BINANCE, Location.POLONIEX)])
@@ -186,3 +188,32 @@ def test_cancel_async_task(rotkehlchen_api_server_with_exchanges):
     response = requests.get(api_url_for(server, 'asynctasksresource'))
     result = assert_proper_sync_response_with_result(response)
     assert result == {'completed': [], 'pending': []}
+
+
+@pytest.mark.parametrize('legacy_messages_via_websockets', [True])
+def test_async_task_completion_notification_and_expiry(rotkehlchen_api_server, websocket_connection):  # noqa: E501
+    """Test that the completion of an async task is sent via websockets and that results
+    which are not collected are dropped after the TTL"""
+    task_ids = []
+    for _ in range(2):
+        response = requests.get(api_url_for(
+            rotkehlchen_api_server,
+            'manuallytrackedbalancesresource',
+        ), json={'async_query': True})
+        task_ids.append(assert_ok_async_response(response))
+
+    websocket_connection.wait_until_messages_num(num=2, timeout=10)
+    assert sorted(websocket_connection.pop_message()['data']['task_id'] for _ in range(2)) == task_ids  # noqa: E501
+    response = requests.get(api_url_for(rotkehlchen_api_server, 'asynctasksresource'))
+    assert assert_proper_sync_response_with_result(response) == {'completed': task_ids, 'pending': []}  # noqa: E501
+    response = requests.get(api_url_for(rotkehlchen_api_server, 'specific_async_tasks_resource', task_id=task_ids[0]))  # noqa: E501
+    assert assert_proper_sync_response_with_result(response)['status'] == 'completed'
+
+    # the result of the second task is never collected and gets dropped after the TTL
+    with patch('rotkehlchen.api.rest.ts_now', return_value=ts_now() + ASYNC_TASK_RESULT_TTL + 1):
+        response = requests.get(api_url_for(rotkehlchen_api_server, 'asynctasksresource'))
+        assert assert_proper_sync_response_with_result(response) == {'completed': [], 'pending': []}  # noqa: E501
+        response = requests.get(api_url_for(rotkehlchen_api_server, 'specific_async_tasks_resource', task_id=task_ids[1]))  # noqa: E501
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    assert rotkehlchen_api_server.rest_api.rotkehlchen.api_task_greenlets == []
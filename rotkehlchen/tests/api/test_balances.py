@@ -522,8 +522,8 @@ def test_balance_snapshot_error_message(
 
     result = assert_proper_sync_response_with_result(response)
     assert result == {'assets': {}, 'liabilities': {}, 'location': {}, 'net_usd': '0'}
-    websocket_connection.wait_until_messages_num(num=2, timeout=10)
-    assert websocket_connection.messages_num() == 2
+    websocket_connection.wait_until_messages_num(num=3, timeout=10)
+    assert websocket_connection.messages_num() == 3
     msg = websocket_connection.pop_message()
     assert msg == {
         'type': 'legacy',
@@ -532,6 +532,16 @@ def test_balance_snapshot_error_message(
             'verbosity': 'error',
         },
     }
+    assert websocket_connection.messages_num() == 2
+    msg = websocket_connection.pop_message()
+    assert msg['type'] == 'balance_source_queried'
+    assert msg['data'].pop('duration') >= 0
+    assert msg['data'] == {
+        'location': 'binance',
+        'name': 'binance',
+        'status': 'failed',
+        'error': 'binance account API request failed. Could not reach binance due to Made a booboo',  # noqa: E501
+    }
     assert websocket_connection.messages_num() == 1
     msg = websocket_connection.pop_message()
     assert msg == {
@@ -958,3 +968,23 @@ def test_blockchain_balances_refresh(rotkehlchen_api_server: 'APIServer', ethere
             A_USDT.identifier: {'amount': '3', 'usd_value': '54'},
         }
         assert one_time_query_result == query_blockchain_balance(4)
+
+
+@pytest.mark.parametrize('number_of_eth_accounts', [0])
+def test_query_caches(rotkehlchen_api_server: 'APIServer') -> None:
+    """Test that the age and hit rate of the cached queries can be queried"""
+    rotki = rotkehlchen_api_server.rest_api.rotkehlchen
+    rotki.chains_aggregator.query_balances()
+    rotki.chains_aggregator.query_balances()
+    response = requests.get(api_url_for(rotkehlchen_api_server, 'querycachesresource'))
+    result = assert_proper_sync_response_with_result(response)
+    entry = next(x for x in result if x['owner'] == 'blockchain' and x['name'] == 'query_balances')
+    assert entry['age'] is not None
+    assert {k: entry[k] for k in ('ttl', 'stale_while_revalidate', 'entries', 'hits', 'misses', 'hit_rate')} == {  # noqa: E501
+        'ttl': 600,
+        'stale_while_revalidate': True,
+        'entries': 1,
+        'hits': 1,
+        'misses': 1,
+        'hit_rate': 0.5,
+    }
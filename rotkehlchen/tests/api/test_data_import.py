@@ -1,12 +1,18 @@
+import csv
 import os
 import shutil
+from collections.abc import Iterator
 from http import HTTPStatus
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
 
 import pytest
 import requests
 
+from rotkehlchen.api.websockets.typedefs import WSMessageType
+from rotkehlchen.data_import.importers.binance import BinanceImporter
 from rotkehlchen.db.filtering import AssetMovementsFilterQuery, TradesFilterQuery
 from rotkehlchen.fval import FVal
 from rotkehlchen.tests.utils.api import (
@@ -35,6 +41,10 @@ from rotkehlchen.tests.utils.dataimport import (
     assert_shapeshift_trades_import_results,
     assert_uphold_transactions_import_results,
 )
+from rotkehlchen.types import Timestamp
+
+if TYPE_CHECKING:
+    from rotkehlchen.db.dbhandler import DBHandler
 
 mocked_prices = {
     'BTC': {
@@ -673,3 +683,88 @@ def test_kucoin_history_import(rotkehlchen_api_server):
         assert assert_proper_sync_response_with_result(response) is True
 
     assert_kucoin_import_results(rotki)
+
+
+@pytest.mark.parametrize('function_scope_initialize_mock_rotki_notifier', [True])
+def test_binance_import_streamed(database: 'DBHandler', tmp_path: Path) -> None:
+    """Test that binance rows are grouped while they are streamed, that the entries are
+    written in batches and that the progress of the import is sent over the websockets"""
+    filepath = tmp_path / 'binance.csv'
+    rows = ['User_ID,UTC_Time,Account,Operation,Coin,Change,Remark']
+    for hour in range(10):
+        rows.extend((
+            f'1,2020-10-28 {hour:02}:00:00,Spot,Deposit,BTC,0.1,',
+            f'1,2020-10-28 {hour:02}:30:00,Spot,Buy,BTC,0.001,',
+            f'1,2020-10-28 {hour:02}:30:00,Spot,Buy,EUR,-15.5,',
+        ))
+    filepath.write_text('\n'.join(rows) + '\n')
+
+    read_rows = []
+
+    def stream_rows() -> Iterator[dict[str, Any]]:
+        with filepath.open(encoding='utf-8') as csvfile:
+            for row in csv.DictReader(csvfile):
+                read_rows.append(row)
+                yield row
+
+    assert BinanceImporter._binance_rows_are_sorted(rows=stream_rows()) is True
+    read_rows.clear()
+    groups = BinanceImporter(db=database)._group_binance_rows(
+        rows=stream_rows(),
+        rows_are_sorted=True,
+    )
+    _, group = next(groups)
+    assert len(group) == 1 and group[0]['Operation'] == 'Deposit'
+    assert len(read_rows) == 2  # the first group is complete once a row of another time is read
+    assert [len(x[1]) for x in groups] == [2] + [1, 2] * 9
+
+    with (
+        patch('rotkehlchen.data_import.utils.ITEMS_PER_DB_WRITE', 4),
+        patch('rotkehlchen.data_import.utils.PROGRESS_NOTIFICATION_INTERVAL', 0),
+    ):
+        assert BinanceImporter(db=database).import_csv(filepath=filepath) == (True, '')
+
+    with database.conn.read_ctx() as cursor:
+        assert cursor.execute('SELECT COUNT(*) FROM trades').fetchone()[0] == 10
+        assert cursor.execute('SELECT COUNT(*) FROM asset_movements').fetchone()[0] == 10
+
+    messages = [
+        x.data for x in database.msg_aggregator.rotki_notifier.messages  # type: ignore[union-attr]  # rotki_notifier is MockRotkiNotifier
+        if x.message_type == WSMessageType.CSV_IMPORT_PROGRESS
+    ]
+    assert len(messages) == 6  # a message per batch of 4 entries and one at the end
+    assert messages[-1] == {
+        'processed_bytes': filepath.stat().st_size,
+        'total_bytes': filepath.stat().st_size,
+        'imported_entries': 20,
+    }
+
+
+def test_binance_import_unsorted_rows(database: 'DBHandler', tmp_path: Path) -> None:
+    """Test that the rows of a binance export that is not sorted by time are all grouped
+    by their timestamp and that nothing is imported if the file misses a needed column"""
+    filepath = Path(__file__).resolve().parent.parent / 'data' / 'binance_history.csv'
+    importer = BinanceImporter(db=database)
+    with filepath.open(encoding='utf-8-sig') as csvfile:
+        assert importer._binance_rows_are_sorted(rows=csv.DictReader(csvfile)) is False
+        csvfile.seek(0)
+        groups = list(importer._group_binance_rows(
+            rows=csv.DictReader(csvfile),
+            rows_are_sorted=False,
+        ))
+
+    timestamps = [timestamp for timestamp, _ in groups]
+    assert len(timestamps) == len(set(timestamps))
+    assert len(dict(groups)[Timestamp(1673587740)]) == 2  # 2023-01-13 05:29:00 is in two places
+
+    malformed_filepath = tmp_path / 'binance.csv'
+    malformed_filepath.write_text(
+        'User_ID,UTC_Time,Account,Operation,Coin,Remark\n'
+        '1,2020-10-28 00:00:00,Spot,Deposit,BTC,\n'
+        '1,2020-10-28 01:00:00,Spot,Deposit,ETH,\n',
+    )
+    importer = BinanceImporter(db=database)
+    assert importer.import_csv(filepath=malformed_filepath) == (True, '')
+    assert importer.bad_rows_count == 2
+    with database.conn.read_ctx() as cursor:
+        assert cursor.execute('SELECT COUNT(*) FROM asset_movements').fetchone()[0] == 0
@@ -8,6 +8,7 @@ import requests
 
 from rotkehlchen.api.server import APIServer
 from rotkehlchen.constants.misc import USERDB_NAME, USERSDIR_NAME
+from rotkehlchen.db.dbhandler import DB_READ_CONNECTIONS
 from rotkehlchen.db.settings import ROTKEHLCHEN_DB_VERSION
 from rotkehlchen.tests.utils.api import (
     api_url_for,
@@ -54,6 +55,8 @@ def test_query_db_info(
         assert {'size': len(backup2_contents), 'time': 1626382287, 'version': 27} in userdb['backups']  # noqa: E501
         assert {'size': 0, 'time': 1633042045, 'version': 28} in userdb['backups']
         assert {'size': len(backup1_contents), 'time': 1624053928, 'version': 26} in userdb['backups']  # noqa: E501
+        assert userdb['read_pool']['size'] == DB_READ_CONNECTIONS
+        assert userdb['read_pool']['open'] >= 1  # the user db was read with a pooled connection
 
 
 def test_create_download_delete_backup(
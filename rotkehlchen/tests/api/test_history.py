@@ -381,6 +381,39 @@ def test_query_pnl_report_events_pagination_filtering(
         else:
             assert x['timestamp'] >= events[idx + 1]['timestamp']
 
+    # filter by event type and asset and order by the taxable pnl
+    response = requests.post(
+        api_url_for(
+            rotkehlchen_api_server_with_exchanges,
+            'per_report_data_resource',
+            report_id=report_id,
+        ),
+        json={
+            'event_type': 'trade',
+            'order_by_attributes': ['pnl_taxable'],
+            'ascending': [ascending_timestamp],
+        },
+    )
+    trades = assert_proper_sync_response_with_result(response)['entries']
+    expected_trades = [x for x in master_events if x['type'] == 'trade']
+    assert len(trades) == len(expected_trades) != 0
+    assert all(x in expected_trades for x in trades)
+    pnls = [FVal(x['pnl_taxable']) for x in trades]
+    assert pnls == sorted(pnls, reverse=not ascending_timestamp)
+
+    asset = expected_trades[0]['asset_identifier']
+    response = requests.post(
+        api_url_for(
+            rotkehlchen_api_server_with_exchanges,
+            'per_report_data_resource',
+            report_id=report_id,
+        ),
+        json={'asset': asset},
+    )
+    result = assert_proper_sync_response_with_result(response)
+    assert result['entries'] == [x for x in master_events if x['asset_identifier'] == asset]
+    assert result['entries_found'] == len(result['entries'])
+
 
 @pytest.mark.parametrize('ethereum_accounts', [[]])
 @pytest.mark.parametrize('have_decoders', [[True]])
@@ -11,7 +11,11 @@ from rotkehlchen.accounting.mixins.event import AccountingEventType
 from rotkehlchen.chain.ethereum.constants import ETHEREUM_ETHERSCAN_NODE_NAME
 from rotkehlchen.chain.ethereum.modules.convex.constants import CPT_CONVEX
 from rotkehlchen.chain.evm.decoding.curve.constants import CPT_CURVE
-from rotkehlchen.constants.misc import DEFAULT_MAX_LOG_BACKUP_FILES, DEFAULT_SQL_VM_INSTRUCTIONS_CB
+from rotkehlchen.constants.misc import (
+    DEFAULT_FVAL_BACKEND,
+    DEFAULT_MAX_LOG_BACKUP_FILES,
+    DEFAULT_SQL_VM_INSTRUCTIONS_CB,
+)
 from rotkehlchen.fval import FVal
 from rotkehlchen.history.events.structures.evm_event import EvmProduct
 from rotkehlchen.tests.utils.api import (
@@ -44,6 +48,7 @@ def generate_expected_info(
             'max_logfiles_num': 3,
             'max_size_in_mb_all_logs': 300,
             'sqlite_instructions': 5000,
+            'fval_backend': 'decimal',
         },
     }
     return result
@@ -427,6 +432,8 @@ def test_configuration(rotkehlchen_api_server):
     assert result['max_logfiles_num']['value'] == DEFAULT_MAX_LOG_BACKUP_FILES
     assert result['sqlite_instructions']['is_default'] is True
     assert result['sqlite_instructions']['value'] == DEFAULT_SQL_VM_INSTRUCTIONS_CB
+    assert result['fval_backend']['is_default'] is True
+    assert result['fval_backend']['value'] == DEFAULT_FVAL_BACKEND
 
 
 def test_query_all_chain_ids(rotkehlchen_api_server):
@@ -1,11 +1,14 @@
 from random import randint
+from unittest.mock import patch
 from uuid import uuid4
 
 import gevent
 import pytest
+from pysqlcipher3 import dbapi2 as sqlcipher
 
 from rotkehlchen.accounting.structures.balance import Balance
 from rotkehlchen.constants.assets import A_ETH
+from rotkehlchen.db.drivers.gevent import READ_POOL_MAP, DBConnectionType
 from rotkehlchen.db.filtering import HistoryEventFilterQuery
 from rotkehlchen.db.history_events import DBHistoryEvents
 from rotkehlchen.fval import FVal
@@ -151,3 +154,68 @@ def test_can_disable_callback(database):  # pylint: disable=unused-argument
     This is a regression test since setting to 0 was hitting an assertion before
     """
     assert True  # no need to do anything. Test would fail at fixture setup
+
+
+def test_read_pool(database):
+    """Test that reads use the pooled read only connections unless the greenlet has an open
+    write transaction, that they don't see uncommitted writes of other greenlets and that
+    reads fall back to the main connection if no pooled connection gets free in time"""
+    pool = database.conn.read_pool
+    assert READ_POOL_MAP[DBConnectionType.USER] is pool  # for the progress callback
+    event = make_history_event()
+    written, committed = gevent.event.Event(), gevent.event.Event()
+
+    def write_and_wait() -> None:
+        with database.user_write() as write_cursor:
+            DBHistoryEvents(database).add_history_event(write_cursor, event)
+            with database.conn.read_ctx() as cursor:  # sees its own uncommitted write
+                assert cursor.execute('SELECT COUNT(*) FROM history_events').fetchone()[0] == 1
+            written.set()
+            committed.wait()
+
+    acquisitions = pool.acquisitions
+    writer = gevent.spawn(write_and_wait)
+    written.wait()
+    assert pool.acquisitions == acquisitions  # the writer read from the main connection
+    with database.conn.read_ctx() as cursor:
+        assert cursor.execute('SELECT COUNT(*) FROM history_events').fetchone()[0] == 0
+        with database.conn.read_ctx() as nested_cursor:  # nested reads use the same connection
+            assert nested_cursor.execute('SELECT COUNT(*) FROM history_events').fetchone()[0] == 0
+        assert pool.serialize()['in_use'] == 1
+        with pytest.raises(sqlcipher.OperationalError):  # pylint: disable=no-member
+            cursor.execute('DELETE FROM history_events')
+
+    committed.set()
+    writer.get()
+    with database.conn.read_ctx() as cursor:
+        assert cursor.execute('SELECT COUNT(*) FROM history_events').fetchone()[0] == 1
+
+    release = gevent.event.Event()
+
+    def hold_connection() -> None:
+        with database.conn.read_ctx() as cursor:
+            cursor.execute('SELECT COUNT(*) FROM history_events')
+            release.wait()
+
+    holders = [gevent.spawn(hold_connection) for _ in range(pool.size)]
+    gevent.sleep(0.01)
+    with (
+        patch('rotkehlchen.db.drivers.gevent.MAX_READ_CONNECTION_WAIT', 0.1),
+        database.conn.read_ctx() as cursor,
+    ):  # all pooled connections are taken so this reads from the main connection
+        assert cursor.execute('SELECT COUNT(*) FROM history_events').fetchone()[0] == 1
+
+    release.set()
+    gevent.joinall(holders, raise_error=True)
+    stats = pool.serialize()
+    assert stats['open'] == pool.size
+    assert stats['in_use'] == 0
+    assert stats['waits'] == stats['fallbacks'] == 1
+    assert stats['max_wait'] >= 0.1
+
+    with database.conn.read_ctx() as cursor, database.user_write() as write_cursor:
+        write_cursor.execute('DELETE FROM history_events')
+        # a pooled cursor opened before the write does not see its uncommitted writes
+        assert cursor.execute('SELECT COUNT(*) FROM history_events').fetchone()[0] == 1
+        with database.conn.read_ctx() as nested_cursor:
+            assert nested_cursor.execute('SELECT COUNT(*) FROM history_events').fetchone()[0] == 0
@@ -29,6 +29,7 @@ from rotkehlchen.constants.misc import USERSDIR_NAME
 from rotkehlchen.data_handler import DataHandler
 from rotkehlchen.db.cache import DBCacheDynamic, DBCacheStatic
 from rotkehlchen.db.dbhandler import DBHandler
+from rotkehlchen.db.drivers.gevent import DBCursor
 from rotkehlchen.db.filtering import AssetMovementsFilterQuery, TradesFilterQuery
 from rotkehlchen.db.misc import detect_sqlcipher_version
 from rotkehlchen.db.queried_addresses import QueriedAddresses
@@ -314,7 +315,9 @@ def test_export_import_db(data_dir: Path, username: str, sql_vm_instructions_cb:
     with data.db.user_write() as cursor:
         data.db.add_manually_tracked_balances(cursor, [starting_balance])
 
-    encoded_data, _ = data.compress_and_encrypt_db()
+    encrypted_file, _ = data.compress_and_encrypt_db()
+    with encrypted_file:
+        encoded_data = encrypted_file.read()
     # The server would return them decoded
     data.decompress_and_decrypt_db(encoded_data)
     with data.db.user_write() as cursor:
@@ -1865,6 +1868,62 @@ def test_binance_pairs(user_data_dir, sql_vm_instructions_cb):
     assert query == []
 
 
+def test_binance_last_trade_ids_follow_exchange(database: 'DBHandler') -> None:
+    """Test that the last trade ids of the markets of a binance exchange are renamed along
+    with the exchange and deleted along with its query ranges"""
+    database.add_exchange('binance_1', Location.BINANCE, make_api_key(), make_api_secret())
+    database.add_exchange('binance11', Location.BINANCE, make_api_key(), make_api_secret())
+    with database.user_write() as write_cursor:
+        for name, symbol, trade_id in (
+            ('binance_1', 'ETHBTC', 5),
+            ('binance_1', 'BNBBTC', 7),
+            ('binance11', 'ETHBTC', 9),
+        ):
+            database.set_dynamic_cache(
+                write_cursor=write_cursor,
+                name=DBCacheDynamic.LAST_TRADE_ID,
+                value=trade_id,
+                location=Location.BINANCE.serialize(),
+                location_name=name,
+                symbol=symbol,
+            )
+
+        database.edit_exchange(
+            write_cursor=write_cursor,
+            name='binance_1',
+            location=Location.BINANCE,
+            new_name='binance 2',
+            api_key=None,
+            api_secret=None,
+            passphrase=None,
+            kraken_account_type=None,
+            binance_selected_trade_pairs=None,
+        )
+
+    def get_last_trade_ids(cursor: DBCursor, name: str) -> list[int | None]:
+        return [database.get_dynamic_cache(
+            cursor=cursor,
+            name=DBCacheDynamic.LAST_TRADE_ID,
+            location=Location.BINANCE.serialize(),
+            location_name=name,
+            symbol=symbol,
+        ) for symbol in ('ETHBTC', 'BNBBTC')]
+
+    with database.conn.read_ctx() as cursor:
+        assert get_last_trade_ids(cursor, 'binance_1') == [None, None]
+        assert get_last_trade_ids(cursor, 'binance 2') == [5, 7]
+        assert get_last_trade_ids(cursor, 'binance11') == [9, None]
+
+    with database.user_write() as write_cursor:
+        database.delete_used_query_range_for_exchange(
+            write_cursor=write_cursor,
+            location=Location.BINANCE,
+            exchange_name='binance 2',
+        )
+        assert get_last_trade_ids(write_cursor, 'binance 2') == [None, None]
+        assert get_last_trade_ids(write_cursor, 'binance11') == [9, None]
+
+
 def test_fresh_db_adds_version(user_data_dir, sql_vm_instructions_cb):
     """Test that the DB version gets committed to a fresh DB.
 
@@ -2372,6 +2372,12 @@ def test_upgrade_db_42_to_43(user_data_dir, messages_aggregator):
         # check hop-protocol counterparty is there. If redecoding in upgrade will need to customize
         assert cursor.execute('SELECT COUNT(*) from evm_events_info WHERE counterparty=?', ('hop-protocol',)).fetchone()[0] == 1  # noqa: E501
         assert cursor.execute('SELECT COUNT(*) from evm_events_info WHERE counterparty=?', ('hop',)).fetchone()[0] == 0  # noqa: E501
+        assert table_exists(cursor, 'evmtx_receipt_log_index') is False
+        assert table_exists(cursor, 'xpub_derived_addresses') is False
+        assert table_exists(cursor, 'eth2_daily_performance') is False
+        assert cursor.execute(
+            'SELECT COUNT(*) FROM sqlite_master WHERE type="index" AND name LIKE "idx_%"',
+        ).fetchone()[0] == 0
 
     # Execute upgrade
     db = _init_db_with_target_version(
@@ -2392,6 +2398,31 @@ def test_upgrade_db_42_to_43(user_data_dir, messages_aggregator):
 
         cursor.execute('SELECT seq FROM location WHERE location=?', 'p')
         assert cursor.fetchone() == (Location.HTX.value,)
+        assert table_exists(cursor, 'evmtx_receipt_log_index') is True
+        assert cursor.execute(
+            'SELECT COUNT(*) FROM sqlite_master WHERE type="index" AND tbl_name=?',
+            ('evmtx_receipt_log_index',),
+        ).fetchone()[0] == 2
+        assert table_exists(cursor, 'xpub_derived_addresses') is True
+        assert table_exists(cursor, 'eth2_daily_performance') is True
+        assert {x[0] for x in cursor.execute(
+            'SELECT name FROM sqlite_master WHERE type="index" AND tbl_name IN '
+            '("history_events", "evm_events_info", "evm_transactions", '
+            '"evmtx_address_mappings", "timed_balances", "eth2_daily_performance") '
+            'AND name LIKE "idx_%"',
+        )} == {
+            'idx_history_events_timestamp',
+            'idx_history_events_location',
+            'idx_history_events_location_label',
+            'idx_history_events_asset',
+            'idx_history_events_type',
+            'idx_evm_events_info_tx_hash',
+            'idx_evm_events_info_counterparty',
+            'idx_evm_transactions_timestamp',
+            'idx_evmtx_address_mappings_address',
+            'idx_timed_balances_currency',
+            'idx_eth2_daily_performance_timestamp',
+        }
 
 
 def test_latest_upgrade_correctness(user_data_dir):
@@ -2437,12 +2468,16 @@ def test_latest_upgrade_correctness(user_data_dir):
     tables_after_upgrade = {x[0] for x in result}
     result = cursor.execute('SELECT name FROM sqlite_master WHERE type="view"')
     views_after_upgrade = {x[0] for x in result}
+    result = cursor.execute('SELECT name FROM sqlite_master WHERE type="index"')
+    indexes_after_upgrade = {x[0] for x in result}
     # also add latest tables (this will indicate if DB upgrade missed something
     db.conn.executescript(DB_SCRIPT_CREATE_TABLES)
     result = cursor.execute('SELECT name FROM sqlite_master WHERE type="table"')
     tables_after_creation = {x[0] for x in result}
     result = cursor.execute('SELECT name FROM sqlite_master WHERE type="view"')
     views_after_creation = {x[0] for x in result}
+    result = cursor.execute('SELECT name FROM sqlite_master WHERE type="index"')
+    indexes_after_creation = {x[0] for x in result}
 
     assert cursor.execute('SELECT value FROM settings WHERE name="version"').fetchone()[0] == '43'
     removed_tables = set()
@@ -2453,6 +2488,7 @@ def test_latest_upgrade_correctness(user_data_dir):
     assert missing_views == removed_views
     assert tables_after_creation - tables_after_upgrade == set()
     assert views_after_creation - views_after_upgrade == set()
+    assert indexes_after_creation - indexes_after_upgrade == set()
     new_tables = tables_after_upgrade - tables_before
     assert new_tables == set()
     new_views = views_after_upgrade - views_before
@@ -1,4 +1,8 @@
+import dataclasses
+from unittest.mock import patch
+
 from rotkehlchen.chain.accounts import BlockchainAccountData
+from rotkehlchen.chain.evm.structures import EvmTxReceiptLog
 from rotkehlchen.chain.evm.types import EvmAccount
 from rotkehlchen.data_handler import DataHandler
 from rotkehlchen.db.evmtx import DBEvmTx
@@ -10,7 +14,12 @@ from rotkehlchen.tests.utils.constants import (
     ETH_ADDRESS3,
     MOCK_INPUT_DATA,
 )
-from rotkehlchen.tests.utils.factories import make_evm_address, make_evm_tx_hash
+from rotkehlchen.tests.utils.factories import (
+    make_ethereum_transaction,
+    make_evm_address,
+    make_evm_tx_hash,
+    make_random_bytes,
+)
 from rotkehlchen.types import (
     ChainID,
     EvmInternalTransaction,
@@ -307,3 +316,71 @@ def test_query_also_internal_evm_transactions(data_dir, username, sql_vm_instruc
             has_premium=True,
         )
         assert result == [tx1, tx3, tx4]
+
+
+def test_iter_logs(database):
+    """Test that the logs of the saved receipts can be queried by address, first topic and
+    block range via the receipt log index, also when they span multiple pages"""
+    dbevmtx = DBEvmTx(database)
+    emitter_1, emitter_2 = make_evm_address(), make_evm_address()
+    topic_1, topic_2 = make_random_bytes(32), make_random_bytes(32)
+    transactions = [make_ethereum_transaction(tx_hash=make_evm_tx_hash()) for _ in range(3)]
+    transactions = [dataclasses.replace(tx, block_number=idx * 10) for idx, tx in enumerate(transactions)]  # noqa: E501
+    with database.user_write() as write_cursor:
+        dbevmtx.add_evm_transactions(write_cursor, transactions, relevant_address=ETH_ADDRESS1)
+        for tx in transactions:
+            dbevmtx.add_or_ignore_receipt_data(
+                write_cursor=write_cursor,
+                chain_id=ChainID.ETHEREUM,
+                data={
+                    'transactionHash': tx.tx_hash.hex(),
+                    'contractAddress': None,
+                    'logs': [{
+                        'logIndex': log_index,
+                        'data': '0x01',
+                        'address': address,
+                        'removed': False,
+                        'topics': [x.hex() for x in topics],
+                    } for log_index, (address, topics) in enumerate((
+                        (emitter_1, [topic_1, b'\x00' * 32]),
+                        (emitter_1, [topic_2]),
+                        (emitter_2, [topic_1]),
+                        (emitter_2, []),
+                    ))],
+                },
+            )
+
+    with database.conn.read_ctx() as cursor:
+        logs = list(dbevmtx.iter_logs(cursor, ChainID.ETHEREUM, address=emitter_1, topic0=topic_1))
+        assert [(tx_hash, block) for tx_hash, block, _ in logs] == [(tx.tx_hash, tx.block_number) for tx in transactions]  # noqa: E501
+        assert logs[0][2] == EvmTxReceiptLog(
+            log_index=0,
+            data=b'\x01',
+            address=emitter_1,
+            removed=False,
+            topics=[topic_1, b'\x00' * 32],
+        )
+        assert [x[2].log_index for x in dbevmtx.iter_logs(cursor, ChainID.ETHEREUM, topic0=topic_1, block_range=(10, 20))] == [0, 2, 0, 2]  # noqa: E501
+        assert [x[2].topics for x in dbevmtx.iter_logs(cursor, ChainID.ETHEREUM, address=emitter_2, block_range=(0, 5))] == [[topic_1], []]  # noqa: E501
+        assert list(dbevmtx.iter_logs(cursor, ChainID.OPTIMISM, topic0=topic_1)) == []
+        with patch('rotkehlchen.db.evmtx.TX_IDS_QUERY_CHUNK_SIZE', 3):
+            all_logs = list(dbevmtx.iter_logs(cursor, ChainID.ETHEREUM))
+        assert [(block, x.log_index) for _, block, x in all_logs] == [(block, log_index) for block in (0, 10, 20) for log_index in range(4)]  # noqa: E501
+
+    with database.user_write() as write_cursor:  # deleting the transaction removes its logs
+        write_cursor.execute('DELETE FROM evm_transactions WHERE tx_hash=?', (transactions[0].tx_hash,))  # noqa: E501
+        assert write_cursor.execute('SELECT COUNT(*) FROM evmtx_receipt_log_index').fetchone()[0] == 8  # noqa: E501
+
+
+def test_evm_transactions_query_plans(database):
+    """Test that the transactions queries of an account and of a chain use their indexes"""
+    dbevmtx = DBEvmTx(database)
+    for filter_query, index in (
+        (EvmTransactionsFilterQuery.make(limit=10, offset=0, accounts=[EvmAccount(address=ETH_ADDRESS1)], chain_id=ChainID.ETHEREUM), 'idx_evmtx_address_mappings_address'),  # noqa: E501
+        (EvmTransactionsFilterQuery.make(limit=10, offset=0, chain_id=ChainID.ETHEREUM), 'idx_evm_transactions_timestamp'),  # noqa: E501
+    ):
+        query, bindings = dbevmtx._form_evm_transaction_dbquery(*filter_query.prepare(), has_premium=True)  # noqa: E501
+        with database.conn.read_ctx() as cursor:
+            plan = [x[3] for x in cursor.execute(f'EXPLAIN QUERY PLAN {query}', bindings)]
+        assert any(index in line for line in plan), plan
+        assert not any(line.startswith('SCAN') and 'INDEX' not in line for line in plan), plan
@@ -493,3 +493,143 @@ def test_get_history_events_free_filter(database: 'DBHandler'):
                 for free_event in free_result:
                     assert free_event.identifier is not None
                     assert free_event.identifier > 3, 'Free sub-events should be from the latest 3 event groups'  # noqa: E501
+
+
+def test_iterate_history_events(database: 'DBHandler') -> None:
+    """Test that streaming the events in pages returns all of them, ordered as the
+    accountant processes them, and that narrowing the columns by entry type works"""
+    db = DBHistoryEvents(database)
+    events: list[HistoryEvent | EvmEvent | EthWithdrawalEvent | EthDepositEvent] = []
+    for idx in range(14):
+        # a few events per second with their sequence index not following the milliseconds
+        timestamp, sequence_index = TimestampMS((idx // 4) * 1000 + 999 - idx), idx % 3
+        if idx % 4 == 0:
+            events.append(HistoryEvent(
+                event_identifier=f'TEST{idx}',
+                sequence_index=sequence_index,
+                timestamp=timestamp,
+                location=Location.KRAKEN,
+                event_type=HistoryEventType.TRADE,
+                event_subtype=HistoryEventSubType.NONE,
+                asset=A_ETH,
+                balance=Balance(FVal(idx)),
+            ))
+        elif idx % 4 == 1:
+            events.append(EvmEvent(
+                tx_hash=make_evm_tx_hash(),
+                sequence_index=sequence_index,
+                timestamp=timestamp,
+                location=Location.ETHEREUM,
+                event_type=HistoryEventType.SPEND,
+                event_subtype=HistoryEventSubType.FEE,
+                asset=A_ETH,
+                balance=Balance(FVal(idx)),
+                counterparty='gas',
+                address=make_evm_address(),
+            ))
+        elif idx % 4 == 2:
+            events.append(EthWithdrawalEvent(
+                validator_index=idx,
+                timestamp=timestamp,
+                balance=Balance(FVal(idx)),
+                withdrawal_address=make_evm_address(),
+                is_exit=False,
+            ))
+        else:
+            events.append(EthDepositEvent(
+                tx_hash=make_evm_tx_hash(),
+                validator_index=idx,
+                sequence_index=sequence_index,
+                timestamp=timestamp,
+                balance=Balance(FVal(32)),
+                depositor=make_evm_address(),
+            ))
+
+    with database.user_write() as write_cursor:
+        db.add_history_events(write_cursor=write_cursor, history=events)
+
+    with database.conn.read_ctx() as cursor:
+        all_events = db.get_history_events(
+            cursor=cursor,
+            filter_query=HistoryEventFilterQuery.make(),
+            has_premium=True,
+            group_by_event_ids=False,
+        )
+        assert len(all_events) == len(events)
+        for ascending in (True, False):
+            expected = sorted(all_events, key=lambda x: (
+                x.timestamp // 1000 if ascending else -(x.timestamp // 1000),
+                x.sequence_index,
+                x.identifier,
+            ))
+            for page_size in (1, 4, 14, 100):
+                assert list(db.iterate_history_events(
+                    cursor=cursor,
+                    filter_query=HistoryEventFilterQuery.make(),
+                    has_premium=True,
+                    page_size=page_size,
+                    ascending=ascending,
+                )) == expected
+
+        for entry_type in HistoryBaseEntryType:
+            filter_query = HistoryEventFilterQuery.make(
+                entry_types=IncludeExcludeFilterData(values=[entry_type]),
+            )
+            query, _ = db._create_history_events_query(
+                filter_query=filter_query,
+                entries_limit=FREE_HISTORY_EVENTS_LIMIT,
+                has_premium=True,
+            )
+            assert ('evm_events_info' in query) is (entry_type in {
+                HistoryBaseEntryType.EVM_EVENT,
+                HistoryBaseEntryType.ETH_DEPOSIT_EVENT,
+            })
+            assert ('eth_staking_events_info' in query) is (entry_type not in {
+                HistoryBaseEntryType.HISTORY_EVENT,
+                HistoryBaseEntryType.EVM_EVENT,
+            })
+            assert list(db.iterate_history_events(
+                cursor=cursor,
+                filter_query=filter_query,
+                has_premium=True,
+                page_size=2,
+            )) == [x for x in all_events if x.entry_type == entry_type] == db.get_history_events(
+                cursor=cursor,
+                filter_query=filter_query,
+                has_premium=True,
+                group_by_event_ids=False,
+            )
+
+
+@pytest.mark.parametrize(('filter_query', 'has_premium', 'group_by_event_ids', 'index'), [
+    (HistoryEventFilterQuery.make(limit=10, offset=0, order_by_rules=[('timestamp', False)]), True, False, 'idx_history_events_timestamp'),  # noqa: E501
+    (HistoryEventFilterQuery.make(limit=10, offset=0, order_by_rules=[('timestamp', False)]), False, False, 'idx_history_events_timestamp'),  # noqa: E501
+    (HistoryEventFilterQuery.make(limit=10, offset=0, exclude_ignored_assets=True), True, True, 'idx_history_events_asset'),  # noqa: E501
+    (HistoryEventFilterQuery.make(from_ts=Timestamp(1), to_ts=Timestamp(2)), True, False, 'idx_history_events_timestamp'),  # noqa: E501
+    (HistoryEventFilterQuery.make(location=Location.KRAKEN, from_ts=Timestamp(1), to_ts=Timestamp(2)), True, False, 'idx_history_events_location'),  # noqa: E501
+    (HistoryEventFilterQuery.make(location_labels=[make_evm_address()]), True, False, 'idx_history_events_location_label'),  # noqa: E501
+    (HistoryEventFilterQuery.make(assets=(A_ETH,)), True, False, 'idx_history_events_asset'),
+    (HistoryEventFilterQuery.make(event_types=[HistoryEventType.DEPOSIT], event_subtypes=[HistoryEventSubType.DEPOSIT_ASSET]), True, False, 'idx_history_events_type'),  # noqa: E501
+    (EvmEventFilterQuery.make(tx_hashes=[make_evm_tx_hash()]), True, False, 'idx_evm_events_info_tx_hash'),  # noqa: E501
+    (EvmEventFilterQuery.make(counterparties=['aave']), True, False, 'idx_evm_events_info_counterparty'),  # noqa: E501
+])
+def test_history_events_query_plans(
+        database: 'DBHandler',
+        filter_query: HistoryEventFilterQuery,
+        has_premium: bool,
+        group_by_event_ids: bool,
+        index: str,
+) -> None:
+    """Test that the history events queries of the main filters use their indexes
+    and don't scan the events tables without an index"""
+    query, bindings = DBHistoryEvents(database)._create_history_events_query(
+        filter_query=filter_query,
+        entries_limit=FREE_HISTORY_EVENTS_LIMIT,
+        has_premium=has_premium,
+        group_by_event_ids=group_by_event_ids,
+    )
+    with database.conn.read_ctx() as cursor:
+        plan = [x[3] for x in cursor.execute(f'EXPLAIN QUERY PLAN {query}', bindings)]
+
+    assert any(index in line for line in plan), plan
+    assert not any(line in ('SCAN history_events', 'SCAN evm_events_info') for line in plan), plan
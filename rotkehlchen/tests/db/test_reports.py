@@ -1,7 +1,19 @@
-from rotkehlchen.accounting.pnl import PnlTotals
+from typing import TYPE_CHECKING
+
+from rotkehlchen.accounting.mixins.event import AccountingEventType
+from rotkehlchen.accounting.pnl import PNL, PnlTotals
+from rotkehlchen.accounting.structures.processed_event import ProcessedAccountingEvent
+from rotkehlchen.constants import ONE, ZERO
+from rotkehlchen.constants.assets import A_BTC, A_ETH
+from rotkehlchen.db.filtering import ReportDataFilterQuery
 from rotkehlchen.db.reports import DBAccountingReports
 from rotkehlchen.db.settings import DBSettings
+from rotkehlchen.fval import FVal
 from rotkehlchen.tests.utils.constants import A_GBP
+from rotkehlchen.types import Location, Price, Timestamp
+
+if TYPE_CHECKING:
+    from rotkehlchen.db.dbhandler import DBHandler
 
 
 def test_report_settings(database):
@@ -55,3 +67,60 @@ def test_report_settings(database):
         else:
             value = getattr(settings, setting_name)
         assert returned_settings[x] == value
+
+
+def test_report_events_columns(database: 'DBHandler') -> None:
+    """Test that the report events are saved in a batch and can be filtered and sorted
+    by their columns, including the pnl whose text needs a numeric order"""
+    dbreport = DBAccountingReports(database)
+    report_id = dbreport.add_report(
+        first_processed_timestamp=Timestamp(1),
+        start_ts=Timestamp(0),
+        end_ts=Timestamp(10),
+        settings=DBSettings(),
+    )
+    events = [ProcessedAccountingEvent(
+        event_type=event_type,
+        notes=f'event {index}',
+        location=Location.KRAKEN,
+        timestamp=Timestamp(index + 1),
+        asset=asset,
+        free_amount=ZERO,
+        taxable_amount=ONE,
+        price=Price(FVal(10)),
+        pnl=PNL(taxable=FVal(pnl), free=ZERO),
+        cost_basis=None,
+        index=index,
+        extra_data={'tx_hash': '0x01'},
+    ) for index, (event_type, asset, pnl) in enumerate((
+        (AccountingEventType.TRADE, A_ETH, '9'),
+        (AccountingEventType.FEE, A_ETH, '-1.5'),
+        (AccountingEventType.TRADE, A_BTC, '10'),
+        (AccountingEventType.TRADE, A_ETH, '100'),
+    ))]
+    dbreport.add_report_events(
+        report_id=report_id,
+        ts_converter=str,
+        events=events,
+    )
+
+    all_events, found = dbreport.get_report_data(
+        filter_=ReportDataFilterQuery.make(report_id=report_id),
+        with_limit=False,
+    )
+    assert (all_events, found) == (events, 4)
+    eth_trades, found = dbreport.get_report_data(
+        filter_=ReportDataFilterQuery.make(
+            report_id=report_id,
+            event_type=AccountingEventType.TRADE,
+            asset=A_ETH,
+            order_by_rules=[('pnl_taxable', False)],
+        ),
+        with_limit=False,
+    )
+    assert (eth_trades, found) == ([events[3], events[0]], 2)
+    by_pnl, _ = dbreport.get_report_data(
+        filter_=ReportDataFilterQuery.make(report_id=report_id, order_by_rules=[('pnl_taxable', True)]),  # noqa: E501
+        with_limit=False,
+    )
+    assert by_pnl == [events[1], events[0], events[2], events[3]]
@@ -77,6 +77,22 @@ def test_delete_bitcoin_xpub(setup_db_for_xpub_tests):
         assert len(cursor.fetchall()) == 0
 
 
+def test_xpub_derived_addresses(setup_db_for_xpub_tests):
+    """Test that the addresses derived from an xpub are cached per xpub and that they
+    are deleted along with the xpub"""
+    db, xpub1, xpub2, _, all_addresses = setup_db_for_xpub_tests
+    derived_addresses = {(0, idx): address for idx, address in enumerate(all_addresses[5:10])}
+    with db.user_write() as write_cursor:
+        db.add_xpub_derived_addresses(write_cursor, xpub2, derived_addresses)
+        # adding them again is ignored
+        db.add_xpub_derived_addresses(write_cursor, xpub2, {(0, 0): all_addresses[5]})
+        assert db.get_xpub_derived_addresses(write_cursor, xpub2) == derived_addresses
+        assert db.get_xpub_derived_addresses(write_cursor, xpub1) == {}
+
+        db.delete_bitcoin_xpub(write_cursor, xpub2)
+        assert write_cursor.execute('SELECT COUNT(*) FROM xpub_derived_addresses').fetchone()[0] == 0  # noqa: E501
+
+
 def test_get_bitcoin_xpub_data(setup_db_for_xpub_tests):
     """Test that retrieving bitcoin xpub data also returns all properly mapped tags"""
     db, xpub1, xpub2, xpub3, _ = setup_db_for_xpub_tests
@@ -289,6 +289,65 @@ def test_binance_query_trade_history(function_scope_binance):
     assert trades == expected_trades
 
 
+def test_binance_query_trade_history_from_last_trade_id(function_scope_binance):
+    """Test that the trades of each market are queried again only after the last trade
+    seen in it and that trades after the end of the queried range are not skipped"""
+    binance = function_scope_binance
+    binance.selected_pairs = ['BNBBTC', 'ETHBTC']
+    queried_from_ids = []
+
+    def mock_my_trades(url, params, **kwargs):  # pylint: disable=unused-argument
+        if 'myTrades' not in url:
+            return MockResponse(200, '[]')
+
+        queried_from_ids.append((params['symbol'], params['fromId']))
+        if params['symbol'] == 'BNBBTC' and params['fromId'] <= 28457:
+            return MockResponse(200, BINANCE_MYTRADES_RESPONSE)
+        return MockResponse(200, '[]')
+
+    with patch.object(binance.session, 'request', side_effect=mock_my_trades):
+        trades = binance.query_trade_history(start_ts=Timestamp(0), end_ts=Timestamp(1499865548), only_cache=False)  # noqa: E501
+        assert trades == []  # the trade is after the end of the range
+        assert sorted(queried_from_ids) == [('BNBBTC', 0), ('ETHBTC', 0)]
+
+        queried_from_ids.clear()  # the last trade id is only saved along with the trades
+        trades, _ = binance.query_online_trade_history(start_ts=Timestamp(1499865548), end_ts=Timestamp(1564301134))  # noqa: E501
+        assert [x.link for x in trades] == ['28457']
+        trades = binance.query_trade_history(start_ts=Timestamp(0), end_ts=Timestamp(1564301134), only_cache=False)  # noqa: E501
+        assert [x.link for x in trades] == ['28457']
+        assert sorted(queried_from_ids) == [('BNBBTC', 0), ('BNBBTC', 0), ('ETHBTC', 0), ('ETHBTC', 0)]  # noqa: E501
+
+        queried_from_ids.clear()
+        trades = binance.query_trade_history(start_ts=Timestamp(0), end_ts=Timestamp(1600000000), only_cache=False)  # noqa: E501
+        assert [x.link for x in trades] == ['28457']
+        assert sorted(queried_from_ids) == [('BNBBTC', 28458), ('ETHBTC', 0)]
+
+
+def test_binance_request_weight_budget(function_scope_binance):
+    """Test that the used request weight is read from the responses and that requests
+    wait for the next minute when it's over the budget"""
+    binance = function_scope_binance
+    used_weight = '100'
+
+    def mock_response(**kwargs):  # pylint: disable=unused-argument
+        return MockResponse(200, '[]', headers={'x-mbx-used-weight-1m': used_weight})
+
+    with (
+        patch.object(binance.session, 'request', side_effect=mock_response),
+        patch('rotkehlchen.exchanges.binance.gevent.sleep') as mock_sleep,
+    ):
+        binance.api_query(api_type='api', method='myTrades', options={'symbol': 'BNBBTC'})
+        assert binance.used_weight == 100
+        used_weight = '5900'
+        binance.api_query(api_type='api', method='myTrades', options={'symbol': 'BNBBTC'})
+        assert binance.used_weight == 5900
+        assert mock_sleep.call_count == 0
+        binance.api_query(api_type='api', method='myTrades', options={'symbol': 'BNBBTC'})
+
+    assert mock_sleep.call_count == 1
+    assert 0 < mock_sleep.call_args.args[0] <= 60
+
+
 def test_binance_query_trade_history_unexpected_data(function_scope_binance):
     """Test that turning a binance trade that contains unexpected data is handled gracefully"""
     binance = function_scope_binance
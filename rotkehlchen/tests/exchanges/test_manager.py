@@ -1,8 +1,23 @@
 import inspect
+from contextlib import ExitStack
 from importlib import import_module
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
 
+import gevent
+import pytest
+
+from rotkehlchen.api.websockets.typedefs import WSMessageType
+from rotkehlchen.errors.misc import RemoteError
 from rotkehlchen.exchanges.constants import SUPPORTED_EXCHANGES
 from rotkehlchen.exchanges.manager import ExchangeManager
+from rotkehlchen.tests.utils.exchanges import create_test_bitstamp, create_test_kraken
+from rotkehlchen.types import Location, Timestamp
+
+if TYPE_CHECKING:
+    from rotkehlchen.db.dbhandler import DBHandler
+    from rotkehlchen.exchanges.exchange import ExchangeInterface
+    from rotkehlchen.tests.fixtures.messages import MockRotkiNotifier
 
 EXCHANGE_METHODS_TO_CHECK = (
     'query_balances',
@@ -32,3 +47,74 @@ def test_all_methods_implemented():
             code = inspect.getsource(method)
             msg = f'{method_name} for exchange {name} is not implemented'
             assert 'raise NotImplementedError' not in code, msg
+
+
+@pytest.mark.parametrize('function_scope_initialize_mock_rotki_notifier', [True])
+def test_query_history_in_parallel(
+        database: 'DBHandler',
+        exchange_manager: ExchangeManager,
+) -> None:
+    """Test that the exchanges' history is queried in parallel up to the given limit, that
+    a failed endpoint doesn't stop the rest and that the progress is sent over websockets"""
+    kraken = create_test_kraken(database=database, msg_aggregator=database.msg_aggregator)
+    bitstamp = create_test_bitstamp(database=database, msg_aggregator=database.msg_aggregator)
+    exchange_manager.connected_exchanges[Location.KRAKEN].append(kraken)
+    exchange_manager.connected_exchanges[Location.BITSTAMP].append(bitstamp)
+    notifier: MockRotkiNotifier = database.msg_aggregator.rotki_notifier  # type: ignore[assignment]  # it's mocked
+
+    def mock_query(exchange: 'ExchangeInterface', method: str) -> Any:
+        def query(start_ts: Timestamp, end_ts: Timestamp, **_: Any) -> list[int]:
+            assert (start_ts, end_ts) == (Timestamp(0), Timestamp(1700000000))
+            if exchange == kraken and method == 'query_trade_history':
+                gevent.sleep(0.2)  # a slow paginated query
+            if exchange == bitstamp and method == 'query_margin_history':
+                raise RemoteError('bitstamp margin query failed')
+            return [1, 2]
+        return patch.object(exchange, method, side_effect=query)
+
+    def query_history(max_parallel: int) -> tuple[list[str], list[dict[str, Any]]]:
+        notifier.reset()
+        errors: list[str] = []
+        with ExitStack() as stack:
+            for exchange in (kraken, bitstamp):
+                for method in (
+                    'query_trade_history',
+                    'query_margin_history',
+                    'query_deposits_withdrawals',
+                    'query_income_loss_expense',
+                ):
+                    stack.enter_context(mock_query(exchange, method))
+
+            exchange_manager.query_history_with_callbacks(
+                start_ts=Timestamp(0),
+                end_ts=Timestamp(1700000000),
+                fail_callback=errors.append,
+                max_parallel=max_parallel,
+            )
+
+        return errors, [
+            x.data for x in notifier.messages  # type: ignore[misc]  # data is a dict
+            if x.message_type == WSMessageType.EXCHANGE_HISTORY_SYNC
+        ]
+
+    errors, messages = query_history(max_parallel=4)
+    assert errors == ['bitstamp margin query failed']
+    assert [(x['name'], x['endpoint'], x['status']) for x in messages if x['status'] != 'started'] == [  # noqa: E501
+        # bitstamp is not delayed by the slow kraken query
+        ('bitstamp', 'trades', 'finished'),
+        ('bitstamp', 'margin_positions', 'failed'),
+        ('bitstamp', 'asset_movements', 'finished'),
+        ('bitstamp', 'history_events', 'finished'),
+        ('mockkraken', 'trades', 'finished'),
+        ('mockkraken', 'margin_positions', 'finished'),
+        ('mockkraken', 'asset_movements', 'finished'),
+        ('mockkraken', 'history_events', 'finished'),
+    ]
+    kraken_trades = messages[[(x['name'], x['status']) for x in messages].index(('mockkraken', 'finished'))]  # noqa: E501
+    assert kraken_trades['location'] == 'kraken'
+    assert kraken_trades['entries'] == 2
+    assert kraken_trades['duration'] >= 0.2
+    assert kraken_trades['entries_per_second'] <= 10
+
+    _, messages = query_history(max_parallel=1)  # with one at a time kraken goes first
+    assert [x['name'] for x in messages if x['status'] != 'started'] == ['mockkraken'] * 4 + ['bitstamp'] * 4  # noqa: E501
@@ -6,7 +6,7 @@ import gevent
 import pytest
 
 from rotkehlchen.assets.asset import Asset, EvmToken
-from rotkehlchen.constants.assets import A_BTC, A_DAI, A_ETH, A_EUR, A_YFI
+from rotkehlchen.constants.assets import A_BTC, A_DAI, A_ETH, A_EUR, A_USD, A_YFI
 from rotkehlchen.errors.asset import UnsupportedAsset
 from rotkehlchen.externalapis.coingecko import Coingecko, CoingeckoAssetData
 from rotkehlchen.fval import FVal
@@ -137,3 +137,24 @@ def test_asset_icons_for_collections(icon_manager: IconManager) -> None:
 
     assert icon_manager.iconfile_path(eth).exists()
     assert times_api_was_queried == 4
+
+
+def test_query_multiple_current_prices(session_coingecko: Coingecko) -> None:
+    """Test that the prices of multiple assets are queried in a single request and that
+    the assets without a price in the response are omitted"""
+    queried_urls = []
+
+    def mock_coingecko(url, **kwargs):  # pylint: disable=unused-argument
+        queried_urls.append(url)
+        return MockResponse(HTTPStatus.OK, '{"bitcoin": {"usd": 65000}, "ethereum": {"usd": 3100.5}}')  # noqa: E501
+
+    from_assets = [x.resolve_to_asset_with_oracles() for x in (A_BTC, A_ETH, A_YFI)]
+    with patch.object(session_coingecko.session, 'get', side_effect=mock_coingecko):
+        prices = session_coingecko.query_multiple_current_prices(
+            from_assets=from_assets,
+            to_asset=A_USD.resolve_to_asset_with_oracles(),
+        )
+
+    assert prices == {A_BTC: Price(FVal(65000)), A_ETH: Price(FVal('3100.5'))}
+    assert len(queried_urls) == 1
+    assert 'ids=bitcoin%2Cethereum%2Cyearn-finance&vs_currencies=usd' in queried_urls[0]
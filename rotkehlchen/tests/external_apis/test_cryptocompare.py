@@ -1,4 +1,5 @@
 import datetime
+import operator
 import os
 from unittest.mock import patch
 
@@ -25,6 +26,7 @@ from rotkehlchen.externalapis.cryptocompare import (
 )
 from rotkehlchen.fval import FVal
 from rotkehlchen.globaldb.handler import GlobalDBHandler
+from rotkehlchen.globaldb.price_chunks import query_chunked_prices
 from rotkehlchen.history.types import HistoricalPrice, HistoricalPriceOracle
 from rotkehlchen.tests.utils.constants import A_DAO, A_SNGLS, A_XMR
 from rotkehlchen.types import Price, Timestamp
@@ -45,18 +47,17 @@ def test_cryptocompare_query_pricehistorical(cryptocompare):
 def get_globaldb_cache_entries(from_asset: Asset, to_asset: Asset) -> list[HistoricalPrice]:
     """TODO: This should probaly be moved in the globaldb/handler.py if we use it elsewhere
     and made more generic (accept different sources)"""
-    connection = GlobalDBHandler().conn
-    cursor = connection.cursor()
-    query = cursor.execute(
-        'SELECT from_asset, to_asset, source_type, timestamp, price FROM '
-        'price_history WHERE from_asset=? AND to_asset=? AND source_type=? ORDER BY timestamp ASC',
-        (
-            from_asset.identifier,
-            to_asset.identifier,
-            HistoricalPriceOracle.CRYPTOCOMPARE.serialize_for_db(),  # pylint: disable=no-member
-        ),
-    )
-    return [HistoricalPrice.deserialize_from_db(x) for x in query]
+    with GlobalDBHandler().conn.read_ctx() as cursor:
+        entries = query_chunked_prices(
+            cursor=cursor,
+            from_asset=from_asset.identifier,
+            to_asset=to_asset.identifier,
+            source=HistoricalPriceOracle.CRYPTOCOMPARE,
+        )
+    return [
+        HistoricalPrice.deserialize_from_db(x)
+        for x in sorted(entries, key=operator.itemgetter(3))
+    ]
 
 
 @pytest.mark.parametrize('use_clean_caching_directory', [True])
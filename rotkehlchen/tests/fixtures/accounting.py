@@ -255,7 +255,7 @@ def _create_inquirer(
         msg_aggregator=MessagesAggregator(),
     )
 
-    mocked_methods = ('find_price', 'find_usd_price', 'find_price_and_oracle', 'find_usd_price_and_oracle', '_query_fiat_pair')  # noqa: E501
+    mocked_methods = ('find_price', 'find_usd_price', 'find_usd_prices', 'find_price_and_oracle', 'find_usd_price_and_oracle', '_query_fiat_pair')  # noqa: E501
     for x in mocked_methods:  # restore Inquirer to original state if needed
         old = f'{x}_old'
         if (original_method := getattr(Inquirer, old, None)) is not None:
@@ -403,9 +403,14 @@ def _create_inquirer(
         inquirer.find_price_and_oracle = Inquirer.find_price_and_oracle = mock_prices_with_oracles  # type: ignore
         inquirer.find_usd_price_and_oracle = Inquirer.find_usd_price_and_oracle = mock_usd_prices_with_oracles  # type: ignore  # noqa: E501
 
+    def mock_find_usd_prices(assets, ignore_cache: bool = False):
+        return {asset: Inquirer.find_usd_price(asset, ignore_cache=ignore_cache) for asset in assets}  # noqa: E501
+
     def mock_query_fiat_pair(*args, **kwargs):  # pylint: disable=unused-argument
         return (ONE, CurrentPriceOracle.FIAT)
 
+    inquirer.find_usd_prices = Inquirer.find_usd_prices = mock_find_usd_prices  # type: ignore
+
     inquirer._query_fiat_pair = Inquirer._query_fiat_pair = mock_query_fiat_pair  # type: ignore
 
     return inquirer
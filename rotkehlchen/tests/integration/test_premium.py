@@ -1,14 +1,17 @@
+import hashlib
 import json
-from base64 import b64decode
+import zlib
+from base64 import b64decode, b64encode
 from http import HTTPStatus
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 from unittest.mock import patch
 
 import gevent
 import pytest
 
 from rotkehlchen.constants.assets import A_EUR
+from rotkehlchen.crypto import decrypt
 from rotkehlchen.db.cache import DBCacheStatic
 from rotkehlchen.db.settings import ModifiableDBSettings
 from rotkehlchen.errors.api import (
@@ -24,6 +27,7 @@ from rotkehlchen.tests.utils.premium import (
     VALID_PREMIUM_SECRET,
     assert_db_got_replaced,
     create_patched_requests_get_for_premium,
+    get_db_backup_hash,
     get_different_hash,
     setup_starting_environment,
 )
@@ -66,7 +70,7 @@ def test_upload_data_to_server(
     with rotkehlchen_instance.data.db.conn.read_ctx() as cursor:
         last_write_ts = rotkehlchen_instance.data.db.get_setting(cursor, name='last_write_ts')
 
-    _, our_hash = rotkehlchen_instance.data.compress_and_encrypt_db()
+    our_hash = get_db_backup_hash(rotkehlchen_instance)
     remote_hash = get_different_hash(our_hash)
 
     def mock_succesfull_upload_data_to_server(
@@ -80,7 +84,7 @@ def test_upload_data_to_server(
         assert data['original_hash'] == our_hash
         assert data['last_modify_ts'] == last_write_ts
         assert 'index' in data
-        assert len(files['db_file']) == data['length']
+        assert len(files['db_file'].read()) == data['length']
         assert 'nonce' in data
         assert data['compression'] == 'zlib'
 
@@ -152,7 +156,7 @@ def test_upload_data_to_server_same_hash(rotkehlchen_instance):
         # Write anything in the DB to set a non-zero last_write_ts
         rotkehlchen_instance.data.db.set_settings(write_cursor, ModifiableDBSettings(main_currency=A_EUR))  # noqa: E501
 
-    _, our_hash = rotkehlchen_instance.data.compress_and_encrypt_db()
+    our_hash = get_db_backup_hash(rotkehlchen_instance)
     remote_hash = our_hash
 
     patched_post = patch.object(
@@ -189,7 +193,7 @@ def test_upload_data_to_server_smaller_db(rotkehlchen_instance, db_settings: dic
         assert last_ts is None
         # Write anything in the DB to set a non-zero last_write_ts
         rotkehlchen_instance.data.db.set_settings(cursor, ModifiableDBSettings(main_currency=A_EUR.resolve_to_asset_with_oracles()))  # noqa: E501
-    _, our_hash = rotkehlchen_instance.data.compress_and_encrypt_db()
+    our_hash = get_db_backup_hash(rotkehlchen_instance)
     remote_hash = get_different_hash(our_hash)
 
     patched_post = patch.object(
@@ -512,7 +516,7 @@ def test_upload_data_to_server_db_already_in_use(rotkehlchen_instance):
         assert last_ts is None
         # Write anything in the DB to set a non-zero last_write_ts
         rotkehlchen_instance.data.db.set_settings(cursor, ModifiableDBSettings(main_currency=A_EUR))  # noqa: E501
-    _, our_hash = rotkehlchen_instance.data.compress_and_encrypt_db()
+    our_hash = get_db_backup_hash(rotkehlchen_instance)
     remote_hash = get_different_hash(our_hash)
 
     patched_post = patch.object(
@@ -576,7 +580,7 @@ def test_upload_data_to_server_db_locked(rotkehlchen_instance):
         # Write anything in the DB to set a non-zero last_write_ts
         rotkehlchen_instance.data.db.set_settings(cursor, ModifiableDBSettings(main_currency=A_EUR))  # noqa: E501
 
-    _, our_hash = rotkehlchen_instance.data.compress_and_encrypt_db()
+    our_hash = get_db_backup_hash(rotkehlchen_instance)
     remote_hash = get_different_hash(our_hash)
 
     patched_post = patch.object(
@@ -618,7 +622,7 @@ def test_error_db_too_big(rotkehlchen_instance: 'Rotkehlchen') -> None:
         return MockResponse(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, 'Payload size is too big')
 
     assert rotkehlchen_instance.premium is not None
-    _, our_hash = rotkehlchen_instance.data.compress_and_encrypt_db()
+    our_hash = get_db_backup_hash(rotkehlchen_instance)
     remote_hash = get_different_hash(our_hash)
     patched_post = patch.object(
         rotkehlchen_instance.premium.session,
@@ -640,6 +644,42 @@ def test_error_db_too_big(rotkehlchen_instance: 'Rotkehlchen') -> None:
     assert error == 'Size limit reached'
 
 
+@pytest.mark.parametrize('start_with_valid_premium', [True])
+def test_upload_data_from_file(rotkehlchen_instance: 'Rotkehlchen', db_password: str) -> None:
+    """Test that the DB backup file is uploaded whole with a single request and that the
+    uploaded data restore the DB"""
+    requests_data: list[dict[str, Any]] = []
+    uploaded_files: list[bytes] = []
+
+    def mock_post(url, data, files, timeout):  # pylint: disable=unused-argument
+        requests_data.append(data)
+        uploaded_files.append(files['db_file'].read())
+        return MockResponse(200, '{"result": true}')
+
+    assert rotkehlchen_instance.premium is not None
+    encrypted_file, our_hash = rotkehlchen_instance.data.compress_and_encrypt_db()
+    with (
+        encrypted_file,
+        patch.object(rotkehlchen_instance.premium.session, 'post', side_effect=mock_post),
+    ):
+        encrypted_data = encrypted_file.read()  # upload_data should rewind the file
+        result = rotkehlchen_instance.premium.upload_data(
+            data_file=encrypted_file,
+            our_hash=our_hash,
+            last_modify_ts=ts_now(),
+            compression_type='zlib',
+        )
+
+    assert result == {'result': True}
+    assert len(requests_data) == 1
+    assert requests_data[0]['index'] == 0
+    assert requests_data[0]['length'] == len(encrypted_data)
+    assert 'total_length' not in requests_data[0]
+    assert uploaded_files == [encrypted_data]
+    decompressed_data = zlib.decompress(decrypt(db_password.encode(), encrypted_data))
+    assert b64encode(hashlib.sha256(decompressed_data).digest()).decode() == our_hash
+
+
 @pytest.mark.parametrize('start_with_valid_premium', [True])
 @pytest.mark.parametrize('device_limit', [1, 2])
 def test_device_limits(rotkehlchen_instance: 'Rotkehlchen', device_limit: int) -> None:
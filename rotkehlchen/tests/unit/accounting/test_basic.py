@@ -1,4 +1,6 @@
+import dataclasses
 from typing import TYPE_CHECKING
+from unittest.mock import patch
 
 import pytest
 
@@ -12,6 +14,7 @@ from rotkehlchen.chain.evm.decoding.cowswap.constants import CPT_COWSWAP
 from rotkehlchen.constants import ONE, ZERO
 from rotkehlchen.constants.assets import A_BTC, A_COMP, A_ETH, A_EUR, A_USD, A_USDC, A_WBTC
 from rotkehlchen.constants.timing import DAY_IN_SECONDS
+from rotkehlchen.db.reports import DBAccountingReports
 from rotkehlchen.exchanges.data_structures import Trade
 from rotkehlchen.fval import FVal
 from rotkehlchen.history.events.structures.base import HistoryEvent
@@ -543,3 +546,37 @@ def test_non_history_event_in_history_iterator(accountant):
     no_message_errors(accountant.msg_aggregator)
     missing_acquisitions = accountant.pots[0].cost_basis.missing_acquisitions
     assert missing_acquisitions == []
+
+
+@pytest.mark.parametrize('mocked_price_queries', [prices])
+def test_resume_from_accounting_checkpoint(accountant: 'Accountant') -> None:
+    """Test that a report whose period starts after a saved accounting checkpoint skips the
+    events before it and gives the same result as processing all the events"""
+    start_ts, end_ts = Timestamp(1474000000), Timestamp(1495751688)
+    dbpnl = DBAccountingReports(accountant.db)
+    report, events = accounting_history_process(accountant, start_ts, end_ts, history1)
+    checkpoints = dbpnl.get_checkpoints(until_ts=end_ts)
+    assert [x[0] for x in checkpoints] == [1451606400]  # start of 2016
+
+    with patch.object(Trade, 'process', autospec=True, side_effect=Trade.process) as process:
+        resumed_report, resumed_events = accounting_history_process(accountant, start_ts, end_ts, history1)  # noqa: E501
+
+    assert process.call_count == 2  # only the trades of 2016
+    assert dbpnl.get_checkpoints(until_ts=end_ts) == checkpoints
+    for key in ('processed_actions', 'total_actions', 'overview', 'last_processed_timestamp'):
+        assert resumed_report[key] == report[key]
+    assert len(resumed_events) == len(events)
+    for resumed_event, event in zip(resumed_events, events, strict=True):
+        assert resumed_event.serialize_to_dict(accountant.pots[0].timestamp_to_date) == event.serialize_to_dict(accountant.pots[0].timestamp_to_date)  # noqa: E501
+
+    # editing an event before the checkpoint invalidates it
+    history = list(history1)
+    history[1] = dataclasses.replace(history[1], rate=Price(FVal(1)))
+    with patch.object(Trade, 'process', autospec=True, side_effect=Trade.process) as process:
+        edited_report, _ = accounting_history_process(accountant, start_ts, end_ts, history)
+
+    assert process.call_count == 4
+    new_checkpoints = dbpnl.get_checkpoints(until_ts=end_ts)
+    assert [x[0] for x in new_checkpoints] == [1451606400]
+    assert new_checkpoints[0][1] != checkpoints[0][1]
+    assert edited_report['overview'] != report['overview']
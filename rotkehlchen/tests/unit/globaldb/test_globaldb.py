@@ -1341,3 +1341,82 @@ def test_check_wal_mode_of_package_db(globaldb: GlobalDBHandler) -> None:
         journal_mode = cursor.execute('PRAGMA journal_mode').fetchone()[0]
 
     assert journal_mode == 'delete'
+
+
+def test_evm_token_memory_cache(globaldb: GlobalDBHandler) -> None:
+    """Test that get_evm_token results, including misses, are cached in memory and that
+    the cache is invalidated when tokens are added, edited or deleted"""
+    address = make_evm_address()
+    stats_before = globaldb.get_evm_token_cache_stats()
+    assert globaldb.get_evm_token(address=address, chain_id=ChainID.ETHEREUM) is None
+    assert globaldb.get_evm_token(address=address, chain_id=ChainID.ETHEREUM) is None
+    stats = globaldb.get_evm_token_cache_stats()
+    assert stats['misses'] == stats_before['misses'] + 1
+    assert stats['hits'] == stats_before['hits'] + 1
+
+    token = EvmToken.initialize(
+        address=address,
+        chain_id=ChainID.ETHEREUM,
+        token_kind=EvmTokenKind.ERC20,
+        decimals=18,
+        name='Cached token',
+        symbol='CACHE',
+    )
+    globaldb.add_asset(token)  # the cached miss should be removed
+    cached_token = globaldb.get_evm_token(address=address, chain_id=ChainID.ETHEREUM)
+    assert cached_token is not None and cached_token.name == 'Cached token'
+    assert globaldb.get_evm_token(address=address, chain_id=ChainID.ETHEREUM) is cached_token
+
+    globaldb.edit_evm_token(EvmToken.initialize(
+        address=address,
+        chain_id=ChainID.ETHEREUM,
+        token_kind=EvmTokenKind.ERC20,
+        decimals=6,
+        name='Edited token',
+        symbol='CACHE',
+    ))
+    edited_token = globaldb.get_evm_token(address=address, chain_id=ChainID.ETHEREUM)
+    assert edited_token is not None and edited_token.name == 'Edited token'
+    assert edited_token.decimals == 6
+
+    globaldb.delete_evm_token(address=address, chain_id=ChainID.ETHEREUM)
+    assert globaldb.get_evm_token(address=address, chain_id=ChainID.ETHEREUM) is None
+
+
+def test_evm_token_memory_cache_underlying_tokens(globaldb: GlobalDBHandler) -> None:
+    """Test that adding underlying tokens or cleaning the asset resolver cache also
+    invalidates the cached evm tokens"""
+    pool_address, underlying_address = make_evm_address(), make_evm_address()
+    globaldb.add_asset(EvmToken.initialize(
+        address=pool_address,
+        chain_id=ChainID.ETHEREUM,
+        token_kind=EvmTokenKind.ERC20,
+        decimals=18,
+        name='Pool token',
+        symbol='POOL',
+    ))
+    pool_token = globaldb.get_evm_token(address=pool_address, chain_id=ChainID.ETHEREUM)
+    assert pool_token is not None and not pool_token.underlying_tokens
+    assert globaldb.get_evm_token(address=underlying_address, chain_id=ChainID.ETHEREUM) is None
+
+    underlying_token = UnderlyingToken(
+        address=underlying_address,
+        token_kind=EvmTokenKind.ERC20,
+        weight=ONE,
+    )
+    with globaldb.conn.write_ctx() as write_cursor:
+        globaldb._add_underlying_tokens(
+            write_cursor=write_cursor,
+            parent_token_identifier=pool_token.identifier,
+            underlying_tokens=[underlying_token],
+            chain_id=ChainID.ETHEREUM,
+        )
+    pool_token = globaldb.get_evm_token(address=pool_address, chain_id=ChainID.ETHEREUM)
+    assert pool_token is not None and pool_token.underlying_tokens == [underlying_token]
+    assert globaldb.get_evm_token(address=underlying_address, chain_id=ChainID.ETHEREUM) is not None  # noqa: E501
+
+    AssetResolver.clean_memory_cache(identifier=pool_token.identifier)
+    assert (pool_address, ChainID.ETHEREUM) not in globaldb.evm_token_cache
+    assert (underlying_address, ChainID.ETHEREUM) in globaldb.evm_token_cache
+    AssetResolver.clean_memory_cache()
+    assert len(globaldb.evm_token_cache) == 0
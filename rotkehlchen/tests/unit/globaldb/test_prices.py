@@ -1,5 +1,16 @@
+from unittest.mock import patch
+
+import pytest
+
 from rotkehlchen.constants.assets import A_BAL, A_BTC, A_ETH, A_USD
 from rotkehlchen.fval import FVal
+from rotkehlchen.globaldb.price_chunks import (
+    PRICE_BLOCK_SIZE,
+    PRICE_CHUNK_SECONDS,
+    decode_price_chunk,
+    encode_price_chunk,
+    query_chunked_prices,
+)
 from rotkehlchen.history.types import HistoricalPrice, HistoricalPriceOracle
 from rotkehlchen.tests.utils.constants import A_EUR
 from rotkehlchen.types import Price, Timestamp
@@ -131,3 +142,207 @@ def test_get_historical_price(globaldb, historical_price_test_data):  # pylint:
         max_seconds_distance=3600,
     )
     assert price_entry is None
+
+
+@pytest.mark.usefixtures('historical_price_test_data')
+def test_get_historical_price_from_memory_cache(globaldb):
+    """Test that the historical prices memory cache finds the same prices as the DB query
+    and that it sees the prices added while it's enabled"""
+    with globaldb.conn.read_ctx() as cursor:
+        timestamps = {x[3] for from_asset in (A_ETH, A_BTC) for x in query_chunked_prices(
+            cursor=cursor,
+            from_asset=from_asset.identifier,
+            to_asset=A_EUR.identifier,
+        )}
+
+    queries = [
+        (from_asset, timestamp + offset, distance, source)
+        for from_asset in (A_ETH, A_BTC, A_BAL)
+        for timestamp in timestamps
+        for offset in (-3601, -10, -1, 0, 2, 3600)
+        for distance in (0, 10, 3600)
+        for source in (None, HistoricalPriceOracle.CRYPTOCOMPARE, HistoricalPriceOracle.COINGECKO, HistoricalPriceOracle.MANUAL)  # noqa: E501
+    ]
+    expected = [globaldb.get_historical_price(
+        from_asset=from_asset,
+        to_asset=A_EUR,
+        timestamp=timestamp,
+        max_seconds_distance=distance,
+        source=source,
+    ) for from_asset, timestamp, distance, source in queries]
+    assert any(x is not None for x in expected)
+
+    with globaldb.historical_prices_cache():
+        assert [globaldb.get_historical_price(
+            from_asset=from_asset,
+            to_asset=A_EUR,
+            timestamp=timestamp,
+            max_seconds_distance=distance,
+            source=source,
+        ) for from_asset, timestamp, distance, source in queries] == expected
+        assert len(globaldb.historical_prices) == 3  # one load per pair
+
+        new_price = HistoricalPrice(
+            from_asset=A_ETH,
+            to_asset=A_EUR,
+            source=HistoricalPriceOracle.CRYPTOCOMPARE,
+            timestamp=Timestamp(1600000000),
+            price=Price(FVal(300)),
+        )
+        globaldb.add_historical_prices([new_price])
+        assert globaldb.get_historical_price(
+            from_asset=A_ETH,
+            to_asset=A_EUR,
+            timestamp=Timestamp(1600000010),
+            max_seconds_distance=3600,
+        ) == new_price
+
+    assert globaldb.historical_prices is None
+    with (
+        patch('rotkehlchen.globaldb.handler.HISTORICAL_PRICES_CACHE_SIZE', 2),
+        globaldb.historical_prices_cache(),
+    ):
+        for from_asset in (A_ETH, A_BTC, A_BAL):
+            globaldb.get_historical_price(
+                from_asset=from_asset,
+                to_asset=A_EUR,
+                timestamp=Timestamp(1600000000),
+                max_seconds_distance=3600,
+            )
+        # only the most recently used pairs are kept
+        assert list(globaldb.historical_prices) == [
+            (A_BTC.identifier.lower(), A_EUR.identifier.lower()),
+            (A_BAL.identifier.lower(), A_EUR.identifier.lower()),
+        ]
+
+
+def test_encode_price_chunk():
+    """Test that the values of the prices of a chunk are decoded exactly as they were encoded
+    and that the decoded prices have no trailing zeros"""
+    prices = [
+        (100, '1'),
+        (3700, '396.56'),
+        (7300, '0.000000000123456789123456789'),
+        (10900, '1E-12'),
+        (14500, '1E+5'),
+        (18100, '2044.7600000000000000000001'),
+        (21700, '0.1'),
+    ]
+    data, _ = encode_price_chunk(0, prices)
+    assert [(x[0], FVal(x[1])) for x in decode_price_chunk(0, data)] == [(x[0], FVal(x[1])) for x in prices]  # noqa: E501
+    assert decode_price_chunk(0, encode_price_chunk(0, [])[0]) == []
+    assert decode_price_chunk(0, encode_price_chunk(0, [(100, '2.50'), (200, '3.125')])[0]) == [(100, '2.5'), (200, '3.125')]  # noqa: E501
+    hourly_prices = [(PRICE_CHUNK_SECONDS + idx * 3600, str(FVal(2000) + FVal(idx) / 100)) for idx in range(672)]  # noqa: E501
+    data, block_index = encode_price_chunk(PRICE_CHUNK_SECONDS, hourly_prices)
+    assert decode_price_chunk(PRICE_CHUNK_SECONDS, data) == hourly_prices
+    assert len(data) < 672 * 4
+    assert len(block_index) == 672 // PRICE_BLOCK_SIZE * 8
+
+
+def test_query_chunked_prices_with_block_index(globaldb):
+    """Test that the prices of a time range found with the block index of the chunks are
+    the same as the ones found by decoding the whole chunks"""
+    prices = [HistoricalPrice(
+        from_asset=A_ETH,
+        to_asset=A_EUR,
+        source=HistoricalPriceOracle.CRYPTOCOMPARE,
+        timestamp=Timestamp(PRICE_CHUNK_SECONDS + idx * 3600 + idx % 7),
+        price=Price(FVal(2000) + FVal(idx) / 3),
+    ) for idx in range(1000)]
+    globaldb.add_historical_prices(prices)
+    all_entries = [(x.timestamp, str(x.price)) for x in prices]
+    with globaldb.conn.read_ctx() as cursor:
+        for from_ts in (0, PRICE_CHUNK_SECONDS, prices[7].timestamp, prices[8].timestamp + 1, prices[700].timestamp):  # noqa: E501
+            for to_ts in (from_ts, from_ts + 3600, from_ts + 20 * 3600):
+                assert [(x[3], x[4]) for x in query_chunked_prices(
+                    cursor=cursor,
+                    from_asset=A_ETH.identifier,
+                    to_asset=A_EUR.identifier,
+                    from_ts=from_ts,
+                    to_ts=to_ts,
+                )] == [x for x in all_entries if from_ts <= x[0] <= to_ts]
+
+
+def test_chunked_historical_prices(globaldb):
+    """Test that the prices of the oracles are stored in chunks that are merged on each
+    addition and that the manual prices are kept in price_history"""
+    hourly_prices = [HistoricalPrice(
+        from_asset=A_ETH,
+        to_asset=A_EUR,
+        source=HistoricalPriceOracle.CRYPTOCOMPARE,
+        timestamp=Timestamp(PRICE_CHUNK_SECONDS - 10 * 3600 + idx * 3600),
+        price=Price(FVal(1000) + FVal(idx) / 3),
+    ) for idx in range(20)]  # spanning two chunks
+    globaldb.add_historical_prices(hourly_prices[::2])
+    globaldb.add_historical_prices(hourly_prices[1::2] + [hourly_prices[0]._replace(price=Price(FVal(1)))])  # noqa: E501
+    manual_price = HistoricalPrice(
+        from_asset=A_ETH,
+        to_asset=A_EUR,
+        source=HistoricalPriceOracle.MANUAL,
+        timestamp=Timestamp(PRICE_CHUNK_SECONDS),
+        price=Price(FVal(5)),
+    )
+    globaldb.add_historical_prices([manual_price])
+    with globaldb.conn.read_ctx() as cursor:
+        assert cursor.execute(
+            'SELECT source_type, timestamp FROM price_history WHERE from_asset=? AND to_asset=?',
+            (A_ETH.identifier, A_EUR.identifier),
+        ).fetchall() == [('A', PRICE_CHUNK_SECONDS)]
+        assert cursor.execute(
+            'SELECT chunk_start, first_timestamp, last_timestamp, prices_num FROM '
+            'price_history_chunks WHERE from_asset=? AND to_asset=? ORDER BY chunk_start',
+            (A_ETH.identifier, A_EUR.identifier),
+        ).fetchall() == [
+            (0, hourly_prices[0].timestamp, hourly_prices[9].timestamp, 10),
+            (PRICE_CHUNK_SECONDS, hourly_prices[10].timestamp, hourly_prices[19].timestamp, 10),
+        ]
+
+    # existing prices are not replaced by add_historical_prices
+    for entry in hourly_prices:
+        assert globaldb.get_historical_price(
+            from_asset=A_ETH,
+            to_asset=A_EUR,
+            timestamp=entry.timestamp,
+            max_seconds_distance=0,
+            source=HistoricalPriceOracle.CRYPTOCOMPARE,
+        ) == entry
+    assert globaldb.get_historical_price(  # the manual price is at the same time as a chunked one
+        from_asset=A_ETH,
+        to_asset=A_EUR,
+        timestamp=Timestamp(PRICE_CHUNK_SECONDS + 1000),
+        max_seconds_distance=3600,
+    ) == manual_price
+    assert globaldb.get_historical_prices(
+        query_data=[(A_ETH, A_EUR, Timestamp(PRICE_CHUNK_SECONDS - 1)), (A_ETH, A_EUR, Timestamp(1))],  # noqa: E501
+        max_seconds_distance=3600,
+        source=HistoricalPriceOracle.CRYPTOCOMPARE,
+    ) == [hourly_prices[10], None]
+    assert globaldb.get_historical_price_range(from_asset=A_ETH, to_asset=A_EUR) == (
+        hourly_prices[0].timestamp,
+        hourly_prices[19].timestamp,
+    )
+    assert globaldb.get_historical_price_range(
+        from_asset=A_ETH,
+        to_asset=A_EUR,
+        source=HistoricalPriceOracle.MANUAL,
+    ) == (PRICE_CHUNK_SECONDS, PRICE_CHUNK_SECONDS)
+
+    # a single price replaces the existing one
+    new_price = hourly_prices[3]._replace(price=Price(FVal(3)))
+    assert globaldb.add_single_historical_price(new_price) is True
+    assert globaldb.get_historical_price(
+        from_asset=A_ETH,
+        to_asset=A_EUR,
+        timestamp=new_price.timestamp,
+        max_seconds_distance=0,
+    ) == new_price
+
+    globaldb.delete_historical_prices(
+        from_asset=A_ETH,
+        to_asset=A_EUR,
+        source=HistoricalPriceOracle.CRYPTOCOMPARE,
+    )
+    assert globaldb.get_historical_price_range(from_asset=A_ETH, to_asset=A_EUR) == (
+        PRICE_CHUNK_SECONDS,
+        PRICE_CHUNK_SECONDS,
+    )
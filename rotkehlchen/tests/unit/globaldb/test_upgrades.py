@@ -15,12 +15,14 @@ from rotkehlchen.constants.misc import GLOBALDB_NAME, GLOBALDIR_NAME
 from rotkehlchen.db.drivers.gevent import DBConnection, DBConnectionType
 from rotkehlchen.db.utils import table_exists
 from rotkehlchen.errors.misc import DBUpgradeError
+from rotkehlchen.fval import FVal
 from rotkehlchen.globaldb.cache import (
     globaldb_get_general_cache_keys_and_values_like,
     globaldb_get_general_cache_last_queried_ts_by_key,
     globaldb_get_unique_cache_value,
 )
 from rotkehlchen.globaldb.handler import GlobalDBHandler
+from rotkehlchen.globaldb.price_chunks import decode_price_chunk
 from rotkehlchen.globaldb.schema import (
     DB_CREATE_ASSET_COLLECTIONS,
     DB_CREATE_LOCATION_ASSET_MAPPINGS,
@@ -669,6 +671,15 @@ def test_upgrade_v7_v8(globaldb: GlobalDBHandler):
         cursor.execute('UPDATE general_cache SET last_queried_ts=? WHERE key LIKE ?', (ts_now(), 'CURVE_LP_TOKENS%'))  # noqa: E501
         assert should_update_protocol_cache(CacheType.CURVE_LP_TOKENS) is False
 
+        assert table_exists(cursor, 'price_history_chunks') is False
+        oracle_prices = cursor.execute(
+            'SELECT from_asset, to_asset, source_type, timestamp, price FROM price_history '
+            'WHERE source_type NOT IN ("A", "E")',
+        ).fetchall()
+        manual_prices_num = cursor.execute(
+            'SELECT COUNT(*) FROM price_history WHERE source_type IN ("A", "E")',
+        ).fetchone()[0]
+
     assert unique_entries['Wormhole Token', 'W'] == 263
     assert unique_entries['TokenFi', 'TOKEN'] == 264
     assert unique_entries['HTX', 'HTX'] == 265
@@ -753,6 +764,19 @@ def test_upgrade_v7_v8(globaldb: GlobalDBHandler):
         # ensure that now curve cache should be eligible to update
         assert should_update_protocol_cache(CacheType.CURVE_LP_TOKENS, '1') is True
 
+        # the prices of the oracles were moved to chunks and the manual ones were kept
+        assert cursor.execute(
+            'SELECT COUNT(*) FROM price_history WHERE source_type NOT IN ("A", "E")',
+        ).fetchone()[0] == 0
+        assert cursor.execute('SELECT COUNT(*) FROM price_history').fetchone()[0] == manual_prices_num  # noqa: E501
+        assert sorted(
+            (from_asset, to_asset, source_type, timestamp, FVal(price))
+            for from_asset, to_asset, source_type, chunk_start, data in cursor.execute(
+                'SELECT from_asset, to_asset, source_type, chunk_start, data FROM price_history_chunks',  # noqa: E501
+            )
+            for timestamp, price in decode_price_chunk(chunk_start, data)
+        ) == sorted((*x[:4], FVal(x[4])) for x in oracle_prices)
+
     with (
         pytest.raises(IntegrityError),
         globaldb.conn.write_ctx() as write_cursor,
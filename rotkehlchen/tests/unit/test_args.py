@@ -28,3 +28,13 @@ def test_arg_sql_vm_instructions_cb(argparser):
     assert args.sqlite_instructions == 200
     args = argparser.parse_args(['--sqlite-instructions', '0'])
     assert args.sqlite_instructions == 0
+
+
+def test_arg_fval_backend(argparser):
+    with pytest.raises(SystemExit):
+        argparser.parse_args(['--fval-backend', 'float'])
+
+    args = argparser.parse_args(['--data-dir', 'foo'])
+    assert args.fval_backend is None
+    args = argparser.parse_args(['--fval-backend', 'fixed'])
+    assert args.fval_backend == 'fixed'
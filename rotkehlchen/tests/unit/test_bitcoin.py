@@ -16,8 +16,9 @@ from rotkehlchen.chain.bitcoin.utils import (
     scriptpubkey_to_p2pkh_address,
     scriptpubkey_to_p2sh_address,
 )
-from rotkehlchen.chain.bitcoin.xpub import XpubData
+from rotkehlchen.chain.bitcoin.xpub import XpubData, _derive_addresses_from_xpub_data
 from rotkehlchen.chain.constants import NON_BITCOIN_CHAINS, SupportedBlockchain
+from rotkehlchen.constants import ZERO
 from rotkehlchen.errors.misc import RemoteError, XPUBError
 from rotkehlchen.fval import FVal
 from rotkehlchen.tests.utils.ens import ENS_BRUNO_BTC_ADDR, ENS_BRUNO_BTC_BYTES
@@ -153,6 +154,51 @@ def test_pubkey_to_bech32_address():
     assert address == 'bc1p0vuq2cmrm7xdyc4wskdg8hp2prgkpe56g09knye73ne97tjdqfgqru9fkg'
 
 
+def test_derive_addresses_from_xpub_with_cache():
+    """Test that the addresses derived from an xpub are the ones with activity and the ones
+    without before them and that already derived addresses are not derived again"""
+    xpub_data = XpubData(
+        xpub=HDKey.from_xpub(xpub='xpub68V4ZQQ62mea7ZUKn2urQu47Bdn2Wr7SxrBxBDDwE3kjytj361YBGSKDT4WoBrE5htrSB8eAMe59NPnKrcAbiv2veN5GQUmfdjRddD1Hxrk', path='m'),  # noqa: E501
+        blockchain=SupportedBlockchain.BITCOIN,
+    )
+    receiving_xpub = xpub_data.xpub.derive_child(0)
+    used_addresses = {receiving_xpub.derive_child(idx).address() for idx in (0, 3, 7)}
+
+    def mock_have_transactions(accounts):
+        return {x: (x in used_addresses, ZERO) for x in accounts}
+
+    derived_addresses: dict = {}
+    with (
+        patch('rotkehlchen.chain.bitcoin.xpub.have_bitcoin_transactions', side_effect=mock_have_transactions),  # noqa: E501
+        patch.object(HDKey, 'derive_child', autospec=True, side_effect=HDKey.derive_child) as derive_child,  # noqa: E501
+    ):
+        result = _derive_addresses_from_xpub_data(
+            xpub_data=xpub_data,
+            start_receiving_index=0,
+            start_change_index=0,
+            gap_limit=5,
+            derived_addresses=derived_addresses,
+        )
+        # receiving addresses up to the batch after the last used one, change addresses
+        # of the first batch and the next batch of each that got derived while querying
+        assert len(derived_addresses) == 30
+        assert derive_child.call_count == 32  # 30 addresses + receiving and change roots
+        assert used_addresses <= {x.address for x in result}
+        for (account_index, derived_index), address in derived_addresses.items():
+            assert address == xpub_data.xpub.derive_child(account_index).derive_child(derived_index).address()  # noqa: E501
+
+        derive_child.reset_mock()
+        assert _derive_addresses_from_xpub_data(
+            xpub_data=xpub_data,
+            start_receiving_index=0,
+            start_change_index=0,
+            gap_limit=5,
+            derived_addresses=derived_addresses,
+        ) == result
+        assert derive_child.call_count == 2  # only the receiving and change roots
+        assert len(derived_addresses) == 30
+
+
 def test_from_xpub_with_conversion():
     legacy_xpub = 'xpub6CjniigyzMWgVDHvDpgvsroPkTJeqUbrHJaLHARHmAM8zuAbCjmHpp3QhKTcnnscd6iBDrqmABCJjnpwUW42cQjtvKjaEZRcShHKEVh35Y8'  # noqa: E501
     legacy_xpub_hdkey = HDKey.from_xpub(xpub=legacy_xpub, path='m')
@@ -1,26 +1,37 @@
+from collections import defaultdict
 from contextlib import ExitStack
 from typing import TYPE_CHECKING
 from unittest.mock import patch
 
+import gevent
 import pytest
 
+from rotkehlchen.accounting.structures.balance import Balance, BalanceSheet
+from rotkehlchen.api.websockets.typedefs import WSMessageType
 from rotkehlchen.assets.asset import Asset
 from rotkehlchen.assets.utils import get_or_create_evm_token
 from rotkehlchen.chain.accounts import BlockchainAccountData
 from rotkehlchen.chain.aggregator import ChainsAggregator, _module_name_to_class
+from rotkehlchen.chain.bitcoin.hdkey import HDKey
+from rotkehlchen.chain.bitcoin.xpub import XpubData, XpubManager
 from rotkehlchen.chain.evm.constants import LAST_SPAM_TXS_CACHE
 from rotkehlchen.chain.evm.types import NodeName, WeightedNode, string_to_evm_address
 from rotkehlchen.chain.gnosis.constants import GNOSIS_ETHERSCAN_NODE
 from rotkehlchen.constants import ONE
+from rotkehlchen.constants.assets import A_ETH
 from rotkehlchen.db.cache import DBCacheDynamic
+from rotkehlchen.errors.misc import RemoteError
+from rotkehlchen.fval import FVal
+from rotkehlchen.tests.fixtures.messages import MockRotkiNotifier
 from rotkehlchen.tests.utils.blockchain import setup_evm_addresses_activity_mock
-from rotkehlchen.tests.utils.factories import make_evm_address
+from rotkehlchen.tests.utils.factories import UNIT_BTC_ADDRESS1, make_evm_address
 from rotkehlchen.tests.utils.polygon_pos import ALCHEMY_RPC_ENDPOINT
 from rotkehlchen.types import AVAILABLE_MODULES_MAP, SPAM_PROTOCOL, ChainID, SupportedBlockchain
 
 if TYPE_CHECKING:
     from rotkehlchen.chain.gnosis.manager import GnosisManager
     from rotkehlchen.chain.polygon_pos.manager import PolygonPOSManager
+    from rotkehlchen.types import ChecksumEvmAddress
 
 
 ALCHEMY_POLYGON_NODE = WeightedNode(
@@ -327,3 +338,61 @@ def test_detect_evm_accounts_spam_tx_gnosis(gnosis_manager: 'GnosisManager') ->
         assert gnosis_manager.transactions.address_has_been_spammed(evm_address) is True
         # verify that the gnosiscan API get's queried with the last recorded blocknumber
         assert all(f'startBlock={block_number}' in call.args[0] for call in mocked_get.mock_calls), "URL must contain 'startBlock=' and correct block number"  # noqa: E501
+
+
+@pytest.mark.parametrize('ethereum_accounts', [['0x9531C059098e3d194fF87FebB587aB07B30B1306']])
+@pytest.mark.parametrize('btc_accounts', [[UNIT_BTC_ADDRESS1]])
+def test_query_balances_in_parallel(
+        blockchain: 'ChainsAggregator',
+        ethereum_accounts: list['ChecksumEvmAddress'],
+) -> None:
+    """Test that all chains with accounts are queried in parallel, that the result of each
+    chain is sent as soon as it is queried and that an error of a chain is raised only
+    after the rest of the chains are queried"""
+    def query_eth_balances(ignore_cache: bool) -> None:
+        assert ignore_cache is True
+        gevent.sleep(0.2)
+        blockchain.balances.eth[ethereum_accounts[0]] = BalanceSheet(
+            assets=defaultdict(Balance, {A_ETH: Balance(amount=ONE, usd_value=FVal(2000))}),
+        )
+
+    notifier = MockRotkiNotifier()
+    with (
+        patch.object(blockchain, 'query_eth_balances', side_effect=query_eth_balances),
+        patch.object(blockchain, 'query_btc_balances', side_effect=RemoteError('btc is down')),
+        patch.object(blockchain.msg_aggregator, 'rotki_notifier', notifier),
+        pytest.raises(RemoteError, match='btc is down'),
+    ):
+        blockchain.query_balances(ignore_cache=True)
+
+    assert blockchain.balances.eth[ethereum_accounts[0]].assets[A_ETH].usd_value == FVal(2000)
+    messages = [x.data for x in notifier.messages if x.message_type == WSMessageType.BALANCE_SOURCE_QUERIED]  # noqa: E501
+    assert all(x.pop('duration') >= 0 for x in messages)  # type: ignore[arg-type]  # they are dicts
+    assert messages == [{
+        'location': 'blockchain',
+        'name': 'btc',
+        'status': 'failed',
+        'error': 'btc is down',
+    }, {
+        'location': 'blockchain',
+        'name': 'eth',
+        'status': 'finished',
+        'usd_value': '2000',
+    }]
+
+
+@pytest.mark.parametrize('ethereum_accounts', [[]])
+def test_query_balances_checks_xpubs_without_accounts(blockchain: 'ChainsAggregator') -> None:
+    """Test that querying all balances ignoring the cache checks for new xpub addresses
+    even if no address of the xpub is tracked yet"""
+    with blockchain.database.user_write() as write_cursor:
+        blockchain.database.add_bitcoin_xpub(write_cursor, XpubData(
+            xpub=HDKey.from_xpub(xpub='xpub68V4ZQQ62mea7ZUKn2urQu47Bdn2Wr7SxrBxBDDwE3kjytj361YBGSKDT4WoBrE5htrSB8eAMe59NPnKrcAbiv2veN5GQUmfdjRddD1Hxrk', path='m'),  # noqa: E501
+            blockchain=SupportedBlockchain.BITCOIN,
+        ))
+
+    assert len(blockchain.accounts.btc) == 0
+    with patch.object(XpubManager, 'check_for_new_xpub_addresses') as check_for_new_xpub_addresses:
+        blockchain.query_balances(ignore_cache=True)
+
+    check_for_new_xpub_addresses.assert_called_once_with(blockchain=SupportedBlockchain.BITCOIN)
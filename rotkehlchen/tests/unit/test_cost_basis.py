@@ -1,4 +1,5 @@
 import csv
+import json
 import tempfile
 from itertools import zip_longest
 from pathlib import Path
@@ -7,7 +8,7 @@ from typing import TYPE_CHECKING, cast
 import pytest
 
 from rotkehlchen.accounting.accountant import Accountant
-from rotkehlchen.accounting.cost_basis import AssetAcquisitionEvent
+from rotkehlchen.accounting.cost_basis import AssetAcquisitionEvent, CostBasisCalculator
 from rotkehlchen.accounting.cost_basis.base import AverageCostBasisMethod
 from rotkehlchen.accounting.export.csv import FILENAME_ALL_CSV, CSVExporter
 from rotkehlchen.accounting.mixins.event import AccountingEventType
@@ -38,6 +39,7 @@ from rotkehlchen.types import (
     TimestampMS,
     TradeType,
 )
+from rotkehlchen.utils.serialization import rlk_jsondumps
 
 if TYPE_CHECKING:
     from rotkehlchen.db.dbhandler import DBHandler
@@ -865,6 +867,72 @@ def test_missing_acquisitions(accountant: Accountant):
     assert cost_basis.missing_acquisitions == expected_missing_acquisitions
 
 
+@pytest.mark.parametrize('cost_basis_method', list(CostBasisMethod))
+def test_cost_basis_state_serialization(
+        accountant: Accountant,
+        cost_basis_method: CostBasisMethod,
+) -> None:
+    """Test that the cost basis state saved in accounting checkpoints is restored so that
+    the next spends use the same acquisitions as they would have without the checkpoint"""
+    settings = DBSettings(cost_basis_method=cost_basis_method)
+    cost_basis = accountant.pots[0].cost_basis
+    cost_basis.reset(settings)
+    for idx, (bought, rate) in enumerate((('2', '100'), ('1', '300'), ('3', '200'))):
+        cost_basis.get_events(A_BTC).acquisitions_manager.add_in_event(AssetAcquisitionEvent(
+            amount=FVal(bought),
+            timestamp=Timestamp(1000 + idx),
+            rate=Price(FVal(rate)),
+            index=idx,
+        ))
+    cost_basis.get_events(A_ETH).acquisitions_manager.add_in_event(AssetAcquisitionEvent(
+        amount=ONE,
+        timestamp=Timestamp(1000),
+        rate=Price(FVal(10)),
+        index=3,
+    ))
+    for asset, amount in ((A_BTC, FVal('2.5')), (A_ETH, FVal(2))):
+        cost_basis.spend_asset(
+            location=Location.EXTERNAL,
+            timestamp=Timestamp(2000),
+            asset=asset,
+            amount=amount,
+            rate=Price(FVal(400)),
+            taxable_spend=True,
+        )
+
+    restored = CostBasisCalculator(
+        database=accountant.pots[0].database,
+        msg_aggregator=accountant.msg_aggregator,
+    )
+    restored.reset(settings)
+    restored.deserialize_state(json.loads(rlk_jsondumps(cost_basis.serialize_state())))
+    assert len(restored.missing_acquisitions) == 1
+    assert restored.missing_acquisitions == cost_basis.missing_acquisitions
+    assert restored.get_events(A_BTC).acquisitions_manager.get_acquisitions() == cost_basis.get_events(A_BTC).acquisitions_manager.get_acquisitions()  # noqa: E501
+
+    # acquisitions after the restore are ordered along the restored ones
+    spends = []
+    for calculator in (cost_basis, restored):
+        calculator.get_events(A_BTC).acquisitions_manager.add_in_event(AssetAcquisitionEvent(
+            amount=ONE,
+            timestamp=Timestamp(3000),
+            rate=Price(FVal(250)),
+            index=4,
+        ))
+        spends.append(calculator.spend_asset(
+            location=Location.EXTERNAL,
+            timestamp=Timestamp(4000),
+            asset=A_BTC,
+            amount=FVal(3),
+            rate=Price(FVal(500)),
+            taxable_spend=True,
+        ))
+
+    assert spends[0].is_complete is True
+    assert spends[0] == spends[1]
+    assert restored.get_events(A_BTC).acquisitions_manager.get_acquisitions() == cost_basis.get_events(A_BTC).acquisitions_manager.get_acquisitions()  # noqa: E501
+
+
 @pytest.mark.parametrize('db_settings', [
     {'cost_basis_method': CostBasisMethod.ACB},
 ])
@@ -776,6 +776,8 @@ def test_eth_validators_performance(eth2, database, ethereum_accounts):
                 is_exit=True,
             ),
         ])
+        # as done by the withdrawals and produced blocks queries after storing them
+        dbeth2.update_daily_performance(write_cursor)
 
     def check_performance_validator(performance, vindex, check_keys, expected_data, expected_apr):
         for check_key in check_keys:
@@ -825,6 +827,93 @@ def test_eth_validators_performance(eth2, database, ethereum_accounts):
     assert performance['validators'] == {}
 
 
+def test_validators_daily_performance(database):
+    """Test that the daily cumulative profit of the validators is kept up to date as
+    staking events are added, edited, marked as exits and deleted and that the profit
+    in periods with partial days matches the one of the events"""
+    dbevents, dbeth2 = DBHistoryEvents(database), DBEth2(database)
+    vindex1, vindex2 = 1, 2
+    tracked_address, builder_address = make_evm_address(), make_evm_address()
+    start_ts = Timestamp(1700006400)  # 2023-11-15 00:00 UTC
+    with database.user_write() as write_cursor:
+        dbevents.add_history_events(write_cursor, [
+            EthWithdrawalEvent(
+                validator_index=vindex1,
+                timestamp=ts_sec_to_ms(Timestamp(start_ts + day * DAY_IN_SECONDS + HOUR_IN_SECONDS * day)),  # noqa: E501
+                balance=Balance(FVal('0.01') * (day + 1)),
+                withdrawal_address=tracked_address,
+                is_exit=False,
+            ) for day in range(6)
+        ] + [
+            EthBlockEvent(
+                validator_index=vindex2,
+                timestamp=ts_sec_to_ms(Timestamp(start_ts + DAY_IN_SECONDS + HOUR_IN_SECONDS)),
+                balance=Balance(FVal('0.2')),
+                fee_recipient=tracked_address,
+                block_number=1,
+                is_mev_reward=False,
+            ), EthBlockEvent(
+                validator_index=vindex2,
+                timestamp=ts_sec_to_ms(Timestamp(start_ts + DAY_IN_SECONDS + HOUR_IN_SECONDS)),
+                balance=Balance(FVal('0.5')),
+                fee_recipient=builder_address,
+                block_number=1,
+                is_mev_reward=True,
+            ),
+        ])
+        dbeth2.update_daily_performance(write_cursor)
+
+    def assert_profit(from_ts, to_ts, withdrawals, exits, execution, validator_indices=None):
+        with database.conn.read_ctx() as cursor:
+            assert dbeth2.get_validators_profit(
+                cursor=cursor,
+                from_ts=from_ts,
+                to_ts=to_ts,
+                validator_indices=validator_indices,
+                tracked_addresses=[tracked_address],
+            ) == (withdrawals, exits, execution)
+
+    end_ts = Timestamp(start_ts + 10 * DAY_IN_SECONDS)
+    assert_profit(start_ts, end_ts, {vindex1: FVal('0.21')}, {}, {vindex2: FVal('0.2')})
+    # periods starting and ending in the middle of days
+    assert_profit(Timestamp(start_ts + 1), end_ts, {vindex1: FVal('0.20')}, {}, {vindex2: FVal('0.2')})  # noqa: E501
+    assert_profit(Timestamp(start_ts + DAY_IN_SECONDS + HOUR_IN_SECONDS), Timestamp(start_ts + 4 * DAY_IN_SECONDS + HOUR_IN_SECONDS * 4), {vindex1: FVal('0.14')}, {}, {vindex2: FVal('0.2')})  # noqa: E501
+    assert_profit(Timestamp(start_ts + 2 * DAY_IN_SECONDS), Timestamp(start_ts + 2 * DAY_IN_SECONDS + HOUR_IN_SECONDS * 3), {vindex1: FVal('0.03')}, {}, {})  # noqa: E501
+    assert_profit(start_ts, end_ts, {}, {}, {vindex2: FVal('0.2')}, validator_indices={vindex2})
+
+    # add an exit, which is the only new event that should be accounted for
+    with database.user_write() as write_cursor:
+        dbevents.add_history_event(write_cursor, EthWithdrawalEvent(
+            validator_index=vindex1,
+            timestamp=ts_sec_to_ms(Timestamp(start_ts + 8 * DAY_IN_SECONDS)),
+            balance=Balance(FVal('32.5')),
+            withdrawal_address=tracked_address,
+            is_exit=False,
+        ))
+        dbeth2.update_daily_performance(write_cursor)
+        dbeth2.set_validator_exit(write_cursor, index=vindex1, withdrawable_timestamp=Timestamp(start_ts + 7 * DAY_IN_SECONDS))  # noqa: E501
+        assert write_cursor.execute('SELECT SUM(events) FROM eth2_daily_performance').fetchone()[0] == 9  # noqa: E501
+
+    assert_profit(start_ts, end_ts, {vindex1: FVal('0.21')}, {vindex1: FVal('0.5')}, {vindex2: FVal('0.2')})  # noqa: E501
+
+    # editing an event changes the profit of the days after it
+    with database.conn.read_ctx() as cursor:
+        first_withdrawal = next(x for x in dbevents.get_history_events(
+            cursor=cursor,
+            filter_query=HistoryEventFilterQuery.make(),
+            has_premium=True,
+        ) if x.timestamp == ts_sec_to_ms(start_ts))
+    first_withdrawal.balance = Balance(FVal('1.01'))
+    first_withdrawal.timestamp = ts_sec_to_ms(Timestamp(start_ts + DAY_IN_SECONDS))
+    assert dbevents.edit_history_event(first_withdrawal) == (True, '')
+    assert_profit(start_ts, end_ts, {vindex1: FVal('1.21')}, {vindex1: FVal('0.5')}, {vindex2: FVal('0.2')})  # noqa: E501
+    assert_profit(start_ts, Timestamp(start_ts + DAY_IN_SECONDS - 1), {}, {}, {})
+
+    # deleting an accounted event recalculates everything
+    assert dbevents.delete_history_events_by_identifier([first_withdrawal.identifier]) is None
+    assert_profit(start_ts, end_ts, {vindex1: FVal('0.20')}, {vindex1: FVal('0.5')}, {vindex2: FVal('0.2')})  # noqa: E501
+
+
 @pytest.mark.vcr()
 @pytest.mark.freeze_time('2024-02-02 13:34:45 GMT')
 @pytest.mark.parametrize('network_mocking', [False])
@@ -1,5 +1,6 @@
 import datetime
 import json
+import os
 from copy import deepcopy
 from http import HTTPStatus
 from pathlib import Path
@@ -10,6 +11,14 @@ import pytest
 from rotkehlchen.accounting.structures.balance import Balance
 from rotkehlchen.assets.asset import Asset
 from rotkehlchen.assets.resolver import AssetResolver
+from rotkehlchen.chain.ethereum.airdrop_index import (
+    INDEX_SUFFIX,
+    AddressIndex,
+    address_to_key,
+    is_address_index,
+    source_signature,
+    write_address_index,
+)
 from rotkehlchen.chain.ethereum.airdrops import (
     AIRDROPS_INDEX,
     AIRDROPS_REPO_BASE,
@@ -461,12 +470,20 @@ def test_check_airdrops(
             'SELECT value FROM unique_cache WHERE key=?', ('AIRDROPS_HASHdiva.csv',),
         ).fetchone()[0] == 'updated_hash'
 
-    # Test cache file and row is created
+    # Test cache file, its index and row is created
     for protocol_name, data in MOCK_AIRDROP_INDEX['airdrops'].items():
         if 'csv_path' in data:
             assert (data_dir / APPDIR_NAME / AIRDROPSDIR_NAME / f'{protocol_name}.csv').is_file()
+            assert is_address_index(
+                path=data_dir / APPDIR_NAME / AIRDROPSDIR_NAME / f'{protocol_name}{INDEX_SUFFIX}',
+                source=data_dir / APPDIR_NAME / AIRDROPSDIR_NAME / f'{protocol_name}.csv',
+            )
     for protocol_name in MOCK_AIRDROP_INDEX['poap_airdrops']:
         assert (data_dir / APPDIR_NAME / AIRDROPSPOAPDIR_NAME / f'{protocol_name}.json').is_file()
+        assert is_address_index(
+            path=data_dir / APPDIR_NAME / AIRDROPSPOAPDIR_NAME / f'{protocol_name}{INDEX_SUFFIX}',
+            source=data_dir / APPDIR_NAME / AIRDROPSPOAPDIR_NAME / f'{protocol_name}.json',
+        )
     with GlobalDBHandler().conn.read_ctx() as cursor:
         assert globaldb_get_unique_cache_value(
             cursor=cursor,
@@ -528,3 +545,49 @@ def test_fetch_airdrops_metadata(database, remote_etag, database_etag):
         )
         if remote_etag != database_etag:  # check if the value is updated
             assert metadata[0]['diva'].name == 'new_name'
+
+
+def test_address_index(tmp_path: Path) -> None:
+    """Test that the addresses of an index are found by binary search, that the invalid
+    row of the source file is kept and that the index is outdated once the source changes"""
+    entries = {
+        address_to_key(f'0x{idx:040x}'): str(idx)
+        for idx in range(1, 1000, 2)
+    }
+    (source := tmp_path / 'test.csv').write_text('address,amount\n')
+    write_address_index(
+        path=(path := tmp_path / f'test{INDEX_SUFFIX}'),
+        entries=entries,  # type: ignore[arg-type]
+        signature=source_signature(source),
+    )
+    assert is_address_index(path=path, source=source) is True
+    with AddressIndex(path) as index:
+        assert index.count == 500
+        assert index.invalid_row is None
+        for key, value in entries.items():
+            assert index.get(key) == value  # type: ignore[arg-type]
+        for missing in (f'0x{0:040x}', f'0x{2:040x}', f'0x{1000:040x}'):
+            assert index.get(address_to_key(missing)) is None  # type: ignore[arg-type]
+
+    write_address_index(
+        path=path,
+        entries={},
+        signature=source_signature(source),
+        invalid_row=['0x', ''],
+    )
+    with AddressIndex(path) as index:
+        assert index.count == 0
+        assert index.invalid_row == ['0x', '']
+        assert index.get(address_to_key(TEST_ADDR1)) is None  # type: ignore[arg-type]
+
+    assert address_to_key('not an address') is None
+    assert address_to_key(TEST_ADDR1) == bytes.fromhex(TEST_ADDR1[2:])
+    source.write_text('address,amount\n0x,1\n')  # a new download changes the size
+    assert is_address_index(path=path, source=source) is False
+    write_address_index(path=path, entries={}, signature=source_signature(source))
+    assert is_address_index(path=path, source=source) is True
+    os.utime(source, ns=(0, 0))  # same size but modified at another time
+    assert is_address_index(path=path, source=source) is False
+    assert is_address_index(path=path, source=tmp_path / 'missing.csv') is False
+    path.write_bytes(b'invalid')
+    assert is_address_index(path=path, source=source) is False
@@ -6,7 +6,12 @@ import pytest
 from rotkehlchen.accounting.structures.balance import Balance
 from rotkehlchen.chain.ethereum.modules.gitcoin.constants import GITCOIN_GRANTS_OLD1
 from rotkehlchen.chain.evm.constants import GENESIS_HASH
-from rotkehlchen.chain.evm.decoding.constants import CPT_GAS
+from rotkehlchen.chain.evm.decoding.constants import (
+    CPT_GAS,
+    ERC20_APPROVE,
+    ERC20_OR_ERC721_TRANSFER,
+)
+from rotkehlchen.chain.evm.decoding.utils import decodes_topics, index_event_rules
 from rotkehlchen.chain.evm.l2_with_l1_fees.types import L2WithL1FeesTransaction
 from rotkehlchen.chain.evm.types import EvmAccount, string_to_evm_address
 from rotkehlchen.constants.assets import A_ETH, A_SAI
@@ -295,3 +300,103 @@ def test_genesis_remove_address(
         )
 
     assert len(genesis_tx) == 0, 'Genesis transaction should have been deleted'
+
+
+def test_index_event_rules():
+    """Test that the topic index of event rules keeps the registration order
+    and that dynamic rules are candidates for every topic"""
+    topic_a, topic_b, topic_c = b'a' * 32, b'b' * 32, b'c' * 32
+
+    @decodes_topics(topic_a)
+    def rule_a():
+        pass
+
+    @decodes_topics(topic_a, topic_b)
+    def rule_ab():
+        pass
+
+    def dynamic_rule():
+        pass
+
+    @decodes_topics(topic_b)
+    def rule_b():
+        pass
+
+    index, dynamic_rules = index_event_rules([rule_a, dynamic_rule, rule_ab, rule_b])
+    assert index == {
+        topic_a: [rule_a, dynamic_rule, rule_ab],
+        topic_b: [dynamic_rule, rule_ab, rule_b],
+    }
+    assert dynamic_rules == [dynamic_rule]
+    assert index.get(topic_c, dynamic_rules) == [dynamic_rule]
+
+
+def test_decoder_event_rules_index(
+        ethereum_transaction_decoder,
+        optimism_transaction_decoder,
+        base_transaction_decoder,
+        arbitrum_one_transaction_decoder,
+):
+    """Test that the decoders only try the relevant rules for well known topics and that
+    all the event rules declare their topics so that no rule is tried for every log"""
+    for decoder in (
+            ethereum_transaction_decoder,
+            optimism_transaction_decoder,
+            base_transaction_decoder,
+            arbitrum_one_transaction_decoder,
+    ):
+        assert decoder.event_rules_by_topic[ERC20_APPROVE][0] == decoder._maybe_decode_erc20_approve  # noqa: E501
+        assert decoder.event_rules_by_topic[ERC20_OR_ERC721_TRANSFER][0] == decoder._maybe_decode_erc20_721_transfer  # noqa: E501
+        assert decoder.dynamic_event_rules == []
+        for rules in decoder.event_rules_by_topic.values():
+            assert len(rules) < len(decoder.rules.event_rules)
+
+
+@pytest.mark.parametrize('use_custom_database', ['ethtxs.db'])
+def test_decode_undecoded_transactions_in_chunks(ethereum_transaction_decoder, database):
+    """Test that the undecoded transactions are read from the DB in bulk and that the
+    events of each transaction are saved before decoding the next one of the chunk, so
+    that decoders reading earlier events from the DB don't depend on the chunking"""
+    dbevmtx = DBEvmTx(database)
+    undecoded_hashes = dbevmtx.get_transaction_hashes_not_decoded(chain_id=ChainID.ETHEREUM, limit=None)  # noqa: E501
+    assert len(undecoded_hashes) > 2
+    with database.conn.read_ctx() as cursor:
+        tx_hashes, transactions = dbevmtx.get_transactions_and_receipts_not_decoded(
+            cursor=cursor,
+            chain_id=ChainID.ETHEREUM,
+            limit=len(undecoded_hashes),
+        )
+        assert tx_hashes == undecoded_hashes
+        for tx_hash in tx_hashes:  # the bulk read should match reading each transaction
+            tx, receipt = transactions[tx_hash]
+            assert receipt == dbevmtx.get_receipt(cursor, tx_hash, ChainID.ETHEREUM)
+            assert [tx] == dbevmtx.get_evm_transactions(
+                cursor=cursor,
+                filter_=EvmTransactionsFilterQuery.make(tx_hash=tx_hash, chain_id=ChainID.ETHEREUM),  # noqa: E501
+                has_premium=True,
+            )
+
+    decoded_before = []
+
+    def decode_transaction_events(**kwargs):  # pylint: disable=unused-argument
+        with database.conn.read_ctx() as cursor:
+            decoded_before.append(cursor.execute('SELECT COUNT(*) FROM evm_tx_mappings').fetchone()[0])  # noqa: E501
+        return [], False
+
+    decoder = ethereum_transaction_decoder
+    with (  # decoding itself is tested elsewhere. Here only check the chunking and the writes
+        patch.object(decoder, '_decode_transaction_events', side_effect=decode_transaction_events) as decode_mock,  # noqa: E501
+        patch.object(database, 'user_write', wraps=database.user_write) as user_write,
+    ):
+        decoder.get_and_decode_undecoded_transactions(limit=3, chunk_size=2)
+        assert decode_mock.call_count == 3
+        assert user_write.call_count == 3  # one write for each transaction
+        assert decoded_before == [0, 1, 2]  # including the second one of the first chunk
+        assert dbevmtx.get_transaction_hashes_not_decoded(chain_id=ChainID.ETHEREUM, limit=None) == undecoded_hashes[3:]  # noqa: E501
+
+        decoder.get_and_decode_undecoded_transactions(chunk_size=2)
+        assert decode_mock.call_count == len(undecoded_hashes)
+        assert dbevmtx.count_hashes_not_decoded(chain_id=ChainID.ETHEREUM) == 0
+
+    with database.conn.read_ctx() as cursor:
+        assert cursor.execute('SELECT COUNT(*) FROM evm_tx_mappings').fetchone()[0] == len(undecoded_hashes)  # noqa: E501
@@ -1,13 +1,32 @@
+import itertools
 import math
+import operator
+import os
+from contextlib import suppress
+from decimal import Decimal, DecimalException
 
 import pytest
 
 from rotkehlchen.constants import ZERO
 from rotkehlchen.errors.serialization import ConversionError
-from rotkehlchen.fval import FVal
+from rotkehlchen.fval import (
+    FVAL_BACKEND_ENV,
+    FixedPointFVal,
+    FVal,
+    get_fval_backend,
+    set_fval_backend,
+)
 from rotkehlchen.utils.serialization import rlk_jsondumps
 
 
+@pytest.fixture(name='fval_backend', autouse=True, params=['decimal', 'fixed'])
+def fixture_fval_backend(request):
+    """Run all FVal tests with both backends"""
+    set_fval_backend(request.param)
+    yield request.param
+    set_fval_backend(os.environ.get(FVAL_BACKEND_ENV, 'decimal'))
+
+
 def test_simple_arithmetic():
     a = FVal(5.21)
     b = FVal(2.12)
@@ -175,3 +194,58 @@ def test_calculations_with_large_values():
     assert FVal(
         115792089237316195423570985008687907853269984665640564039457584007913129639936,
     ) + 1 == FVal(115792089237316195423570985008687907853269984665640564039457584007913129639937)
+
+
+def test_backend_selection(fval_backend):
+    assert get_fval_backend() == fval_backend
+    value = FVal('1.5')
+    assert isinstance(value, FVal)
+    assert isinstance(value, FixedPointFVal) is (fval_backend == 'fixed')
+    assert isinstance(value + value, FixedPointFVal) is (fval_backend == 'fixed')
+    with pytest.raises(ValueError):
+        set_fval_backend('float')
+
+
+def test_fixed_point_same_as_decimal():
+    """Test that the fixed point backend gives exactly the same results as Decimal,
+    including the decimals kept in the string representation, for values that fit in fixed
+    point, values that don't and operations that move values between the two"""
+    values = [
+        '0', '-0', '0.00', '1', '-1', '1.50', '-2.25', '0.1', '3.000000000000000001',
+        '123456789.123456789012345678', '-0.000000000000000001', '1E-20', '1E+3',
+        '2.5E+76', str(2 ** 256 - 1), str(10 ** 80), '0.333333333333333333333333333',
+    ]
+    binary_operations = [operator.add, operator.sub, operator.mul, operator.truediv, operator.floordiv, operator.mod]  # noqa: E501
+    comparisons = [operator.lt, operator.le, operator.gt, operator.ge, operator.eq]
+    for a, b in itertools.product(values, repeat=2):
+        fixed_a, fixed_b, decimal_a, decimal_b = FixedPointFVal(a), FixedPointFVal(b), Decimal(a), Decimal(b)  # noqa: E501
+        assert str(fixed_a) == f'{decimal_a:f}'
+        assert float(fixed_a) == float(decimal_a)
+        assert hash(fixed_a) == hash(decimal_a)
+        assert str(-fixed_a) == f'{-decimal_a:f}'
+        assert str(abs(fixed_a)) == f'{decimal_a.copy_abs():f}'
+        for comparison in comparisons:
+            assert comparison(fixed_a, fixed_b) == comparison(decimal_a, decimal_b), f'{comparison} {a} {b}'  # noqa: E501
+        for int_b in (0, 3, -7, 10 ** 80):
+            assert str(fixed_a + int_b) == f'{decimal_a + int_b:f}'
+            assert str(fixed_a * int_b) == f'{decimal_a * int_b:f}'
+            assert (fixed_a < int_b) == (decimal_a < int_b)
+            assert (fixed_a == int_b) == (decimal_a == int_b)
+
+        for operation in binary_operations:
+            try:
+                decimal_result = operation(decimal_a, decimal_b)
+            except DecimalException:  # division by zero or a quotient that doesn't fit
+                with pytest.raises(DecimalException):
+                    operation(fixed_a, fixed_b)
+                continue
+
+            result = operation(fixed_a, fixed_b)
+            assert str(result) == f'{decimal_result:f}', f'{operation} {a} {b}'
+            with suppress(DecimalException):  # results can be used in operations again
+                assert str(operation(result, fixed_a)) == f'{operation(decimal_result, decimal_a):f}'  # noqa: E501
+
+    # values that would overflow the Decimal precision are rounded like Decimal does
+    big = FixedPointFVal(10 ** 77 * 9)
+    assert str(big + big) == f'{Decimal(10 ** 77 * 9) + Decimal(10 ** 77 * 9):f}'
+    assert str(big * FixedPointFVal('1.5')) == f'{Decimal(10 ** 77 * 9) * Decimal("1.5"):f}'
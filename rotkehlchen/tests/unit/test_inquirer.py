@@ -347,6 +347,44 @@ def test_find_usd_price_via_second_oracle(inquirer):
         assert oracle_instance.query_current_price.call_count == 1
 
 
+@pytest.mark.parametrize('use_clean_caching_directory', [True])
+@pytest.mark.parametrize('should_mock_current_price_queries', [False])
+def test_find_usd_prices(inquirer, globaldb):
+    """Test that each oracle is queried once for all the assets whose price was not
+    found by the previous oracles and that assets with special handling or a manual
+    price are not sent to the oracles"""
+    inquirer._oracle_instances = [MagicMock() for _ in inquirer._oracles]
+    for oracle_instance in inquirer._oracle_instances:
+        oracle_instance.rate_limited_in_last.return_value = False
+        oracle_instance.query_multiple_current_prices.return_value = {}
+    btc_price, eth_price, link_price = Price(FVal('30000')), Price(FVal('2000')), Price(FVal('7'))
+    inquirer._oracle_instances[0].query_multiple_current_prices.return_value = {A_BTC: btc_price}
+    inquirer._oracle_instances[1].query_multiple_current_prices.return_value = {A_ETH: eth_price}
+    globaldb.add_manual_latest_price(from_asset=A_LINK, to_asset=A_USD, price=link_price)
+
+    prices = inquirer.find_usd_prices([A_BTC, A_ETH, A_1INCH, A_KFEE, A_LINK, A_USD, A_BTC])
+    assert prices == {
+        A_BTC: btc_price,
+        A_ETH: eth_price,
+        A_1INCH: ZERO_PRICE,
+        A_KFEE: Price(FVal('0.01')),
+        A_LINK: link_price,
+        A_USD: Price(FVal(1)),
+    }
+    queried_assets = [
+        call.kwargs['from_assets']
+        for oracle_instance in inquirer._oracle_instances
+        for call in oracle_instance.query_multiple_current_prices.call_args_list
+    ]
+    assert queried_assets == [[A_BTC, A_ETH, A_1INCH], [A_ETH, A_1INCH], [A_1INCH], [A_1INCH], [A_1INCH]]  # noqa: E501
+    for oracle_instance in inquirer._oracle_instances:
+        assert oracle_instance.query_current_price.call_count == 0
+
+    # the prices found are cached and not queried again
+    assert inquirer.find_usd_prices([A_BTC, A_ETH]) == {A_BTC: btc_price, A_ETH: eth_price}
+    assert inquirer._oracle_instances[0].query_multiple_current_prices.call_count == 1
+
+
 @pytest.mark.parametrize('use_clean_caching_directory', [True])
 @pytest.mark.parametrize('should_mock_current_price_queries', [False])
 def test_find_usd_price_manual_prices_preference(inquirer, globaldb):
@@ -0,0 +1,157 @@
+import time
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from rotkehlchen.tests.utils.api import api_url_for, assert_proper_sync_response_with_result
+from rotkehlchen.utils.rate_limit import (
+    MIN_RATE,
+    RATE_INCREASE,
+    HostRateLimiter,
+    RateLimitedError,
+    RateLimitedSession,
+    RateLimiters,
+)
+
+if TYPE_CHECKING:
+    from rotkehlchen.api.server import APIServer
+
+
+def make_response(status_code: int, headers: dict[str, str] | None = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return response
+
+
+def test_host_rate_limiter_aimd() -> None:
+    """Test that a host is not limited until it throttles a request and that then its rate
+    is decreased multiplicatively on throttling and increased additively on success"""
+    limiter = HostRateLimiter(host='test.rotki.com', api_key=None)
+    with patch('gevent.sleep') as sleep_mock:
+        for _ in range(10):
+            limiter.acquire()
+            limiter.on_response(make_response(200))
+    assert sleep_mock.call_count == 0
+    assert limiter.rate is None
+
+    limiter.on_response(make_response(429))
+    assert limiter.rate == 0.5  # half of the 10 requests in the 10 seconds window
+    assert limiter.throttled == 1
+    limiter.on_response(make_response(200))
+    assert limiter.rate == 0.5 + RATE_INCREASE
+    limiter.on_response(make_response(429))
+    limiter.on_response(make_response(429))
+    limiter.on_response(make_response(429))
+    assert limiter.rate == MIN_RATE
+
+    with patch('gevent.sleep', side_effect=lambda seconds: setattr(limiter, 'tokens', 1)) as sleep_mock:  # noqa: E501
+        limiter.acquire()  # waits for a token since the last 429 took them all
+    assert sleep_mock.call_count == 1
+    assert sleep_mock.call_args.args[0] == pytest.approx(1 / MIN_RATE, rel=0.01)
+
+    serialized = limiter.serialize()
+    assert serialized['rate'] == MIN_RATE
+    assert serialized['requests'] == 11
+    assert serialized['throttled'] == 4
+    assert serialized['waiting'] == 0
+
+
+def test_host_rate_limiter_headers() -> None:
+    """Test that the Retry-After and rate limit budget headers block the host"""
+    limiter = HostRateLimiter(host='test.rotki.com', api_key=None)
+    limiter.on_response(make_response(200, {'X-RateLimit-Remaining': '5', 'X-RateLimit-Reset': '3000'}))  # noqa: E501
+    assert limiter.remaining == 5
+    assert limiter.serialize()['blocked_for'] == 0
+
+    limiter.on_response(make_response(429, {'Retry-After': '3000'}))
+    with patch('gevent.sleep') as sleep_mock, pytest.raises(RateLimitedError):
+        limiter.acquire()
+    assert sleep_mock.call_count == 0
+    assert limiter.waiting == 0
+
+    limiter = HostRateLimiter(host='test.rotki.com', api_key=None)
+    limiter.on_response(make_response(200, {
+        'RateLimit-Remaining': '0',
+        'RateLimit-Reset': str(int(time.time()) + 2),  # a timestamp instead of seconds
+    }))
+    assert limiter.remaining == 0
+    assert 0 < limiter.serialize()['blocked_for'] <= 2
+    with patch('gevent.sleep', side_effect=lambda seconds: setattr(limiter, 'blocked_until', 0)) as sleep_mock:  # noqa: E501
+        limiter.acquire()
+    assert sleep_mock.call_count == 1
+    assert limiter.rate is None  # the host did not throttle any request
+
+
+def test_rate_limited_session() -> None:
+    """Test that sessions share the limiter of a host per API key"""
+    api_key = 'key1'
+    sessions = [
+        RateLimitedSession(api_key_getter=lambda: api_key),
+        RateLimitedSession(api_key_getter=lambda: api_key),
+        RateLimitedSession(),
+    ]
+    with patch.object(
+        target=requests.adapters.HTTPAdapter,
+        attribute='send',
+        side_effect=lambda *args, **kwargs: make_response(200, {'X-RateLimit-Remaining': '7'}),
+    ):
+        for session in sessions:
+            session.get('https://ratelimit.rotki.com/test')
+
+        api_key = 'key2'  # changing the key at runtime uses the new key's limiter
+        sessions[0].get('https://ratelimit.rotki.com/test')
+
+    limiters = [x for x in RateLimiters().serialize() if x['host'] == 'ratelimit.rotki.com']
+    assert limiters == [{
+        'host': 'ratelimit.rotki.com',
+        'has_api_key': False,
+        'rate': None,
+        'tokens': None,
+        'remaining': 7,
+        'blocked_for': 0,
+        'waiting': 0,
+        'requests': 1,
+        'throttled': 0,
+    }, {
+        'host': 'ratelimit.rotki.com',
+        'has_api_key': True,
+        'rate': None,
+        'tokens': None,
+        'remaining': 7,
+        'blocked_for': 0,
+        'waiting': 0,
+        'requests': 2,
+        'throttled': 0,
+    }, {
+        'host': 'ratelimit.rotki.com',
+        'has_api_key': True,
+        'rate': None,
+        'tokens': None,
+        'remaining': 7,
+        'blocked_for': 0,
+        'waiting': 0,
+        'requests': 1,
+        'throttled': 0,
+    }]
+
+
+def test_reset_rate_limiters() -> None:
+    """Test that resetting the rate limiters drops the ones learned so far"""
+    RateLimiters().get(host='reset.rotki.com', api_key='key').on_response(make_response(429))
+    assert 'reset.rotki.com' in [x['host'] for x in RateLimiters().serialize()]
+    RateLimiters().reset()
+    assert RateLimiters().serialize() == []
+    assert RateLimiters().get(host='reset.rotki.com', api_key='key').rate is None
+
+
+def test_query_rate_limits(rotkehlchen_api_server: 'APIServer') -> None:
+    limiter = RateLimiters().get(host='api.ratelimit.rotki.com', api_key=None)
+    limiter.on_response(make_response(429))
+    response = requests.get(api_url_for(rotkehlchen_api_server, 'ratelimitsresource'))
+    result = assert_proper_sync_response_with_result(response)
+    assert {'host': 'api.ratelimit.rotki.com', 'throttled': 1} in [
+        {'host': x['host'], 'throttled': x['throttled']} for x in result
+    ]
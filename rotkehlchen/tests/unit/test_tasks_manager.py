@@ -1,9 +1,11 @@
 import datetime
+from collections.abc import Callable
 from typing import TYPE_CHECKING, Any, cast
 from unittest.mock import MagicMock, patch
 
 import gevent
 import pytest
+import requests
 
 from rotkehlchen.accounting.structures.balance import Balance
 from rotkehlchen.assets.asset import EvmToken, UnderlyingToken
@@ -31,8 +33,10 @@ from rotkehlchen.premium.premium import Premium, PremiumCredentials, Subscriptio
 from rotkehlchen.serialization.deserialize import deserialize_timestamp
 from rotkehlchen.tasks.calendar import ENS_CALENDAR_COLOR
 from rotkehlchen.tasks.manager import PREMIUM_STATUS_CHECK, TaskManager
+from rotkehlchen.tasks.scheduling import TaskPriority, TaskStats
 from rotkehlchen.tasks.utils import should_run_periodic_task
 from rotkehlchen.tests.fixtures.websockets import WebsocketReader
+from rotkehlchen.tests.utils.api import api_url_for, assert_proper_sync_response_with_result
 from rotkehlchen.tests.utils.ethereum import (
     TEST_ADDR1,
     TEST_ADDR2,
@@ -442,6 +446,62 @@ def test_try_start_same_task(rotkehlchen_api_server):
         }
 
 
+@pytest.mark.parametrize('max_tasks_num', [1])
+def test_tasks_scheduled_by_virtual_time(task_manager: TaskManager) -> None:
+    """Check that tasks are considered in the order of their virtual time so that a task
+    that did not get a free slot runs next, and that the task statistics are kept"""
+    calls = []
+
+    def make_task(name: str) -> Callable[[], list[gevent.Greenlet]]:
+        def task() -> list[gevent.Greenlet]:
+            calls.append(name)
+            return [task_manager.greenlet_manager.spawn_and_track(
+                after_seconds=None,
+                task_name=name,
+                exception_is_error=True,
+                method=gevent.sleep,
+                seconds=0.1,
+            )]
+
+        task.__name__ = name
+        return task
+
+    task_manager.potential_tasks = [make_task('_maybe_run_a'), make_task('_maybe_run_b')]
+    task_manager.schedule()
+    assert len(calls) == 1, 'only one task slot is available'
+    stats = task_manager.get_tasks_stats()
+    assert stats['running_tasks_num'] == 1
+    assert [(x['name'], x['status'], x['runs']) for x in stats['tasks']] == [
+        ({'_maybe_run_a': 'run_b', '_maybe_run_b': 'run_a'}[calls[0]], 'waiting', 0),
+        (calls[0].removeprefix('_maybe_'), 'running', 1),
+    ]
+
+    for _ in range(2):  # the task that waited runs next and then none is running
+        gevent.joinall([x for greenlets in task_manager.running_greenlets.values() for x in greenlets])  # noqa: E501
+        task_manager.schedule()
+
+    assert sorted(calls[:2]) == ['_maybe_run_a', '_maybe_run_b']
+    for task_stats in task_manager.get_tasks_stats()['tasks'][:2]:
+        assert task_stats['priority'] == 'normal'
+        assert task_stats['runs'] >= 1
+        assert task_stats['last_duration'] >= 0.1
+        assert task_stats['average_duration'] >= 0.1
+
+    assert TaskStats(name='test', priority=TaskPriority.HIGH).weight() == 4
+    assert TaskStats(name='test', priority=TaskPriority.LOW, backlog=999).weight() == 4
+
+
+@pytest.mark.parametrize('max_tasks_num', [5])
+def test_query_background_tasks_stats(rotkehlchen_api_server: 'APIServer') -> None:
+    response = requests.get(api_url_for(rotkehlchen_api_server, 'backgroundtasksresource'))
+    result = assert_proper_sync_response_with_result(response)
+    assert result['max_tasks_num'] == 5
+    tasks = {x['name']: x for x in result['tasks']}
+    assert tasks['decode_evm_transactions']['priority'] == 'high'
+    assert tasks['update_owned_assets']['priority'] == 'low'
+    assert tasks['query_missing_prices']['priority'] == 'normal'
+
+
 def test_should_run_periodic_task(database: 'DBHandler') -> None:
     """
     Check that should_run_periodic_task correctly reads the key_value_cache when they have been
@@ -4,6 +4,7 @@ from datetime import datetime
 from json.decoder import JSONDecodeError
 from unittest.mock import patch
 
+import gevent
 import pytest
 from eth_typing import HexAddress, HexStr
 from eth_utils import to_checksum_address
@@ -27,7 +28,12 @@ from rotkehlchen.utils.misc import (
     pairwise_longest,
     timestamp_to_date,
 )
-from rotkehlchen.utils.mixins.cacheable import CacheableMixIn, cache_response_timewise
+from rotkehlchen.utils.mixins.cacheable import (
+    CACHE_MAX_STALE_FOR_SECS,
+    CacheableMixIn,
+    cache_response_timewise,
+)
+from rotkehlchen.utils.mixins.lockable import LockableQueryMixIn, protect_with_lock
 from rotkehlchen.utils.serialization import jsonloads_dict, jsonloads_list
 from rotkehlchen.utils.version_check import get_current_version
 
@@ -199,13 +205,16 @@ def test_is_production():
         assert is_production() is False  # even if full tag, when not frozen not production
 
 
-class Foo(CacheableMixIn):
+class Foo(CacheableMixIn, LockableQueryMixIn):
     def __init__(self):
         super().__init__()
 
         self.do_sum_call_count = 0
         self.do_something_call_count = 0
         self.do_something_arguments_dont_matter_count = 0
+        self.do_slow_count_call_count = 0
+        self.do_slow_division_call_count = 0
+        self.do_locked_count_call_count = 0
 
     @cache_response_timewise()
     def do_sum(self, arg1, arg2, **kwargs):  # pylint: disable=unused-argument
@@ -222,6 +231,24 @@ class Foo(CacheableMixIn):
         self.do_something_arguments_dont_matter_count += 1
         return arg1 + arg2
 
+    @cache_response_timewise(ttl_secs=10, stale_while_revalidate=True)
+    def do_slow_count(self, **kwargs):  # pylint: disable=unused-argument
+        self.do_slow_count_call_count += 1
+        gevent.sleep(0.1)
+        return self.do_slow_count_call_count
+
+    @cache_response_timewise()
+    def do_slow_division(self, arg1, arg2, **kwargs):  # pylint: disable=unused-argument
+        self.do_slow_division_call_count += 1
+        gevent.sleep(0.1)
+        return arg1 / arg2
+
+    @protect_with_lock()
+    @cache_response_timewise(ttl_secs=10, stale_while_revalidate=True)
+    def do_locked_count(self, **kwargs):  # pylint: disable=unused-argument
+        self.do_locked_count_call_count += 1
+        return self.do_locked_count_call_count
+
 
 def test_cache_response_timewise():
     """Test that cached value is called and not the function again"""
@@ -271,6 +298,107 @@ def test_cache_response_timewise_with_arguments_matter_false():
     assert instance.do_something_arguments_dont_matter_count == 2
 
 
+def test_cache_response_timewise_stale_while_revalidate():
+    """Test that a function's own ttl is used and that when it expires the stale result
+    is returned while a single greenlet refreshes it in the background"""
+    instance = Foo()
+    now = 1700000000
+    with patch('rotkehlchen.utils.mixins.cacheable.ts_now', side_effect=lambda: now):
+        assert instance.do_slow_count() == 1
+        now += 9
+        assert instance.do_slow_count() == 1
+        now += 1  # expired after the function's 10 seconds instead of the default ttl
+        assert instance.do_slow_count() == 1
+        assert instance.do_slow_count() == 1
+        assert [x.name for x in instance.pending_queries.values()] == ['do_slow_count']
+        assert instance.serialize_cache_stats()[0]['refreshing'] is True
+        gevent.joinall([x.greenlet for x in instance.pending_queries.values()])
+        assert instance.do_slow_count() == 2
+        assert instance.do_slow_count_call_count == 2
+        assert instance.serialize_cache_stats() == [{
+            'name': 'do_slow_count',
+            'ttl': 10,
+            'stale_while_revalidate': True,
+            'max_stale': CACHE_MAX_STALE_FOR_SECS,
+            'entries': 1,
+            'age': 0,
+            'refreshing': False,
+            'hits': 2,
+            'stale_hits': 2,
+            'misses': 1,
+            'coalesced': 0,
+            'failed_refreshes': 0,
+            'hit_rate': 0.8,
+        }]
+
+        now += 10 + CACHE_MAX_STALE_FOR_SECS  # expired too long ago to be returned
+        assert instance.do_slow_count() == 3
+        assert instance.pending_queries == {}
+
+        instance.cache_ttl_secs = 0  # disabling the cache also disables serving stale results
+        assert instance.do_slow_count() == 4
+
+
+def test_cache_response_timewise_single_flight():
+    """Test that concurrent callers that miss the cache wait for the same query"""
+    instance = Foo()
+    greenlets = [gevent.spawn(instance.do_slow_division, 4, 2) for _ in range(3)]
+    gevent.joinall(greenlets)
+    assert [x.get() for x in greenlets] == [2, 2, 2]
+    assert instance.do_slow_division_call_count == 1
+    assert instance.cache_stats['do_slow_division'].coalesced == 2
+
+    greenlets = [gevent.spawn(instance.do_slow_division, 4, 0) for _ in range(2)]
+    gevent.joinall(greenlets)
+    for greenlet in greenlets:  # the error of the query is raised to all the callers
+        with pytest.raises(ZeroDivisionError):
+            greenlet.get()
+    assert instance.do_slow_division_call_count == 2
+    assert instance.pending_queries == {}
+
+
+def test_cache_response_timewise_refresh_with_lock():
+    """Test that the background refresh of an expired result waits for the lock of the
+    function, that flushing the cache or logging out kills it and that a query that misses
+    the cache takes it over instead of waiting for it while holding the lock"""
+    instance = Foo()
+    now = 1700000000
+    with patch('rotkehlchen.utils.mixins.cacheable.ts_now', side_effect=lambda: now):
+        assert instance.do_locked_count() == 1
+        now += 10
+        assert instance.do_locked_count() == 1
+        with next(iter(instance.query_locks_map.values())):
+            gevent.sleep(0.1)
+            assert instance.do_locked_count_call_count == 1  # the refresh waits for the lock
+        gevent.joinall(list(instance.cache_refreshes.values()))
+        assert instance.do_locked_count_call_count == 2
+        assert instance.do_locked_count() == 2
+        assert instance.cache_refreshes == instance.pending_queries == {}
+
+        now += 10
+        assert instance.do_locked_count() == 2
+        with next(iter(instance.query_locks_map.values())):
+            gevent.sleep(0.1)
+            instance.flush_cache('do_locked_count')
+            assert instance.cache_refreshes == instance.pending_queries == {}
+
+        now += 10
+        assert instance.do_locked_count() == 3  # flushed, so queried again
+        now += 10
+        assert instance.do_locked_count() == 3
+        instance.kill_cache_refreshes()
+        assert instance.cache_refreshes == instance.pending_queries == {}
+        assert instance.do_locked_count_call_count == 3
+
+        assert instance.do_locked_count() == 3
+        assert len(instance.cache_refreshes) == 1
+        instance.cache_ttl_secs = 0  # the refresh can't run until this query releases the lock
+        with gevent.Timeout(5):
+            assert instance.do_locked_count() == 4
+        assert instance.cache_refreshes == instance.pending_queries == {}
+        assert instance.do_locked_count_call_count == 4
+
+
 def test_convert_to_int():
     assert convert_to_int('5') == 5
     assert convert_to_int('37451082560000003241000000000003221111111111') == 37451082560000003241000000000003221111111111  # noqa: E501
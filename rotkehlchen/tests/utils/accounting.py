@@ -103,7 +103,7 @@ def _get_pnl_report_after_processing(
     dbpnl = DBAccountingReports(database)
     report = dbpnl.get_reports(report_id=report_id, with_limit=False)[0][0]
     events = dbpnl.get_report_data(
-        filter_=ReportDataFilterQuery.make(report_id=1),
+        filter_=ReportDataFilterQuery.make(report_id=report_id),
         with_limit=False,
     )[0]
     return report, events
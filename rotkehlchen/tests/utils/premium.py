@@ -22,6 +22,13 @@ VALID_PREMIUM_SECRET = (
 )
 
 
+def get_db_backup_hash(rotkehlchen_instance: Rotkehlchen) -> str:
+    """Returns the hash of the DB backup closing the file of its encrypted data"""
+    encrypted_file, our_hash = rotkehlchen_instance.data.compress_and_encrypt_db()
+    with encrypted_file:
+        return our_hash
+
+
 def mock_query_last_metadata(last_modify_ts, data_hash, data_size):
     def do_mock_query_last_metadata(url, data, timeout):  # pylint: disable=unused-argument
         assert len(data) == 1
@@ -155,7 +162,7 @@ def setup_starting_environment(
         our_last_write_ts = rotkehlchen_instance.data.db.get_setting(cursor, name='last_write_ts')
         assert rotkehlchen_instance.data.db.get_setting(cursor, name='main_currency') == DEFAULT_TESTS_MAIN_CURRENCY  # noqa: E501
 
-    _, our_hash = rotkehlchen_instance.data.compress_and_encrypt_db()
+    our_hash = get_db_backup_hash(rotkehlchen_instance)
 
     if same_hash_with_remote:
         remote_hash = our_hash
@@ -39,6 +39,9 @@ class LRUCacheWithRemove(Generic[KT, VT]):
     def __contains__(self, key: KT) -> bool:
         return key in self.cache
 
+    def __len__(self) -> int:
+        return len(self.cache)
+
 
 class DefaultLRUCache(LRUCacheWithRemove[KT, VT]):
     """LRU cache that behaves like defaultdict when accessing objects"""
@@ -1,8 +1,14 @@
+import logging
 from collections.abc import Callable
 from copy import deepcopy
+from dataclasses import dataclass
 from functools import wraps
 from typing import TYPE_CHECKING, Any, NamedTuple
 
+import gevent
+from gevent.event import AsyncResult
+
+from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.utils.misc import ts_now
 
 from .common import function_sig_key
@@ -10,17 +16,47 @@ from .common import function_sig_key
 if TYPE_CHECKING:
     from rotkehlchen.types import Timestamp
 
+logger = logging.getLogger(__name__)
+log = RotkehlchenLogsAdapter(logger)
+
 
 class ResultCache(NamedTuple):
     """Represents a time-cached result of some API query"""
     result: dict
     timestamp: 'Timestamp'
+    name: str  # name of the cached function
+
+
+class PendingQuery(NamedTuple):
+    """A query of a cached function that is running right now"""
+    name: str
+    greenlet: gevent.Greenlet
+    result: AsyncResult
+    # True for a background refresh until its greenlet calls the function
+    refresh: bool = False
+
+
+@dataclass(init=True, repr=True, eq=False, order=False, unsafe_hash=False, frozen=False)
+class CacheStats:
+    """Settings and counters of the cache of a function of an object"""
+    ttl_secs: int | None
+    stale_while_revalidate: bool
+    max_stale_secs: int
+    hits: int = 0
+    # hits of expired results that were returned while they were refreshed in the background
+    stale_hits: int = 0
+    misses: int = 0
+    # misses that waited for the result of the same query that was already running
+    coalesced: int = 0
+    failed_refreshes: int = 0
 
 
 # Seconds for which cached api queries will be cached
-# By default 10 minutes.
-# TODO: Make configurable!
+# By default 10 minutes. Functions can set their own with the ttl_secs of the decorator
 CACHE_RESPONSE_FOR_SECS = 600
+# Seconds after expiring for which a result can be returned while it's refreshed in the background
+# By default 1 hour. Functions can set their own with the max_stale_secs of the decorator
+CACHE_MAX_STALE_FOR_SECS = 3600
 
 
 class CacheableMixIn:
@@ -35,6 +71,10 @@ class CacheableMixIn:
         self.results_cache: dict[int, ResultCache] = {}
         # Can also be 0 which means cache is disabled.
         self.cache_ttl_secs = CACHE_RESPONSE_FOR_SECS
+        self.pending_queries: dict[int, PendingQuery] = {}
+        self.cache_stats: dict[str, CacheStats] = {}
+        # greenlets refreshing expired results in the background
+        self.cache_refreshes: dict[int, gevent.Greenlet] = {}
 
     def flush_cache(self, name: str, *args: Any, **kwargs: Any) -> None:
         cache_key = function_sig_key(
@@ -45,44 +85,200 @@ class CacheableMixIn:
             **kwargs,
         )
         self.results_cache.pop(cache_key, None)
+        # a running refresh may have queried the data before they changed
+        self._kill_cache_refresh(cache_key)
+
+    def kill_cache_refreshes(self) -> None:
+        """Kills the greenlets refreshing expired results. To be called when the object
+        is no longer used, such as when logging out"""
+        for cache_key in list(self.cache_refreshes):
+            self._kill_cache_refresh(cache_key)
+
+    def _kill_cache_refresh(self, cache_key: int) -> None:
+        if (greenlet := self.cache_refreshes.pop(cache_key, None)) is None:
+            return
+
+        greenlet.kill()
+        if (pending := self.pending_queries.get(cache_key)) is not None and pending.greenlet is greenlet:  # noqa: E501
+            # killed before calling the function. Wake up any callers waiting for it
+            del self.pending_queries[cache_key]
+            pending.result.set_exception(gevent.GreenletExit())
+
+    def cache_ttl(self, stats: CacheStats) -> int:
+        """The seconds for which the results of a function are cached. 0 if disabled"""
+        if stats.ttl_secs is None or self.cache_ttl_secs == 0:
+            return self.cache_ttl_secs
+        return stats.ttl_secs
+
+    def serialize_cache_stats(self) -> list[dict[str, Any]]:
+        """The settings, age and hit rate of the cache of each function called so far"""
+        now = ts_now()
+        result = []
+        for name, stats in self.cache_stats.items():
+            timestamps = [x.timestamp for x in self.results_cache.values() if x.name == name]
+            queries = stats.hits + stats.stale_hits + stats.misses + stats.coalesced
+            result.append({
+                'name': name,
+                'ttl': self.cache_ttl(stats),
+                'stale_while_revalidate': stats.stale_while_revalidate,
+                'max_stale': stats.max_stale_secs,
+                'entries': len(timestamps),
+                'age': now - min(timestamps) if len(timestamps) != 0 else None,
+                'refreshing': any(x.name == name for x in self.pending_queries.values()),
+                'hits': stats.hits,
+                'stale_hits': stats.stale_hits,
+                'misses': stats.misses,
+                'coalesced': stats.coalesced,
+                'failed_refreshes': stats.failed_refreshes,
+                'hit_rate': round((stats.hits + stats.stale_hits) / queries, 3) if queries != 0 else None,  # noqa: E501
+            })
+
+        return result
 
 
-def _cache_response_timewise_base(
+def _run_query(
+        wrappingobj: CacheableMixIn,
+        f: Callable,
+        name: str,
+        cache_key: int,
+        pending: PendingQuery | None,
+        *args: Any,
+        **kwargs: Any,
+) -> Any:
+    """Call the function, write the result in cache and give it to any waiting callers
+
+    pending is the registered query of the current greenlet that others wait for, if any.
+    """
+    now = ts_now()
+    try:
+        result = f(wrappingobj, *args, **kwargs)
+    except BaseException as e:  # also wake up the waiting callers if the greenlet is killed
+        if pending is not None:
+            pending.result.set_exception(e)
+        raise
+    finally:
+        if pending is not None:
+            del wrappingobj.pending_queries[cache_key]
+
+    wrappingobj.results_cache[cache_key] = ResultCache(result, now, name)
+    if pending is not None:
+        pending.result.set(result)
+    return result
+
+
+def _refresh_in_background(
+        wrappingobj: CacheableMixIn,
+        name: str,
+        cache_key: int,
+        *args: Any,
+        **kwargs: Any,
+) -> None:
+    """Spawn a greenlet that refreshes an expired cached result. Callers that miss the cache
+    while it runs wait for its result instead of querying again.
+
+    The greenlet calls the method of the object and not the function itself so that
+    it goes through the other decorators, such as protect_with_lock, like any caller.
+    """
+    def refresh() -> None:
+        try:
+            getattr(wrappingobj, name)(*args, **kwargs)
+        except Exception as e:  # pylint: disable=broad-except
+            wrappingobj.cache_stats[name].failed_refreshes += 1
+            log.error(f'Failed to refresh the cached result of {name} due to {e!s}')
+        finally:
+            wrappingobj.cache_refreshes.pop(cache_key, None)
+
+    greenlet = wrappingobj.cache_refreshes[cache_key] = gevent.Greenlet(refresh)
+    wrappingobj.pending_queries[cache_key] = PendingQuery(
+        name=name,
+        greenlet=greenlet,
+        result=AsyncResult(),
+        refresh=True,
+    )
+    greenlet.start()
+
+
+def _cached_query(
         wrappingobj: CacheableMixIn,
         f: Callable,
         arguments_matter: bool,
         forward_ignore_cache: bool,
+        ttl_secs: int | None,
+        stale_while_revalidate: bool,
+        max_stale_secs: int,
         *args: Any,
         **kwargs: Any,
-) -> tuple[bool, int, 'Timestamp', dict]:
+) -> Any:
     """Base code used in the 2 cache_response_timewise decorators"""
     if forward_ignore_cache:
         ignore_cache = kwargs.get('ignore_cache', False)
     else:
         ignore_cache = kwargs.pop('ignore_cache', False)
+    name = f.__name__
     cache_key = function_sig_key(
-        f.__name__,        # name
+        name,              # name
         arguments_matter,  # arguments_matter
         True,              # skip_ignore_cache
         *args,
         **kwargs,
     )
-    now = ts_now()
-    if ignore_cache is False and cache_key in wrappingobj.results_cache:
-        # Check the cache
-        cache_life_secs = now - wrappingobj.results_cache[cache_key].timestamp
-
-    cache_miss = (
-        ignore_cache is True or
-        cache_key not in wrappingobj.results_cache or
-        cache_life_secs >= wrappingobj.cache_ttl_secs
-    )
-    return cache_miss, cache_key, now, kwargs
+    if (stats := wrappingobj.cache_stats.get(name)) is None:
+        stats = wrappingobj.cache_stats[name] = CacheStats(
+            ttl_secs=ttl_secs,
+            stale_while_revalidate=stale_while_revalidate,
+            max_stale_secs=max_stale_secs,
+        )
+    ttl = wrappingobj.cache_ttl(stats)
+    pending = wrappingobj.pending_queries.get(cache_key)
+    if pending is not None and pending.refresh and pending.greenlet is gevent.getcurrent():
+        # the background refresh got through the outer decorators. Run the query for it
+        pending = wrappingobj.pending_queries[cache_key] = pending._replace(refresh=False)
+        return _run_query(wrappingobj, f, name, cache_key, pending, *args, **kwargs)
+
+    if ignore_cache is False:
+        if (cached := wrappingobj.results_cache.get(cache_key)) is not None:
+            if (age := ts_now() - cached.timestamp) < ttl:
+                stats.hits += 1
+                return cached.result
+
+            if stale_while_revalidate and ttl != 0 and age < ttl + max_stale_secs:
+                stats.stale_hits += 1
+                if pending is None:
+                    _refresh_in_background(wrappingobj, name, cache_key, *args, **kwargs)
+                return cached.result
+
+        if pending is not None and pending.refresh is False and pending.greenlet is not gevent.getcurrent():  # noqa: E501
+            stats.coalesced += 1
+            return pending.result.get()  # raises the error of the query if it failed
+
+    stats.misses += 1
+    if pending is None:  # let callers that miss the cache meanwhile wait for this query
+        pending = wrappingobj.pending_queries[cache_key] = PendingQuery(
+            name=name,
+            greenlet=gevent.getcurrent(),
+            result=AsyncResult(),
+        )
+    elif pending.refresh:
+        # A background refresh that has not called the function yet may be waiting for a
+        # lock that the current greenlet holds, so it's not waited for. The query is
+        # taken over from it and its callers get the result of this one.
+        pending = wrappingobj.pending_queries[cache_key] = pending._replace(
+            greenlet=gevent.getcurrent(),
+            refresh=False,
+        )
+        if (refresh := wrappingobj.cache_refreshes.pop(cache_key, None)) is not None:
+            refresh.kill()
+    else:  # ignore_cache or a recursive call of the query
+        pending = None
+    return _run_query(wrappingobj, f, name, cache_key, pending, *args, **kwargs)
 
 
 def cache_response_timewise(
         arguments_matter: bool = True,
         forward_ignore_cache: bool = False,
+        ttl_secs: int | None = None,
+        stale_while_revalidate: bool = False,
+        max_stale_secs: int = CACHE_MAX_STALE_FOR_SECS,
 ) -> Callable:
     """ This is a decorator for caching results of functions of objects.
     The objects must adhere to the CachableOject interface.
@@ -106,26 +302,31 @@ def cache_response_timewise(
 
     if forward_ignore_cache is True then if the ignore_cache argument is given it's
     forward to the decorated function instead of being silently consumed.
+
+    ttl_secs are the seconds the results are cached for. If None the object's
+    cache_ttl_secs are used. If the object's cache is disabled it's disabled for all.
+
+    If stale_while_revalidate is True then an expired result is returned right away
+    while a greenlet queries the function again in the background. Only results that
+    expired less than max_stale_secs ago are returned.
+
+    Callers that miss the cache while the same query runs wait for its result
+    instead of querying the function again.
     """
     def _cache_response_timewise(f: Callable) -> Callable:
         @wraps(f)
         def wrapper(wrappingobj: CacheableMixIn, *args: Any, **kwargs: Any) -> Any:
-            cache_miss, cache_key, now, kwargs = _cache_response_timewise_base(
+            return _cached_query(
                 wrappingobj,
                 f,
                 arguments_matter,
                 forward_ignore_cache,
+                ttl_secs,
+                stale_while_revalidate,
+                max_stale_secs,
                 *args,
                 **kwargs,
             )
-            if cache_miss:
-                # Call the function, write the result in cache and return it
-                result = f(wrappingobj, *args, **kwargs)
-                wrappingobj.results_cache[cache_key] = ResultCache(result, now)
-                return result
-
-            # else hit the cache and return it
-            return wrappingobj.results_cache[cache_key].result
 
         return wrapper
     return _cache_response_timewise
@@ -134,6 +335,9 @@ def cache_response_timewise(
 def cache_response_timewise_immutable(
         arguments_matter: bool = True,
         forward_ignore_cache: bool = False,
+        ttl_secs: int | None = None,
+        stale_while_revalidate: bool = False,
+        max_stale_secs: int = CACHE_MAX_STALE_FOR_SECS,
 ) -> Callable:
     """ Same as cache_response_timewise but resulting dict is a copy so, the cache
     itself can't be mutated.
@@ -141,21 +345,19 @@ def cache_response_timewise_immutable(
     def _cache_response_timewise_immutable(f: Callable) -> Callable:
         @wraps(f)
         def wrapper(wrappingobj: CacheableMixIn, *args: Any, **kwargs: Any) -> Any:
-            cache_miss, cache_key, now, kwargs = _cache_response_timewise_base(
+            result = _cached_query(
                 wrappingobj,
                 f,
                 arguments_matter,
                 forward_ignore_cache,
+                ttl_secs,
+                stale_while_revalidate,
+                max_stale_secs,
                 *args,
                 **kwargs,
             )
-            if cache_miss:
-                # Call the function, and write the result in cache
-                result = f(wrappingobj, *args, **kwargs)
-                wrappingobj.results_cache[cache_key] = ResultCache(result, now)
-
             # in any case return a copy of the cache to avoid potential mutation
-            return deepcopy(wrappingobj.results_cache[cache_key].result)
+            return deepcopy(result)
 
         return wrapper
     return _cache_response_timewise_immutable
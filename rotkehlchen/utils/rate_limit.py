@@ -0,0 +1,221 @@
+import logging
+import time
+from collections import deque
+from collections.abc import Callable
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+import gevent
+import requests
+
+from rotkehlchen.logging import RotkehlchenLogsAdapter
+
+logger = logging.getLogger(__name__)
+log = RotkehlchenLogsAdapter(logger)
+
+# Lowest rate in requests per second a host is throttled down to
+MIN_RATE = 0.2
+# Factor applied to the observed request rate of a host when it responds with a 429
+RATE_DECREASE_FACTOR = 0.5
+# Requests per second added to the rate of a throttled host after each successful request
+RATE_INCREASE = 0.05
+# Window in seconds over which the request rate of a host is observed
+RATE_OBSERVATION_WINDOW = 10
+# If a host asks to wait for longer than this many seconds, requests fail immediately
+MAX_RATE_LIMIT_WAIT = 60
+# Values of the rate limit reset headers above this are timestamps instead of seconds
+RESET_TIMESTAMP_THRESHOLD = 10 ** 9
+
+
+class RateLimitedError(requests.exceptions.RequestException):
+    """Raised instead of sending a request to a host that asked to not be queried
+    for longer than we are willing to wait"""
+
+
+def _parse_seconds(value: str | None, now: float) -> float | None:
+    """Parse the seconds to wait from the value of a Retry-After or rate limit reset header.
+    The value can be seconds, a unix timestamp or an HTTP date. Returns None if invalid."""
+    if value is None:
+        return None
+
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            return parsedate_to_datetime(value).timestamp() - now
+        except (TypeError, ValueError):
+            return None
+
+    if seconds > RESET_TIMESTAMP_THRESHOLD:
+        return seconds - now
+    return seconds
+
+
+class HostRateLimiter:
+    """Adaptive token bucket rate limiter of the requests to a host with an API key
+
+    Hosts are not limited until they throttle a request. Then the rate is set to a fraction
+    of the observed request rate and increases additively after each successful request
+    (AIMD). Hosts that give a Retry-After or say that the rate limit budget is exhausted
+    are not queried again until the given time.
+    """
+
+    def __init__(self, host: str, api_key: str | None) -> None:
+        self.host = host
+        self.api_key = api_key
+        self.rate: float | None = None  # requests per second. None means no limit
+        self.tokens = 1.0
+        self.last_refill = time.monotonic()
+        self.blocked_until = 0.0  # monotonic time until which requests should wait
+        self.remaining: int | None = None  # the budget left as reported by the host
+        self.waiting = 0  # number of requests waiting to be sent
+        self.requests = 0
+        self.throttled = 0
+        self.sent_times: deque[float] = deque()
+
+    def _refill(self, now: float) -> None:
+        if self.rate is not None:
+            self.tokens = min(max(1.0, self.rate), self.tokens + (now - self.last_refill) * self.rate)  # noqa: E501
+        self.last_refill = now
+
+    def _wait_time(self, now: float) -> float:
+        """Seconds to wait until a request can be sent. Takes a token if it can be sent now"""
+        if now < self.blocked_until:
+            return self.blocked_until - now
+
+        if self.rate is None:
+            return 0
+
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+
+        return (1 - self.tokens) / self.rate
+
+    def acquire(self) -> None:
+        """Wait until a request can be sent to the host
+
+        May raise:
+        - RateLimitedError if the host asked to wait for more than MAX_RATE_LIMIT_WAIT
+        """
+        self.waiting += 1
+        try:
+            while (wait := self._wait_time(now := time.monotonic())) > 0:
+                if wait > MAX_RATE_LIMIT_WAIT:
+                    raise RateLimitedError(
+                        f'{self.host} is rate limited for the next {int(wait)} seconds',
+                    )
+                gevent.sleep(wait)
+        finally:
+            self.waiting -= 1
+
+        self.requests += 1
+        self.sent_times.append(now)
+        while self.sent_times[0] < now - RATE_OBSERVATION_WINDOW:
+            self.sent_times.popleft()
+
+    def on_response(self, response: requests.Response) -> None:
+        """Adapt the rate and budget to the status code and the rate limit headers"""
+        now = time.monotonic()
+        headers = response.headers
+        if (remaining := headers.get('X-RateLimit-Remaining', headers.get('RateLimit-Remaining'))) is not None:  # noqa: E501
+            try:
+                self.remaining = int(float(remaining))
+            except ValueError:
+                self.remaining = None
+
+        wait = _parse_seconds(value=headers.get('Retry-After'), now=time.time())
+        if wait is None and self.remaining == 0:
+            wait = _parse_seconds(
+                value=headers.get('X-RateLimit-Reset', headers.get('RateLimit-Reset')),
+                now=time.time(),
+            )
+        if wait is not None and wait > 0:
+            self.blocked_until = max(self.blocked_until, now + wait)
+
+        if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+            self.throttled += 1
+            observed_rate = len(self.sent_times) / RATE_OBSERVATION_WINDOW
+            self.rate = max(MIN_RATE, min(self.rate or observed_rate, observed_rate) * RATE_DECREASE_FACTOR)  # noqa: E501
+            self.tokens, self.last_refill = 0, now
+            log.debug(f'{self.host} throttled a request. Rate limiting it to {self.rate:.2f} requests per second')  # noqa: E501
+        elif self.rate is not None and response.ok:
+            self.rate += RATE_INCREASE
+
+    def serialize(self) -> dict[str, Any]:
+        now = time.monotonic()
+        self._refill(now)
+        return {
+            'host': self.host,
+            'has_api_key': self.api_key is not None,
+            'rate': None if self.rate is None else round(self.rate, 3),
+            'tokens': None if self.rate is None else round(self.tokens, 3),
+            'remaining': self.remaining,
+            'blocked_for': max(0, round(self.blocked_until - now, 3)),
+            'waiting': self.waiting,
+            'requests': self.requests,
+            'throttled': self.throttled,
+        }
+
+
+class RateLimiters:
+    """Singleton registry of the rate limiters of all the hosts queried by rotki so that
+    all the clients and greenlets that query a host with the same API key share its limits
+    """
+    __instance: Optional['RateLimiters'] = None
+    _limiters: dict[tuple[str, str | None], HostRateLimiter]
+
+    def __new__(cls) -> 'RateLimiters':
+        if RateLimiters.__instance is not None:
+            return RateLimiters.__instance
+
+        RateLimiters.__instance = super().__new__(cls)
+        RateLimiters.__instance._limiters = {}
+        return RateLimiters.__instance
+
+    def get(self, host: str, api_key: str | None) -> HostRateLimiter:
+        if (limiter := self._limiters.get((host, api_key))) is None:
+            limiter = self._limiters[(host, api_key)] = HostRateLimiter(host=host, api_key=api_key)
+        return limiter
+
+    def reset(self) -> None:
+        """Drop all the limiters, so that nothing learned with the API keys of a user
+        is kept after they log out"""
+        self._limiters = {}
+
+    def serialize(self) -> list[dict[str, Any]]:
+        return [
+            limiter.serialize() for _, limiter in sorted(
+                self._limiters.items(),
+                key=lambda x: (x[0][0], x[0][1] or ''),
+            )
+        ]
+
+
+class RateLimitedSession(requests.Session):
+    """A requests session that paces the requests to each host with the shared rate limiters
+
+    The api_key_getter returns the API key the requests are made with, so that hosts that
+    limit per key have a limiter per key. It's a callable since keys can change at runtime.
+    """
+
+    def __init__(self, api_key_getter: Callable[[], str | None] | None = None) -> None:
+        super().__init__()
+        self.api_key_getter = api_key_getter
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        """May raise:
+        - RateLimitedError if the host asked to wait for more than MAX_RATE_LIMIT_WAIT
+        - requests.exceptions.RequestException for any error of the request
+        """
+        limiter = RateLimiters().get(
+            host=urlparse(request.url or '').netloc,
+            api_key=None if self.api_key_getter is None else self.api_key_getter(),
+        )
+        limiter.acquire()
+        response = super().send(request, **kwargs)
+        limiter.on_response(response)
+        return response
@@ -0,0 +1,126 @@
+"""
+Benchmark of checking the tracked addresses against airdrop CSV files. It compares reading
+every CSV row and testing it against the addresses, which is what check_airdrops used to
+do, against looking up the addresses in the address index built once per CSV file. For
+both it prints the time and the peak of the memory allocated while checking all airdrops.
+
+Run from the root of the repo with: python -m tools.benchmarks.airdrop_index
+"""
+from gevent import monkey  # isort:skip
+monkey.patch_all()  # isort:skip
+
+import argparse
+import csv
+import random
+import tempfile
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+from rotkehlchen.chain.ethereum.airdrop_index import AddressIndex, address_to_key
+from rotkehlchen.chain.ethereum.airdrops import _build_csv_airdrop_index
+from rotkehlchen.chain.evm.types import string_to_evm_address
+from rotkehlchen.logging import TRACE, add_logging_level
+
+add_logging_level('TRACE', TRACE)
+
+p = argparse.ArgumentParser()
+p.add_argument(
+    '--airdrops',
+    help='Number of airdrop CSV files',
+    type=int,
+    default=40,
+)
+p.add_argument(
+    '--rows',
+    help='Number of rows of each airdrop CSV file',
+    type=int,
+    default=250_000,
+)
+p.add_argument(
+    '--addresses',
+    help='Number of tracked addresses',
+    type=int,
+    default=50,
+)
+args = p.parse_args()
+
+
+def make_address() -> str:
+    return f'0x{random.randbytes(20).hex()}'
+
+
+def write_csvs(data_dir: Path, addresses: list[str]) -> list[Path]:
+    """Write the airdrop CSVs, each with a few of the tracked addresses"""
+    paths = []
+    for airdrop in range(args.airdrops):
+        rows = [(make_address(), str(random.randint(1, 10**6))) for _ in range(args.rows)]
+        rows.extend((address, '100') for address in random.sample(addresses, k=3))
+        random.shuffle(rows)
+        paths.append(path := data_dir / f'airdrop_{airdrop}.csv')
+        with open(path, 'w', encoding='utf8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(('address', 'amount'))
+            writer.writerows(rows)
+
+    return paths
+
+
+def scan_csvs(paths: list[Path], addresses: list[str]) -> int:
+    found = 0
+    for path in paths:
+        with open(path, encoding='utf8') as f:
+            iterator = csv.reader(f)
+            next(iterator)
+            for addr, _ in iterator:
+                if addr in addresses:
+                    found += 1
+
+    return found
+
+
+def lookup_indexes(paths: list[Path], addresses: list[str]) -> int:
+    found = 0
+    keys = [key for address in addresses if (key := address_to_key(address)) is not None]
+    for path in paths:
+        with AddressIndex(path.with_suffix('.idx')) as index:
+            found += sum(index.get(key) is not None for key in keys)
+
+    return found
+
+
+def measure(check: Callable[[], int]) -> tuple[float, int, float]:
+    """Returns the seconds, found addresses and peak MB allocated by the check"""
+    tracemalloc.start()
+    found = 0
+
+    def run() -> None:
+        nonlocal found
+        found = check()
+
+    seconds = timeit.timeit(run, number=1)
+    peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    return seconds, found, peak
+
+
+def main() -> None:
+    random.seed(42)
+    addresses = [string_to_evm_address(make_address()) for _ in range(args.addresses)]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        print(f'Writing {args.airdrops} airdrop CSVs of {args.rows} rows')
+        paths = write_csvs(Path(tmpdir), addresses)
+        build_seconds = timeit.timeit(lambda: [_build_csv_airdrop_index(x) for x in paths], number=1)  # noqa: E501
+        print(f'Built the indexes in {build_seconds:.2f} seconds')
+        print(f'{"check":>8} {"seconds":>9} {"found":>6} {"peak MB":>8}')
+        for name, check in (
+            ('csv scan', lambda: scan_csvs(paths, addresses)),
+            ('index', lambda: lookup_indexes(paths, addresses)),
+        ):
+            seconds, found, peak = measure(check)
+            print(f'{name:>8} {seconds:>9.4f} {found:>6} {peak:>8.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark of importing a generated Binance CSV export. It reports the imported rows per
+second and the peak RSS of the process, which should stay bounded however big the file
+is since the rows are streamed and the entries are written in batches.
+
+The generated file has deposits and trades between two assets on alternating timestamps
+so that both the single and the multiple row entries of the importer are exercised.
+Running with --materialize reads the whole file into memory first like the importer used
+to, to compare the peak RSS of the two.
+
+Run from the root of the repo with: python -m tools.benchmarks.csv_import
+"""
+from gevent import monkey  # isort:skip
+monkey.patch_all()  # isort:skip
+
+import argparse
+import csv
+import resource
+import tempfile
+import timeit
+from datetime import UTC, datetime
+from pathlib import Path
+from unittest.mock import patch
+
+from rotkehlchen.data_import.importers.binance import BinanceImporter
+from rotkehlchen.db.dbhandler import DBHandler
+from rotkehlchen.globaldb.handler import GlobalDBHandler
+from rotkehlchen.logging import TRACE, add_logging_level
+from rotkehlchen.user_messages import MessagesAggregator
+
+add_logging_level('TRACE', TRACE)
+
+p = argparse.ArgumentParser()
+p.add_argument(
+    '--rows',
+    help='Number of rows in the generated CSV file',
+    type=int,
+    default=1_000_000,
+)
+p.add_argument(
+    '--materialize',
+    help='Read all the rows in memory before importing them',
+    action='store_true',
+)
+args = p.parse_args()
+
+
+def generate_csv(filepath: Path) -> None:
+    """Write a Binance export with a deposit or a trade of two rows per timestamp"""
+    with open(filepath, 'w', encoding='utf-8', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(['User_ID', 'UTC_Time', 'Account', 'Operation', 'Coin', 'Change', 'Remark'])  # noqa: E501
+        timestamp, written = 1600000000, 0
+        while written < args.rows:
+            date = datetime.fromtimestamp(timestamp, tz=UTC).strftime('%Y-%m-%d %H:%M:%S')
+            if timestamp % 2 == 0:
+                writer.writerow([1, date, 'Spot', 'Deposit', 'BTC', '0.0123', ''])
+                written += 1
+            else:
+                writer.writerow([1, date, 'Spot', 'Buy', 'BTC', '0.001', ''])
+                writer.writerow([1, date, 'Spot', 'Buy', 'EUR', '-15.5', ''])
+                written += 2
+            timestamp += 60
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        data_dir = Path(tmpdir)
+        csv_path = data_dir / 'binance.csv'
+        generate_csv(csv_path)
+        GlobalDBHandler(data_dir=data_dir, sql_vm_instructions_cb=0)
+        user_dir = data_dir / 'benchmark'
+        user_dir.mkdir()
+        database = DBHandler(
+            user_data_dir=user_dir,
+            password='123',
+            msg_aggregator=MessagesAggregator(),
+            initial_settings=None,
+            sql_vm_instructions_cb=0,
+            resume_from_backup=False,
+        )
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        dict_reader = csv.DictReader
+        with patch(
+            target='rotkehlchen.data_import.importers.binance.csv.DictReader',
+            new=lambda csvfile: list(dict_reader(csvfile)) if args.materialize else dict_reader(csvfile),  # noqa: E501
+        ):
+            seconds = timeit.timeit(
+                lambda: BinanceImporter(db=database).import_csv(filepath=csv_path),
+                number=1,
+            )
+
+        rss_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        print(f'Imported {args.rows} rows ({csv_path.stat().st_size / 2 ** 20:.1f} MiB) in {seconds:.2f} seconds')  # noqa: E501
+        print(f'{"rows/sec":>12} {"RSS before (MiB)":>17} {"peak RSS (MiB)":>15}')
+        print(f'{args.rows / seconds:>12.1f} {rss_before / 1024:>17.1f} {rss_peak / 1024:>15.1f}')
+        database.logout()
+        GlobalDBHandler().cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark of the per-log cost of trying the EVM event decoding rules as the number of
+registered rules grows. It compares trying every rule in sequence, which is what the
+decoder used to do, against looking up the candidate rules in the topic index built
+by index_event_rules.
+
+Run from the root of the repo with: python -m tools.benchmarks.evm_event_rules
+"""
+
+import argparse
+import os
+import timeit
+from collections.abc import Callable
+
+from rotkehlchen.chain.evm.decoding.structures import DEFAULT_DECODING_OUTPUT, DecodingOutput
+from rotkehlchen.chain.evm.decoding.utils import decodes_topics, index_event_rules
+
+p = argparse.ArgumentParser()
+p.add_argument(
+    '--rules',
+    help='Comma separated numbers of registered rules to benchmark',
+    type=str,
+    default='10,50,100,500,1000',
+)
+p.add_argument(
+    '--logs',
+    help='Number of logs decoded per measurement',
+    type=int,
+    default=10_000,
+)
+p.add_argument(
+    '--dynamic-rules',
+    help='Number of rules that do not declare their topics',
+    type=int,
+    default=2,
+)
+args = p.parse_args()
+
+
+def make_rule(topic: bytes) -> Callable[[bytes], DecodingOutput]:
+    """Make a rule that like most real ones rejects immediately for any other topic"""
+    @decodes_topics(topic)
+    def rule(log_topic: bytes) -> DecodingOutput:
+        if log_topic != topic:
+            return DEFAULT_DECODING_OUTPUT
+        return DecodingOutput(matched_counterparty='benchmark')
+
+    return rule
+
+
+def make_dynamic_rule() -> Callable[[bytes], DecodingOutput]:
+    def rule(log_topic: bytes) -> DecodingOutput:  # pylint: disable=unused-argument
+        return DEFAULT_DECODING_OUTPUT
+
+    return rule
+
+
+def try_rules(rules: list[Callable[[bytes], DecodingOutput]], log_topic: bytes) -> bool:
+    return any(rule(log_topic) != DEFAULT_DECODING_OUTPUT for rule in rules)
+
+
+def decode_linear(
+        rules: list[Callable[[bytes], DecodingOutput]],
+        log_topics: list[bytes],
+) -> None:
+    for log_topic in log_topics:
+        try_rules(rules, log_topic)
+
+
+def decode_indexed(
+        index: dict[bytes, list[Callable[[bytes], DecodingOutput]]],
+        dynamic_rules: list[Callable[[bytes], DecodingOutput]],
+        log_topics: list[bytes],
+) -> None:
+    for log_topic in log_topics:
+        try_rules(index.get(log_topic, dynamic_rules), log_topic)
+
+
+def main() -> None:
+    print(f'{"rules":>8} {"linear (us/log)":>16} {"indexed (us/log)":>17} {"speedup":>8}')
+    for rules_num in (int(x) for x in args.rules.split(',')):
+        topics = [os.urandom(32) for _ in range(rules_num)]
+        rules = [make_dynamic_rule() for _ in range(args.dynamic_rules)]
+        rules.extend(make_rule(topic) for topic in topics)
+        index, dynamic_rules = index_event_rules(rules)
+        # half of the logs match a rule, the other half are logs no rule knows about
+        log_topics = [topics[i % rules_num] if i % 2 == 0 else os.urandom(32) for i in range(args.logs)]  # noqa: E501
+
+        linear = timeit.timeit(lambda: decode_linear(rules, log_topics), number=1)  # noqa: B023
+        indexed = timeit.timeit(lambda: decode_indexed(index, dynamic_rules, log_topics), number=1)  # noqa: B023
+        linear_per_log = linear / args.logs * 1_000_000
+        indexed_per_log = indexed / args.logs * 1_000_000
+        print(f'{rules_num:>8} {linear_per_log:>16.3f} {indexed_per_log:>17.3f} {linear / indexed:>7.1f}x')  # noqa: E501
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+"""
+Benchmark of decoding the undecoded EVM transactions of a synthetic user DB. It compares
+decoding the transactions one by one with a read and a write transaction for each of them,
+which is what the undecoded transactions task used to do, against the chunked path that
+reads whole chunks of transactions at once and saves the events of each transaction
+before decoding the next one.
+
+The synthetic transactions have a gas payment and a few logs with unknown topics so
+the numbers mostly show the cost of the DB reads and writes around the decoding.
+
+Run from the root of the repo with: python -m tools.benchmarks.evm_tx_decoding
+"""
+from gevent import monkey  # isort:skip
+monkey.patch_all()  # isort:skip
+
+import argparse
+import os
+import tempfile
+import timeit
+from pathlib import Path
+from unittest.mock import patch
+
+from rotkehlchen.chain.accounts import BlockchainAccountData
+from rotkehlchen.chain.ethereum.decoding.decoder import EthereumTransactionDecoder
+from rotkehlchen.chain.ethereum.node_inquirer import EthereumInquirer
+from rotkehlchen.chain.ethereum.transactions import EthereumTransactions
+from rotkehlchen.db.dbhandler import DBHandler
+from rotkehlchen.db.evmtx import DBEvmTx
+from rotkehlchen.globaldb.handler import GlobalDBHandler
+from rotkehlchen.greenlets.manager import GreenletManager
+from rotkehlchen.logging import TRACE, add_logging_level
+from rotkehlchen.types import (
+    ChainID,
+    EvmTransaction,
+    EVMTxHash,
+    SupportedBlockchain,
+    Timestamp,
+    deserialize_evm_tx_hash,
+)
+from rotkehlchen.user_messages import MessagesAggregator
+from rotkehlchen.utils.misc import get_chunks
+
+add_logging_level('TRACE', TRACE)
+
+USER_ADDRESS = '0x9531C059098e3d194fF87FebB587aB07B30B1306'
+OTHER_ADDRESS = '0xc37b40ABdB939635068d3c5f13E7faF686F03B65'
+
+p = argparse.ArgumentParser()
+p.add_argument(
+    '--transactions',
+    help='Number of undecoded transactions in the synthetic DB',
+    type=int,
+    default=2000,
+)
+p.add_argument(
+    '--logs',
+    help='Number of logs in the receipt of each transaction',
+    type=int,
+    default=3,
+)
+p.add_argument(
+    '--chunk-sizes',
+    help='Comma separated chunk sizes to benchmark for the chunked path',
+    type=str,
+    default='10,100,500',
+)
+args = p.parse_args()
+
+
+def populate_db(database: DBHandler) -> list[EVMTxHash]:
+    """Add the user account and the synthetic transactions with their receipts"""
+    transactions, receipts = [], []
+    for idx in range(args.transactions):
+        raw_tx_hash = os.urandom(32)
+        tx_hash = deserialize_evm_tx_hash(raw_tx_hash)
+        transactions.append(EvmTransaction(
+            tx_hash=tx_hash,
+            chain_id=ChainID.ETHEREUM,
+            timestamp=Timestamp(1600000000 + idx),
+            block_number=10000000 + idx,
+            from_address=USER_ADDRESS,  # type: ignore[arg-type]  # it's checksummed
+            to_address=OTHER_ADDRESS,  # type: ignore[arg-type]  # it's checksummed
+            value=0,
+            gas=100000,
+            gas_price=10 ** 10,
+            gas_used=50000,
+            input_data=b'',
+            nonce=idx,
+        ))
+        receipts.append({
+            'transactionHash': '0x' + raw_tx_hash.hex(),
+            'type': '0x2',
+            'status': 1,
+            'contractAddress': None,
+            'logs': [{
+                'logIndex': log_index,
+                'data': '0x' + os.urandom(32).hex(),
+                'address': OTHER_ADDRESS,
+                'removed': False,
+                'topics': ['0x' + os.urandom(32).hex() for _ in range(3)],
+            } for log_index in range(args.logs)],
+        })
+
+    dbevmtx = DBEvmTx(database)
+    with database.user_write() as write_cursor:
+        database.add_blockchain_accounts(
+            write_cursor=write_cursor,
+            account_data=[BlockchainAccountData(chain=SupportedBlockchain.ETHEREUM, address=USER_ADDRESS)],  # type: ignore[arg-type]  # noqa: E501
+        )
+        dbevmtx.add_evm_transactions(
+            write_cursor=write_cursor,
+            evm_transactions=transactions,
+            relevant_address=USER_ADDRESS,  # type: ignore[arg-type]  # it's checksummed
+        )
+        for receipt in receipts:
+            dbevmtx.add_or_ignore_receipt_data(
+                write_cursor=write_cursor,
+                chain_id=ChainID.ETHEREUM,
+                data=receipt,
+            )
+
+    return [tx.tx_hash for tx in transactions]
+
+
+def reset_decoding(database: DBHandler) -> None:
+    with database.user_write() as write_cursor:
+        write_cursor.execute('DELETE FROM history_events')
+        write_cursor.execute('DELETE FROM evm_tx_mappings')
+
+
+def decode_per_transaction(decoder: EthereumTransactionDecoder, tx_hashes: list[EVMTxHash]) -> None:  # noqa: E501
+    """Decode as the undecoded transactions task used to, with a write for each transaction"""
+    for chunk in get_chunks(tx_hashes, n=100):
+        decoder.decode_transaction_hashes(ignore_cache=False, tx_hashes=chunk)
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        data_dir = Path(tmpdir)
+        msg_aggregator = MessagesAggregator()
+        GlobalDBHandler(data_dir=data_dir, sql_vm_instructions_cb=0)
+        user_dir = data_dir / 'benchmark'
+        user_dir.mkdir()
+        database = DBHandler(
+            user_data_dir=user_dir,
+            password='123',
+            msg_aggregator=msg_aggregator,
+            initial_settings=None,
+            sql_vm_instructions_cb=0,
+            resume_from_backup=False,
+        )
+        tx_hashes = populate_db(database)
+        ethereum_inquirer = EthereumInquirer(
+            greenlet_manager=GreenletManager(msg_aggregator=msg_aggregator),
+            database=database,
+        )
+        with patch(  # don't refresh the protocol caches from the network during decoding
+            target='rotkehlchen.chain.evm.node_inquirer.should_update_protocol_cache',
+            new=lambda *args, **kwargs: False,
+        ):
+            decoder = EthereumTransactionDecoder(
+                database=database,
+                ethereum_inquirer=ethereum_inquirer,
+                transactions=EthereumTransactions(ethereum_inquirer=ethereum_inquirer, database=database),  # noqa: E501
+            )
+            print(f'Decoding {args.transactions} transactions with {args.logs} logs each')
+            print(f'{"path":>16} {"seconds":>9} {"txs/sec":>9}')
+            per_tx = timeit.timeit(lambda: decode_per_transaction(decoder, tx_hashes), number=1)
+            print(f'{"per transaction":>16} {per_tx:>9.2f} {args.transactions / per_tx:>9.1f}')
+            for chunk_size in (int(x) for x in args.chunk_sizes.split(',')):
+                reset_decoding(database)
+                chunked = timeit.timeit(
+                    lambda: decoder.get_and_decode_undecoded_transactions(chunk_size=chunk_size),  # noqa: B023
+                    number=1,
+                )
+                print(f'{f"chunks of {chunk_size}":>16} {chunked:>9.2f} {args.transactions / chunked:>9.1f}')  # noqa: E501
+
+        database.logout()
+        GlobalDBHandler().cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark of the FVal operations that dominate accounting and balance aggregation with
+the Decimal backend and the fixed point backend that can be selected at startup with
+the ROTKI_FVAL_BACKEND environment variable.
+
+The values are random amounts and prices with up to 18 decimals, like the ones of tokens.
+
+Run from the root of the repo with: python -m tools.benchmarks.fval
+"""
+
+import argparse
+import operator
+import random
+import timeit
+from collections.abc import Callable
+
+from rotkehlchen.fval import FixedPointFVal, FVal, set_fval_backend
+
+p = argparse.ArgumentParser()
+p.add_argument(
+    '--values',
+    help='Number of values each operation is applied to per measurement',
+    type=int,
+    default=100_000,
+)
+p.add_argument(
+    '--repeat',
+    help='Number of measurements of each operation. The best one is reported',
+    type=int,
+    default=5,
+)
+args = p.parse_args()
+
+
+def random_values() -> list[str]:
+    values = []
+    for _ in range(args.values):
+        decimals = random.randint(0, 18)
+        values.append(f'{random.randint(0, 10 ** 6)}.{random.randint(0, 10 ** decimals - 1):0{decimals}d}')  # noqa: E501
+    return values
+
+
+def sum_values(fvals: list[FVal]) -> None:
+    total = fvals[0]
+    for value in fvals:
+        total += value
+
+
+def measure(function: Callable[[], object]) -> float:
+    """Return the best time of an operation on all values in ns per value"""
+    return min(timeit.repeat(function, number=1, repeat=args.repeat)) / args.values * 10 ** 9
+
+
+def main() -> None:
+    raw_values = random_values()
+    print(f'{"operation":>10} {"decimal (ns)":>13} {"fixed (ns)":>11} {"speedup":>8}')
+    results: dict[str, list[float]] = {}
+    for backend in ('decimal', 'fixed'):
+        set_fval_backend(backend)  # type: ignore[arg-type]  # it's one of the two
+        values = [FVal(x) for x in raw_values]
+        other_values = values[1:] + values[:1]
+        assert all(isinstance(x, FixedPointFVal) is (backend == 'fixed') for x in values)
+        for name, function in (
+                ('create', lambda: [FVal(x) for x in raw_values]),
+                ('add', lambda: list(map(operator.add, values, other_values))),  # noqa: B023
+                ('sum', lambda: sum_values(values)),  # noqa: B023
+                ('mul', lambda: list(map(operator.mul, values, other_values))),  # noqa: B023
+                ('compare', lambda: list(map(operator.lt, values, other_values))),  # noqa: B023
+                ('equal', lambda: list(map(operator.eq, values, other_values))),  # noqa: B023
+                ('serialize', lambda: list(map(str, values))),  # noqa: B023
+        ):
+            results.setdefault(name, []).append(measure(function))
+
+    set_fval_backend('decimal')
+    for name, (decimal_time, fixed_time) in results.items():
+        print(f'{name:>10} {decimal_time:>13.1f} {fixed_time:>11.1f} {decimal_time / fixed_time:>7.2f}x')  # noqa: E501
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,310 @@
+"""
+Benchmark of the main history events and EVM transactions queries on a synthetic user DB
+of many events. For each query it prints the time it took against its latency budget and
+the tables it had to scan fully according to EXPLAIN QUERY PLAN. Exits with an error if
+any query is over its budget or scans a big table without using an index.
+
+The synthetic events are grouped in EVM transactions and exchange events of a few
+accounts, locations, assets, types and counterparties, spread over a few years.
+
+Run from the root of the repo with: python -m tools.benchmarks.history_events_queries
+"""
+from gevent import monkey  # isort:skip
+monkey.patch_all()  # isort:skip
+
+import argparse
+import random
+import re
+import sys
+import tempfile
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from rotkehlchen.assets.asset import Asset
+from rotkehlchen.db.dbhandler import DBHandler
+from rotkehlchen.db.evmtx import DBEvmTx
+from rotkehlchen.db.filtering import (
+    EvmEventFilterQuery,
+    EvmTransactionsFilterQuery,
+    HistoryBaseEntryFilterQuery,
+    HistoryEventFilterQuery,
+)
+from rotkehlchen.db.history_events import DBHistoryEvents
+from rotkehlchen.globaldb.handler import GlobalDBHandler
+from rotkehlchen.history.events.structures.base import HistoryBaseEntryType
+from rotkehlchen.history.events.structures.types import HistoryEventSubType, HistoryEventType
+from rotkehlchen.logging import TRACE, add_logging_level
+from rotkehlchen.types import ChainID, Location, Timestamp
+from rotkehlchen.user_messages import MessagesAggregator
+
+add_logging_level('TRACE', TRACE)
+
+ADDRESSES = [f'0x{idx:040x}' for idx in range(1, 21)]
+COUNTERPARTIES = ['uniswap-v2', 'uniswap-v3', 'aave', 'compound', 'curve', 'gas', None]
+EVENT_TYPES = [
+    (HistoryEventType.SPEND, HistoryEventSubType.FEE),
+    (HistoryEventType.SPEND, HistoryEventSubType.NONE),
+    (HistoryEventType.RECEIVE, HistoryEventSubType.NONE),
+    (HistoryEventType.TRADE, HistoryEventSubType.SPEND),
+    (HistoryEventType.TRADE, HistoryEventSubType.RECEIVE),
+    (HistoryEventType.DEPOSIT, HistoryEventSubType.DEPOSIT_ASSET),
+    (HistoryEventType.WITHDRAWAL, HistoryEventSubType.REMOVE_ASSET),
+]
+START_TS = 1500000000
+TS_STEP = 60  # seconds between two event groups
+
+p = argparse.ArgumentParser()
+p.add_argument(
+    '--events',
+    help='Number of history events in the synthetic DB',
+    type=int,
+    default=1_000_000,
+)
+p.add_argument(
+    '--budget-factor',
+    help='Factor to multiply the latency budgets with, for slower machines',
+    type=float,
+    default=1.0,
+)
+args = p.parse_args()
+
+
+def populate_db(database: DBHandler) -> list[str]:
+    """Add the synthetic events in groups of three, each of them in a transaction for EVM
+    events. Returns the assets of the events"""
+    random.seed(42)
+    with database.conn.read_ctx() as cursor:
+        assets = [x[0] for x in cursor.execute('SELECT identifier FROM assets LIMIT 200')]
+
+    history_events, evm_events, transactions, mappings = [], [], [], []
+    for group in range(args.events // 3):
+        timestamp = START_TS + group * TS_STEP
+        address = random.choice(ADDRESSES)
+        is_evm = group % 4 != 0
+        if is_evm:
+            tx_hash = group.to_bytes(32, byteorder='big')
+            event_identifier = '10x' + tx_hash.hex()
+            location = Location.ETHEREUM
+            transactions.append((
+                group + 1, tx_hash, ChainID.ETHEREUM.serialize_for_db(), timestamp,
+                10000000 + group, address, ADDRESSES[0], '0', '21000', '1', '21000', b'', 1,
+            ))
+            mappings.append((group + 1, address))
+        else:
+            event_identifier = f'exchange_{group}'
+            location = random.choice([Location.KRAKEN, Location.BINANCE, Location.COINBASE])
+
+        counterparty = random.choice(COUNTERPARTIES)
+        for sequence_index in range(3):
+            identifier = group * 3 + sequence_index + 1
+            event_type, event_subtype = random.choice(EVENT_TYPES)
+            history_events.append((
+                identifier,
+                (HistoryBaseEntryType.EVM_EVENT if is_evm else HistoryBaseEntryType.HISTORY_EVENT).value,  # noqa: E501
+                event_identifier,
+                sequence_index,
+                timestamp * 1000,
+                location.serialize_for_db(),
+                address,
+                random.choice(assets),
+                '1.5',
+                '10',
+                None,
+                event_type.serialize(),
+                event_subtype.serialize(),
+            ))
+            if is_evm:
+                evm_events.append((identifier, tx_hash, counterparty, None, None, None))
+
+    with database.user_write() as write_cursor:
+        write_cursor.executemany(
+            'INSERT INTO history_events(identifier, entry_type, event_identifier, '
+            'sequence_index, timestamp, location, location_label, asset, amount, usd_value, '
+            'notes, type, subtype) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            history_events,
+        )
+        write_cursor.executemany(
+            'INSERT INTO evm_events_info(identifier, tx_hash, counterparty, product, '
+            'address, extra_data) VALUES(?, ?, ?, ?, ?, ?)',
+            evm_events,
+        )
+        write_cursor.executemany(
+            'INSERT INTO evm_transactions(identifier, tx_hash, chain_id, timestamp, '
+            'block_number, from_address, to_address, value, gas, gas_price, gas_used, '
+            'input_data, nonce) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            transactions,
+        )
+        write_cursor.executemany(
+            'INSERT INTO evmtx_address_mappings(tx_id, address) VALUES(?, ?)',
+            mappings,
+        )
+        write_cursor.executemany(  # ignore a few assets
+            'INSERT INTO multisettings(name, value) VALUES(?, ?)',
+            [('ignored_asset', x) for x in assets[:5]],
+        )
+
+    return assets
+
+
+def full_scans(database: DBHandler, query: str, bindings: list[Any]) -> list[str]:
+    """The tables that the query plan scans without an index"""
+    with database.conn.read_ctx() as cursor:
+        plan = [x[3] for x in cursor.execute(f'EXPLAIN QUERY PLAN {query}', bindings)]
+    return [
+        match.group(1) for line in plan
+        if (match := re.match(r'SCAN (\w+)(?: AS \w+)?$', line)) is not None
+    ]
+
+
+def history_query(
+        database: DBHandler,
+        filter_query: HistoryBaseEntryFilterQuery,
+        has_premium: bool,
+        group_by_event_ids: bool,
+) -> tuple[Callable[[], Any], str, list[Any]]:
+    """Query history events like the history events endpoint does"""
+    dbevents = DBHistoryEvents(database)
+
+    def run() -> None:
+        with database.conn.read_ctx() as cursor:
+            dbevents.get_history_events_and_limit_info(
+                cursor=cursor,
+                filter_query=filter_query,
+                has_premium=has_premium,
+                group_by_event_ids=group_by_event_ids,
+                entries_limit=None if has_premium else 100,
+            )
+
+    query, bindings = dbevents._create_history_events_query(
+        filter_query=filter_query,
+        entries_limit=100,
+        has_premium=has_premium,
+        group_by_event_ids=group_by_event_ids,
+    )
+    if filter_query.pagination is not None:
+        query = f'SELECT * FROM ({query}) {filter_query.pagination.prepare()}'
+    return run, query, bindings
+
+
+def transactions_query(
+        database: DBHandler,
+        filter_query: EvmTransactionsFilterQuery,
+) -> tuple[Callable[[], Any], str, list[Any]]:
+    """Query EVM transactions like the transactions endpoint does"""
+    dbevmtx = DBEvmTx(database)
+
+    def run() -> None:
+        with database.conn.read_ctx() as cursor:
+            dbevmtx.get_evm_transactions_and_limit_info(
+                cursor=cursor,
+                filter_=filter_query,
+                has_premium=True,
+            )
+
+    query, bindings = dbevmtx._form_evm_transaction_dbquery(*filter_query.prepare(), has_premium=True)  # noqa: E501
+    return run, query, bindings
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        data_dir = Path(tmpdir)
+        GlobalDBHandler(data_dir=data_dir, sql_vm_instructions_cb=0)
+        user_dir = data_dir / 'benchmark'
+        user_dir.mkdir()
+        database = DBHandler(
+            user_data_dir=user_dir,
+            password='123',
+            msg_aggregator=MessagesAggregator(),
+            initial_settings=None,
+            sql_vm_instructions_cb=0,
+            resume_from_backup=False,
+        )
+        print(f'Populating the DB with {args.events} history events')
+        assets = populate_db(database)
+        end_ts = Timestamp(START_TS + args.events // 3 * TS_STEP)
+        month_ago = Timestamp(end_ts - 30 * 24 * 3600)
+        queries: list[tuple[str, float, tuple[Callable[[], Any], str, list[Any]]]] = [
+            ('latest page', 0.5, history_query(
+                database=database,
+                filter_query=HistoryEventFilterQuery.make(limit=10, offset=0, order_by_rules=[('timestamp', False)]),  # noqa: E501
+                has_premium=True,
+                group_by_event_ids=False,
+            )),
+            ('latest page grouped', 2, history_query(
+                database=database,
+                filter_query=HistoryEventFilterQuery.make(limit=10, offset=0, order_by_rules=[('timestamp', False)], exclude_ignored_assets=True),  # noqa: E501
+                has_premium=True,
+                group_by_event_ids=True,
+            )),
+            ('free latest page', 0.5, history_query(
+                database=database,
+                filter_query=HistoryEventFilterQuery.make(limit=10, offset=0, order_by_rules=[('timestamp', False)]),  # noqa: E501
+                has_premium=False,
+                group_by_event_ids=False,
+            )),
+            ('last month', 0.5, history_query(
+                database=database,
+                filter_query=HistoryEventFilterQuery.make(limit=10, offset=0, from_ts=month_ago, to_ts=end_ts),  # noqa: E501
+                has_premium=True,
+                group_by_event_ids=False,
+            )),
+            ('location', 0.5, history_query(
+                database=database,
+                filter_query=HistoryEventFilterQuery.make(limit=10, offset=0, location=Location.KRAKEN, from_ts=month_ago, to_ts=end_ts),  # noqa: E501
+                has_premium=True,
+                group_by_event_ids=False,
+            )),
+            ('account', 0.5, history_query(
+                database=database,
+                filter_query=HistoryEventFilterQuery.make(limit=10, offset=0, location_labels=[ADDRESSES[3]], from_ts=month_ago, to_ts=end_ts),  # noqa: E501
+                has_premium=True,
+                group_by_event_ids=False,
+            )),
+            ('asset', 0.5, history_query(
+                database=database,
+                filter_query=HistoryEventFilterQuery.make(limit=10, offset=0, assets=(Asset(assets[10]),)),  # noqa: E501
+                has_premium=True,
+                group_by_event_ids=False,
+            )),
+            ('type', 2, history_query(
+                database=database,
+                filter_query=HistoryEventFilterQuery.make(limit=10, offset=0, event_types=[HistoryEventType.DEPOSIT], event_subtypes=[HistoryEventSubType.DEPOSIT_ASSET]),  # noqa: E501
+                has_premium=True,
+                group_by_event_ids=False,
+            )),
+            ('transaction', 0.1, history_query(
+                database=database,
+                filter_query=EvmEventFilterQuery.make(tx_hashes=[(12345).to_bytes(32, byteorder='big')]),  # type: ignore[list-item]  # noqa: E501
+                has_premium=True,
+                group_by_event_ids=False,
+            )),
+            ('counterparty', 2, history_query(
+                database=database,
+                filter_query=EvmEventFilterQuery.make(limit=10, offset=0, counterparties=['aave'], from_ts=month_ago, to_ts=end_ts),  # noqa: E501
+                has_premium=True,
+                group_by_event_ids=False,
+            )),
+            ('account transactions', 2, transactions_query(
+                database=database,
+                filter_query=EvmTransactionsFilterQuery.make(limit=10, offset=0, accounts=[(ADDRESSES[3], None)], chain_id=ChainID.ETHEREUM),  # type: ignore[list-item]  # noqa: E501
+            )),
+        ]
+        print(f'{"query":>22} {"seconds":>9} {"budget":>7}  full scans')
+        failed = False
+        for name, base_budget, (run, query, bindings) in queries:
+            budget = base_budget * args.budget_factor
+            seconds = timeit.timeit(run, number=1)
+            scans = [x for x in full_scans(database, query, bindings) if x in ('history_events', 'evm_events_info', 'evm_transactions', 'evmtx_address_mappings')]  # noqa: E501
+            failed |= seconds > budget or len(scans) != 0
+            print(f'{name:>22} {seconds:>9.3f} {budget:>7.2f}  {", ".join(scans)}')
+
+        database.logout()
+        GlobalDBHandler().cleanup()
+        if failed:
+            sys.exit('Some queries were over their budget or scanned a table without an index')
+
+
+if __name__ == '__main__':
+    main()
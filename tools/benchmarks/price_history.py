@@ -0,0 +1,151 @@
+"""
+Benchmark of the storage of the cached historical prices of the price oracles. It compares
+one price_history row per price, which is how they used to be stored, against the chunks
+of a month per pair of price_history_chunks. For both it prints the size of the global DB
+file and the time of looking up the closest price to random timestamps of random pairs.
+
+Run from the root of the repo with: python -m tools.benchmarks.price_history
+"""
+import argparse
+import random
+import sqlite3
+import tempfile
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+
+from rotkehlchen.globaldb.price_chunks import make_price_chunks, query_chunked_prices
+from rotkehlchen.globaldb.schema import DB_SCRIPT_CREATE_TABLES
+from rotkehlchen.logging import TRACE, add_logging_level
+
+add_logging_level('TRACE', TRACE)
+
+p = argparse.ArgumentParser()
+p.add_argument(
+    '--pairs',
+    help='Number of asset pairs with cached prices',
+    type=int,
+    default=50,
+)
+p.add_argument(
+    '--days',
+    help='Number of days of hourly prices of each pair',
+    type=int,
+    default=730,
+)
+p.add_argument(
+    '--lookups',
+    help='Number of closest price lookups',
+    type=int,
+    default=5000,
+)
+args = p.parse_args()
+
+START_TS = 1577836800  # 2020-01-01
+HOUR = 3600
+SOURCE = 'C'  # cryptocompare
+
+
+def make_prices() -> list[tuple[int, str]]:
+    """Hourly prices of a random walk rounded to the decimals the oracles usually return"""
+    price, prices = random.uniform(0.01, 50000), []
+    for hour in range(args.days * 24):
+        price *= random.uniform(0.98, 1.02)
+        prices.append((START_TS + hour * HOUR, f'{price:.6g}'))
+
+    return prices
+
+
+def create_db(path: Path, pairs: dict[str, list[tuple[int, str]]], chunked: bool) -> None:
+    with sqlite3.connect(path) as conn:
+        conn.executescript(DB_SCRIPT_CREATE_TABLES)
+        conn.executemany(
+            'INSERT INTO assets(identifier, name, type) VALUES(?, ?, ?)',
+            [(asset, asset, 'A') for asset in (*pairs, 'USD')],
+        )
+        for asset, prices in pairs.items():
+            if chunked:
+                conn.executemany(
+                    'INSERT INTO price_history_chunks(from_asset, to_asset, source_type, '
+                    'chunk_start, first_timestamp, last_timestamp, prices_num, data, '
+                    'block_index) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    [(asset, 'USD', SOURCE, *chunk) for chunk in make_price_chunks(prices)],
+                )
+            else:
+                conn.executemany(
+                    'INSERT INTO price_history(from_asset, to_asset, source_type, timestamp, '
+                    'price) VALUES(?, ?, ?, ?, ?)',
+                    [(asset, 'USD', SOURCE, timestamp, price) for timestamp, price in prices],
+                )
+
+    with sqlite3.connect(path) as conn:
+        conn.execute('VACUUM;')
+
+
+def closest(entries: list[tuple], timestamp: int) -> tuple | None:
+    if len(entries) == 0:
+        return None
+    return min(entries, key=lambda x: abs(x[3] - timestamp))
+
+
+def closest_row(cursor: sqlite3.Cursor, asset: str, timestamp: int) -> tuple | None:
+    return closest(cursor.execute(
+        'SELECT from_asset, to_asset, source_type, timestamp, price FROM price_history '
+        'WHERE from_asset=? AND to_asset=? AND source_type=? AND timestamp BETWEEN ? AND ?',
+        (asset, 'USD', SOURCE, timestamp - HOUR, timestamp + HOUR),
+    ).fetchall(), timestamp)
+
+
+def closest_chunked(cursor: sqlite3.Cursor, asset: str, timestamp: int) -> tuple | None:
+    return closest(query_chunked_prices(
+        cursor=cursor,  # type: ignore[arg-type]  # only execute is used
+        from_asset=asset,
+        to_asset='USD',
+        from_ts=timestamp - HOUR,
+        to_ts=timestamp + HOUR,
+    ), timestamp)
+
+
+def measure(
+        path: Path,
+        lookup: Callable[[sqlite3.Cursor, str, int], tuple | None],
+        queries: list[tuple[str, int]],
+) -> tuple[float, list[tuple | None]]:
+    """Returns the average milliseconds of each lookup and the found prices"""
+    with sqlite3.connect(path) as conn:
+        cursor = conn.cursor()
+        found: list[tuple | None] = []
+        seconds = timeit.timeit(
+            lambda: found.extend(lookup(cursor, asset, timestamp) for asset, timestamp in queries),
+            number=1,
+        )
+
+    return seconds * 1000 / len(queries), found
+
+
+def main() -> None:
+    random.seed(42)
+    pairs = {f'ASSET{idx}': make_prices() for idx in range(args.pairs)}
+    end_ts = START_TS + args.days * 24 * HOUR
+    queries = [
+        (random.choice(list(pairs)), random.randint(START_TS, end_ts))
+        for _ in range(args.lookups)
+    ]
+    print(f'{args.pairs} pairs of {args.days * 24} hourly prices')
+    print(f'{"storage":>8} {"MB":>8} {"lookup ms":>10}')
+    results = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name, chunked, lookup in (
+            ('rows', False, closest_row),
+            ('chunks', True, closest_chunked),
+        ):
+            create_db(path := Path(tmpdir) / f'{name}.db', pairs, chunked)
+            milliseconds, found = measure(path, lookup, queries)
+            results.append(found)
+            print(f'{name:>8} {path.stat().st_size / 1024 / 1024:>8.2f} {milliseconds:>10.4f}')
+
+    assert results[0] == results[1], 'The lookups of the two storages differ'
+
+
+if __name__ == '__main__':
+    main()